@@ -0,0 +1,175 @@
+"""
+This module contains code used for benchmarking creating runs in and
+listing the experiments and runs of QCoDeS databases with many runs.
+"""
+
+import os
+import shutil
+import tempfile
+import time
+from typing import ClassVar
+
+import numpy as np
+
+from qcodes import ManualParameter
+from qcodes.dataset.data_set import new_data_set
+from qcodes.dataset.data_set_info import get_run_summaries
+from qcodes.dataset.descriptions.dependencies import InterDependencies_
+from qcodes.dataset.descriptions.param_spec import ParamSpecBase
+from qcodes.dataset.experiment_container import experiments, new_experiment
+from qcodes.dataset.guids import generate_guid
+from qcodes.dataset.measurements import Measurement
+from qcodes.dataset.sqlite.connection import atomic
+from qcodes.dataset.sqlite.database import connect
+from qcodes.dataset.sqlite.queries import format_table_name
+
+# creating a result table takes longer the more tables there are, so the
+# number of runs is kept to what a busy lab database holds after some years
+N_EXPERIMENTS = 100
+RUNS_PER_EXPERIMENT = 200
+
+
+def create_runs_db(path: str, n_experiments: int, runs_per_experiment: int) -> None:
+    """
+    Create a database with ``n_experiments`` experiments of
+    ``runs_per_experiment`` completed runs each. The first run of each
+    experiment is created through the dataset, the others are copies of it
+    inserted in bulk, each with an empty result table, since creating them
+    one by one takes much longer.
+    """
+    conn = connect(path)
+    x = ParamSpecBase("x", "numeric")
+    y = ParamSpecBase("y", "numeric")
+    interdeps = InterDependencies_(dependencies={y: (x,)})
+    templates = []
+    for i in range(n_experiments):
+        exp = new_experiment(f"experiment_{i}", sample_name=f"sample_{i}", conn=conn)
+        template = new_data_set("measurement", exp_id=exp.exp_id, conn=conn)
+        template.set_interdependencies(interdeps)
+        template.mark_started()
+        template.add_results([{"x": j, "y": np.sin(j)} for j in range(10)])
+        template.mark_completed()
+        templates.append((exp, template))
+
+    run_columns = ", ".join(
+        row[1]
+        for row in conn.execute("PRAGMA table_info(runs)").fetchall()
+        if row[1] not in ("run_id", "result_table_name", "result_counter", "guid")
+    )
+    counters = range(2, runs_per_experiment + 1)
+    with atomic(conn) as atomic_conn:
+        for exp, template in templates:
+            (table_sql,) = atomic_conn.execute(
+                "SELECT sql FROM sqlite_master WHERE type='table' AND name=?",
+                (template.table_name,),
+            ).fetchone()
+            table_names = [
+                format_table_name(exp.format_string, "results", exp.exp_id, counter)
+                for counter in counters
+            ]
+            for table_name in table_names:
+                atomic_conn.execute(
+                    table_sql.replace(template.table_name, table_name, 1)
+                )
+            atomic_conn.executemany(
+                f"INSERT INTO runs (result_table_name, result_counter, guid, "
+                f"{run_columns}) SELECT ?, ?, ?, {run_columns} FROM runs "
+                "WHERE run_id = ?",
+                (
+                    (table_name, counter, generate_guid(), template.run_id)
+                    for table_name, counter in zip(table_names, counters)
+                ),
+            )
+            atomic_conn.execute(
+                "UPDATE experiments SET run_counter = ? WHERE exp_id = ?",
+                (runs_per_experiment, exp.exp_id),
+            )
+        atomic_conn.execute(
+            "UPDATE runs SET captured_run_id = run_id, "
+            "captured_counter = result_counter"
+        )
+    conn.close()
+
+
+class ListExperiments:
+    """
+    This benchmark measures listing the experiments of a database with
+    N_EXPERIMENTS experiments of RUNS_PER_EXPERIMENT runs each, together with
+    their number of runs, and getting a summary of all runs.
+    """
+
+    number = 1
+    repeat = 5
+    timeout = 1200
+
+    timer = time.perf_counter
+
+    def setup_cache(self):
+        path = os.path.abspath("experiments.db")
+        create_runs_db(path, N_EXPERIMENTS, RUNS_PER_EXPERIMENT)
+        return path
+
+    def setup(self, path):
+        self.conn = connect(path)
+
+    def teardown(self, path):
+        self.conn.close()
+
+    def time_experiments(self, path):
+        [(exp.name, len(exp)) for exp in experiments(conn=self.conn)]
+
+    def peakmem_experiments(self, path):
+        [(exp.name, len(exp)) for exp in experiments(conn=self.conn)]
+
+    def time_get_run_summaries(self, path):
+        get_run_summaries(self.conn)
+
+    def peakmem_get_run_summaries(self, path):
+        get_run_summaries(self.conn)
+
+
+class CreateRun:
+    """
+    This benchmark measures the latency of creating, starting and completing
+    a run with a measurement, in an empty database and in a database with
+    N_EXPERIMENTS * RUNS_PER_EXPERIMENT runs.
+    """
+
+    number = 1
+    repeat = 20
+    timeout = 1200
+
+    params = (False, True)
+    param_names: ClassVar[list[str]] = ["many_runs"]
+
+    timer = time.perf_counter
+
+    def setup_cache(self):
+        path = os.path.abspath("create_run.db")
+        create_runs_db(path, N_EXPERIMENTS, RUNS_PER_EXPERIMENT)
+        return path
+
+    def setup(self, path, many_runs):
+        self.tmpdir = None
+        if many_runs:
+            self.conn = connect(path)
+        else:
+            self.tmpdir = tempfile.mkdtemp()
+            self.conn = connect(os.path.join(self.tmpdir, "empty.db"))
+        self.experiment = new_experiment(
+            "create_run", sample_name="benchmark", conn=self.conn
+        )
+        x = ManualParameter("x")
+        y = ManualParameter("y")
+        self.meas = Measurement(self.experiment)
+        self.meas.register_parameter(x)
+        self.meas.register_parameter(y, setpoints=(x,))
+
+    def teardown(self, path, many_runs):
+        self.conn.close()
+        if self.tmpdir is not None:
+            shutil.rmtree(self.tmpdir)
+
+    def time_measurement_run(self, path, many_runs):
+        with self.meas.run():
+            pass
@@ -0,0 +1,255 @@
+"""
+This module contains code used for benchmarking loading the data of QCoDeS
+datasets from the database, into the cache of a running measurement and
+into pandas and xarray, as well as exporting it to netCDF files.
+"""
+
+import os
+import shutil
+import tempfile
+import time
+from typing import ClassVar, NamedTuple
+
+import numpy as np
+
+from qcodes.dataset.data_set import DataSet, _ResultColumns, load_by_id
+from qcodes.dataset.descriptions.dependencies import InterDependencies_
+from qcodes.dataset.descriptions.param_spec import ParamSpecBase
+from qcodes.dataset.experiment_container import new_experiment
+from qcodes.dataset.sqlite.database import connect
+
+# the number of values of the inner setpoint, and the length of the values of
+# 'array' type parameters
+INNER_LENGTH = 1000
+# the number of rows that are inserted in one go when creating a dataset
+ROWS_PER_INSERT = 100_000
+
+
+class DatasetSpec(NamedTuple):
+    """
+    Description of a dataset with parameters ``y0``, ``y1``, ... that depend on
+    an outer setpoint ``x`` and an inner setpoint ``t``.
+    """
+
+    n_points: int
+    """Number of points of each dependent parameter."""
+    n_params: int
+    """Number of dependent parameters."""
+    paramtype: str
+    """
+    The type of the dependent parameters and the inner setpoint. For 'array'
+    each row holds arrays of INNER_LENGTH values, for 'numeric' a single value.
+    """
+    shaped: bool
+    """Whether the shapes of the dependent parameters are stored."""
+
+
+DATASETS = {
+    "numeric-1e3pts-1param": DatasetSpec(1_000, 1, "numeric", False),
+    "numeric-1e5pts-1param": DatasetSpec(100_000, 1, "numeric", False),
+    "numeric-1e5pts-1param-shaped": DatasetSpec(100_000, 1, "numeric", True),
+    "numeric-1e7pts-1param": DatasetSpec(10_000_000, 1, "numeric", False),
+    "numeric-1e7pts-1param-shaped": DatasetSpec(10_000_000, 1, "numeric", True),
+    "numeric-1e5pts-10params-shaped": DatasetSpec(100_000, 10, "numeric", True),
+    "numeric-1e5pts-100params-shaped": DatasetSpec(100_000, 100, "numeric", True),
+    "array-1e5pts-1param-shaped": DatasetSpec(100_000, 1, "array", True),
+    "array-1e7pts-1param": DatasetSpec(10_000_000, 1, "array", False),
+    "array-1e7pts-1param-shaped": DatasetSpec(10_000_000, 1, "array", True),
+    "array-1e5pts-100params-shaped": DatasetSpec(100_000, 100, "array", True),
+}
+
+
+def start_dataset(conn, spec: DatasetSpec) -> DataSet:
+    """
+    Create a dataset for the given spec and mark it started.
+    """
+    x = ParamSpecBase("x", "numeric")
+    t = ParamSpecBase("t", spec.paramtype)
+    ys = [ParamSpecBase(f"y{i}", spec.paramtype) for i in range(spec.n_params)]
+    interdeps = InterDependencies_(dependencies={y: (x, t) for y in ys})
+    n_inner = min(INNER_LENGTH, spec.n_points)
+    shapes = (
+        {y.name: (spec.n_points // n_inner, n_inner) for y in ys}
+        if spec.shaped
+        else None
+    )
+    dataset = DataSet(conn=conn)
+    dataset.set_interdependencies(interdeps, shapes=shapes)
+    dataset.mark_started()
+    return dataset
+
+
+def add_rows(dataset: DataSet, spec: DatasetSpec, start: int, stop: int, rng) -> None:
+    """
+    Add the rows with the outer setpoint indices from ``start`` to ``stop``
+    for 'array' type datasets, or the points from ``start`` to ``stop`` for
+    'numeric' type datasets. The columns are inserted in bulk since adding
+    them through a measurement takes much longer.
+    """
+    keys = ("x", "t", *(f"y{i}" for i in range(spec.n_params)))
+    n_inner = min(INNER_LENGTH, spec.n_points)
+    if spec.paramtype == "array":
+        inner = np.linspace(0, 1, n_inner)
+        columns = [
+            np.arange(start, stop, dtype=float),
+            [inner] * (stop - start),
+            *([rng.random(n_inner) for _ in range(stop - start)] for _ in keys[2:]),
+        ]
+    else:
+        indices = np.arange(start, stop)
+        columns = [
+            (indices // n_inner).astype(float),
+            (indices % n_inner).astype(float),
+            *(rng.random(stop - start) for _ in keys[2:]),
+        ]
+    dataset._add_result_columns([_ResultColumns(keys=keys, columns=columns)])
+
+
+def create_dataset(conn, spec: DatasetSpec) -> int:
+    """
+    Create a completed dataset for the given spec and return its run id.
+    """
+    rng = np.random.default_rng(0)
+    dataset = start_dataset(conn, spec)
+    n_rows = (
+        spec.n_points // INNER_LENGTH if spec.paramtype == "array" else spec.n_points
+    )
+    rows_per_insert = max(ROWS_PER_INSERT // spec.n_params, 1)
+    if spec.paramtype == "array":
+        rows_per_insert = max(rows_per_insert // INNER_LENGTH, 1)
+    for start in range(0, n_rows, rows_per_insert):
+        add_rows(dataset, spec, start, min(start + rows_per_insert, n_rows), rng)
+    dataset.mark_completed()
+    return dataset.run_id
+
+
+class _LoadDatasets:
+    """
+    Base class of the benchmarks that read the datasets of DATASETS. The
+    database with the datasets is shared by all benchmarks that derive from
+    this class.
+    """
+
+    number = 1
+    repeat = 3
+    timeout = 1800
+
+    params: ClassVar[list[str]] = list(DATASETS)
+    param_names: ClassVar[list[str]] = ["dataset"]
+
+    timer = time.perf_counter
+
+    def setup_cache(self):
+        # creating the datasets with 1e7 points takes a while, so the
+        # database is only created once. asv runs this in a temporary
+        # directory that it removes afterwards
+        path = os.path.abspath("datasets.db")
+        conn = connect(path)
+        new_experiment("benchmark", sample_name="load", conn=conn)
+        run_ids = {name: create_dataset(conn, spec) for name, spec in DATASETS.items()}
+        conn.close()
+        return path, run_ids
+
+    def setup(self, cache, name):
+        path, run_ids = cache
+        self.conn = connect(path)
+        self.dataset = load_by_id(run_ids[name], conn=self.conn)
+
+    def teardown(self, cache, name):
+        self.conn.close()
+
+
+class LoadData(_LoadDatasets):
+    """
+    This benchmark measures loading all the data of a dataset, directly and
+    through its cache.
+    """
+
+    def time_get_parameter_data(self, cache, name):
+        self.dataset.get_parameter_data()
+
+    def peakmem_get_parameter_data(self, cache, name):
+        self.dataset.get_parameter_data()
+
+    def time_cache_data(self, cache, name):
+        self.dataset.cache.data()
+
+
+class ExportData(_LoadDatasets):
+    """
+    This benchmark measures exporting all the data of a dataset to pandas,
+    xarray and netCDF files.
+    """
+
+    def setup(self, cache, name):
+        super().setup(cache, name)
+        self.export_dir = tempfile.mkdtemp()
+
+    def teardown(self, cache, name):
+        super().teardown(cache, name)
+        shutil.rmtree(self.export_dir)
+
+    def time_to_pandas_dataframe(self, cache, name):
+        self.dataset.to_pandas_dataframe()
+
+    def peakmem_to_pandas_dataframe(self, cache, name):
+        self.dataset.to_pandas_dataframe()
+
+    def time_to_xarray_dataset(self, cache, name):
+        self.dataset.to_xarray_dataset()
+
+    def peakmem_to_xarray_dataset(self, cache, name):
+        self.dataset.to_xarray_dataset()
+
+    def time_export_netcdf(self, cache, name):
+        self.dataset.export("netcdf", path=self.export_dir)
+
+    def peakmem_export_netcdf(self, cache, name):
+        self.dataset.export("netcdf", path=self.export_dir)
+
+
+class LiveCacheRefresh:
+    """
+    This benchmark measures how long it takes the cache of a running
+    measurement that already holds some data to load the rows that have
+    been added since it was last refreshed, as a live plot does.
+    """
+
+    number = 1
+    repeat = 10
+
+    params = ([1, 10, 100], ["numeric", "array"])
+    param_names: ClassVar[list[str]] = ["n_params", "paramtype"]
+
+    timer = time.perf_counter
+
+    # the number of points already in the cache and added before each refresh
+    existing_points = 100_000
+    new_points = 1_000
+
+    def setup(self, n_params, paramtype):
+        self.tmpdir = tempfile.mkdtemp()
+        self.conn = connect(os.path.join(self.tmpdir, "live.db"))
+        new_experiment("benchmark", sample_name="live", conn=self.conn)
+        total_points = self.existing_points + self.new_points
+        self.spec = DatasetSpec(total_points, n_params, paramtype, True)
+        self.dataset = start_dataset(self.conn, self.spec)
+        rng = np.random.default_rng(0)
+        scale = INNER_LENGTH if paramtype == "array" else 1
+        add_rows(self.dataset, self.spec, 0, self.existing_points // scale, rng)
+        self.dataset.cache.data()
+        add_rows(
+            self.dataset,
+            self.spec,
+            self.existing_points // scale,
+            total_points // scale,
+            rng,
+        )
+
+    def teardown(self, n_params, paramtype):
+        self.dataset.mark_completed()
+        self.conn.close()
+        shutil.rmtree(self.tmpdir)
+
+    def time_load_new_data(self, n_params, paramtype):
+        self.dataset.cache.load_data_from_db()
@@ -0,0 +1,124 @@
+"""
+This module contains code used for benchmarking the overhead that the
+measurement machinery of the QCoDeS dataset adds per measured point.
+"""
+
+import os
+import shutil
+import tempfile
+import time
+from typing import ClassVar
+
+import qcodes
+from qcodes import ManualParameter
+from qcodes.dataset.dond.do_nd import dond
+from qcodes.dataset.dond.sweeps import LinSweep
+from qcodes.dataset.experiment_container import new_experiment
+from qcodes.dataset.measurements import Measurement
+from qcodes.dataset.sqlite.database import initialise_database
+
+
+def _init_db(tmpdir: str) -> None:
+    qcodes.config["core"]["db_location"] = os.path.join(tmpdir, "temp.db")
+    qcodes.config["core"]["db_debug"] = False
+    initialise_database()
+
+
+def _count_results(results, length, state):
+    state["length"] = length
+
+
+class SubscriberOverhead:
+    """
+    This benchmark measures how much subscribers slow down adding results
+    to a measurement, for a varying number of subscribers.
+    """
+
+    number = 1
+    repeat = 8
+
+    params = (0, 1, 10)
+    param_names: ClassVar[list[str]] = ["n_subscribers"]
+
+    timer = time.perf_counter
+
+    n_points = 10_000
+
+    def setup(self, n_subscribers):
+        self.tmpdir = tempfile.mkdtemp()
+        _init_db(self.tmpdir)
+        self.experiment = new_experiment("subscribers", sample_name="benchmark")
+        self.x = ManualParameter("x")
+        self.y = ManualParameter("y")
+        meas = Measurement(self.experiment)
+        meas.write_period = 0.1
+        meas.register_parameter(self.x)
+        meas.register_parameter(self.y, setpoints=(self.x,))
+        self.states = [{} for _ in range(n_subscribers)]
+        for state in self.states:
+            meas.add_subscriber(_count_results, state)
+        self.runner = meas.run()
+        self.datasaver = self.runner.__enter__()
+
+    def teardown(self, n_subscribers):
+        self.runner.__exit__(None, None, None)
+        self.experiment.conn.close()
+        shutil.rmtree(self.tmpdir)
+
+    def time_add_result(self, n_subscribers):
+        for i in range(self.n_points):
+            self.datasaver.add_result((self.x, i), (self.y, 2 * i))
+        # the subscribers are called once the results have been written
+        self.datasaver.flush_data_to_database(block=True)
+
+
+class DondOverhead:
+    """
+    This benchmark measures the time that dond takes per point of a one
+    dimensional sweep of parameters that take no time to set and get, for a
+    varying number of points and measured parameters.
+    """
+
+    number = 1
+    repeat = 5
+    timeout = 600
+
+    params = ([100, 1000], [1, 10, 100])
+    param_names: ClassVar[list[str]] = ["n_points", "n_params"]
+
+    timer = time.perf_counter
+
+    def setup(self, n_points, n_params):
+        self.tmpdir = tempfile.mkdtemp()
+        _init_db(self.tmpdir)
+        self.experiment = new_experiment("dond", sample_name="benchmark")
+        self.x = ManualParameter("x", initial_value=0.0)
+        self.ys = [
+            ManualParameter(f"y{i}", initial_value=float(i)) for i in range(n_params)
+        ]
+
+    def teardown(self, n_points, n_params):
+        self.experiment.conn.close()
+        shutil.rmtree(self.tmpdir)
+
+    def _dond(self, n_points):
+        dond(
+            LinSweep(self.x, 0, 1, n_points),
+            *self.ys,
+            exp=self.experiment,
+            do_plot=False,
+            show_progress=False,
+        )
+
+    def time_dond(self, n_points, n_params):
+        self._dond(n_points)
+
+    def track_dond_time_per_point(self, n_points, n_params):
+        start = time.perf_counter()
+        self._dond(n_points)
+        return (time.perf_counter() - start) / n_points
+
+    track_dond_time_per_point.unit = "seconds"  # type: ignore[attr-defined]
+
+    def peakmem_dond(self, n_points, n_params):
+        self._dond(n_points)
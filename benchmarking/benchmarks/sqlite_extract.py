@@ -0,0 +1,125 @@
+"""
+This module contains code used for benchmarking extracting large runs from
+one QCoDeS database into another.
+"""
+
+import os
+import shutil
+import time
+
+import numpy as np
+
+from qcodes.dataset.data_set import DataSet
+from qcodes.dataset.database_extract_runs import (
+    extract_runs_into_db,
+    extract_runs_into_dbs,
+)
+from qcodes.dataset.descriptions.dependencies import InterDependencies_
+from qcodes.dataset.descriptions.param_spec import ParamSpecBase
+from qcodes.dataset.experiment_container import new_experiment
+from qcodes.dataset.sqlite.connection import atomic
+from qcodes.dataset.sqlite.database import connect
+
+N_RUNS = 4
+N_ROWS = 1_000_000
+
+
+def _create_source_db(path: str) -> None:
+    """
+    Create a database with N_RUNS completed runs of N_ROWS rows each. The rows
+    are inserted with executemany in one go since adding them through the
+    dataset takes much longer.
+    """
+    conn = connect(path)
+    exp = new_experiment("benchmark", sample_name="extract", conn=conn)
+    x = ParamSpecBase("x", "numeric")
+    y = ParamSpecBase("y", "numeric")
+    z = ParamSpecBase("z", "numeric")
+    interdeps = InterDependencies_(dependencies={z: (x, y)})
+    rng = np.random.default_rng(0)
+    for _ in range(N_RUNS):
+        dataset = DataSet(conn=conn, exp_id=exp.exp_id)
+        dataset.set_interdependencies(interdeps)
+        dataset.mark_started()
+        values = rng.random((N_ROWS, 3)).tolist()
+        with atomic(conn) as atomic_conn:
+            atomic_conn.executemany(
+                f'INSERT INTO "{dataset.table_name}" (x, y, z) VALUES (?, ?, ?)',
+                values,
+            )
+        dataset.mark_completed()
+    conn.close()
+
+
+def copy_rows_one_by_one(source_db_path: str, target_db_path: str) -> None:
+    """
+    Copy the result tables of all runs by inserting the rows one at a time,
+    the way extract_runs_into_db used to copy them before it attached the
+    source database.
+    """
+    source_conn = connect(source_db_path)
+    target_conn = connect(target_db_path)
+    table_names = [
+        row[0]
+        for row in source_conn.execute("SELECT result_table_name FROM runs").fetchall()
+    ]
+    with atomic(target_conn) as atomic_conn:
+        for table_name in table_names:
+            atomic_conn.execute(
+                f'CREATE TABLE "{table_name}" '
+                "(id INTEGER PRIMARY KEY, x NUMERIC, y NUMERIC, z NUMERIC)"
+            )
+            for row in source_conn.execute(f'SELECT +x, +y, +z FROM "{table_name}"'):
+                atomic_conn.execute(
+                    f'INSERT INTO "{table_name}" (x, y, z) VALUES (?, ?, ?)', row
+                )
+    source_conn.close()
+    target_conn.close()
+
+
+class ExtractRuns:
+    """
+    This benchmark compares extracting N_RUNS runs of N_ROWS rows each with
+    extract_runs_into_db, into one target database or in parallel into a
+    target database per run, to copying the rows one by one.
+    """
+
+    number = 1
+    repeat = 3
+    timeout = 1200
+
+    timer = time.perf_counter
+
+    def setup_cache(self):
+        # creating the source database takes a while, so it is only created
+        # once and shared by all benchmarks and repeats
+        path = os.path.abspath("extract_source.db")
+        _create_source_db(path)
+        return path
+
+    def setup(self, path):
+        self.target_dir = os.path.abspath("extract_targets")
+        os.makedirs(self.target_dir, exist_ok=True)
+
+    def teardown(self, path):
+        shutil.rmtree(self.target_dir)
+
+    def time_extract_runs_into_db(self, path):
+        extract_runs_into_db(
+            path,
+            os.path.join(self.target_dir, "target.db"),
+            *range(1, N_RUNS + 1),
+        )
+
+    def time_extract_runs_into_dbs(self, path):
+        extract_runs_into_dbs(
+            path,
+            {
+                os.path.join(self.target_dir, f"target_{run_id}.db"): [run_id]
+                for run_id in range(1, N_RUNS + 1)
+            },
+            max_workers=N_RUNS,
+        )
+
+    def time_copy_rows_one_by_one(self, path):
+        copy_rows_one_by_one(path, os.path.join(self.target_dir, "target.db"))
@@ -0,0 +1,91 @@
+"""
+This module contains code used for benchmarking the strategies that can be
+used to insert many rows into a result table of the QCoDeS database.
+"""
+
+import itertools
+import os
+import shutil
+import tempfile
+import time
+from typing import ClassVar
+
+import numpy as np
+
+from qcodes.dataset.sqlite.connection import atomic, transaction
+from qcodes.dataset.sqlite.database import connect
+from qcodes.dataset.sqlite.query_helpers import insert_many_columns, insert_many_values
+from qcodes.dataset.sqlite.settings import SQLiteSettings
+
+
+def insert_with_compound_values(conn, formatted_name, columns, values):
+    """
+    Insert rows with INSERT statements holding as many rows as the
+    SQLITE_MAX_VARIABLE_NUMBER allows, i.e. the way insert_many_values
+    used to write data before it switched to executemany.
+    """
+    no_of_columns = len(columns)
+    rows_per_statement = int(
+        int(SQLiteSettings.limits["MAX_VARIABLE_NUMBER"]) / no_of_columns
+    )
+    _columns = ",".join(columns)
+    _values = "(" + ",".join(["?"] * no_of_columns) + ")"
+
+    with atomic(conn) as atomic_conn:
+        for start in range(0, len(values), rows_per_statement):
+            chunk = values[start : start + rows_per_statement]
+            query = (
+                f'INSERT INTO "{formatted_name}" ({_columns}) '
+                f"VALUES {','.join([_values] * len(chunk))}"
+            )
+            transaction(atomic_conn, query, *itertools.chain.from_iterable(chunk))
+
+
+class InsertManyRows:
+    """
+    This benchmark compares inserting rows with large compound VALUES
+    statements to inserting them with executemany of a prepared single row
+    statement, for a varying number of columns and rows per call.
+    """
+
+    # Each call appends more rows to the same table, so setup does not
+    # need to run between iterations
+    number = 1
+    repeat = 8
+
+    params = ([1, 5, 20], [100, 10_000])
+    param_names: ClassVar[list[str]] = ["n_columns", "n_rows"]
+
+    timer = time.perf_counter
+
+    def setup(self, n_columns, n_rows):
+        self.tmpdir = tempfile.mkdtemp()
+        self.conn = connect(os.path.join(self.tmpdir, "insert.db"))
+        self.columns = [f"param_{i}" for i in range(n_columns)]
+        self.table_name = "results"
+        column_definitions = ",".join(f"{col} numeric" for col in self.columns)
+        with atomic(self.conn) as conn:
+            transaction(
+                conn,
+                f'CREATE TABLE "{self.table_name}" '
+                f"(id INTEGER PRIMARY KEY, {column_definitions})",
+            )
+        self.column_values = [np.random.rand(n_rows) for _ in self.columns]
+        self.row_values = [list(row) for row in zip(*self.column_values)]
+
+    def teardown(self, n_columns, n_rows):
+        self.conn.close()
+        shutil.rmtree(self.tmpdir)
+
+    def time_compound_values(self, n_columns, n_rows):
+        insert_with_compound_values(
+            self.conn, self.table_name, self.columns, self.row_values
+        )
+
+    def time_executemany_rows(self, n_columns, n_rows):
+        insert_many_values(self.conn, self.table_name, self.columns, self.row_values)
+
+    def time_executemany_columns(self, n_columns, n_rows):
+        insert_many_columns(
+            self.conn, self.table_name, self.columns, self.column_values
+        )
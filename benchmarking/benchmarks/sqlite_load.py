@@ -0,0 +1,83 @@
+"""
+This module contains code used for benchmarking the loading of numeric data
+from a result table of the QCoDeS database.
+"""
+
+import os
+import time
+from typing import ClassVar
+
+import numpy as np
+
+from qcodes.dataset.data_set import DataSet, _ResultColumns
+from qcodes.dataset.descriptions.dependencies import InterDependencies_
+from qcodes.dataset.descriptions.param_spec import ParamSpecBase
+from qcodes.dataset.experiment_container import new_experiment
+from qcodes.dataset.sqlite.database import connect
+from qcodes.dataset.sqlite.queries import get_parameter_tree_values
+
+N_ROWS = (1_000_000, 10_000_000)
+
+
+class LoadNumericData:
+    """
+    This benchmark compares loading a numeric parameter and its setpoint
+    with the per value 'numeric' converter to loading them as float64 arrays
+    in bulk, which is what get_parameter_data does for parameter trees of
+    only numeric parameters.
+    """
+
+    number = 1
+    repeat = 3
+    timeout = 600
+
+    params = N_ROWS
+    param_names: ClassVar[list[str]] = ["n_rows"]
+
+    timer = time.perf_counter
+
+    def setup_cache(self):
+        # writing 1e7 rows takes a while, so the databases are only created
+        # once and shared by all benchmarks and repeats. asv runs this in a
+        # temporary directory that it removes afterwards
+        paths = {}
+        for n_rows in N_ROWS:
+            path = os.path.abspath(f"load_{n_rows}.db")
+            conn = connect(path)
+            new_experiment("benchmark", sample_name="load", conn=conn)
+            dataset = DataSet(conn=conn)
+            x = ParamSpecBase("x", "numeric")
+            y = ParamSpecBase("y", "numeric")
+            dataset.set_interdependencies(InterDependencies_(dependencies={y: (x,)}))
+            dataset.mark_started()
+            yvals = np.random.rand(n_rows)
+            # NaN values are stored as text, include some of them
+            yvals[::1000] = np.nan
+            dataset._add_result_columns(
+                [
+                    _ResultColumns(
+                        keys=("x", "y"), columns=[np.arange(n_rows, dtype=float), yvals]
+                    )
+                ]
+            )
+            dataset.mark_completed()
+            paths[n_rows] = (path, dataset.run_id)
+            conn.close()
+        return paths
+
+    def setup(self, paths, n_rows):
+        path, run_id = paths[n_rows]
+        self.conn = connect(path)
+        self.dataset = DataSet(run_id=run_id, conn=self.conn)
+
+    def teardown(self, paths, n_rows):
+        self.conn.close()
+
+    def time_converter_per_value(self, paths, n_rows):
+        rows = get_parameter_tree_values(
+            self.conn, self.dataset.table_name, "y", "x", skip_converters=False
+        )
+        [np.array(column, dtype=np.float64) for column in zip(*rows)]
+
+    def time_float64_in_bulk(self, paths, n_rows):
+        self.dataset.get_parameter_data()
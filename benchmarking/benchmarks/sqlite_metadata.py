@@ -0,0 +1,143 @@
+"""
+This module contains code used for benchmarking finding runs by their
+metadata in a QCoDeS database with many runs.
+"""
+
+import os
+import random
+import shutil
+import time
+
+from qcodes.dataset.data_set_info import find_runs
+from qcodes.dataset.descriptions.dependencies import InterDependencies_
+from qcodes.dataset.descriptions.rundescriber import RunDescriber
+from qcodes.dataset.descriptions.versioning.serialization import to_json_for_storage
+from qcodes.dataset.experiment_container import new_experiment
+from qcodes.dataset.sqlite.database import connect
+from qcodes.dataset.sqlite.db_upgrades import perform_db_upgrade_10_to_11
+
+N_RUNS = 100_000
+
+_METADATA_TAGS = ("fridge", "T_mK", "operator", "B_T")
+
+
+def _create_version10_db(path: str) -> None:
+    """
+    Create a database of version 10, which stores the metadata in a column
+    of the runs table per tag, with N_RUNS runs with metadata. The runs are
+    inserted in bulk since creating them one by one takes minutes.
+    """
+    conn = connect(path, version=10)
+    new_experiment("benchmark", sample_name="metadata", conn=conn)
+    for tag in _METADATA_TAGS:
+        conn.execute(f'ALTER TABLE runs ADD COLUMN "{tag}"')
+    description = to_json_for_storage(RunDescriber(InterDependencies_()))
+    rng = random.Random(0)
+    conn.executemany(
+        """
+        INSERT INTO runs (
+            exp_id, name, result_table_name, result_counter, run_timestamp,
+            completed_timestamp, is_completed, parameters, guid,
+            run_description, parent_datasets, captured_run_id,
+            captured_counter, fridge, T_mK, operator, B_T
+        ) VALUES (1, ?, ?, ?, ?, ?, 1, '', ?, ?, '[]', ?, ?, ?, ?, ?, ?)
+        """,
+        (
+            (
+                f"run_{i}",
+                f"results-1-{i}",
+                i,
+                float(i),
+                float(i + 1),
+                f"guid-{i}",
+                description,
+                i,
+                i,
+                rng.choice(["BF1", "BF2", "BF3", "BF4"]),
+                rng.uniform(5, 300),
+                rng.choice(["alice", "bob"]),
+                rng.uniform(0, 9),
+            )
+            for i in range(1, N_RUNS + 1)
+        ),
+    )
+    conn.commit()
+    conn.close()
+
+
+class FindRunsByMetadata:
+    """
+    This benchmark compares finding runs by their metadata in the indexed
+    run_metadata table with find_runs to selecting them by the metadata
+    columns of the runs table of a database of version 10.
+    """
+
+    number = 1
+    repeat = 5
+    timeout = 600
+
+    timer = time.perf_counter
+
+    def setup_cache(self):
+        # creating the databases takes a while, so they are only created once
+        # and shared by all benchmarks and repeats. asv runs this in a
+        # temporary directory that it removes afterwards
+        path_v10 = os.path.abspath("metadata_v10.db")
+        path_v11 = os.path.abspath("metadata_v11.db")
+        _create_version10_db(path_v10)
+        shutil.copy(path_v10, path_v11)
+        conn = connect(path_v11)
+        conn.close()
+        return path_v10, path_v11
+
+    def setup(self, paths):
+        path_v10, path_v11 = paths
+        self.conn_v10 = connect(path_v10, version=10)
+        self.conn_v11 = connect(path_v11)
+
+    def teardown(self, paths):
+        self.conn_v10.close()
+        self.conn_v11.close()
+
+    def time_find_runs(self, paths):
+        find_runs(
+            where={"fridge": "BF3", "T_mK": ("<", 20)}, conn=self.conn_v11, columns=()
+        )
+
+    def time_find_runs_selective(self, paths):
+        find_runs(where={"T_mK": ("<", 5.5)}, conn=self.conn_v11, columns=())
+
+    def time_select_by_metadata_columns(self, paths):
+        self.conn_v10.execute(
+            'SELECT run_id FROM runs WHERE "fridge" = ? AND "T_mK" < ?', ("BF3", 20)
+        ).fetchall()
+
+
+class UpgradeMetadataColumns:
+    """
+    This benchmark measures moving the metadata of N_RUNS runs from the
+    columns of the runs table into the run_metadata table.
+    """
+
+    number = 1
+    repeat = 3
+    timeout = 600
+
+    timer = time.perf_counter
+
+    def setup_cache(self):
+        path = os.path.abspath("metadata_v10.db")
+        _create_version10_db(path)
+        return path
+
+    def setup(self, path):
+        # every repeat upgrades a fresh copy of the database
+        shutil.copy(path, "metadata_upgrade.db")
+        self.conn = connect("metadata_upgrade.db", version=10)
+
+    def teardown(self, path):
+        self.conn.close()
+        os.remove("metadata_upgrade.db")
+
+    def time_upgrade_10_to_11(self, path):
+        perform_db_upgrade_10_to_11(self.conn, show_progress_bar=False)
@@ -12,8 +12,10 @@ from .data_set import (
     new_data_set,
 )
 from .data_set_in_memory import load_from_file, load_from_netcdf
+from .data_set_info import RunSummary, find_runs, get_run_summaries
 from .data_set_protocol import DataSetProtocol, DataSetType
-from .database_extract_runs import extract_runs_into_db
+from .database_archive import archive_runs, archive_runs_older_than
+from .database_extract_runs import extract_runs_into_db, extract_runs_into_dbs
 from .descriptions.dependencies import InterDependencies_, ParamSpecTree
 from .descriptions.param_spec import ParamSpec
 from .descriptions.rundescriber import RunDescriber
@@ -36,6 +38,7 @@ from .experiment_settings import get_default_experiment_id, reset_default_experi
 from .export_config import get_data_export_path
 from .guid_helpers import guids_from_dbs, guids_from_dir, guids_from_list_str
 from .legacy_import import import_dat_file
+from .live_feed import LiveFeedPublisher, LiveFeedReader
 from .measurement_extensions import (
     DataSetDefinition,
     LinSweeper,
@@ -44,7 +47,9 @@ from .measurement_extensions import (
 )
 from .measurements import Measurement
 from .plotting import plot_by_id, plot_dataset
+from .run_catalog import CatalogEntry, RunCatalog
 from .sqlite.connection import ConnectionPlus
+from .sqlite.connection_manager import ConnectionManager, get_connection_manager
 from .sqlite.database import (
     connect,
     initialise_database,
@@ -62,6 +67,8 @@ __all__ = [
     "AbstractSweep",
     "ArraySweep",
     "BreakConditionInterrupt",
+    "CatalogEntry",
+    "ConnectionManager",
     "ConnectionPlus",
     "DataSetProtocol",
     "DataSetType",
@@ -71,11 +78,15 @@ __all__ = [
     "Measurement",
     "ParamSpec",
     "ParamSpecTree",
+    "RunCatalog",
     "RunDescriber",
+    "RunSummary",
     "SQLiteSettings",
     "SequentialParamsCaller",
     "ThreadPoolParamsCaller",
     "TogetherSweep",
+    "archive_runs",
+    "archive_runs_older_than",
     "call_params_threaded",
     "connect",
     "datasaver_builder",
@@ -87,9 +98,13 @@ __all__ = [
     "dond_into",
     "experiments",
     "extract_runs_into_db",
+    "extract_runs_into_dbs",
+    "find_runs",
+    "get_connection_manager",
     "get_data_export_path",
     "get_default_experiment_id",
     "get_guids_by_run_spec",
+    "get_run_summaries",
     "guids_from_dbs",
     "guids_from_dir",
     "guids_from_list_str",
@@ -98,6 +113,8 @@ __all__ = [
     "initialise_or_create_database_at",
     "initialised_database_at",
     "LinSweeper",
+    "LiveFeedPublisher",
+    "LiveFeedReader",
     "load_by_counter",
     "load_by_guid",
     "load_by_id",
@@ -1,21 +1,24 @@
 from __future__ import annotations
 
 import importlib
+import itertools
 import json
 import logging
 import tempfile
 import time
 import uuid
+from collections import deque
 from dataclasses import dataclass
 from pathlib import Path
-from queue import Queue
-from threading import Thread
+from queue import Empty, Queue
+from threading import Condition, Thread
 from typing import TYPE_CHECKING, Any, Literal
 
 import numpy
 from tqdm.auto import trange
 
 import qcodes
+from qcodes.dataset.data_set_info import get_run_summaries
 from qcodes.dataset.data_set_protocol import (
     SPECS,
     BaseDataSet,
@@ -36,15 +39,10 @@ from qcodes.dataset.export_config import (
 from qcodes.dataset.guids import filter_guids_by_parts, generate_guid, parse_guid
 from qcodes.dataset.linked_datasets.links import Link, links_to_str, str_to_links
 from qcodes.dataset.sqlite.connection import ConnectionPlus, atomic, atomic_transaction
-from qcodes.dataset.sqlite.database import (
-    conn_from_dbpath_or_conn,
-    connect,
-    get_DB_location,
-)
+from qcodes.dataset.sqlite.database import conn_from_dbpath_or_conn, connect
 from qcodes.dataset.sqlite.queries import (
     _check_if_table_found,
     _get_result_table_name_by_guid,
-    _query_guids_from_run_spec,
     add_data_to_dynamic_columns,
     add_parameter,
     completed,
@@ -56,6 +54,8 @@ from qcodes.dataset.sqlite.queries import (
     get_guid_from_run_id,
     get_metadata_from_run_id,
     get_parameter_data,
+    get_parameter_data_for_one_paramtree,
+    get_parameter_tree_row_id,
     get_parent_dataset_links,
     get_run_description,
     get_run_timestamp_from_run_id,
@@ -71,11 +71,17 @@ from qcodes.dataset.sqlite.queries import (
 from qcodes.dataset.sqlite.query_helpers import (
     VALUE,
     VALUES,
-    insert_many_values,
+    insert_many_columns,
     length,
     one,
     select_one_where,
 )
+from qcodes.dataset.sqlite.sidecar import SidecarWriter
+from qcodes.dataset.sqlite.wal_checkpoint import (
+    WALCheckpointer,
+    WALCheckpointMetrics,
+    is_wal_mode,
+)
 from qcodes.utils import (
     NumpyJSONEncoder,
 )
@@ -90,14 +96,18 @@ from .exporters.export_to_pandas import (
     load_to_dataframe_dict,
 )
 from .exporters.export_to_xarray import (
+    _NotStreamableError,
+    _stream_to_h5netcdf,
     load_to_xarray_dataarray_dict,
+    load_to_xarray_dataarray_dict_lazy,
     load_to_xarray_dataset,
+    load_to_xarray_dataset_lazy,
     xarray_to_h5netcdf_with_complex_numbers,
 )
-from .subscriber import _Subscriber
+from .subscriber import ResultBatch, _Subscriber
 
 if TYPE_CHECKING:
-    from collections.abc import Callable, Mapping, Sequence
+    from collections.abc import Callable, Iterator, Mapping, Sequence
 
     import pandas as pd
     import xarray as xr
@@ -123,35 +133,246 @@ log = logging.getLogger(__name__)
 # a json inside a 'metadata' column
 
 
+@dataclass
+class BackgroundWriterMetrics:
+    """
+    Snapshot of the state of the thread that writes data to the database in
+    the background.
+    """
+
+    queue_depth: int
+    """Number of result items waiting to be written."""
+    queue_bytes: int
+    """Estimated size in bytes of the result items waiting to be written."""
+    lag: float
+    """Time in seconds that the oldest waiting result item has been queued."""
+    rows_per_second: float
+    """Rows written per second spent writing to the database."""
+    bytes_per_second: float
+    """Bytes written per second spent writing to the database."""
+    rows_written: int
+    """Total number of rows written by the background writer."""
+    rows_dropped: int
+    """Total number of rows dropped because the write queue was full."""
+
+
+class _DataWriteQueue(Queue[Any]):
+    """
+    Queue of items for the background writer that keeps track of the
+    estimated size of the queued results. If ``max_bytes`` is given, adding
+    results that would make the queue exceed it either blocks until the
+    writer has caught up or drops the results, depending on
+    ``block_when_full``. A single item larger than ``max_bytes`` is still
+    accepted once the queue is empty.
+    """
+
+    writer_check_interval = 1.0
+    """Time in seconds between checks that the writer is alive while blocking."""
+
+    def __init__(self, max_bytes: int | None = None, block_when_full: bool = True):
+        super().__init__()
+        self.max_bytes = max_bytes
+        self.block_when_full = block_when_full
+        self.rows_dropped = 0
+        self._pending_bytes = 0
+        self._enqueue_times: deque[float] = deque()
+        self._bytes_condition = Condition()
+
+    def put_results(
+        self,
+        item: dict[str, Any],
+        nbytes: int,
+        nrows: int,
+        writer: _BackgroundWriter | None = None,
+    ) -> bool:
+        """
+        Put a result item on the queue.
+
+        Args:
+            item: The result item.
+            nbytes: Estimated size of the results in bytes.
+            nrows: Number of rows of the results.
+            writer: The thread that writes the items of the queue. While
+                waiting for the queue to have room, it is checked every
+                ``writer_check_interval`` seconds that the writer is still
+                alive.
+
+        Returns:
+            False if the item was dropped because the queue was full,
+            True otherwise.
+
+        Raises:
+            RuntimeError: If the writer has stopped, caused by the exception
+                that it stopped with, if any.
+
+        """
+        if writer is not None:
+            writer.raise_if_stopped()
+        with self._bytes_condition:
+            while self._is_full(nbytes):
+                if not self.block_when_full:
+                    self.rows_dropped += nrows
+                    return False
+                self._bytes_condition.wait(timeout=self.writer_check_interval)
+                if writer is not None:
+                    writer.raise_if_stopped()
+            self._pending_bytes += nbytes
+            self._enqueue_times.append(time.perf_counter())
+        item["nbytes"] = nbytes
+        self.put(item)
+        return True
+
+    def results_written(self, nbytes: int, nitems: int) -> None:
+        """
+        Release the space taken up by result items that have been written
+        to the database.
+        """
+        with self._bytes_condition:
+            self._pending_bytes -= nbytes
+            for _ in range(nitems):
+                self._enqueue_times.popleft()
+            self._bytes_condition.notify_all()
+
+    def _is_full(self, nbytes: int) -> bool:
+        return (
+            self.max_bytes is not None
+            and self._pending_bytes > 0
+            and self._pending_bytes + nbytes > self.max_bytes
+        )
+
+    @property
+    def pending_items(self) -> int:
+        return len(self._enqueue_times)
+
+    @property
+    def pending_bytes(self) -> int:
+        return self._pending_bytes
+
+    @property
+    def lag(self) -> float:
+        with self._bytes_condition:
+            if not self._enqueue_times:
+                return 0.0
+            return time.perf_counter() - self._enqueue_times[0]
+
+
 class _BackgroundWriter(Thread):
     """
-    Write the results from the DataSet's dataqueue in a new thread
+    Write the results from the DataSet's dataqueue in a new thread.
+    Result items that are already waiting in the queue when the writer
+    gets to them are written together in a single transaction.
     """
 
-    def __init__(self, queue: Queue[Any], conn: ConnectionPlus):
+    def __init__(self, queue: _DataWriteQueue, conn: ConnectionPlus):
         super().__init__(daemon=True)
         self.queue = queue
         self.path = conn.path_to_dbfile
         self.keep_writing = True
+        self.rows_written = 0
+        self.bytes_written = 0
+        self.write_time = 0.0
+        self.exception: BaseException | None = None
+        # a control item taken off the queue while collecting a batch
+        self._next_item: dict[str, Any] | None = None
 
     def run(self) -> None:
+        try:
+            self._run()
+        except BaseException as e:
+            self.exception = e
+            raise
+
+    def raise_if_stopped(self) -> None:
+        """
+        Raise if the thread has been started and is not alive any more.
+        """
+        if self.ident is None or self.is_alive():
+            return
+        raise RuntimeError(
+            "The thread that writes data to the database in the background has stopped."
+        ) from self.exception
+
+    def _run(self) -> None:
         self.conn = connect(self.path)
+        if _WRITERS[self.path].wal_checkpointer is not None:
+            # the write-ahead log is checkpointed between the transactions
+            self.conn.execute("PRAGMA wal_autocheckpoint=0")
 
         while self.keep_writing:
-            item = self.queue.get()
+            if self._next_item is not None:
+                item, self._next_item = self._next_item, None
+            else:
+                item = self.queue.get()
             if item["keys"] == "stop":
                 self.keep_writing = False
                 self.conn.close()
+                self.queue.task_done()
             elif item["keys"] == "finalize":
                 _WRITERS[self.path].active_datasets.remove(item["values"])
+                self.queue.task_done()
             else:
-                self.write_results(item["keys"], item["values"], item["table_name"])
-            self.queue.task_done()
+                self._write_batch(self._collect_batch(item))
+
+    def _collect_batch(self, first_item: dict[str, Any]) -> list[dict[str, Any]]:
+        """
+        Collect the given result item and all result items directly
+        following it in the queue. Collection stops at the first control
+        item, which is handled next, after the batch has been written.
+        """
+        batch = [first_item]
+        while True:
+            try:
+                item = self.queue.get_nowait()
+            except Empty:
+                return batch
+            if item["keys"] in ("stop", "finalize"):
+                self._next_item = item
+                return batch
+            batch.append(item)
+
+    def _write_batch(self, batch: Sequence[dict[str, Any]]) -> None:
+        t_start = time.perf_counter()
+        nbytes = sum(item["nbytes"] for item in batch)
+        nrows = 0
+        try:
+            with atomic(self.conn):
+                for table_name, items in itertools.groupby(
+                    batch, key=lambda item: item["table_name"]
+                ):
+                    results = [
+                        _ResultColumns(keys=tuple(item["keys"]), columns=item["values"])
+                        for item in items
+                    ]
+                    for result in _merge_result_columns(results):
+                        self.write_results(
+                            list(result.keys), result.columns, table_name
+                        )
+                        nrows += len(result)
+            wal_checkpointer = _WRITERS[self.path].wal_checkpointer
+            if wal_checkpointer is not None:
+                wal_checkpointer.notify_flush(nbytes)
+            # the results of each dataset in the transaction are published
+            # to its subscribers together once they have been committed
+            committed: dict[Callable[[Sequence[_ResultColumns]], None], list[Any]] = {}
+            for item in batch:
+                committed.setdefault(item["publish"], []).append(item["result"])
+            for publish, committed_results in committed.items():
+                publish(committed_results)
+        finally:
+            self.write_time += time.perf_counter() - t_start
+            self.rows_written += nrows
+            self.bytes_written += nbytes
+            self.queue.results_written(nbytes, len(batch))
+            for _ in batch:
+                self.queue.task_done()
 
     def write_results(
-        self, keys: Sequence[str], values: Sequence[list[Any]], table_name: str
+        self,
+        keys: Sequence[str],
+        values: Sequence[Sequence[VALUE] | numpy.ndarray],
+        table_name: str,
     ) -> None:
-        insert_many_values(self.conn, table_name, keys, values)
+        insert_many_columns(self.conn, table_name, keys, values)
 
     def shutdown(self) -> None:
         """
@@ -166,12 +387,67 @@ class _BackgroundWriter(Thread):
             self.join()
 
 
+@dataclass
+class _ResultColumns:
+    """
+    Results for one parameter tree (or one standalone parameter) stored
+    column by column. Columns of 'numeric', 'text' and 'complex' parameters
+    are flat numpy arrays, columns of 'array' parameters are lists of
+    arrays (one array per row).
+    """
+
+    keys: tuple[str, ...]
+    columns: list[numpy.ndarray | list[Any]]
+
+    def __len__(self) -> int:
+        return len(self.columns[0])
+
+    @property
+    def nbytes(self) -> int:
+        """Estimate of the memory taken up by the values."""
+        return sum(
+            column.nbytes
+            if isinstance(column, numpy.ndarray)
+            else sum(numpy.asarray(value).nbytes for value in column)
+            for column in self.columns
+        )
+
+
+def _merge_result_columns(results: Sequence[_ResultColumns]) -> list[_ResultColumns]:
+    """
+    Merge consecutive result columns that hold values for the same
+    parameters so that they can be written to the database in one go.
+    The order of the rows is preserved.
+    """
+    merged: list[_ResultColumns] = []
+    non_empty = (result for result in results if len(result) > 0)
+    for keys, group in itertools.groupby(non_empty, key=lambda result: result.keys):
+        parts = list(group)
+        if len(parts) == 1:
+            merged.append(parts[0])
+            continue
+        # each column is concatenated once from all of its parts
+        merged.append(
+            _ResultColumns(
+                keys=keys,
+                columns=[
+                    numpy.concatenate(column_parts)
+                    if all(isinstance(part, numpy.ndarray) for part in column_parts)
+                    else list(itertools.chain.from_iterable(column_parts))
+                    for column_parts in zip(*(part.columns for part in parts))
+                ],
+            )
+        )
+    return merged
+
+
 @dataclass
 class _WriterStatus:
     bg_writer: _BackgroundWriter | None
     write_in_background: bool | None
-    data_write_queue: Queue[Any]
+    data_write_queue: _DataWriteQueue
     active_datasets: set[int]
+    wal_checkpointer: WALCheckpointer | None = None
 
 
 _WRITERS: dict[str, _WriterStatus] = {}
@@ -255,8 +531,9 @@ class DataSet(BaseDataSet):
         self._parent_dataset_links: list[Link]
         #: In memory representation of the data in the dataset.
         self._cache: DataSetCacheWithDBBackend = DataSetCacheWithDBBackend(self)
-        self._results: list[dict[str, VALUE]] = []
+        self._results: list[_ResultColumns] = []
         self._in_memory_cache = in_memory_cache
+        self._sidecar_writer: SidecarWriter | None = None
 
         if run_id is not None:
             if not run_exists(self.conn, run_id):
@@ -311,7 +588,12 @@ class DataSet(BaseDataSet):
             self._export_info = ExportInfo({})
         assert self.path_to_db is not None
         if _WRITERS.get(self.path_to_db) is None:
-            queue: Queue[Any] = Queue()
+            queue = _DataWriteQueue(
+                max_bytes=qcodes.config.dataset.write_queue_max_bytes,
+                block_when_full=(
+                    qcodes.config.dataset.write_queue_full_behavior == "block"
+                ),
+            )
             ws: _WriterStatus = _WriterStatus(
                 bg_writer=None,
                 write_in_background=None,
@@ -683,6 +965,9 @@ class DataSet(BaseDataSet):
 
         writer_status = self._writer_status
 
+        if writer_status.wal_checkpointer is None:
+            writer_status.wal_checkpointer = self._start_wal_checkpointer()
+
         write_in_background_status = writer_status.write_in_background
         if (
             write_in_background_status is not None
@@ -703,8 +988,17 @@ class DataSet(BaseDataSet):
                 writer_status.bg_writer.start()
         else:
             writer_status.write_in_background = False
+            if writer_status.wal_checkpointer is not None:
+                writer_status.wal_checkpointer.suspend_autocheckpoint(self.conn)
 
         writer_status.active_datasets.add(self.run_id)
+
+        sidecar_threshold = qcodes.config.dataset.sidecar_threshold_bytes
+        if sidecar_threshold is not None and self.path_to_db not in ("", ":memory:"):
+            assert self.path_to_db is not None
+            self._sidecar_writer = SidecarWriter(
+                self.path_to_db, self.guid, sidecar_threshold
+            )
         self.cache.prepare()
 
     def mark_completed(self) -> None:
@@ -726,9 +1020,13 @@ class DataSet(BaseDataSet):
         """
         Perform the necessary clean-up
         """
+        self._ensure_dataset_written()
         for sub in self.subscribers.values():
             sub.done_callback()
-        self._ensure_dataset_written()
+        if self._sidecar_writer is not None:
+            self._sidecar_writer.close()
+            self._sidecar_writer = None
+        self.cache._close_live_feeds()
 
     def add_results(self, results: Sequence[Mapping[str, VALUE]]) -> None:
         """
@@ -749,20 +1047,103 @@ class DataSet(BaseDataSet):
 
         self._raise_if_not_writable()
 
-        expected_keys = frozenset.union(*(frozenset(d) for d in results))
-        values = [[d.get(k, None) for k in expected_keys] for d in results]
+        expected_keys = tuple(frozenset.union(*(frozenset(d) for d in results)))
+        columns: list[numpy.ndarray | list[Any]] = [
+            [d.get(k, None) for d in results] for k in expected_keys
+        ]
+        self._add_result_columns([_ResultColumns(keys=expected_keys, columns=columns)])
+
+    def _add_result_columns(self, results: Sequence[_ResultColumns]) -> None:
+        """
+        Write column-wise results to the database, either directly or by
+        handing them over to the background writer. Consecutive results for
+        the same parameters are written with a single insert.
+        """
+        self._raise_if_not_writable()
 
         writer_status = self._writer_status
+        table_name = self.table_name
 
-        if writer_status.write_in_background:
-            item = {
-                "keys": list(expected_keys),
-                "values": values,
-                "table_name": self.table_name,
-            }
-            writer_status.data_write_queue.put(item)
-        else:
-            insert_many_values(self.conn, self.table_name, list(expected_keys), values)
+        written: list[_ResultColumns] = []
+        for result in _merge_result_columns(results):
+            sidecar_sizes = (
+                self._sidecar_writer.tell() if self._sidecar_writer is not None else {}
+            )
+            try:
+                stored = result
+                if self._sidecar_writer is not None:
+                    stored = self._offload_to_sidecar(result)
+                if writer_status.write_in_background:
+                    item = {
+                        "keys": list(stored.keys),
+                        "values": stored.columns,
+                        "table_name": table_name,
+                        "result": result,
+                        "publish": self._publish_results,
+                    }
+                    enqueued = writer_status.data_write_queue.put_results(
+                        item,
+                        nbytes=stored.nbytes,
+                        nrows=len(stored),
+                        writer=writer_status.bg_writer,
+                    )
+                    if not enqueued:
+                        log.warning(
+                            f"Dropped {len(result)} rows of {list(result.keys)} "
+                            f"for run {self.run_id} since the write queue is full."
+                        )
+                        self._discard_sidecar_data(sidecar_sizes)
+                else:
+                    insert_many_columns(
+                        self.conn, table_name, list(stored.keys), stored.columns
+                    )
+                    written.append(result)
+            except BaseException:
+                self._discard_sidecar_data(sidecar_sizes)
+                raise
+        if written:
+            if writer_status.wal_checkpointer is not None:
+                writer_status.wal_checkpointer.notify_flush(
+                    sum(result.nbytes for result in written)
+                )
+            self._publish_results(written)
+
+    def _publish_results(self, results: Sequence[_ResultColumns]) -> None:
+        """
+        Hand results that have been committed to the database over to the
+        subscribers as one :class:`.ResultBatch`. This is called from the
+        background writer thread when writing in the background.
+        """
+        subscribers = list(self.subscribers.values())
+        if not subscribers:
+            return
+        batch = ResultBatch.from_results(results)
+        for subscriber in subscribers:
+            subscriber.publish(batch)
+
+    def _offload_to_sidecar(self, result: _ResultColumns) -> _ResultColumns:
+        """
+        Move large values of 'array' type parameters to the sidecar files of
+        the run, leaving references to them in the result columns.
+        """
+        assert self._sidecar_writer is not None
+        interdeps = self._rundescriber.interdeps
+        columns = [
+            self._sidecar_writer.offload(key, column)
+            if interdeps[key].type == "array"
+            else column
+            for key, column in zip(result.keys, result.columns)
+        ]
+        return _ResultColumns(keys=result.keys, columns=columns)
+
+    def _discard_sidecar_data(self, sizes: Mapping[str, int]) -> None:
+        """
+        Discard the data offloaded to the sidecar files after they had the
+        given sizes, since the rows referring to it are not written to the
+        database.
+        """
+        if self._sidecar_writer is not None:
+            self._sidecar_writer.truncate(sizes)
 
     def _raise_if_not_writable(self) -> None:
         if self.pristine:
@@ -792,6 +1173,9 @@ class DataSet(BaseDataSet):
             if writer_status.bg_writer is not None:
                 writer_status.bg_writer.shutdown()
                 writer_status.bg_writer = None
+            if writer_status.wal_checkpointer is not None:
+                writer_status.wal_checkpointer.stop()
+                writer_status.wal_checkpointer = None
 
     def get_parameter_data(
         self,
@@ -847,16 +1231,26 @@ class DataSet(BaseDataSet):
             array or string.
 
         """
-        if len(params) == 0:
-            valid_param_names = [
-                ps.name for ps in self._rundescriber.interdeps.non_dependencies
-            ]
-        else:
-            valid_param_names = self._validate_parameters(*params)
         return get_parameter_data(
-            self.conn, self.table_name, valid_param_names, start, end, callback
+            self.conn,
+            self.table_name,
+            self._parameter_tree_names(*params),
+            start,
+            end,
+            callback,
         )
 
+    def _parameter_tree_names(
+        self, *params: str | ParamSpec | ParameterBase
+    ) -> list[str]:
+        """
+        The names of the given parameters, or of all parameters that are not
+        dependencies of other parameters if none are given.
+        """
+        if len(params) == 0:
+            return [ps.name for ps in self._rundescriber.interdeps.non_dependencies]
+        return self._validate_parameters(*params)
+
     def to_pandas_dataframe_dict(
         self,
         *params: str | ParamSpec | ParameterBase,
@@ -957,6 +1351,7 @@ class DataSet(BaseDataSet):
         start: int | None = None,
         end: int | None = None,
         use_multi_index: Literal["auto", "always", "never"] = "auto",
+        lazy: bool = False,
     ) -> dict[str, xr.DataArray]:
         """
         Returns the values stored in the :class:`.DataSet` for the specified parameters
@@ -999,6 +1394,15 @@ class DataSet(BaseDataSet):
                 If set to "auto" multi index will be used if projecting the data onto
                 a grid requires filling non measured values with NaN  and the shapes
                 of the data has not been set in the run description.
+                Not used if ``lazy`` is True.
+            lazy: If True, the data is not loaded but backed by dask arrays
+                whose chunks are loaded from the database when they are
+                computed, e.g. to work with a slice of a dataset that does
+                not fit into memory. Parameters whose shape is set in the run
+                description and whose data is complete are laid out on their
+                grid, other parameters are indexed by the position of the
+                result along a dimension named ``{name}_index``. See
+                :func:`.load_to_xarray_dataarray_dict_lazy` for details.
 
         Returns:
             Dictionary from requested parameter names to :py:class:`xr.DataArray` s
@@ -1011,6 +1415,10 @@ class DataSet(BaseDataSet):
                 dataarray_dict = ds.to_xarray_dataarray_dict()
 
         """
+        if lazy:
+            return load_to_xarray_dataarray_dict_lazy(
+                self, self._parameter_tree_names(*params), start=start, end=end
+            )
         data = self.get_parameter_data(*params, start=start, end=end)
         datadict = load_to_xarray_dataarray_dict(
             self, data, use_multi_index=use_multi_index
@@ -1024,6 +1432,7 @@ class DataSet(BaseDataSet):
         start: int | None = None,
         end: int | None = None,
         use_multi_index: Literal["auto", "always", "never"] = "auto",
+        lazy: bool = False,
     ) -> xr.Dataset:
         """
         Returns the values stored in the :class:`.DataSet` for the specified parameters
@@ -1064,6 +1473,15 @@ class DataSet(BaseDataSet):
                 If set to "auto" multi index will be used if projecting the data onto
                 a grid requires filling non measured values with NaN  and the shapes
                 of the data has not been set in the run description.
+                Not used if ``lazy`` is True.
+            lazy: If True, the data is not loaded but backed by dask arrays
+                whose chunks are loaded from the database when they are
+                computed, e.g. to work with a slice of a dataset that does
+                not fit into memory. Parameters whose shape is set in the run
+                description and whose data is complete are laid out on their
+                grid, other parameters are indexed by the position of the
+                result along a dimension named ``{name}_index``. See
+                :func:`.load_to_xarray_dataarray_dict_lazy` for details.
 
         Returns:
             :py:class:`xr.Dataset` with the requested parameter(s) data as
@@ -1075,6 +1493,10 @@ class DataSet(BaseDataSet):
                 xds = ds.to_xarray_dataset()
 
         """
+        if lazy:
+            return load_to_xarray_dataset_lazy(
+                self, self._parameter_tree_names(*params), start=start, end=end
+            )
         data = self.get_parameter_data(*params, start=start, end=end)
 
         return load_to_xarray_dataset(self, data, use_multi_index=use_multi_index)
@@ -1133,10 +1555,39 @@ class DataSet(BaseDataSet):
         min_count: int = 1,
         state: Any | None = None,
         callback_kwargs: Mapping[str, Any] | None = None,
+        batched: bool = False,
     ) -> str:
+        """
+        Subscribe a callback to the results written to this :class:`.DataSet`.
+        The callback is called from a separate thread with the results, the
+        number of rows in the :class:`.DataSet` and ``state``.
+
+        Args:
+            callback: The function to call.
+            min_wait: Minimum time in milliseconds between calls.
+            min_count: Minimum number of new rows to call the callback with.
+            state: Object passed to every call of the callback.
+            callback_kwargs: Additional keyword arguments for the callback.
+            batched: If False, the results are a list of row tuples with the
+                values of all parameters. If True, they are a list of
+                :class:`.ResultBatch`, one per transaction that wrote rows
+                to the database, holding the values column by column.
+
+        Returns:
+            The id of the subscriber, which can be passed to
+            :meth:`unsubscribe`.
+
+        """
         subscriber_id = uuid.uuid4().hex
         subscriber = _Subscriber(
-            self, subscriber_id, callback, state, min_wait, min_count, callback_kwargs
+            self,
+            subscriber_id,
+            callback,
+            state,
+            min_wait,
+            min_count,
+            callback_kwargs,
+            batched=batched,
         )
         self.subscribers[subscriber_id] = subscriber
         subscriber.start()
@@ -1180,17 +1631,17 @@ class DataSet(BaseDataSet):
         """
         Remove subscriber with the provided uuid
         """
-        with atomic(self.conn) as conn:
-            sub = self.subscribers[uuid]
-            remove_trigger(conn, sub.trigger_id)
-            sub.schedule_stop()
-            sub.join()
-            del self.subscribers[uuid]
+        sub = self.subscribers[uuid]
+        sub.schedule_stop()
+        sub.join()
+        del self.subscribers[uuid]
 
     def unsubscribe_all(self) -> None:
         """
         Remove all subscribers
         """
+        # subscribers of earlier versions of QCoDeS were notified by
+        # triggers on the results tables, remove any that were left behind
         sql = """
         SELECT name FROM sqlite_master
         WHERE type = 'trigger'
@@ -1235,8 +1686,9 @@ class DataSet(BaseDataSet):
         tree.
 
         Deal with 'numeric' type parameters. If a 'numeric' top level parameter
-        has non-scalar shape, it must be unrolled into a list of dicts of
-        single values (database).
+        has non-scalar shape, its values are flattened into one column per
+        parameter such that each element ends up in its own row of the
+        database.
         """
         self._raise_if_not_writable()
         interdeps = self._rundescriber.interdeps
@@ -1264,17 +1716,17 @@ class DataSet(BaseDataSet):
                         )
 
             if toplevel_param.type == "array":
-                res_list = self._finalize_res_dict_array(result_dict, all_params)
+                res_columns = self._finalize_res_columns_array(result_dict, all_params)
             elif toplevel_param.type in ("numeric", "text", "complex"):
-                res_list = self._finalize_res_dict_numeric_text_or_complex(
+                res_columns = self._finalize_res_columns_numeric_text_or_complex(
                     result_dict, toplevel_param, inff_params, deps_params
                 )
             else:
-                res_dict: dict[str, VALUE] = {
-                    ps.name: result_dict[ps] for ps in all_params
-                }
-                res_list = [res_dict]
-            self._results += res_list
+                res_columns = _ResultColumns(
+                    keys=tuple(ps.name for ps in all_params),
+                    columns=[[result_dict[ps]] for ps in all_params],
+                )
+            self._results.append(res_columns)
 
         # Finally, handle standalone parameters
 
@@ -1282,7 +1734,7 @@ class DataSet(BaseDataSet):
 
         if standalones:
             stdln_dict = {st: result_dict[st] for st in standalones}
-            self._results += self._finalize_res_dict_standalones(stdln_dict)
+            self._results += self._finalize_res_columns_standalones(stdln_dict)
             if self._in_memory_cache:
                 for st in standalones:
                     new_results[st.name] = {
@@ -1293,11 +1745,11 @@ class DataSet(BaseDataSet):
             self.cache.add_data(new_results)
 
     @staticmethod
-    def _finalize_res_dict_array(
+    def _finalize_res_columns_array(
         result_dict: Mapping[ParamSpecBase, values_type], all_params: set[ParamSpecBase]
-    ) -> list[dict[str, VALUE]]:
+    ) -> _ResultColumns:
         """
-        Make a list of res_dicts out of the results for a 'array' type
+        Make a single row of results out of the results for a 'array' type
         parameter. The results are assumed to already have been validated for
         type and shape
         """
@@ -1320,96 +1772,58 @@ class DataSet(BaseDataSet):
                     f"Cannot handle unknown paramtype {paramtype!r} of {ps!r}."
                 )
 
-        res_dict = {ps.name: reshaper(result_dict[ps], ps) for ps in all_params}
-
-        return [res_dict]
+        return _ResultColumns(
+            keys=tuple(ps.name for ps in all_params),
+            columns=[[reshaper(result_dict[ps], ps)] for ps in all_params],
+        )
 
     @staticmethod
-    def _finalize_res_dict_numeric_text_or_complex(
+    def _finalize_res_columns_numeric_text_or_complex(
         result_dict: Mapping[ParamSpecBase, numpy.ndarray],
         toplevel_param: ParamSpecBase,
         inff_params: set[ParamSpecBase],
         deps_params: set[ParamSpecBase],
-    ) -> list[dict[str, VALUE]]:
+    ) -> _ResultColumns:
         """
-        Make a res_dict in the format expected by DataSet.add_results out
-        of the results for a 'numeric' or text type parameter. This includes
-        replicating and unrolling values as needed and also handling the corner
-        case of np.array(1) kind of values
+        Make one flat column per parameter out of the results for a 'numeric'
+        or text type parameter. Scalar setpoints and inferred parameters are
+        repeated to match the number of values of the top level parameter.
         """
-
-        res_list: list[dict[str, VALUE]] = []
         all_params = inff_params.union(deps_params).union({toplevel_param})
 
-        t_map = {"numeric": float, "text": str, "complex": complex}
-
-        toplevel_shape = result_dict[toplevel_param].shape
-        if toplevel_shape == ():
-            # In the case of a single value, life is reasonably simple
-            res_list = [{ps.name: t_map[ps.type](result_dict[ps]) for ps in all_params}]
-        else:
-            # We first massage all values into np.arrays of the same
-            # shape
-            flat_results: dict[str, numpy.ndarray] = {}
-
-            toplevel_val = result_dict[toplevel_param]
-            flat_results[toplevel_param.name] = toplevel_val.ravel()
-            N = len(flat_results[toplevel_param.name])
-            for dep in deps_params:
-                if result_dict[dep].shape == ():
-                    flat_results[dep.name] = numpy.repeat(result_dict[dep], N)
-                else:
-                    flat_results[dep.name] = result_dict[dep].ravel()
-            for inff in inff_params:
-                if numpy.shape(result_dict[inff]) == ():
-                    flat_results[inff.name] = numpy.repeat(result_dict[inff], N)
-                else:
-                    flat_results[inff.name] = result_dict[inff].ravel()
-
-            # And then put everything into the list
+        n_rows = numpy.size(result_dict[toplevel_param])
 
-            res_list = [
-                {p.name: flat_results[p.name][ind] for p in all_params}
-                for ind in range(N)
-            ]
+        keys = []
+        columns: list[numpy.ndarray | list[Any]] = []
+        for ps in all_params:
+            value = numpy.asarray(result_dict[ps])
+            if value.shape == ():
+                column = numpy.repeat(value, n_rows)
+            else:
+                column = value.ravel()
+            keys.append(ps.name)
+            columns.append(_as_column_of_paramtype(column, ps.type))
 
-        return res_list
+        return _ResultColumns(keys=tuple(keys), columns=columns)
 
     @staticmethod
-    def _finalize_res_dict_standalones(
+    def _finalize_res_columns_standalones(
         result_dict: Mapping[ParamSpecBase, numpy.ndarray],
-    ) -> list[dict[str, VALUE]]:
+    ) -> list[_ResultColumns]:
         """
         Massage all standalone parameters into the correct shape
         """
-        res_list: list[dict[str, VALUE]] = []
+        res_columns: list[_ResultColumns] = []
         for param, value in result_dict.items():
-            if param.type == "text":
-                if value.shape:
-                    new_res: list[dict[str, VALUE]] = [
-                        {param.name: str(val)} for val in value
-                    ]
-                    res_list += new_res
-                else:
-                    new_res = [{param.name: str(value)}]
-                    res_list += new_res
-            elif param.type == "numeric":
-                if value.shape:
-                    res_list += [{param.name: number} for number in value]
-                else:
-                    new_res = [{param.name: float(value)}]
-                    res_list += new_res
-            elif param.type == "complex":
-                if value.shape:
-                    res_list += [{param.name: number} for number in value]
-                else:
-                    new_res = [{param.name: complex(value)}]
-                    res_list += new_res
+            if param.type in ("numeric", "text", "complex"):
+                column: numpy.ndarray | list[Any] = _as_column_of_paramtype(
+                    numpy.atleast_1d(value).ravel(), param.type
+                )
             else:
-                new_res = [{param.name: value}]
-                res_list += new_res
+                column = [value]
+            res_columns.append(_ResultColumns(keys=(param.name,), columns=[column]))
 
-        return res_list
+        return res_columns
 
     def _flush_data_to_database(self, block: bool = False) -> None:
         """
@@ -1426,7 +1840,7 @@ class DataSet(BaseDataSet):
         writer_status = self._writer_status
         if len(self._results) > 0:
             try:
-                self.add_results(self._results)
+                self._add_result_columns(self._results)
                 if writer_status.write_in_background:
                     log.debug("Successfully enqueued result for write thread")
                 else:
@@ -1444,6 +1858,62 @@ class DataSet(BaseDataSet):
             log.debug("Waiting for write queue to empty.")
             writer_status.data_write_queue.join()
 
+    def _start_wal_checkpointer(self) -> WALCheckpointer | None:
+        """
+        Start checkpointing the write-ahead log of the database of this
+        dataset in the background, if enabled in the config and if the
+        database is in WAL journal mode.
+        """
+        config = qcodes.config.dataset
+        if not config.wal_checkpoint_in_background or self.path_to_db in (
+            "",
+            ":memory:",
+        ):
+            return None
+        if not is_wal_mode(self.conn):
+            return None
+        assert self.path_to_db is not None
+        wal_checkpointer = WALCheckpointer(
+            self.path_to_db,
+            max_bytes=config.wal_checkpoint_bytes,
+            interval=config.wal_checkpoint_interval,
+        )
+        wal_checkpointer.start()
+        return wal_checkpointer
+
+    def _wal_checkpoint_metrics(self) -> WALCheckpointMetrics | None:
+        """
+        Return the current metrics of the write-ahead log of the database of
+        this dataset or None if it is not checkpointed in the background.
+        """
+        wal_checkpointer = self._writer_status.wal_checkpointer
+        if wal_checkpointer is None:
+            return None
+        return wal_checkpointer.metrics()
+
+    def _background_writer_metrics(self) -> BackgroundWriterMetrics | None:
+        """
+        Return the current metrics of the background writer of the database
+        of this dataset or None if data is not written in the background.
+        """
+        writer_status = self._writer_status
+        bg_writer = writer_status.bg_writer
+        if not writer_status.write_in_background or bg_writer is None:
+            return None
+        queue = writer_status.data_write_queue
+        write_time = bg_writer.write_time
+        return BackgroundWriterMetrics(
+            queue_depth=queue.pending_items,
+            queue_bytes=queue.pending_bytes,
+            lag=queue.lag,
+            rows_per_second=bg_writer.rows_written / write_time if write_time else 0.0,
+            bytes_per_second=(
+                bg_writer.bytes_written / write_time if write_time else 0.0
+            ),
+            rows_written=bg_writer.rows_written,
+            rows_dropped=queue.rows_dropped,
+        )
+
     @property
     def export_info(self) -> ExportInfo:
         return self._export_info
@@ -1461,12 +1931,10 @@ class DataSet(BaseDataSet):
 
     def _export_as_netcdf(self, path: Path, file_name: str) -> Path:
         """Export data as netcdf to a given path with file prefix"""
-        import xarray as xr
-
         file_path = path / file_name
         if (
             qcodes.config.dataset.export_chunked_export_of_large_files_enabled
-            and self._estimate_ds_size()
+            and (estimated_ds_size := self._estimate_ds_size())
             > qcodes.config.dataset.export_chunked_threshold
         ):
             log.info(
@@ -1477,50 +1945,44 @@ class DataSet(BaseDataSet):
                     "ds_name": self.name,
                     "exp_name": self.exp_name,
                     "_export_limit": qcodes.config.dataset.export_chunked_threshold,
-                    "_estimated_ds_size": self._estimate_ds_size(),
+                    "_estimated_ds_size": estimated_ds_size,
                 },
             )
             print(
-                "Large dataset detected. Will write to multiple files first and combine after, to reduce memory overhead."
+                "Large dataset detected. Will write to the file in chunks of rows to reduce memory overhead."
+            )
+            # chunks of rows of at most about the size of the threshold
+            row_size = estimated_ds_size / len(self)
+            rows_per_chunk = (
+                max(int(qcodes.config.dataset.export_chunked_threshold / row_size), 1)
+                if row_size > 0
+                else len(self)
+            )
+            log.info(
+                "Writing chunks of rows to netcdf file.",
+                extra={
+                    "file_name": str(file_path),
+                    "qcodes_guid": self.guid,
+                    "ds_name": self.name,
+                    "exp_name": self.exp_name,
+                    "rows_per_chunk": rows_per_chunk,
+                },
             )
-            with tempfile.TemporaryDirectory() as temp_dir:
-                temp_path = Path(temp_dir)
+            try:
+                _stream_to_h5netcdf(self, file_path, rows_per_chunk)
+            except _NotStreamableError as error:
                 log.info(
-                    "Writing individual files to temp dir.",
+                    f"Can not write the data in chunks of rows: {error} "
+                    "Falling back to combining individual files.",
                     extra={
                         "file_name": str(file_path),
                         "qcodes_guid": self.guid,
                         "ds_name": self.name,
                         "exp_name": self.exp_name,
-                        "temp_dir": temp_dir,
                     },
                 )
-                num_files = len(self)
-                num_digits = len(str(num_files))
-                file_name_template = f"ds_{{:0{num_digits}d}}.nc"
-                for i in trange(num_files, desc="Writing individual files"):
-                    xarray_to_h5netcdf_with_complex_numbers(
-                        self.to_xarray_dataset(start=i + 1, end=i + 1),
-                        temp_path / file_name_template.format(i),
-                    )
-                files = tuple(temp_path.glob("*.nc"))
-                data = xr.open_mfdataset(files)
-                try:
-                    log.info(
-                        "Combining temp files into one file.",
-                        extra={
-                            "file_name": str(file_path),
-                            "qcodes_guid": self.guid,
-                            "ds_name": self.name,
-                            "exp_name": self.exp_name,
-                            "temp_dir": temp_dir,
-                        },
-                    )
-                    xarray_to_h5netcdf_with_complex_numbers(
-                        data, file_path, compute=False
-                    )
-                finally:
-                    data.close()
+                file_path.unlink(missing_ok=True)
+                self._export_as_netcdf_via_temp_files(file_path)
         else:
             log.info(
                 "Writing netcdf file directly.",
@@ -1530,6 +1992,94 @@ class DataSet(BaseDataSet):
             file_path = super()._export_as_netcdf(path=path, file_name=file_name)
         return file_path
 
+    def _export_as_netcdf_via_temp_files(self, file_path: Path) -> None:
+        """
+        Export data as netcdf by writing one file per row to a temporary
+        directory and combining those. Slow, but works for data that can not
+        be written in chunks of rows.
+        """
+        import xarray as xr
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            temp_path = Path(temp_dir)
+            log.info(
+                "Writing individual files to temp dir.",
+                extra={
+                    "file_name": str(file_path),
+                    "qcodes_guid": self.guid,
+                    "ds_name": self.name,
+                    "exp_name": self.exp_name,
+                    "temp_dir": temp_dir,
+                },
+            )
+            num_files = len(self)
+            num_digits = len(str(num_files))
+            file_name_template = f"ds_{{:0{num_digits}d}}.nc"
+            for i in trange(num_files, desc="Writing individual files"):
+                xarray_to_h5netcdf_with_complex_numbers(
+                    self.to_xarray_dataset(start=i + 1, end=i + 1),
+                    temp_path / file_name_template.format(i),
+                )
+            files = tuple(temp_path.glob("*.nc"))
+            data = xr.open_mfdataset(files)
+            try:
+                log.info(
+                    "Combining temp files into one file.",
+                    extra={
+                        "file_name": str(file_path),
+                        "qcodes_guid": self.guid,
+                        "ds_name": self.name,
+                        "exp_name": self.exp_name,
+                        "temp_dir": temp_dir,
+                    },
+                )
+                xarray_to_h5netcdf_with_complex_numbers(data, file_path, compute=False)
+            finally:
+                data.close()
+
+    def _parameter_tree_chunks(
+        self, rows_per_chunk: int
+    ) -> dict[str, Iterator[dict[str, numpy.ndarray]]]:
+        """
+        Return an iterator over chunks of at most ``rows_per_chunk`` rows of
+        the data of each parameter tree, read from the database one chunk at
+        a time. Unlike :meth:`get_parameter_data` the data is not reshaped
+        according to the shapes of the run description.
+        """
+
+        def tree_chunks(tree: str) -> Iterator[dict[str, numpy.ndarray]]:
+            # each chunk is read by the range of its ids, such that sqlite
+            # does not step over the rows of the chunks before it again
+            after_id = 0
+            while True:
+                until_id = get_parameter_tree_row_id(
+                    self.conn,
+                    self.table_name,
+                    tree,
+                    rows_per_chunk - 1,
+                    after_id=after_id,
+                )
+                data, n_rows = get_parameter_data_for_one_paramtree(
+                    self.conn,
+                    self.table_name,
+                    self.description,
+                    tree,
+                    None,
+                    None,
+                    after_id=after_id,
+                    until_id=until_id,
+                )
+                if n_rows > 0 or after_id == 0:
+                    yield data
+                if until_id is None:
+                    return
+                after_id = until_id
+
+        return {
+            param.name: tree_chunks(param.name)
+            for param in self.description.interdeps.non_dependencies
+        }
+
     def _estimate_ds_size(self) -> float:
         """
         Give an estimated size of the dataset as the size of a single row
@@ -1547,6 +2097,18 @@ class DataSet(BaseDataSet):
         return row_size * len(self) / 1024 / 1024
 
 
+def _as_column_of_paramtype(column: numpy.ndarray, paramtype: str) -> numpy.ndarray:
+    """
+    Cast a flat column of values to the numpy type matching how values of
+    the given paramtype are stored in the database.
+    """
+    if paramtype == "text":
+        return column.astype(str)
+    elif paramtype == "complex":
+        return column.astype(complex)
+    return column
+
+
 # public api
 def load_by_run_spec(
     *,
@@ -1594,7 +2156,7 @@ def load_by_run_spec(
         specification.
 
     """
-    internal_conn = conn or connect(get_DB_location())
+    internal_conn = conn or conn_from_dbpath_or_conn(conn=None, path_to_db=None)
     d: DataSetProtocol | None = None
     try:
         guids = get_guids_by_run_spec(
@@ -1660,15 +2222,19 @@ def get_guids_by_run_spec(
         List of guids matching the run spec.
 
     """
-    internal_conn = conn or connect(get_DB_location())
+    internal_conn = conn or conn_from_dbpath_or_conn(conn=None, path_to_db=None)
     try:
-        guids = _query_guids_from_run_spec(
-            internal_conn,
-            captured_run_id=captured_run_id,
-            captured_counter=captured_counter,
-            experiment_name=experiment_name,
-            sample_name=sample_name,
-        )
+        guids = [
+            summary.guid
+            for summary in get_run_summaries(
+                internal_conn,
+                columns=(),
+                captured_run_id=captured_run_id,
+                captured_counter=captured_counter,
+                experiment_name=experiment_name,
+                sample_name=sample_name,
+            )
+        ]
 
         matched_guids = filter_guids_by_parts(guids, location, sample_id, work_station)
 
@@ -1707,7 +2273,7 @@ def load_by_id(run_id: int, conn: ConnectionPlus | None = None) -> DataSetProtoc
     """
     if run_id is None:
         raise ValueError("run_id has to be a positive integer, not None.")
-    internal_conn = conn or connect(get_DB_location())
+    internal_conn = conn or conn_from_dbpath_or_conn(conn=None, path_to_db=None)
     d: DataSetProtocol | None = None
 
     try:
@@ -1748,7 +2314,7 @@ def load_by_guid(guid: str, conn: ConnectionPlus | None = None) -> DataSetProtoc
         RuntimeError: if several runs with the given GUID are found
 
     """
-    internal_conn = conn or connect(get_DB_location())
+    internal_conn = conn or conn_from_dbpath_or_conn(conn=None, path_to_db=None)
     d: DataSetProtocol | None = None
 
     # this function raises a RuntimeError if more than one run matches the GUID
@@ -1792,7 +2358,7 @@ def load_by_counter(
         the given experiment
 
     """
-    internal_conn = conn or connect(get_DB_location())
+    internal_conn = conn or conn_from_dbpath_or_conn(conn=None, path_to_db=None)
     d: DataSetProtocol | None = None
 
     # this function raises a RuntimeError if more than one run matches the GUID
@@ -1815,8 +2381,17 @@ def _get_datasetprotocol_from_guid(guid: str, conn: ConnectionPlus) -> DataSetPr
     if qcodes.config.dataset.load_from_exported_file:
         export_info = _get_datasetprotocol_export_info(run_id=run_id, conn=conn)
 
-        export_file_path = export_info.export_paths.get(
-            DataExportType.NETCDF.value, None
+        export_file_path = next(
+            (
+                export_info.export_paths[export_type.value]
+                for export_type in (
+                    DataExportType.NETCDF,
+                    DataExportType.PARQUET,
+                    DataExportType.ARROW,
+                )
+                if export_type.value in export_info.export_paths
+            ),
+            None,
         )
 
         if export_file_path is not None:
@@ -7,8 +7,13 @@ from typing import TYPE_CHECKING, Generic, Literal, TypeVar
 import numpy as np
 
 from qcodes.dataset.exporters.export_info import ExportInfo
-from qcodes.dataset.sqlite.queries import completed, load_new_data_for_rundescriber
+from qcodes.dataset.sqlite.queries import (
+    _reshape_parameter_tree_data,
+    completed,
+    load_new_data_for_rundescriber,
+)
 
+from .exporters.export_to_arrow import load_parameter_data_from_arrow_file
 from .exporters.export_to_pandas import (
     load_to_concatenated_dataframe,
     load_to_dataframe_dict,
@@ -19,18 +24,20 @@ from .exporters.export_to_xarray import (
 )
 
 if TYPE_CHECKING:
-    from collections.abc import Mapping
+    from collections.abc import Mapping, MutableMapping
 
     import pandas as pd
     import xarray as xr
 
     from qcodes.dataset.descriptions.rundescriber import RunDescriber
+    from qcodes.dataset.export_config import DataExportType
     from qcodes.dataset.sqlite.connection import ConnectionPlus
 
     # used in forward refs that cannot be detected
     from .data_set import DataSet  # noqa F401
     from .data_set_in_memory import DataSetInMem
     from .data_set_protocol import DataSetProtocol, ParameterData
+    from .live_feed import LiveFeedPublisher
 
 DatasetType_co = TypeVar("DatasetType_co", bound="DataSetProtocol", covariant=True)
 
@@ -52,10 +59,15 @@ class DataSetCache(Generic[DatasetType_co]):
     def __init__(self, dataset: DatasetType_co):
         self._dataset = dataset
         self._data: ParameterData = {}
-        #: number of rows read per parameter tree (by the name of the dependent parameter)
+        #: id of the last row read per parameter tree (by the name of the dependent parameter)
         self._read_status: dict[str, int] = {}
         #: number of rows written per parameter tree (by the name of the dependent parameter)
         self._write_status: dict[str, int | None] = {}
+        #: buffers with spare capacity backing the arrays of unshaped
+        #: parameter trees in ``_data``, see :func:`_append_to_buffer`
+        self._buffers: dict[str, dict[str, np.ndarray]] = {}
+        #: publishers that data added to the cache is also written to
+        self._live_feeds: list[LiveFeedPublisher] = []
         self._loaded_from_completed_ds = False
         self._live: bool | None = None
 
@@ -110,6 +122,14 @@ class DataSetCache(Generic[DatasetType_co]):
         from disk
         """
 
+    def _close_live_feeds(self) -> None:
+        """
+        Close the publishers that data added to the cache is written to,
+        which is done once the dataset is completed.
+        """
+        for live_feed in list(self._live_feeds):
+            live_feed.close()
+
     def add_data(self, new_data: Mapping[str, Mapping[str, np.ndarray]]) -> None:
         if self.live is False:
             raise RuntimeError(
@@ -121,12 +141,16 @@ class DataSetCache(Generic[DatasetType_co]):
         for param_name, single_param_dict in new_data.items():
             expanded_data[param_name] = _expand_single_param_dict(single_param_dict)
 
+        for live_feed in self._live_feeds:
+            live_feed.publish(expanded_data)
+
         (self._write_status, self._data) = (
             append_shaped_parameter_data_to_existing_arrays(
                 self.rundescriber,
                 self._write_status,
                 self._data,
                 new_data=expanded_data,
+                buffers=self._buffers,
             )
         )
 
@@ -207,6 +231,8 @@ def load_new_data_from_db_and_append(
     write_status: Mapping[str, int | None],
     read_status: Mapping[str, int],
     existing_data: Mapping[str, Mapping[str, np.ndarray]],
+    *,
+    buffers: MutableMapping[str, dict[str, np.ndarray]] | None = None,
 ) -> tuple[dict[str, int | None], dict[str, int], dict[str, dict[str, np.ndarray]]]:
     """
     Append any new data in the db to an already existing datadict and return the merged
@@ -218,12 +244,15 @@ def load_new_data_from_db_and_append(
         rundescriber: The rundescriber that describes the run
         write_status: Mapping from dependent parameter name to number of rows
           written to the cache previously.
-        read_status: Mapping from dependent parameter name to number of rows
-          read from the db previously.
+        read_status: Mapping from dependent parameter name to the id of the
+          last row read from the db previously.
         existing_data: Mapping from dependent parameter name to mapping
           from parameter name to numpy arrays that the data should be
           inserted into.
           appended to.
+        buffers: Buffers backing the existing data of unshaped parameter
+          trees, which are grown and updated in place.
+          See :func:`append_shaped_parameter_data_to_existing_arrays`.
 
     Returns:
         Updated write and read status, and the updated ``data``
@@ -235,7 +264,7 @@ def load_new_data_from_db_and_append(
 
     (updated_write_status, merged_data) = (
         append_shaped_parameter_data_to_existing_arrays(
-            rundescriber, write_status, existing_data, new_data
+            rundescriber, write_status, existing_data, new_data, buffers=buffers
         )
     )
     return updated_write_status, updated_read_status, merged_data
@@ -246,6 +275,7 @@ def append_shaped_parameter_data_to_existing_arrays(
     write_status: Mapping[str, int | None],
     existing_data: Mapping[str, Mapping[str, np.ndarray]],
     new_data: Mapping[str, Mapping[str, np.ndarray]],
+    buffers: MutableMapping[str, dict[str, np.ndarray]] | None = None,
 ) -> tuple[dict[str, int | None], dict[str, dict[str, np.ndarray]]]:
     """
     Append datadict to an already existing datadict and return the merged
@@ -260,6 +290,12 @@ def append_shaped_parameter_data_to_existing_arrays(
           appended to.
         existing_data: Mapping from dependent parameter name to mapping
           from parameter name to numpy arrays of new data.
+        buffers: Mapping from dependent parameter name to mapping from
+          parameter name to the buffer that backs the existing data of
+          unshaped parameter trees. Appending to unshaped data writes into
+          the spare capacity of these buffers, growing them if needed, and
+          the merged data are views of them. The mapping is updated in
+          place. If None, all unshaped data is copied on every append.
 
     Returns:
         Updated write and read status, and the updated ``data``
@@ -288,6 +324,11 @@ def append_shaped_parameter_data_to_existing_arrays(
                 shape,
                 single_tree_write_status=write_status.get(meas_parameter),
                 meas_parameter=meas_parameter,
+                buffers=(
+                    buffers.setdefault(meas_parameter, {})
+                    if buffers is not None
+                    else None
+                ),
             )
         )
     return updated_write_status, merged_data
@@ -299,6 +340,8 @@ def _merge_data(
     shape: tuple[int, ...] | None,
     single_tree_write_status: int | None,
     meas_parameter: str,
+    *,
+    buffers: dict[str, np.ndarray] | None = None,
 ) -> tuple[dict[str, np.ndarray], int | None]:
     subtree_merged_data = {}
     subtree_parameters = existing_data.keys()
@@ -316,6 +359,8 @@ def _merge_data(
         new_data.get(meas_parameter),
         shape,
         single_tree_write_status,
+        buffers=buffers,
+        param_name=meas_parameter,
     )
     if single_param_merged_data is not None:
         subtree_merged_data[meas_parameter] = single_param_merged_data
@@ -327,6 +372,8 @@ def _merge_data(
                 new_data.get(subtree_param),
                 shape,
                 single_tree_write_status,
+                buffers=buffers,
+                param_name=subtree_param,
             )
             if single_param_merged_data is not None:
                 subtree_merged_data[subtree_param] = single_param_merged_data
@@ -339,13 +386,21 @@ def _merge_data_single_param(
     new_values: np.ndarray | None,
     shape: tuple[int, ...] | None,
     single_tree_write_status: int | None,
+    *,
+    buffers: dict[str, np.ndarray] | None = None,
+    param_name: str = "",
 ) -> tuple[np.ndarray | None, int | None]:
     merged_data: np.ndarray | None
     if (
         existing_values is not None and existing_values.size != 0
     ) and new_values is not None:
         (merged_data, new_write_status) = _insert_into_data_dict(
-            existing_values, new_values, single_tree_write_status, shape=shape
+            existing_values,
+            new_values,
+            single_tree_write_status,
+            shape=shape,
+            buffers=buffers,
+            param_name=param_name,
         )
     elif new_values is not None:
         (merged_data, new_write_status) = _create_new_data_dict(new_values, shape)
@@ -383,24 +438,18 @@ def _insert_into_data_dict(
     new_values: np.ndarray,
     write_status: int | None,
     shape: tuple[int, ...] | None,
+    *,
+    buffers: dict[str, np.ndarray] | None = None,
+    param_name: str = "",
 ) -> tuple[np.ndarray, int | None]:
     if new_values.size == 0:
         return existing_values, write_status
 
     if shape is None or write_status is None:
-        try:
-            data = np.append(existing_values, new_values, axis=0)
-        except ValueError:
-            # we cannot append into a ragged array so make that manually
-            n_existing = existing_values.shape[0]
-            n_new = new_values.shape[0]
-            n_rows = n_existing + n_new
-            data = np.ndarray((n_rows,), dtype=object)
-
-            for i in range(n_existing):
-                data[i] = np.atleast_1d(existing_values[i])
-            for i, j in enumerate(range(n_existing, n_existing + n_new)):
-                data[j] = np.atleast_1d(new_values[i])
+        buffer = buffers.get(param_name) if buffers is not None else None
+        data, buffer = _append_to_buffer(existing_values, new_values, buffer)
+        if buffers is not None:
+            buffers[param_name] = buffer
         return data, None
     else:
         if existing_values.dtype.kind in ("U", "S"):
@@ -426,6 +475,67 @@ def _insert_into_data_dict(
             return existing_values, new_write_status
 
 
+# the capacity of a buffer for unshaped data when it is first created
+_MIN_BUFFER_CAPACITY = 64
+
+
+def _append_to_buffer(
+    existing_values: np.ndarray, new_values: np.ndarray, buffer: np.ndarray | None
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Append rows of new values to existing values that are the first rows of
+    a buffer. If the buffer has no spare capacity, or the existing values are
+    not a view of it, the values are copied to a new buffer of twice the
+    needed capacity, such that appending n rows one at a time costs O(n)
+    rather than the O(n**2) of concatenating every time. The existing values
+    are never modified.
+
+    Rows whose shapes do not match are stored as a one dimensional object
+    array of arrays, which is the form ragged data is loaded from the
+    database in. Only the new rows are wrapped into arrays if the existing
+    values already are in that form.
+
+    Returns:
+        The merged values, which are a view of the first rows of the
+        buffer, and the buffer.
+
+    """
+    n_existing = existing_values.shape[0]
+    n_rows = n_existing + new_values.shape[0]
+    ragged = existing_values.shape[1:] != new_values.shape[1:]
+    if ragged:
+        dtype = np.dtype(object)
+        row_shape: tuple[int, ...] = ()
+    else:
+        dtype = np.result_type(existing_values, new_values)
+        row_shape = existing_values.shape[1:]
+
+    reusable = (
+        buffer is not None
+        and existing_values.base is buffer
+        and buffer.dtype == dtype
+        and buffer.shape[1:] == row_shape
+        and buffer.shape[0] >= n_rows
+    )
+    if not reusable:
+        buffer = np.empty(
+            (max(2 * n_rows, _MIN_BUFFER_CAPACITY), *row_shape), dtype=dtype
+        )
+        if ragged and not (existing_values.dtype == object and row_shape == ()):
+            for i in range(n_existing):
+                buffer[i] = np.atleast_1d(existing_values[i])
+        else:
+            buffer[:n_existing] = existing_values
+    assert buffer is not None
+
+    if ragged:
+        for i in range(n_existing, n_rows):
+            buffer[i] = np.atleast_1d(new_values[i - n_existing])
+    else:
+        buffer[n_existing:n_rows] = new_values
+    return buffer[:n_rows], buffer
+
+
 def _expand_single_param_dict(
     single_param_dict: Mapping[str, np.ndarray],
 ) -> dict[str, np.ndarray]:
@@ -486,6 +596,34 @@ class DataSetCacheDeferred(DataSetCacheInMem):
         return ds
 
 
+class DataSetCacheDeferredArrow(DataSetCacheInMem):
+    """
+    Cache of a :class:`.DataSetInMem` that loads its data from a Parquet or
+    Arrow IPC file written by the parquet or arrow export when it is first
+    needed.
+    """
+
+    def __init__(
+        self,
+        dataset: DataSetInMem,
+        loaded_data: Path | str,
+        export_type: DataExportType,
+    ):
+        super().__init__(dataset)
+        self._arrow_file_path = Path(loaded_data)
+        self._export_type = export_type
+
+    def load_data_from_db(self) -> None:
+        if self._data == {}:
+            data = load_parameter_data_from_arrow_file(
+                self._arrow_file_path, self._export_type
+            )
+            self._data = {
+                tree: _reshape_parameter_tree_data(self.rundescriber, tree, tree_data)
+                for tree, tree_data in data.items()
+            }
+
+
 class DataSetCacheWithDBBackend(DataSetCache["DataSet"]):
     def load_data_from_db(self) -> None:
         """
@@ -525,6 +663,7 @@ class DataSetCacheWithDBBackend(DataSetCache["DataSet"]):
             self._write_status,
             self._read_status,
             self._data,
+            buffers=self._buffers,
         )
         data_not_read = all(
             status is None or status == 0 for status in self._write_status.values()
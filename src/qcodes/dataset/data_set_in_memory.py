@@ -41,11 +41,16 @@ from qcodes.dataset.sqlite.queries import (
 )
 from qcodes.utils import NumpyJSONEncoder
 
-from .data_set_cache import DataSetCacheDeferred, DataSetCacheInMem
+from .data_set_cache import (
+    DataSetCacheDeferred,
+    DataSetCacheDeferredArrow,
+    DataSetCacheInMem,
+)
 from .dataset_helpers import _add_run_to_runs_table
 from .descriptions.versioning import serialization as serial
 from .experiment_settings import get_default_experiment_id
 from .exporters.export_info import ExportInfo
+from .exporters.export_to_arrow import load_arrow_file_metadata
 from .linked_datasets.links import str_to_links
 
 if TYPE_CHECKING:
@@ -301,6 +306,73 @@ class DataSetInMem(BaseDataSet):
 
         return ds
 
+    @classmethod
+    def _load_from_arrow_file(
+        cls,
+        path: Path | str,
+        export_type: DataExportType,
+        path_to_db: Path | str | None = None,
+    ) -> DataSetInMem:
+        """
+        Create a in memory dataset from a Parquet or Arrow IPC file.
+        The file is expected to contain a QCoDeS dataset that has been
+        exported using the QCoDeS parquet or arrow export. The data is
+        loaded from the file when it is first needed.
+
+        Args:
+            path: Path to the file to import.
+            export_type: ``DataExportType.PARQUET`` or ``DataExportType.ARROW``.
+            path_to_db: Optional path to a database where this dataset may be
+                exported to. If not supplied the path can be given at export time
+                or the dataset exported to the default db as set in the QCoDeS config.
+
+        Returns:
+            The loaded dataset.
+
+        """
+        file_metadata = load_arrow_file_metadata(path, export_type)
+        if path_to_db is not None:
+            path_to_db = str(path_to_db)
+
+        with contextlib.closing(
+            conn_from_dbpath_or_conn(conn=None, path_to_db=path_to_db)
+        ) as conn:
+            run_data = get_raw_run_attributes(conn, guid=file_metadata["guid"])
+            path_to_db = conn.path_to_dbfile
+
+        if run_data is not None:
+            run_id = run_data["run_id"]
+            counter = run_data["counter"]
+        else:
+            run_id = file_metadata["captured_run_id"]
+            counter = file_metadata["captured_counter"]
+
+        metadata = dict(file_metadata["metadata"])
+        export_info = ExportInfo.from_str(metadata.pop("export_info", ""))
+        export_info.export_paths[export_type.value] = os.path.abspath(path)
+
+        ds = cls(
+            run_id=run_id,
+            captured_run_id=file_metadata["captured_run_id"],
+            counter=counter,
+            captured_counter=file_metadata["captured_counter"],
+            name=file_metadata["ds_name"],
+            exp_id=0,
+            exp_name=file_metadata["exp_name"],
+            sample_name=file_metadata["sample_name"],
+            guid=file_metadata["guid"],
+            path_to_db=path_to_db,
+            run_timestamp_raw=file_metadata["run_timestamp_raw"],
+            completed_timestamp_raw=file_metadata["completed_timestamp_raw"],
+            metadata=metadata,
+            rundescriber=serial.from_json_to_current(file_metadata["run_description"]),
+            parent_dataset_links=str_to_links(file_metadata["parent_dataset_links"]),
+            export_info=export_info,
+            snapshot=file_metadata["snapshot"],
+        )
+        ds._cache = DataSetCacheDeferredArrow(ds, path, export_type)
+        return ds
+
     @classmethod
     def _load_from_db(cls, conn: ConnectionPlus, guid: str) -> DataSetInMem:
         run_attributes = get_raw_run_attributes(conn, guid)
@@ -480,6 +552,7 @@ class DataSetInMem(BaseDataSet):
             )
 
         self._complete(True)
+        self.cache._close_live_feeds()
 
     @property
     def run_id(self) -> int:
@@ -911,7 +984,7 @@ def load_from_file(
     Create an in-memory dataset from a file.
     The file is expected to contain a QCoDeS dataset that
     has been exported using the QCoDeS export functions.
-    Currently, this only supports loading from netcdf files.
+    Currently, this supports loading from netcdf, parquet and arrow files.
 
     Args:
         path: Path to the file to import.
@@ -930,6 +1003,16 @@ def load_from_file(
     if DataExportType.NETCDF.value == path.suffix.replace(".", ""):
         return DataSetInMem._load_from_netcdf(path=path, path_to_db=path_to_db)
 
+    elif path.suffix.replace(".", "") in (
+        DataExportType.PARQUET.value,
+        DataExportType.ARROW.value,
+    ):
+        return DataSetInMem._load_from_arrow_file(
+            path=path,
+            export_type=DataExportType(path.suffix.replace(".", "")),
+            path_to_db=path_to_db,
+        )
+
     else:
         raise ValueError(
             f"Loading file of type {path.suffix} is not supported."
@@ -1,20 +1,31 @@
 from __future__ import annotations
 
 import json
+from dataclasses import dataclass, field
+from functools import cached_property
 from typing import TYPE_CHECKING, Any
 
 from typing_extensions import TypedDict
 
 from qcodes.dataset.linked_datasets.links import Link, str_to_links
+from qcodes.dataset.sqlite.database import conn_from_dbpath_or_conn
 from qcodes.dataset.sqlite.queries import (
+    RUN_SUMMARY_OPTIONAL_COLUMNS,
     ExperimentAttributeDict,
+    get_metadata_from_run_id,
+    get_parent_dataset_links,
     get_raw_run_attributes,
+    get_raw_run_summaries,
     raw_time_to_str_time,
 )
+from qcodes.dataset.sqlite.query_helpers import select_one_where
 
 from .descriptions.versioning import serialization
 
 if TYPE_CHECKING:
+    from collections.abc import Mapping, Sequence
+
+    from qcodes.dataset.data_set_protocol import DataSetProtocol
     from qcodes.dataset.descriptions.rundescriber import RunDescriber
     from qcodes.dataset.sqlite.connection import ConnectionPlus
 
@@ -73,3 +84,223 @@ def get_run_attributes(conn: ConnectionPlus, guid: str) -> RunAttributesDict | N
         else None,
     }
     return attributes
+
+
+@dataclass(frozen=True)
+class RunSummary:
+    """
+    Lightweight summary of a run in a database file, as returned by
+    :func:`get_run_summaries`. It holds the attributes of the run that can be
+    read with a single query for many runs. The run description, snapshot
+    and parent dataset links are parsed on first access, and read from the
+    database file if they were not loaded with the summary. Use
+    :meth:`load_dataset` to load the dataset of the run.
+    """
+
+    run_id: int
+    exp_id: int
+    guid: str
+    name: str
+    exp_name: str
+    sample_name: str
+    counter: int
+    captured_run_id: int
+    captured_counter: int
+    run_timestamp_raw: float | None
+    completed_timestamp_raw: float | None
+    completed: bool
+    parameters: str | None
+    path_to_db: str
+    _raw_columns: dict[str, Any] = field(repr=False, compare=False)
+
+    def run_timestamp(self, fmt: str = "%Y-%m-%d %H:%M:%S") -> str | None:
+        """
+        Returns run timestamp in a human-readable format, or None if the run
+        has not been started.
+        """
+        return raw_time_to_str_time(self.run_timestamp_raw, fmt)
+
+    def completed_timestamp(self, fmt: str = "%Y-%m-%d %H:%M:%S") -> str | None:
+        """
+        Returns timestamp when the run was completed in a human-readable
+        format, or None if the run is not completed.
+        """
+        return raw_time_to_str_time(self.completed_timestamp_raw, fmt)
+
+    @cached_property
+    def description(self) -> RunDescriber:
+        return serialization.from_json_to_current(self._raw_column("run_description"))
+
+    @cached_property
+    def snapshot(self) -> dict[str, Any] | None:
+        snapshot_raw = self._raw_column("snapshot")
+        return json.loads(snapshot_raw) if snapshot_raw is not None else None
+
+    @cached_property
+    def parent_dataset_links(self) -> list[Link]:
+        links_raw = self._raw_column("parent_datasets")
+        return str_to_links(links_raw) if links_raw is not None else []
+
+    @property
+    def metadata(self) -> dict[str, Any]:
+        return self._raw_column("metadata")
+
+    def load_dataset(self) -> DataSetProtocol:
+        """
+        Load the dataset of the run from its database file.
+        """
+        from qcodes.dataset.data_set import load_by_guid
+
+        conn = conn_from_dbpath_or_conn(conn=None, path_to_db=self.path_to_db)
+        return load_by_guid(self.guid, conn=conn)
+
+    def _raw_column(self, column: str) -> Any:
+        if column not in self._raw_columns:
+            conn = conn_from_dbpath_or_conn(conn=None, path_to_db=self.path_to_db)
+            try:
+                if column == "metadata":
+                    value = get_metadata_from_run_id(conn, self.run_id)
+                elif column == "parent_datasets":
+                    value = get_parent_dataset_links(conn, self.run_id)
+                else:
+                    value = select_one_where(
+                        conn, "runs", column, "run_id", self.run_id
+                    )
+            finally:
+                conn.close()
+            self._raw_columns[column] = value
+        return self._raw_columns[column]
+
+
+def get_run_summaries(
+    conn: ConnectionPlus | None = None,
+    *,
+    columns: Sequence[str] | None = None,
+    run_ids: Sequence[int] | None = None,
+    exp_id: int | None = None,
+    experiment_name: str | None = None,
+    sample_name: str | None = None,
+    captured_run_id: int | None = None,
+    captured_counter: int | None = None,
+    where: Mapping[str, Any] | None = None,
+    order_by: str = "run_id",
+    descending: bool = False,
+    limit: int | None = None,
+    offset: int = 0,
+) -> list[RunSummary]:
+    """
+    Get a :class:`RunSummary` of each run in a database file that matches
+    the supplied specifications, with a single query. This is much faster
+    than loading the datasets of many runs, which takes several queries per
+    run. All arguments are optional.
+
+    Args:
+        conn: An optional connection to the database. If no connection is
+            supplied a connection to the default database will be opened.
+        columns: The large or rarely needed attributes to load along with the
+            summaries, out of "run_description", "snapshot", "parent_datasets"
+            and "metadata". The others are read from the database file when
+            they are first accessed. If None, all of them are loaded.
+        run_ids: The run ids of the runs to get.
+        exp_id: Id of the experiment that the runs belong to.
+        experiment_name: Name of the experiment that the runs belong to.
+        sample_name: Name of the sample of the experiment that the runs
+            belong to.
+        captured_run_id: The ``run_id`` that was originally assigned to the
+            runs at the time of capture.
+        captured_counter: The counter that was originally assigned to the
+            runs at the time of capture.
+        where: Conditions on the metadata of the runs, see :func:`find_runs`.
+        order_by: Sort the runs by "run_id", "exp_id", "name",
+            "run_timestamp", "completed_timestamp", "captured_run_id" or
+            "captured_counter". Runs with the same value are sorted by run_id.
+        descending: Whether to sort the runs in descending order. Runs that
+            have not been started come last when sorting by "run_timestamp"
+            in descending order.
+        limit: The maximum number of summaries to get, e.g. the size of a
+            page. If None, all matching runs are returned.
+        offset: The number of matching runs to skip, e.g. the number of runs
+            on the previous pages.
+
+    Returns:
+        List of the summaries of the matching runs.
+
+    """
+    if columns is None:
+        columns = RUN_SUMMARY_OPTIONAL_COLUMNS
+    internal_conn = conn or conn_from_dbpath_or_conn(conn=None, path_to_db=None)
+    try:
+        raw_summaries = get_raw_run_summaries(
+            internal_conn,
+            columns=columns,
+            run_ids=run_ids,
+            exp_id=exp_id,
+            experiment_name=experiment_name,
+            sample_name=sample_name,
+            captured_run_id=captured_run_id,
+            captured_counter=captured_counter,
+            where=where,
+            order_by=order_by,
+            descending=descending,
+            limit=limit,
+            offset=offset,
+        )
+        path_to_db = internal_conn.path_to_dbfile
+    finally:
+        if not conn:
+            internal_conn.close()
+
+    return [
+        RunSummary(
+            run_id=raw["run_id"],
+            exp_id=raw["exp_id"],
+            guid=raw["guid"],
+            name=raw["name"],
+            exp_name=raw["exp_name"],
+            sample_name=raw["sample_name"],
+            counter=raw["result_counter"],
+            captured_run_id=raw["captured_run_id"],
+            captured_counter=raw["captured_counter"],
+            run_timestamp_raw=raw["run_timestamp"],
+            completed_timestamp_raw=raw["completed_timestamp"],
+            completed=bool(raw["is_completed"]),
+            parameters=raw["parameters"],
+            path_to_db=path_to_db,
+            _raw_columns={column: raw[column] for column in columns},
+        )
+        for raw in raw_summaries
+    ]
+
+
+def find_runs(
+    where: Mapping[str, Any], conn: ConnectionPlus | None = None, **kwargs: Any
+) -> list[RunSummary]:
+    """
+    Find the runs whose metadata matches the given conditions. The runs are
+    selected by a query on the indexed metadata table of the database, so
+    this is fast even for databases with many runs.
+
+    Examples:
+        >>> find_runs(where={"fridge": "BF3", "T_mK": ("<", 20)})
+
+        returns the summaries of the runs with the metadata tag ``fridge``
+        equal to "BF3" and the tag ``T_mK`` less than 20.
+
+    Args:
+        where: Mapping from metadata tags to the value that the metadata of
+            the runs must be equal to, or to a tuple of an operator and a
+            value. The operator is one of "==", "!=", "<", "<=", ">", ">=",
+            "like" for a pattern in the syntax of the SQL LIKE operator and
+            "in" for a sequence of values. Values are compared like in
+            SQLite, i.e. numbers are less than text. Runs that do not have a
+            tag never match a condition on it.
+        conn: An optional connection to the database. If no connection is
+            supplied a connection to the default database will be opened.
+        **kwargs: Further arguments of :func:`get_run_summaries`, e.g. to
+            filter, sort or page the runs.
+
+    Returns:
+        List of the summaries of the matching runs.
+
+    """
+    return get_run_summaries(conn, where=where, **kwargs)
@@ -3,7 +3,7 @@ from __future__ import annotations
 import logging
 import os
 import warnings
-from collections.abc import Callable, Mapping, Sequence
+from collections.abc import Callable, Iterator, Mapping, Sequence
 from enum import Enum
 from importlib.metadata import entry_points
 from pathlib import Path
@@ -17,6 +17,7 @@ from typing import (
 
 import numpy as np
 
+import qcodes
 from qcodes.dataset.descriptions.dependencies import InterDependencies_
 from qcodes.dataset.descriptions.param_spec import ParamSpec, ParamSpecBase
 from qcodes.dataset.export_config import (
@@ -28,6 +29,7 @@ from qcodes.dataset.export_config import (
 )
 
 from .descriptions.versioning.converters import new_to_old
+from .exporters.export_to_arrow import dataset_to_arrow_file
 from .exporters.export_to_csv import dataframe_to_csv
 from .exporters.export_to_xarray import xarray_to_h5netcdf_with_complex_numbers
 from .sqlite.queries import raw_time_to_str_time
@@ -405,6 +407,14 @@ class BaseDataSet(DataSetProtocol, Protocol):
             )
             export_path = Path(self._export_as_csv(path=path, file_name=file_name))
 
+        elif export_type in (DataExportType.PARQUET, DataExportType.ARROW):
+            file_name = self._export_file_name(prefix=prefix, export_type=export_type)
+            export_path = Path(
+                self._export_as_arrow_file(
+                    path=path, file_name=file_name, export_type=export_type
+                )
+            )
+
         else:
             export_path = None
 
@@ -443,6 +453,42 @@ class BaseDataSet(DataSetProtocol, Protocol):
         )
         return path / file_name
 
+    def _export_as_arrow_file(
+        self, path: Path, file_name: str, export_type: DataExportType
+    ) -> Path:
+        """Export data as parquet or arrow to a given path with file prefix."""
+        file_path = path / file_name
+        dataset_to_arrow_file(
+            self,
+            self._parameter_tree_chunks(qcodes.config.dataset.export_row_group_size),
+            file_path,
+            export_type,
+        )
+        return file_path
+
+    def _parameter_tree_chunks(
+        self, rows_per_chunk: int
+    ) -> dict[str, Iterator[dict[str, np.ndarray]]]:
+        """
+        Return an iterator over chunks of at most ``rows_per_chunk`` rows of
+        the data of each parameter tree.
+        """
+
+        def tree_chunks(
+            tree_data: Mapping[str, np.ndarray],
+        ) -> Iterator[dict[str, np.ndarray]]:
+            n_rows = len(next(iter(tree_data.values()), ()))
+            for start in range(0, max(n_rows, 1), rows_per_chunk):
+                yield {
+                    param: values[start : start + rows_per_chunk]
+                    for param, values in tree_data.items()
+                }
+
+        return {
+            tree: tree_chunks(tree_data)
+            for tree, tree_data in self.cache.data().items()
+        }
+
     def _add_metadata_to_netcdf_if_nc_exported(self, tag: str, data: Any) -> None:
         export_paths = self.export_info.export_paths
         nc_file = export_paths.get(DataExportType.NETCDF.value, None)
@@ -0,0 +1,346 @@
+"""
+This module provides archiving of runs: the result tables of completed runs
+are moved from a database file into its archive file, see
+:mod:`qcodes.dataset.sqlite.archive`, which keeps the database file small,
+such that checkpoints of its write-ahead log and backups of it are fast.
+Archived runs are loaded like any other run.
+
+Runs that were completed more than a number of days ago can be archived from
+the command line with::
+
+    qcodes-archive-runs experiments.db --older-than 30 --vacuum
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import re
+import time
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from qcodes.dataset.sqlite.archive import (
+    ARCHIVE_SCHEMA,
+    attach_archive,
+    compress_array,
+)
+from qcodes.dataset.sqlite.array_header import SIDECAR_ARRAY_MAGIC
+from qcodes.dataset.sqlite.complex_codec import COMPLEX_NBYTES
+from qcodes.dataset.sqlite.connection import ConnectionPlus, atomic, transaction
+from qcodes.dataset.sqlite.database import _convert_array, connect
+from qcodes.dataset.sqlite.query_helpers import get_description_map, many_many
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator, Sequence
+    from pathlib import Path
+
+log = logging.getLogger(__name__)
+
+_archived_runs_table_schema = f"""
+CREATE TABLE IF NOT EXISTS {ARCHIVE_SCHEMA}.archived_runs (
+    guid TEXT PRIMARY KEY,
+    run_id INTEGER NOT NULL,
+    result_table_name TEXT NOT NULL,
+    archived_timestamp REAL NOT NULL
+);
+"""
+
+
+def archive_runs(
+    path_to_db: str | Path,
+    *run_ids: int,
+    compression_level: int = 6,
+    vacuum: bool = False,
+) -> list[int]:
+    """
+    Move the result tables of completed runs from a database file into its
+    archive file, which is created if it does not exist. Arrays are
+    compressed on the way. The runs stay in the runs table of the database
+    file and are loaded from it as before, e.g. with
+    :func:`qcodes.dataset.load_by_guid`.
+
+    Connections to the database file that were opened before its archive
+    file was created can not read the archived runs and have to be opened
+    again.
+
+    Args:
+        path_to_db: Path to the database file.
+        run_ids: The ``run_id``'s of the runs to archive. Runs that have been
+          archived before or that have no result table are skipped.
+        compression_level: The zlib compression level from 0 to 9 with which
+          arrays are compressed.
+        vacuum: Whether to vacuum the database file after the runs have been
+          archived, which is needed to shrink it. This rewrites the whole
+          file.
+
+    Returns:
+        The ``run_id``'s of the runs that have been archived.
+
+    Raises:
+        RuntimeError: If one of the runs is not completed or does not exist.
+          The runs before it have been archived nonetheless.
+
+    """
+    conn = connect(path_to_db)
+    try:
+        attach_archive(conn, path_to_db, create=True)
+        transaction(conn, _archived_runs_table_schema)
+
+        archived = [
+            run_id
+            for run_id in run_ids
+            if _archive_run(conn, run_id, compression_level)
+        ]
+        log.info(f"Archived {len(archived)} runs of {path_to_db}")
+
+        if vacuum and archived:
+            transaction(conn, "VACUUM main")
+    finally:
+        conn.close()
+    return archived
+
+
+def archive_runs_older_than(
+    path_to_db: str | Path,
+    days: float,
+    compression_level: int = 6,
+    vacuum: bool = False,
+) -> list[int]:
+    """
+    Archive the runs of a database file that were completed more than a
+    number of days ago, see :func:`archive_runs`.
+
+    Args:
+        path_to_db: Path to the database file.
+        days: The minimum age of the runs to archive in days.
+        compression_level: The zlib compression level from 0 to 9 with which
+          arrays are compressed.
+        vacuum: Whether to vacuum the database file afterwards.
+
+    Returns:
+        The ``run_id``'s of the runs that have been archived.
+
+    """
+    conn = connect(path_to_db)
+    try:
+        sql = """
+              SELECT run_id FROM runs
+              WHERE is_completed = 1 AND completed_timestamp < ?
+              AND result_table_name IN
+              (SELECT name FROM main.sqlite_master WHERE type='table')
+              ORDER BY run_id
+              """
+        cutoff = time.time() - days * 24 * 3600
+        run_ids = [
+            run_id for (run_id,) in many_many(transaction(conn, sql, cutoff), "run_id")
+        ]
+    finally:
+        conn.close()
+    return archive_runs(
+        path_to_db, *run_ids, compression_level=compression_level, vacuum=vacuum
+    )
+
+
+def _archive_run(conn: ConnectionPlus, run_id: int, compression_level: int) -> bool:
+    """
+    Move the result table of a run into the attached archive file.
+
+    A transaction that writes to both files is not atomic in WAL mode, so the
+    result table is copied into the archive file and recorded as archived in
+    one transaction, and dropped from the database file in a second one once
+    the number of rows of the copy has been checked. If the first transaction
+    has been committed before, e.g. by an archiving that was interrupted, the
+    result table is not copied again.
+    """
+    with atomic(conn) as atomic_conn:
+        table_name = _copy_result_table_to_archive(
+            atomic_conn, run_id, compression_level
+        )
+    if table_name is None:
+        return False
+    with atomic(conn) as atomic_conn:
+        _drop_archived_result_table(atomic_conn, run_id, table_name)
+    return True
+
+
+def _copy_result_table_to_archive(
+    conn: ConnectionPlus, run_id: int, compression_level: int
+) -> str | None:
+    """
+    Copy the result table of a run into the attached archive file, unless
+    that has been done before, and return its name. Return None if the run
+    has no result table in the database file. Must be called within an
+    atomic transaction.
+    """
+    row = transaction(
+        conn,
+        "SELECT guid, result_table_name, is_completed FROM runs WHERE run_id = ?",
+        run_id,
+    ).fetchone()
+    if row is None:
+        raise ValueError(f"No run with run_id {run_id} in the database.")
+    guid, table_name, is_completed = row
+    if not is_completed:
+        raise ValueError(
+            "Dataset not completed. An incomplete dataset "
+            f"can not be archived. The incomplete dataset has "
+            f"GUID: {guid} and run_id: {run_id}"
+        )
+    table = transaction(
+        conn,
+        "SELECT sql FROM main.sqlite_master WHERE type='table' AND name=?",
+        table_name,
+    ).fetchone()
+    if table is None:
+        log.info(f"Skipping run {run_id}, it has no result table to archive.")
+        return None
+
+    archived_before = transaction(
+        conn,
+        f"SELECT 1 FROM {ARCHIVE_SCHEMA}.archived_runs WHERE guid = ? AND "
+        f"result_table_name IN (SELECT name FROM {ARCHIVE_SCHEMA}.sqlite_master "
+        "WHERE type='table')",
+        guid,
+    ).fetchone()
+    if archived_before is not None:
+        log.info(f"Run {run_id} has been copied to the archive before.")
+        return table_name
+
+    # the result table keeps its name and declared types in the archive
+    create_sql = re.sub(
+        r"^CREATE TABLE\s+", f"CREATE TABLE {ARCHIVE_SCHEMA}.", table[0], count=1
+    )
+    transaction(conn, f'DROP TABLE IF EXISTS {ARCHIVE_SCHEMA}."{table_name}"')
+    transaction(conn, create_sql)
+
+    cur = transaction(conn, f'PRAGMA main.table_info("{table_name}")')
+    description = get_description_map(cur)
+    columns = [
+        (row[description["name"]], row[description["type"]]) for row in cur.fetchall()
+    ]
+    names = ",".join(f'"{name}"' for name, _ in columns)
+    if any(paramtype == "array" for _, paramtype in columns):
+        # the values are selected as expressions, which have no declared
+        # type, so that they are read as stored rather than converted
+        selection = ",".join(f'+"{name}"' for name, _ in columns)
+        rows = transaction(conn, f'SELECT {selection} FROM main."{table_name}"')
+        conn.executemany(
+            f'INSERT INTO {ARCHIVE_SCHEMA}."{table_name}" ({names}) '
+            f"VALUES ({','.join('?' * len(columns))})",
+            _compress_arrays(
+                rows, [paramtype for _, paramtype in columns], compression_level
+            ),
+        )
+    else:
+        transaction(
+            conn,
+            f'INSERT INTO {ARCHIVE_SCHEMA}."{table_name}" ({names}) '
+            f'SELECT {names} FROM main."{table_name}"',
+        )
+
+    transaction(
+        conn,
+        f"INSERT OR REPLACE INTO {ARCHIVE_SCHEMA}.archived_runs "
+        "(guid, run_id, result_table_name, archived_timestamp) VALUES (?, ?, ?, ?)",
+        guid,
+        run_id,
+        table_name,
+        time.time(),
+    )
+    return table_name
+
+
+def _drop_archived_result_table(
+    conn: ConnectionPlus, run_id: int, table_name: str
+) -> None:
+    """
+    Drop the result table of a run from the database file after checking
+    that its copy in the archive file has as many rows. Must be called
+    within an atomic transaction.
+    """
+    (n_rows,) = transaction(
+        conn, f'SELECT COUNT(*) FROM main."{table_name}"'
+    ).fetchone()
+    (n_archived_rows,) = transaction(
+        conn, f'SELECT COUNT(*) FROM {ARCHIVE_SCHEMA}."{table_name}"'
+    ).fetchone()
+    if n_archived_rows != n_rows:
+        raise ValueError(
+            f"The copy of the result table of run {run_id} in the archive has "
+            f"{n_archived_rows} rows rather than {n_rows}. The result table is "
+            "kept in the database file."
+        )
+    transaction(conn, f'DROP TABLE main."{table_name}"')
+
+
+def _compress_arrays(
+    rows: Iterable[Sequence[object]], paramtypes: Sequence[str], level: int
+) -> Iterator[list[object]]:
+    array_columns = [
+        i for i, paramtype in enumerate(paramtypes) if paramtype == "array"
+    ]
+    for row in rows:
+        values = list(row)
+        for i in array_columns:
+            values[i] = _compress_array_value(values[i], level)
+        yield values
+
+
+def _compress_array_value(value: object, level: int) -> object:
+    # references to sidecar files and complex scalars are kept as they are
+    if (
+        not isinstance(value, bytes)
+        or value.startswith(SIDECAR_ARRAY_MAGIC)
+        or len(value) == COMPLEX_NBYTES
+    ):
+        return value
+    arr = _convert_array(value)
+    if not isinstance(arr, np.ndarray) or arr.dtype.hasobject or arr.dtype.fields:
+        return value
+    compressed = compress_array(arr, level)
+    return compressed if len(compressed) < len(value) else value
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        prog="qcodes-archive-runs",
+        description=(
+            "Move the result tables of completed runs of a QCoDeS database "
+            "file into its archive file."
+        ),
+    )
+    parser.add_argument("path", help="Path to the database file.")
+    parser.add_argument(
+        "--older-than",
+        type=float,
+        required=True,
+        metavar="DAYS",
+        help="Archive the runs that were completed more than DAYS days ago.",
+    )
+    parser.add_argument(
+        "--compression-level",
+        type=int,
+        default=6,
+        choices=range(10),
+        help="zlib compression level of the arrays.",
+    )
+    parser.add_argument(
+        "--vacuum",
+        action="store_true",
+        help="Vacuum the database file afterwards to shrink it.",
+    )
+    args = parser.parse_args()
+
+    archived = archive_runs_older_than(
+        args.path,
+        args.older_than,
+        compression_level=args.compression_level,
+        vacuum=args.vacuum,
+    )
+    print(f"Archived {len(archived)} runs of {args.path}")
+
+
+if __name__ == "__main__":
+    main()
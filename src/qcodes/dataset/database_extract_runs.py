@@ -1,14 +1,19 @@
 from __future__ import annotations
 
 import os
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
 from typing import TYPE_CHECKING
 from warnings import warn
 
 import numpy as np
+from tqdm import tqdm
 
 from qcodes.dataset.data_set import DataSet
 from qcodes.dataset.dataset_helpers import _add_run_to_runs_table
 from qcodes.dataset.experiment_container import _create_exp_if_needed
+from qcodes.dataset.sqlite.archive import archive_path
 from qcodes.dataset.sqlite.connection import ConnectionPlus, atomic
 from qcodes.dataset.sqlite.database import (
     connect,
@@ -21,10 +26,18 @@ from qcodes.dataset.sqlite.queries import (
     get_runid_from_guid,
     is_run_id_in_database,
 )
+from qcodes.dataset.sqlite.sidecar import copy_sidecar_files
 
 if TYPE_CHECKING:
+    from collections.abc import Iterator, Mapping, Sequence
     from pathlib import Path
 
+# the name under which the source DB file is attached to the connection to the
+# target DB file while runs are extracted, and the name under which the
+# archive file of the source DB file is attached, if it has one
+_SOURCE_SCHEMA = "extract_source"
+_SOURCE_ARCHIVE_SCHEMA = "extract_source_archive"
+
 
 def extract_runs_into_db(
     source_db_path: str | Path,
@@ -32,6 +45,8 @@ def extract_runs_into_db(
     *run_ids: int,
     upgrade_source_db: bool = False,
     upgrade_target_db: bool = False,
+    runs_per_transaction: int | None = None,
+    show_progress_bar: bool = False,
 ) -> None:
     """
     Extract a selection of runs into another DB file. All runs must come from
@@ -39,6 +54,10 @@ def extract_runs_into_db(
     and ``sample_name`` in the target db. If such an experiment does not exist, it
     will be created.
 
+    The source DB file is attached to the connection to the target DB file,
+    such that the results of each run are copied by SQLite in a single
+    statement.
+
     Args:
         source_db_path: Path to the source DB file
         target_db_path: Path to the target DB file. The target DB file will be
@@ -48,6 +67,12 @@ def extract_runs_into_db(
           not the newest, should it be upgraded?
         upgrade_target_db: If the target DB is found to be in a version that is
           not the newest, should it be upgraded?
+        runs_per_transaction: Number of runs that are copied in one
+          transaction. If None, all runs are copied in one transaction, such
+          that either all or none of them are copied. Otherwise, the runs of
+          the transactions that were committed before an error remain in the
+          target DB file.
+        show_progress_bar: Whether to show a progress bar of the copied runs.
 
     """
     # Check for versions
@@ -106,29 +131,142 @@ def extract_runs_into_db(
     # this function raises if the target DB file has several experiments
     # matching both the name and sample_name
 
+    if runs_per_transaction is None:
+        runs_per_transaction = max(len(run_ids), 1)
+    batches = [
+        run_ids[i : i + runs_per_transaction]
+        for i in range(0, len(run_ids), runs_per_transaction)
+    ]
+    target_exp_id: int | None = None
+
     try:
-        with atomic(target_conn) as target_conn:
-            target_exp_id = _create_exp_if_needed(
-                target_conn,
-                exp_attrs["name"],
-                exp_attrs["sample_name"],
-                exp_attrs["format_string"],
-                exp_attrs["start_time"],
-                exp_attrs["end_time"],
-            )
+        with (
+            _attach_source_db(target_conn, source_db_path) as source_schemas,
+            tqdm(
+                total=len(run_ids),
+                file=sys.stdout,
+                disable=not show_progress_bar,
+                desc="Extracting runs",
+            ) as pbar,
+        ):
+            for batch in batches:
+                with atomic(target_conn) as target_conn:
+                    if target_exp_id is None:
+                        target_exp_id = _create_exp_if_needed(
+                            target_conn,
+                            exp_attrs["name"],
+                            exp_attrs["sample_name"],
+                            exp_attrs["format_string"],
+                            exp_attrs["start_time"],
+                            exp_attrs["end_time"],
+                        )
 
-            # Finally insert the runs
-            for run_id in run_ids:
-                _extract_single_dataset_into_db(
-                    DataSet(run_id=run_id, conn=source_conn), target_conn, target_exp_id
-                )
+                    # Finally insert the runs
+                    for run_id in batch:
+                        _extract_single_dataset_into_db(
+                            DataSet(run_id=run_id, conn=source_conn),
+                            target_conn,
+                            target_exp_id,
+                            source_schemas,
+                        )
+                        pbar.update()
     finally:
         source_conn.close()
         target_conn.close()
 
 
+def extract_runs_into_dbs(
+    source_db_path: str | Path,
+    run_ids_by_target_db: Mapping[str | Path, Sequence[int]],
+    *,
+    upgrade_source_db: bool = False,
+    upgrade_target_db: bool = False,
+    runs_per_transaction: int | None = None,
+    max_workers: int | None = None,
+) -> None:
+    """
+    Extract selections of runs into several other DB files in parallel, one
+    thread per target DB file. Each selection is extracted as by
+    :func:`extract_runs_into_db`, so all runs of a selection must come from
+    the same experiment.
+
+    Args:
+        source_db_path: Path to the source DB file
+        run_ids_by_target_db: The ``run_id``'s of the runs to copy into each
+          target DB file. The target DB files will be created if they do not
+          exist.
+        upgrade_source_db: If the source DB is found to be in a version that is
+          not the newest, should it be upgraded?
+        upgrade_target_db: If a target DB is found to be in a version that is
+          not the newest, should it be upgraded?
+        runs_per_transaction: Number of runs that are copied in one
+          transaction, see :func:`extract_runs_into_db`.
+        max_workers: Maximum number of target DB files that are written to at
+          the same time. If None, the default of
+          :class:`concurrent.futures.ThreadPoolExecutor` is used.
+
+    Raises:
+        The first error that occurred when extracting the runs into one of
+        the target DB files. The other target DB files are written to
+        nonetheless.
+
+    """
+    # upgrade the source DB file once here rather than concurrently in the
+    # threads that extract from it
+    (s_v, new_v) = get_db_version_and_newest_available_version(source_db_path)
+    if s_v < new_v:
+        if not upgrade_source_db:
+            warn(
+                f"Source DB version is {s_v}, but this function needs it to be"
+                f" in version {new_v}. Run this function again with "
+                "upgrade_source_db=True to auto-upgrade the source DB file."
+            )
+            return
+        connect(source_db_path).close()
+
+    with ThreadPoolExecutor(max_workers) as executor:
+        futures = [
+            executor.submit(
+                extract_runs_into_db,
+                source_db_path,
+                target_db_path,
+                *run_ids,
+                upgrade_target_db=upgrade_target_db,
+                runs_per_transaction=runs_per_transaction,
+            )
+            for target_db_path, run_ids in run_ids_by_target_db.items()
+        ]
+        for future in as_completed(futures):
+            future.result()
+
+
+@contextmanager
+def _attach_source_db(
+    target_conn: ConnectionPlus, source_db_path: str | Path
+) -> Iterator[tuple[str, ...]]:
+    """
+    Attach the source DB file and its archive file, if it has one, to the
+    connection to the target DB file and yield the schema names under which
+    their tables can be accessed.
+    """
+    schemas = {_SOURCE_SCHEMA: os.fspath(source_db_path)}
+    source_archive_path = archive_path(source_db_path)
+    if source_archive_path.exists():
+        schemas[_SOURCE_ARCHIVE_SCHEMA] = os.fspath(source_archive_path)
+    for schema, path in schemas.items():
+        target_conn.execute(f"ATTACH DATABASE ? AS {schema}", (path,))
+    try:
+        yield tuple(schemas)
+    finally:
+        for schema in schemas:
+            target_conn.execute(f"DETACH DATABASE {schema}")
+
+
 def _extract_single_dataset_into_db(
-    dataset: DataSet, target_conn: ConnectionPlus, target_exp_id: int
+    dataset: DataSet,
+    target_conn: ConnectionPlus,
+    target_exp_id: int,
+    source_schemas: Sequence[str],
 ) -> None:
     """
     NB: This function should only be called from within
@@ -144,6 +282,8 @@ def _extract_single_dataset_into_db(
         target_conn: connection to the DB. Must be atomically guarded
         target_exp_id: The ``exp_id`` of the (target DB) experiment in which to
           insert the run
+        source_schemas: The schema names under which the source DB file and
+          its archive file are attached to the target connection
 
     """
 
@@ -165,6 +305,18 @@ def _extract_single_dataset_into_db(
         dataset, target_conn, target_exp_id
     )
     assert target_table_name is not None
+    # archived results are copied as they are stored, i.e. compressed
+    source_schema = next(
+        schema
+        for schema in source_schemas
+        if target_conn.execute(
+            f"SELECT 1 FROM {schema}.sqlite_master WHERE type='table' AND name=?",
+            (dataset.table_name,),
+        ).fetchone()
+    )
     _populate_results_table(
-        source_conn, target_conn, dataset.table_name, target_table_name
+        target_conn, source_schema, dataset.table_name, target_table_name
+    )
+    copy_sidecar_files(
+        source_conn.path_to_dbfile, target_conn.path_to_dbfile, dataset.guid
     )
@@ -6,6 +6,7 @@ from typing import TYPE_CHECKING, Any
 from warnings import warn
 
 from qcodes.dataset.data_set import DataSet, load_by_id, new_data_set
+from qcodes.dataset.data_set_info import RunSummary, get_run_summaries
 from qcodes.dataset.experiment_settings import _set_default_experiment_id
 from qcodes.dataset.sqlite.connection import ConnectionPlus, path_to_dbfile
 from qcodes.dataset.sqlite.database import (
@@ -178,6 +179,14 @@ class Experiment(Sized):
             for run_id in get_runs(self.conn, self.exp_id)
         ]
 
+    def run_summaries(self, **kwargs: Any) -> list[RunSummary]:
+        """
+        Get a summary of each run of this experiment with a single query,
+        which is much faster than loading all the datasets of the experiment.
+        The keyword arguments are passed on to :func:`.get_run_summaries`.
+        """
+        return get_run_summaries(self.conn, exp_id=self.exp_id, **kwargs)
+
     def last_data_set(self) -> DataSetProtocol:
         """Get the last dataset of this experiment"""
         run_id = get_last_run(self.conn, self.exp_id)
@@ -193,7 +202,7 @@ class Experiment(Sized):
         finish_experiment(self.conn, self.exp_id)
 
     def __len__(self) -> int:
-        return len(self.data_sets())
+        return len(get_runs(self.conn, self.exp_id))
 
     def __repr__(self) -> str:
         out = [f"{self.name}#{self.sample_name}#{self.exp_id}@{self.path_to_db}"]
@@ -22,6 +22,8 @@ class DataExportType(enum.Enum):
 
     NETCDF = "nc"
     CSV = "csv"
+    PARQUET = "parquet"
+    ARROW = "arrow"
 
 
 def set_data_export_type(export_type: str) -> None:
@@ -29,7 +31,7 @@ def set_data_export_type(export_type: str) -> None:
 
     Args:
         export_type: Export type to use.
-            Currently supported values: netcdf, csv.
+            Currently supported values: netcdf, csv, parquet, arrow.
 
     """
     # disable file export
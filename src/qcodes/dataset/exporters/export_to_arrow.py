@@ -0,0 +1,315 @@
+"""
+Export of datasets to Parquet and Arrow IPC files, and loading of the data
+from such files.
+
+A file holds one table with a column per parameter and a row per result
+of a parameter tree, like the results table in the database. The rows of
+each parameter tree are stored in one row group (one record batch in an
+Arrow IPC file) per chunk of rows that was read from the database, and
+hold null in the columns of parameters that are not part of the tree. If a
+parameter of a tree can not share the column of a parameter of the same
+name in another tree, e.g. since it has been expanded to a different shape,
+its column is named ``{tree}.{parameter}``.
+
+Parameters with array values are stored as (nested) lists with one level
+per dimension. Complex values are stored as 16 byte fixed size binaries
+holding the real and imaginary part as little endian doubles, the same
+format as in the database.
+
+The run attributes, metadata and run description of the dataset, as well as
+which column holds which parameter of each tree, are stored as JSON in the
+metadata of the schema of the table under the key ``qcodes``.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+from qcodes.dataset.export_config import DataExportType
+from qcodes.dataset.sqlite.complex_codec import COMPLEX_DTYPE, COMPLEX_NBYTES
+from qcodes.utils import NumpyJSONEncoder
+
+from ..descriptions.versioning import serialization as serial
+from ..linked_datasets.links import links_to_str
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator, Mapping
+    from pathlib import Path
+
+    import pyarrow as pa
+
+    from qcodes.dataset.data_set_protocol import DataSetProtocol, ParameterData
+
+ARROW_METADATA_KEY = b"qcodes"
+
+
+def dataset_to_arrow_file(
+    dataset: DataSetProtocol,
+    parameter_tree_chunks: Mapping[str, Iterator[Mapping[str, np.ndarray]]],
+    file_path: str | Path,
+    export_type: DataExportType,
+) -> None:
+    """
+    Write the data of a dataset to a Parquet or Arrow IPC file, one chunk of
+    rows of a parameter tree at a time.
+
+    Args:
+        dataset: The dataset to take the run attributes and metadata from.
+        parameter_tree_chunks: Mapping from the name of each parameter tree
+            to an iterator over the chunks of its data, in the format of one
+            parameter tree of :meth:`.DataSetProtocol.get_parameter_data`.
+            Each iterator must yield at least one, possibly empty, chunk.
+        file_path: Path of the file to write.
+        export_type: ``DataExportType.PARQUET`` or ``DataExportType.ARROW``.
+
+    """
+    import pyarrow as pa
+
+    # the first chunk of every tree is converted up front to infer the schema
+    first_chunks = {
+        tree: _chunk_to_arrow(next(chunks))
+        for tree, chunks in parameter_tree_chunks.items()
+    }
+    fields: dict[str, pa.Field] = {}
+    columns: dict[str, dict[str, str]] = {}
+    for tree, arrays in first_chunks.items():
+        columns[tree] = {}
+        for param, array in arrays.items():
+            column = param
+            if param != tree and (
+                param in first_chunks
+                or (param in fields and fields[param].type != array.type)
+            ):
+                column = f"{tree}.{param}"
+            columns[tree][param] = column
+            fields.setdefault(column, pa.field(column, array.type))
+
+    file_metadata = _dataset_file_metadata(dataset)
+    file_metadata["parameter_trees"] = columns
+    schema = pa.schema(
+        list(fields.values()),
+        metadata={ARROW_METADATA_KEY: json.dumps(file_metadata, cls=NumpyJSONEncoder)},
+    )
+
+    with _table_writer(file_path, schema, export_type) as write_table:
+        for tree, chunks in parameter_tree_chunks.items():
+            arrays = first_chunks.pop(tree)
+            while True:
+                table = _chunk_to_table(schema, columns[tree], arrays)
+                if table.num_rows > 0:
+                    write_table(table)
+                chunk = next(chunks, None)
+                if chunk is None:
+                    break
+                arrays = _chunk_to_arrow(chunk)
+
+
+@contextlib.contextmanager
+def _table_writer(
+    file_path: str | Path, schema: pa.Schema, export_type: DataExportType
+) -> Iterator[Callable[[pa.Table], None]]:
+    """
+    Open a Parquet or Arrow IPC file writer and return a function that
+    writes a table as one row group or record batch.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    if export_type == DataExportType.PARQUET:
+        with pq.ParquetWriter(file_path, schema) as parquet_writer:
+            yield lambda table: parquet_writer.write_table(
+                table, row_group_size=table.num_rows
+            )
+    elif export_type == DataExportType.ARROW:
+        with pa.ipc.new_file(file_path, schema) as ipc_writer:
+            yield ipc_writer.write_table
+    else:
+        raise ValueError(f"Can not write a file of export type {export_type}.")
+
+
+def _dataset_file_metadata(dataset: DataSetProtocol) -> dict[str, Any]:
+    return {
+        "ds_name": dataset.name,
+        "sample_name": dataset.sample_name,
+        "exp_name": dataset.exp_name,
+        "snapshot": dataset._snapshot_raw,
+        "guid": dataset.guid,
+        "run_timestamp_raw": dataset.run_timestamp_raw,
+        "completed_timestamp_raw": dataset.completed_timestamp_raw,
+        "captured_run_id": dataset.captured_run_id,
+        "captured_counter": dataset.captured_counter,
+        "run_id": dataset.run_id,
+        "run_description": serial.to_json_for_storage(dataset.description),
+        "parent_dataset_links": links_to_str(dataset.parent_dataset_links),
+        "metadata": dataset.metadata,
+    }
+
+
+def _chunk_to_arrow(chunk: Mapping[str, np.ndarray]) -> dict[str, pa.Array]:
+    return {param: _to_arrow_array(values) for param, values in chunk.items()}
+
+
+def _chunk_to_table(
+    schema: pa.Schema, columns: Mapping[str, str], arrays: Mapping[str, pa.Array]
+) -> pa.Table:
+    import pyarrow as pa
+
+    arrays_by_column = {columns[param]: array for param, array in arrays.items()}
+    n_rows = len(next(iter(arrays.values()))) if arrays else 0
+    return pa.Table.from_arrays(
+        [
+            arrays_by_column[field.name].cast(field.type)
+            if field.name in arrays_by_column
+            else pa.nulls(n_rows, field.type)
+            for field in schema
+        ],
+        schema=schema,
+    )
+
+
+def _to_arrow_array(values: np.ndarray) -> pa.Array:
+    """
+    Convert the values of a parameter, one row per result, into an arrow
+    array with a (nested) list per row for rows that are arrays. Rows of
+    different shapes, as in an array of dtype object, are supported as long
+    as they have the same number of dimensions.
+    """
+    import pyarrow as pa
+
+    if values.dtype.hasobject and len(values) > 0:
+        rows = [np.asarray(row) for row in values]
+        if len({row.ndim for row in rows}) > 1:
+            raise ValueError(
+                "Can not export values with different numbers of dimensions."
+            )
+        shapes = np.array([row.shape for row in rows], dtype=np.int64)
+        shapes = shapes.reshape(len(rows), rows[0].ndim)
+        flat_values = np.concatenate([row.ravel() for row in rows])
+    else:
+        shapes = np.tile(np.array(values.shape[1:], dtype=np.int64), (len(values), 1))
+        flat_values = values.ravel()
+
+    array = _flat_values_to_arrow(flat_values)
+    for level in reversed(range(shapes.shape[1])):
+        # each row holds the product of the lengths of the outer levels
+        # lists of the length of this level
+        list_lengths = np.repeat(
+            shapes[:, level], np.prod(shapes[:, :level], axis=1, dtype=np.int64)
+        )
+        offsets = np.concatenate([[0], np.cumsum(list_lengths)])
+        array = pa.LargeListArray.from_arrays(pa.array(offsets, pa.int64()), array)
+    return array
+
+
+def _flat_values_to_arrow(values: np.ndarray) -> pa.Array:
+    import pyarrow as pa
+
+    if values.dtype.kind == "c":
+        data = np.ascontiguousarray(values, dtype=COMPLEX_DTYPE)
+        return pa.FixedSizeBinaryArray.from_buffers(
+            pa.binary(COMPLEX_NBYTES), len(data), [None, pa.py_buffer(data)]
+        )
+    if values.dtype.kind in "OU":
+        return pa.array(values.astype(str))
+    return pa.array(values)
+
+
+def _from_arrow_array(array: pa.Array) -> np.ndarray:
+    """
+    Convert an arrow array written by :func:`_to_arrow_array` back into the
+    values of a parameter. Rows of different shapes are returned as an
+    array of dtype object holding one array per row.
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    if pa.types.is_large_list(array.type):
+        lengths = pc.list_value_length(array).to_numpy(zero_copy_only=False)
+        values = _from_arrow_array(array.flatten())
+        if (
+            values.dtype != object
+            and len(lengths) > 0
+            and (lengths == lengths[0]).all()
+        ):
+            return values.reshape(len(array), int(lengths[0]), *values.shape[1:])
+        rows = np.empty(len(array), dtype=object)
+        for i, row in enumerate(np.split(values, np.cumsum(lengths)[:-1])):
+            rows[i] = row
+        return rows
+    if pa.types.is_fixed_size_binary(array.type):
+        return np.frombuffer(
+            array.buffers()[1],
+            dtype=COMPLEX_DTYPE,
+            count=len(array),
+            offset=array.offset * COMPLEX_NBYTES,
+        )
+    if pa.types.is_string(array.type):
+        return array.to_numpy(zero_copy_only=False).astype(str)
+    return array.to_numpy(zero_copy_only=False)
+
+
+def _read_schema(file_path: str | Path, export_type: DataExportType) -> pa.Schema:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    if export_type == DataExportType.PARQUET:
+        return pq.read_schema(file_path)
+    elif export_type == DataExportType.ARROW:
+        with pa.memory_map(str(file_path)) as source:
+            return pa.ipc.open_file(source).schema
+    raise ValueError(f"Can not read a file of export type {export_type}.")
+
+
+def _read_table(file_path: str | Path, export_type: DataExportType) -> pa.Table:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    if export_type == DataExportType.PARQUET:
+        return pq.read_table(file_path)
+    elif export_type == DataExportType.ARROW:
+        with pa.memory_map(str(file_path)) as source:
+            return pa.ipc.open_file(source).read_all()
+    raise ValueError(f"Can not read a file of export type {export_type}.")
+
+
+def load_arrow_file_metadata(
+    file_path: str | Path, export_type: DataExportType
+) -> dict[str, Any]:
+    """
+    Load the run attributes, metadata and run description of the dataset
+    stored in a Parquet or Arrow IPC file written by
+    :func:`dataset_to_arrow_file`.
+    """
+    schema = _read_schema(file_path, export_type)
+    if schema.metadata is None or ARROW_METADATA_KEY not in schema.metadata:
+        raise ValueError(f"{file_path} does not hold a QCoDeS dataset.")
+    return json.loads(schema.metadata[ARROW_METADATA_KEY])
+
+
+def load_parameter_data_from_arrow_file(
+    file_path: str | Path, export_type: DataExportType
+) -> ParameterData:
+    """
+    Load the data stored in a Parquet or Arrow IPC file written by
+    :func:`dataset_to_arrow_file` in the format of
+    :meth:`.DataSetProtocol.get_parameter_data` of a dataset without shapes.
+    """
+    import pyarrow.compute as pc
+
+    parameter_trees = load_arrow_file_metadata(file_path, export_type)[
+        "parameter_trees"
+    ]
+    table = _read_table(file_path, export_type)
+    data: ParameterData = {}
+    for tree, columns in parameter_trees.items():
+        tree_table = table.select(list(columns.values()))
+        tree_table = tree_table.filter(pc.is_valid(tree_table[columns[tree]]))
+        data[tree] = {
+            param: _from_arrow_array(tree_table[column].combine_chunks())
+            for param, column in columns.items()
+        }
+    return data
@@ -2,10 +2,21 @@ from __future__ import annotations
 
 import logging
 import warnings
+from bisect import bisect_right, insort
+from collections import Counter
 from math import prod
 from typing import TYPE_CHECKING, Literal, cast
 
+import numpy as np
+
 from qcodes.dataset.linked_datasets.links import links_to_str
+from qcodes.dataset.sqlite.connection_manager import get_connection_manager
+from qcodes.dataset.sqlite.queries import (
+    get_parameter_data_for_one_paramtree,
+    get_parameter_tree_id_range,
+    get_parameter_tree_row_id,
+    get_parameter_tree_values,
+)
 
 from ..descriptions.versioning import serialization as serial
 from .export_to_pandas import (
@@ -15,14 +26,17 @@ from .export_to_pandas import (
 )
 
 if TYPE_CHECKING:
-    from collections.abc import Hashable, Mapping
+    from collections.abc import Hashable, Mapping, Sequence
     from pathlib import Path
 
-    import numpy as np
+    import h5netcdf
     import pandas as pd
     import xarray as xr
 
+    from qcodes.dataset.data_set import DataSet
     from qcodes.dataset.data_set_protocol import DataSetProtocol, ParameterData
+    from qcodes.dataset.descriptions.rundescriber import RunDescriber
+    from qcodes.dataset.sqlite.connection import ConnectionPlus
 
 _LOG = logging.getLogger(__name__)
 
@@ -76,6 +90,12 @@ def _load_to_xarray_dataarray_dict_no_metadata(
     data_xrdarray_dict: dict[str, xr.DataArray] = {}
 
     for name, subdict in datadict.items():
+        if use_multi_index != "always":
+            grid_xrdarray = _load_grid_to_xarray_dataarray(dataset, name, subdict)
+            if grid_xrdarray is not None:
+                data_xrdarray_dict[name] = grid_xrdarray
+                continue
+
         index = _generate_pandas_index(subdict)
 
         if index is None:
@@ -129,6 +149,83 @@ def _load_to_xarray_dataarray_dict_no_metadata(
     return data_xrdarray_dict
 
 
+def _load_grid_to_xarray_dataarray(
+    dataset: DataSetProtocol, name: str, subdict: Mapping[str, np.ndarray]
+) -> xr.DataArray | None:
+    """
+    Build the data array of a parameter tree with a shape in the run
+    description straight from the axes of its grid, rather than from a
+    pandas index over all points. The points may be the first points of
+    the grid in the order of the shape, in which case only the part of the
+    grid that holds points is exported and the missing points are filled
+    with NaN, like the index of the measured setpoints would do.
+
+    Returns None if the data is not on the grid given by the shape, e.g.
+    since the setpoints do not change along the dimensions of the shape.
+    """
+    import xarray as xr
+
+    shapes = dataset.description.shapes
+    if shapes is None or name not in shapes:
+        return None
+    shape = tuple(int(s) for s in shapes[name])
+    setpoints = list(subdict)[1:]
+    n_points = subdict[name].size
+    if (
+        len(setpoints) != len(shape)
+        or n_points == 0
+        or n_points > prod(shape)
+        or subdict[name].dtype.hasobject
+        or any(subdict[param].size != n_points for param in setpoints)
+        or any(subdict[param].dtype.kind not in "biuf" for param in setpoints)
+    ):
+        return None
+    if n_points < prod(shape) and subdict[name].dtype.kind not in "fc":
+        # the missing points can not be filled with NaN
+        return None
+
+    strides = [prod(shape[axis + 1 :]) for axis in range(len(shape))]
+    # only the outermost dimensions that hold points are partially filled
+    grid_shape = tuple(
+        min(length, -(-n_points // stride)) for length, stride in zip(shape, strides)
+    )
+    coords: dict[str, np.ndarray] = {}
+    for axis, param in enumerate(setpoints):
+        values = subdict[param].ravel()
+        axis_values = values[np.arange(grid_shape[axis]) * strides[axis]]
+        if np.isnan(axis_values).any() or len(np.unique(axis_values)) != len(
+            axis_values
+        ):
+            return None
+        expected = np.broadcast_to(
+            axis_values.reshape([-1 if i == axis else 1 for i in range(len(shape))]),
+            grid_shape,
+        )
+        if n_points == prod(grid_shape):
+            on_grid = np.array_equal(values.reshape(grid_shape), expected)
+        else:
+            on_grid = np.array_equal(values, expected.reshape(-1)[:n_points])
+        if not on_grid:
+            return None
+        coords[param] = axis_values
+
+    data = subdict[name].ravel()
+    if n_points < prod(grid_shape):
+        data = np.concatenate(
+            [data, np.full(prod(grid_shape) - n_points, np.nan, dtype=data.dtype)]
+        )
+    xrdarray = xr.DataArray(
+        data.reshape(grid_shape), coords=coords, dims=setpoints, name=name
+    )
+    # the index of the measured setpoints is sorted along each dimension
+    unsorted_dims = [
+        param for param in setpoints if not (np.diff(coords[param]) > 0).all()
+    ]
+    if unsorted_dims:
+        xrdarray = xrdarray.sortby(unsorted_dims)
+    return xrdarray
+
+
 def load_to_xarray_dataarray_dict(
     dataset: DataSetProtocol,
     datadict: Mapping[str, Mapping[str, np.ndarray]],
@@ -236,8 +333,381 @@ def _paramspec_dict_with_extras(
     return paramspec_dict
 
 
+def load_to_xarray_dataarray_dict_lazy(
+    dataset: DataSet,
+    trees: Sequence[str],
+    *,
+    start: int | None = None,
+    end: int | None = None,
+) -> dict[str, xr.DataArray]:
+    """
+    Build a :py:class:`xr.DataArray` for each of the given parameter trees of
+    a dataset, backed by dask arrays whose chunks are only loaded from the
+    database when they are computed.
+
+    A tree with a shape in the run description whose data is complete is
+    laid out on its grid, like the eagerly loaded data, with a chunk per
+    hyperslab of consecutive rows along the first dimension. The grid is
+    taken from the shape rather than from the setpoints, and only the
+    setpoints of the first point along each dimension are read up front to
+    form the coordinates. Other trees are indexed by the position of the
+    result along a dimension named ``{tree}_index``, with their setpoints
+    as coordinates along it, and a chunk per range of rows of the results
+    table.
+
+    The size of the chunks follows the ``array.chunk-size`` setting of dask.
+    Each chunk is loaded with a read-only connection lent by the manager of
+    :func:`.get_connection_manager`, such that it can be computed in any
+    thread.
+    """
+    dataarrays = _load_to_xarray_dataarray_dict_lazy_no_metadata(
+        dataset, trees, start=start, end=end
+    )
+    for dataname, dataarray in dataarrays.items():
+        _add_param_spec_to_xarray_coords(dataset, dataarray)
+        paramspec_dict = _paramspec_dict_with_extras(dataset, str(dataname))
+        dataarray.attrs.update(paramspec_dict.items())
+        _add_metadata_to_xarray(dataset, dataarray)
+
+    return dataarrays
+
+
+def load_to_xarray_dataset_lazy(
+    dataset: DataSet,
+    trees: Sequence[str],
+    *,
+    start: int | None = None,
+    end: int | None = None,
+) -> xr.Dataset:
+    """
+    Build a :py:class:`xr.Dataset` of the given parameter trees of a dataset
+    backed by dask arrays, see :func:`load_to_xarray_dataarray_dict_lazy`.
+    The setpoints of a tree that is indexed by the position of the result
+    are named ``{tree}_{setpoint}`` if another tree has a coordinate of the
+    same name, which they would otherwise conflict with.
+    """
+    import xarray as xr
+
+    dataarrays = _load_to_xarray_dataarray_dict_lazy_no_metadata(
+        dataset, trees, start=start, end=end
+    )
+    coord_counts = Counter(
+        str(coord) for dataarray in dataarrays.values() for coord in dataarray.coords
+    )
+    for tree, dataarray in dataarrays.items():
+        _add_param_spec_to_xarray_coords(dataset, dataarray)
+        dataarrays[tree] = dataarray.rename(
+            {
+                coord: f"{tree}_{coord}"
+                for coord in dataarray.coords
+                if coord not in dataarray.dims and coord_counts[str(coord)] > 1
+            }
+        )
+
+    # Casting Hashable for the key type until python/mypy#1114
+    # and python/typing#445 are resolved.
+    xrdataset = xr.Dataset(cast("dict[Hashable, xr.DataArray]", dataarrays))
+
+    _add_param_spec_to_xarray_data_vars(dataset, xrdataset)
+    _add_metadata_to_xarray(dataset, xrdataset)
+
+    return xrdataset
+
+
+def _load_to_xarray_dataarray_dict_lazy_no_metadata(
+    dataset: DataSet,
+    trees: Sequence[str],
+    *,
+    start: int | None = None,
+    end: int | None = None,
+) -> dict[str, xr.DataArray]:
+    if not dataset.path_to_db:
+        raise ValueError("Only datasets in a database file can be loaded lazily.")
+
+    return {
+        tree: _lazy_parameter_tree_dataarray(dataset, tree, start, end)
+        for tree in trees
+    }
+
+
+def _lazy_parameter_tree_dataarray(
+    dataset: DataSet, tree: str, start: int | None, end: int | None
+) -> xr.DataArray:
+    import dask
+    import dask.array as da
+    import xarray as xr
+    from dask.base import tokenize
+    from dask.utils import parse_bytes
+
+    interdeps = dataset.description.interdeps
+    setpoints = [
+        spec.name
+        for spec in interdeps.dependencies.get(interdeps._id_to_paramspec[tree], ())
+    ]
+    row_ids = _ParameterTreeRowIds(
+        dataset.conn, dataset.table_name, tree, start=start, end=end
+    )
+    if row_ids.n_rows == 0:
+        empty_data, _ = get_parameter_data_for_one_paramtree(
+            dataset.conn, dataset.table_name, dataset.description, tree, 1, 0
+        )
+        dataarrays = _load_to_xarray_dataarray_dict_no_metadata(
+            dataset, {tree: empty_data}
+        )
+        return dataarrays[tree]
+
+    # the first row tells the dtypes and the shape of the values of a row
+    first_row, _ = get_parameter_data_for_one_paramtree(
+        dataset.conn,
+        dataset.table_name,
+        dataset.description,
+        tree,
+        None,
+        None,
+        after_id=row_ids[0] - 1,
+        until_id=row_ids[0],
+    )
+    # strings are loaded as objects since the first row does not tell the
+    # length of the longest string
+    dtypes = {
+        param: values.dtype if values.dtype.kind != "U" else np.dtype(object)
+        for param, values in first_row.items()
+    }
+    row_shape = first_row[tree].shape[1:]
+    row_size = prod(row_shape)
+    n_rows = row_ids.n_rows
+    row_nbytes = sum(values.nbytes for values in first_row.values())
+    rows_per_chunk = max(
+        parse_bytes(dask.config.get("array.chunk-size")) // max(row_nbytes, 1), 1
+    )
+
+    grid_shape = _complete_grid_shape(dataset, tree, len(setpoints), n_rows * row_size)
+    coords: dict[str, np.ndarray] | None = None
+    if grid_shape is not None:
+        coords = _grid_coordinates(
+            dataset, setpoints, row_ids, grid_shape, row_size, first_row
+        )
+    if grid_shape is not None and coords is not None:
+        slab_size = prod(grid_shape[1:])
+        if slab_size % row_size == 0:
+            rows_per_slab = slab_size // row_size
+            rows_per_chunk = max(rows_per_chunk // rows_per_slab, 1) * rows_per_slab
+        else:
+            # a row holds more than one hyperslab
+            rows_per_chunk = n_rows
+        params = [tree]
+    else:
+        grid_shape = None
+        params = [tree, *setpoints]
+
+    load_rows = dask.delayed(_load_parameter_tree_rows, pure=True)
+    chunks: dict[str, list[da.Array]] = {param: [] for param in params}
+    for chunk_start in range(0, n_rows, rows_per_chunk):
+        chunk_end = min(chunk_start + rows_per_chunk, n_rows)
+        after_id = row_ids[chunk_start] - 1
+        until_id = row_ids[chunk_end - 1]
+        if grid_shape is not None:
+            chunk_shape = (
+                (chunk_end - chunk_start) * row_size // prod(grid_shape[1:]),
+                *grid_shape[1:],
+            )
+        else:
+            chunk_shape = (chunk_end - chunk_start, *row_shape)
+        rows = load_rows(
+            dataset.path_to_db,
+            dataset.table_name,
+            dataset.description,
+            tree,
+            after_id,
+            until_id,
+            {param: dtypes[param] for param in params},
+            chunk_shape,
+            dask_key_name=(
+                f"load-{tree}-{tokenize(dataset.guid, tree, after_id, until_id)}"
+            ),
+        )
+        for param in params:
+            chunks[param].append(
+                da.from_delayed(rows[param], shape=chunk_shape, dtype=dtypes[param])
+            )
+    arrays = {param: da.concatenate(chunks[param], axis=0) for param in params}
+
+    if grid_shape is not None and coords is not None:
+        xrdarray = xr.DataArray(
+            arrays[tree],
+            coords={setpoint: coords[setpoint] for setpoint in setpoints},
+            dims=setpoints,
+            name=tree,
+        )
+        # the eagerly loaded data is sorted along each dimension
+        unsorted_dims = [
+            setpoint
+            for setpoint in setpoints
+            if not (coords[setpoint][:-1] < coords[setpoint][1:]).all()
+        ]
+        if unsorted_dims:
+            xrdarray = xrdarray.sortby(unsorted_dims)
+        return xrdarray
+
+    dims = (
+        f"{tree}_index",
+        *(f"{tree}_dim_{axis}" for axis in range(1, len(row_shape) + 1)),
+    )
+    return xr.DataArray(
+        arrays[tree],
+        coords={setpoint: (dims, arrays[setpoint]) for setpoint in setpoints},
+        dims=dims,
+        name=tree,
+    )
+
+
+class _ParameterTreeRowIds:
+    """
+    The ids of the rows of a parameter tree, from the ``start``-th to the
+    ``end``-th (1-indexed), by their position, without loading all of them.
+    If the tree has a value in every row from its first to its last one,
+    which is the common case, the ids follow from the first id. Otherwise
+    each id is looked up stepping from the closest id before it that has
+    been looked up already, so looking up ascending positions steps over
+    every row only once.
+    """
+
+    def __init__(
+        self,
+        conn: ConnectionPlus,
+        table_name: str,
+        tree: str,
+        *,
+        start: int | None,
+        end: int | None,
+    ):
+        self._conn = conn
+        self._table_name = table_name
+        self._tree = tree
+        count, min_id, max_id = get_parameter_tree_id_range(conn, table_name, tree)
+        offset = max(start - 1, 0) if start is not None else 0
+        stop = count if end is None else min(max(end, 0), count)
+        self.n_rows = max(stop - offset, 0)
+        self._offset = offset
+        self._dense = max_id - min_id + 1 == count
+        self._min_id = min_id
+        # the positions in the table, counted from 0, and the ids of the
+        # rows looked up so far
+        self._positions: list[int] = [-1]
+        self._ids: dict[int, int] = {-1: 0}
+
+    def __getitem__(self, position: int) -> int:
+        if not 0 <= position < self.n_rows:
+            raise IndexError(f"No row at position {position}.")
+        table_position = self._offset + position
+        if self._dense:
+            return self._min_id + table_position
+        if table_position in self._ids:
+            return self._ids[table_position]
+        previous = self._positions[bisect_right(self._positions, table_position) - 1]
+        row_id = get_parameter_tree_row_id(
+            self._conn,
+            self._table_name,
+            self._tree,
+            table_position - previous - 1,
+            after_id=self._ids[previous],
+        )
+        assert row_id is not None
+        insort(self._positions, table_position)
+        self._ids[table_position] = row_id
+        return row_id
+
+
+def _complete_grid_shape(
+    dataset: DataSet, tree: str, n_setpoints: int, n_points: int
+) -> tuple[int, ...] | None:
+    """
+    Return the shape of a parameter tree from the run description if its
+    data is complete and it has a dimension per setpoint.
+    """
+    shapes = dataset.description.shapes
+    if shapes is None or tree not in shapes:
+        return None
+    shape = tuple(int(s) for s in shapes[tree])
+    if len(shape) != n_setpoints or prod(shape) != n_points:
+        return None
+    return shape
+
+
+def _grid_coordinates(
+    dataset: DataSet,
+    setpoints: Sequence[str],
+    row_ids: _ParameterTreeRowIds,
+    shape: tuple[int, ...],
+    row_size: int,
+    first_row: Mapping[str, np.ndarray],
+) -> dict[str, np.ndarray] | None:
+    """
+    Read the values of each setpoint along its dimension of the grid, at the
+    first point along all other dimensions. Returns None if the values along
+    a dimension are not unique, in which case the data is not on the grid.
+    """
+    coords: dict[str, np.ndarray] = {}
+    for axis, setpoint in enumerate(setpoints):
+        positions = np.arange(shape[axis]) * prod(shape[axis + 1 :])
+        rows, elements = np.divmod(positions, row_size)
+        row_values = {}
+        for row in np.unique(rows):
+            ((value,),) = get_parameter_tree_values(
+                dataset.conn,
+                dataset.table_name,
+                setpoint,
+                after_id=row_ids[int(row)] - 1,
+                until_id=row_ids[int(row)],
+            )
+            row_values[row] = np.ravel(value)
+        values = np.asarray(
+            [
+                row_values[row][element if row_values[row].size > 1 else 0]
+                for row, element in zip(rows, elements)
+            ]
+        )
+        if first_row[setpoint].dtype.kind in "biufc":
+            values = values.astype(first_row[setpoint].dtype)
+        if len(np.unique(values)) != len(values):
+            return None
+        coords[setpoint] = values
+    return coords
+
+
+def _load_parameter_tree_rows(
+    path_to_db: str,
+    table_name: str,
+    rundescriber: RunDescriber,
+    tree: str,
+    after_id: int,
+    until_id: int,
+    dtypes: Mapping[str, np.dtype],
+    shape: tuple[int, ...],
+) -> dict[str, np.ndarray]:
+    with get_connection_manager().read_only_connection(path_to_db) as conn:
+        data, _ = get_parameter_data_for_one_paramtree(
+            conn,
+            table_name,
+            rundescriber,
+            tree,
+            None,
+            None,
+            after_id=after_id,
+            until_id=until_id,
+        )
+    return {
+        param: np.asarray(data[param], dtype=dtype).reshape(shape)
+        for param, dtype in dtypes.items()
+    }
+
+
 def xarray_to_h5netcdf_with_complex_numbers(
-    xarray_dataset: xr.Dataset, file_path: str | Path, compute: bool = True
+    xarray_dataset: xr.Dataset,
+    file_path: str | Path,
+    compute: bool = True,
+    *,
+    unlimited_dims: Sequence[str] | None = None,
 ) -> None:
     import cf_xarray as cfxr
     from pandas import MultiIndex
@@ -277,6 +747,7 @@ def xarray_to_h5netcdf_with_complex_numbers(
             engine="h5netcdf",
             invalid_netcdf=allow_invalid_netcdf,
             compute=compute,
+            unlimited_dims=unlimited_dims,
         )
         if not compute and maybe_write_job is not None:
             # Dask and therefor tqdm.dask is slow to
@@ -290,3 +761,247 @@ def xarray_to_h5netcdf_with_complex_numbers(
                     extra={"file_name": file_path},
                 )
                 maybe_write_job.compute()
+
+
+class _NotStreamableError(Exception):
+    """
+    Raised if the data of a dataset can not be appended chunk by chunk to a
+    netcdf file along a single dimension.
+    """
+
+
+def _stream_to_h5netcdf(
+    dataset: DataSet, file_path: str | Path, rows_per_chunk: int
+) -> None:
+    """
+    Export a dataset to a netcdf file without loading all of its data at
+    once. Chunks of about ``rows_per_chunk`` rows are loaded from the
+    database by the range of their ids, converted with
+    :func:`load_to_xarray_dataset` and appended to the file along the
+    outermost setpoint dimension, which is written as an unlimited
+    dimension. A chunk is extended or shortened such that it ends with a
+    complete slice along that dimension. The data in the file is the same as
+    if the whole dataset was exported with
+    :func:`xarray_to_h5netcdf_with_complex_numbers`.
+
+    Before anything is written, the values of the outermost setpoint are
+    read chunk by chunk to check that they do not decrease, i.e. that it is
+    the slowest axis of the sweep, such that the slices along it can be
+    appended.
+
+    Raises:
+        _NotStreamableError: If the data can not be appended along a single
+            dimension, e.g. since it is not on a grid, the outermost setpoint
+            is not increasing or a parameter is not numeric. The file may have
+            been partially written in that case if the data turns out not to
+            be on a grid after the first chunk.
+
+    """
+    import h5netcdf
+    from tqdm.auto import tqdm
+
+    trees = [param.name for param in dataset.description.interdeps.non_dependencies]
+    if len(trees) == 0:
+        raise _NotStreamableError("The dataset holds no parameter trees.")
+    dim = _outer_setpoint(dataset, trees)
+    _check_outer_setpoint_increasing(dataset, dim, rows_per_chunk)
+
+    n_rows = len(dataset)
+    first_chunk: xr.Dataset | None = None
+    file: h5netcdf.File | None = None
+    after_id: int | None = 0 if n_rows > 0 else None
+    try:
+        with tqdm(total=n_rows, desc="Writing chunks to netcdf file") as progress:
+            while after_id is not None:
+                data, n_loaded, after_id = _load_rows_of_complete_slices(
+                    dataset, trees, dim, after_id, rows_per_chunk
+                )
+                chunk = load_to_xarray_dataset(dataset, data)
+                if first_chunk is None:
+                    _check_chunk_appendable(chunk, dim)
+                    xarray_to_h5netcdf_with_complex_numbers(
+                        chunk, file_path, unlimited_dims=[dim]
+                    )
+                    first_chunk = chunk
+                    file = h5netcdf.File(file_path, "a")
+                else:
+                    assert file is not None
+                    _check_chunk_appendable(chunk, dim, first_chunk, file)
+                    _append_chunk(file, chunk, dim)
+                progress.update(n_loaded)
+    finally:
+        if file is not None:
+            with warnings.catch_warnings():
+                warnings.filterwarnings(
+                    "ignore",
+                    module="h5netcdf",
+                    message="You are writing invalid netcdf features",
+                    category=UserWarning,
+                )
+                file.close()
+
+
+def _outer_setpoint(dataset: DataSet, trees: Sequence[str]) -> str:
+    # the dimensions of the exported data are the setpoints in order
+    interdeps = dataset.description.interdeps
+    outer_setpoints = {
+        next(
+            (
+                setpoint.name
+                for setpoint in interdeps.dependencies.get(
+                    interdeps._id_to_paramspec[tree], ()
+                )
+            ),
+            None,
+        )
+        for tree in trees
+    }
+    if len(outer_setpoints) != 1 or None in outer_setpoints:
+        raise _NotStreamableError(
+            "The parameter trees of the dataset do not share an outermost setpoint."
+        )
+    return cast("str", outer_setpoints.pop())
+
+
+def _check_outer_setpoint_increasing(
+    dataset: DataSet, dim: str, rows_per_chunk: int
+) -> None:
+    """
+    Read the values of the outermost setpoint in chunks of rows by the range
+    of their ids and check that they do not decrease from row to row, which
+    is the case if the setpoint is swept slowest.
+    """
+    after_id: int | None = 0
+    last_value: float | None = None
+    while after_id is not None:
+        until_id = get_parameter_tree_row_id(
+            dataset.conn, dataset.table_name, dim, rows_per_chunk - 1, after_id=after_id
+        )
+        rows = get_parameter_tree_values(
+            dataset.conn,
+            dataset.table_name,
+            dim,
+            after_id=after_id,
+            until_id=until_id,
+        )
+        after_id = until_id
+        if len(rows) == 0:
+            continue
+        values = np.concatenate([np.ravel(value) for (value,) in rows])
+        if values.dtype.kind not in "biuf":
+            raise _NotStreamableError(f"{dim} does not hold real numeric values.")
+        if last_value is not None:
+            values = np.concatenate([[last_value], values])
+        if (np.diff(values) < 0).any():
+            raise _NotStreamableError(
+                f"The values of {dim} are not increasing, it is not the "
+                "slowest axis of the sweep."
+            )
+        last_value = values[-1]
+
+
+def _load_rows_of_complete_slices(
+    dataset: DataSet,
+    trees: Sequence[str],
+    dim: str,
+    after_id: int,
+    n_rows: int,
+) -> tuple[ParameterData, int, int | None]:
+    """
+    Load ``n_rows`` rows after the row with id ``after_id`` leaving out the
+    rows at the end that belong to the same slice along ``dim`` as the last
+    row, unless that is the last row of the dataset. If all rows belong to
+    one slice, more rows are loaded until the slice is complete.
+
+    Returns:
+        The data of the rows, the number of rows in it and the id of the last
+        row in it, which is None if it is the last row of the dataset.
+
+    """
+    conn, table_name = dataset.conn, dataset.table_name
+    while True:
+        until_id = get_parameter_tree_row_id(
+            conn, table_name, trees[0], n_rows - 1, after_id=after_id
+        )
+        data: dict[str, dict[str, np.ndarray]] = {}
+        n_loaded = 0
+        for tree in trees:
+            data[tree], n_loaded_of_tree = get_parameter_data_for_one_paramtree(
+                conn,
+                table_name,
+                dataset.description,
+                tree,
+                None,
+                None,
+                after_id=after_id,
+                until_id=until_id,
+            )
+            if tree == trees[0]:
+                n_loaded = n_loaded_of_tree
+            if n_loaded_of_tree != n_loaded or any(
+                len(values) != n_loaded or values.dtype.hasobject
+                for values in data[tree].values()
+            ):
+                raise _NotStreamableError(
+                    "The rows of the dataset do not hold a value of every "
+                    "parameter of a fixed shape."
+                )
+        if until_id is None:
+            return data, n_loaded, None
+
+        rows = data[trees[0]][dim].reshape(n_loaded, -1)
+        in_last_slice = np.isin(rows, rows[-1]).any(axis=1)
+        n_complete = n_loaded - int(np.argmin(in_last_slice[::-1]))
+        if not in_last_slice.all():
+            last_id = get_parameter_tree_row_id(
+                conn, table_name, trees[0], n_complete - 1, after_id=after_id
+            )
+            return (
+                {
+                    name: {param: values[:n_complete] for param, values in tree.items()}
+                    for name, tree in data.items()
+                },
+                n_complete,
+                last_id,
+            )
+        n_rows += n_loaded
+
+
+def _check_chunk_appendable(
+    chunk: xr.Dataset,
+    dim: str,
+    first_chunk: xr.Dataset | None = None,
+    file: h5netcdf.File | None = None,
+) -> None:
+    if dim not in chunk.dims:
+        raise _NotStreamableError(f"The data is not on a grid along {dim}.")
+    for name, variable in chunk.variables.items():
+        if variable.dtype.kind not in "biufc":
+            raise _NotStreamableError(f"{name} does not hold numeric values.")
+        if dim in variable.dims and variable.dims[0] != dim:
+            raise _NotStreamableError(f"{dim} is not the first dimension of {name}.")
+    if first_chunk is None or file is None:
+        return
+
+    if set(chunk.variables) != set(first_chunk.variables):
+        raise _NotStreamableError("The chunks of the data hold different variables.")
+    for name, variable in chunk.variables.items():
+        first_variable = first_chunk.variables[name]
+        if (
+            variable.dims != first_variable.dims
+            or variable.dtype != first_variable.dtype
+        ):
+            raise _NotStreamableError(f"The chunks of {name} are not compatible.")
+        if dim not in variable.dims and not variable.equals(first_variable):
+            raise _NotStreamableError(f"The chunks of the data differ in {name}.")
+    if chunk[dim].values[0] <= file.variables[dim][-1]:
+        raise _NotStreamableError(f"The values of {dim} are not increasing.")
+
+
+def _append_chunk(file: h5netcdf.File, chunk: xr.Dataset, dim: str) -> None:
+    size = file.dimensions[dim].size
+    new_size = size + chunk.sizes[dim]
+    file.resize_dimension(dim, new_size)
+    for name, variable in chunk.variables.items():
+        if dim in variable.dims:
+            file.variables[name][size:new_size] = variable.values
@@ -6,7 +6,7 @@ from pathlib import Path
 from sqlite3 import DatabaseError
 from typing import TYPE_CHECKING, cast
 
-from qcodes.dataset.data_set import get_guids_by_run_spec
+from qcodes.dataset.data_set_info import get_run_summaries
 from qcodes.dataset.guids import validate_guid_format
 from qcodes.dataset.sqlite.database import connect
 
@@ -33,7 +33,9 @@ def guids_from_dbs(
         conn = None
         try:
             conn = connect(str(p))
-            dbdict[p] = get_guids_by_run_spec(conn=conn)
+            dbdict[p] = [
+                summary.guid for summary in get_run_summaries(conn, columns=())
+            ]
         except (RuntimeError, DatabaseError) as e:
             print(e)
         finally:
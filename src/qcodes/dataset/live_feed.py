@@ -0,0 +1,410 @@
+"""
+This module provides a live feed of the data of a running measurement to
+other processes, e.g. for plotting, through shared memory rather than the
+database file.
+
+A :class:`LiveFeedPublisher` writes every chunk of data added to the cache
+of a dataset into a ring buffer in a :class:`multiprocessing.shared_memory.SharedMemory`
+block. A :class:`LiveFeedReader` attached to that block by name in another
+process reads the chunks written since it last read and appends them to
+its own copy of the data.
+
+The block starts with a header holding a magic string, the capacity of the
+ring buffer, the total number of bytes written so far, a flag that is set
+once the publisher is closed, the number of bytes written once the write in
+progress is done, the position of the oldest record that has not been
+overwritten, and the GUID of the dataset. The ring buffer holds one record
+per parameter tree and chunk with a small header of the tree name and, for
+each parameter, its name, dtype and shape, followed by the data. A record
+never wraps around the end of the ring buffer; if it does not fit, a record
+length of zero marks that the next record starts at the beginning.
+
+Like a seqlock, the publisher announces how far a write will reach before
+it touches the ring buffer, and updates the number of bytes written only
+once the write is complete. The reader copies the records up to the number
+of bytes written and checks afterwards against the announced end of the
+latest write that they have not been overwritten in the meantime, even
+partially. A reader that attaches after the ring buffer has wrapped around
+starts at the oldest record that has not been overwritten.
+"""
+
+from __future__ import annotations
+
+import logging
+import struct
+import sys
+import time
+from collections import deque
+from multiprocessing import resource_tracker, shared_memory
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from qcodes.dataset.data_set_cache import _append_to_buffer
+from qcodes.dataset.sqlite.array_header import pack_array_header, unpack_array_header
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+    from types import TracebackType
+
+    from qcodes.dataset.data_set_protocol import DataSetProtocol, ParameterData
+
+log = logging.getLogger(__name__)
+
+LIVE_FEED_MAGIC = b"QCLIVE01"
+LIVE_FEED_ARRAY_MAGIC = b"\x93QCLIVE"
+DEFAULT_LIVE_FEED_SIZE = 64 * 1024**2
+
+# magic, capacity, bytes written, completed, bytes written once the write in
+# progress is done, position of the oldest record, guid
+_HEADER = struct.Struct("<8sQQ?7xQQ36s")
+_WRITTEN_OFFSET = 16
+_COMPLETED_OFFSET = 24
+_BEGUN_OFFSET = 32
+_OLDEST_OFFSET = 40
+_DATA_OFFSET = 128
+# record length, number of parameters
+_RECORD_HEADER = struct.Struct("<II")
+_NAME_LENGTH = struct.Struct("<H")
+_ALIGNMENT = 8
+# how long a reader waits for a write in progress to be announced completely
+# when it looks for the oldest record
+_RETRY_TIMEOUT = 1.0
+_MAX_RETRY_DELAY = 0.01
+
+
+def _padded(nbytes: int) -> int:
+    return -(-nbytes // _ALIGNMENT) * _ALIGNMENT
+
+
+def _pack_name(name: str) -> bytes:
+    encoded = name.encode("utf-8")
+    return _NAME_LENGTH.pack(len(encoded)) + encoded
+
+
+def _unpack_name(record: bytes, offset: int) -> tuple[str, int]:
+    (length,) = _NAME_LENGTH.unpack_from(record, offset)
+    offset += _NAME_LENGTH.size
+    return record[offset : offset + length].decode("utf-8"), offset + length
+
+
+def _pack_record(tree_name: str, tree: Mapping[str, np.ndarray]) -> bytes:
+    parts = [_pack_name(tree_name)]
+    nbytes = _RECORD_HEADER.size + len(parts[0])
+    for name, values in tree.items():
+        array = np.ascontiguousarray(values)
+        header = _pack_name(name) + pack_array_header(
+            LIVE_FEED_ARRAY_MAGIC, array.dtype, array.shape
+        )
+        padding = _padded(nbytes + len(header)) - nbytes - len(header)
+        parts += [header, bytes(padding), array.tobytes()]
+        nbytes += len(header) + padding + array.nbytes
+    parts.append(bytes(_padded(nbytes) - nbytes))
+    record_header = _RECORD_HEADER.pack(_padded(nbytes), len(tree))
+    return b"".join([record_header, *parts])
+
+
+def _unpack_record(record: bytes) -> tuple[str, dict[str, np.ndarray]]:
+    _, n_params = _RECORD_HEADER.unpack_from(record)
+    tree_name, offset = _unpack_name(record, _RECORD_HEADER.size)
+    tree: dict[str, np.ndarray] = {}
+    for _ in range(n_params):
+        name, offset = _unpack_name(record, offset)
+        dtype, shape, header_length = unpack_array_header(
+            record[offset:], LIVE_FEED_ARRAY_MAGIC
+        )
+        offset = _padded(offset + header_length)
+        count = int(np.prod(shape, dtype=np.int64))
+        tree[name] = np.frombuffer(
+            record, dtype=dtype, count=count, offset=offset
+        ).reshape(shape)
+        offset += count * dtype.itemsize
+    return tree_name, tree
+
+
+def _attach_shared_memory(name: str) -> shared_memory.SharedMemory:
+    """
+    Attach to an existing shared memory block without registering it with
+    the resource tracker, which would otherwise remove the block when the
+    attaching process exits.
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    block = shared_memory.SharedMemory(name=name)
+    if sys.platform != "win32":
+        resource_tracker.unregister(block._name, "shared_memory")  # type: ignore[attr-defined]
+    return block
+
+
+class LiveFeedPublisher:
+    """
+    Publishes the data added to the cache of a dataset to a shared memory
+    block that :class:`LiveFeedReader` instances in other processes can
+    read from. Only data added after the publisher is created is published,
+    so it should be created right after the measurement has started, e.g.
+    with the dataset of the ``DataSaver``. The dataset must keep its data in
+    an in-memory cache, which is the default.
+
+    The publisher owns the shared memory block and removes it when it is
+    closed, which happens at the latest when the dataset is marked as
+    completed, e.g. at the end of ``Measurement.run``. Readers that are
+    attached at that point can still read the data written up to then.
+
+    Args:
+        dataset: The dataset to publish the data of.
+        size: Size in bytes of the ring buffer. A reader that falls more
+            than this behind loses data.
+        name: Name of the shared memory block. If None, a unique name is
+            chosen, which is available as :attr:`name`.
+
+    """
+
+    def __init__(
+        self,
+        dataset: DataSetProtocol,
+        size: int = DEFAULT_LIVE_FEED_SIZE,
+        name: str | None = None,
+    ):
+        self._capacity = _padded(size)
+        self._shm = shared_memory.SharedMemory(
+            name=name, create=True, size=_DATA_OFFSET + self._capacity
+        )
+        self._written = 0
+        _HEADER.pack_into(
+            self._shm.buf,
+            0,
+            LIVE_FEED_MAGIC,
+            self._capacity,
+            0,
+            False,
+            0,
+            0,
+            dataset.guid.encode("ascii"),
+        )
+        # the positions of the records, including the markers of wrapping
+        # around, that have not been overwritten yet
+        self._record_starts: deque[int] = deque()
+        self._cache = dataset.cache
+        self._cache._live_feeds.append(self)
+        self._closed = False
+
+    @property
+    def name(self) -> str:
+        """The name to attach a :class:`LiveFeedReader` with."""
+        return self._shm.name
+
+    def publish(self, new_data: Mapping[str, Mapping[str, np.ndarray]]) -> None:
+        """
+        Write a chunk of data to the ring buffer, one record per parameter
+        tree. Trees with values of object dtype, e.g. arrays of varying
+        shape, and chunks larger than the ring buffer can not be published
+        and are skipped with a warning, such that the measurement carries on.
+        """
+        for tree_name, tree in new_data.items():
+            if any(np.asarray(values).dtype.hasobject for values in tree.values()):
+                log.warning(
+                    f"Not publishing data of {tree_name} to live feed "
+                    f"{self.name} since it holds values of object dtype."
+                )
+                continue
+            record = _pack_record(tree_name, tree)
+            if len(record) > self._capacity:
+                log.warning(
+                    f"Not publishing data of {tree_name} to live feed "
+                    f"{self.name} since a chunk of {len(record)} bytes does "
+                    f"not fit into its {self._capacity} bytes."
+                )
+                continue
+            self._write_record(record)
+
+    def _write_record(self, record: bytes) -> None:
+        buffer = self._shm.buf
+        position = self._written % self._capacity
+        wraps = position + len(record) > self._capacity
+        record_start = (
+            self._written + self._capacity - position if wraps else self._written
+        )
+        end = record_start + len(record)
+        if wraps:
+            self._record_starts.append(self._written)
+        self._record_starts.append(record_start)
+        while self._record_starts[0] < end - self._capacity:
+            self._record_starts.popleft()
+        # announce how far the write reaches before overwriting anything, the
+        # oldest record first such that it is never behind the announced end
+        struct.pack_into("<Q", buffer, _OLDEST_OFFSET, self._record_starts[0])
+        struct.pack_into("<Q", buffer, _BEGUN_OFFSET, end)
+
+        if wraps:
+            _RECORD_HEADER.pack_into(buffer, _DATA_OFFSET + position, 0, 0)
+            position = 0
+        start = _DATA_OFFSET + position
+        buffer[start : start + len(record)] = record
+        self._written = end
+        struct.pack_into("<Q", buffer, _WRITTEN_OFFSET, self._written)
+
+    def close(self) -> None:
+        """
+        Stop publishing, mark the feed as completed and remove the shared
+        memory block.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._cache._live_feeds.remove(self)
+        struct.pack_into("<?", self._shm.buf, _COMPLETED_OFFSET, True)
+        self._shm.close()
+        self._shm.unlink()
+
+    def __enter__(self) -> LiveFeedPublisher:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+
+class LiveFeedReader:
+    """
+    Reads the data published by a :class:`LiveFeedPublisher` in another
+    process. Call :meth:`update` to read the data published since the last
+    call, and :meth:`data` to get all data read so far, in the same format
+    as :meth:`.DataSetProtocol.get_parameter_data` of an unshaped dataset.
+
+    Args:
+        name: Name of the shared memory block of the publisher.
+
+    Raises:
+        ValueError: If the shared memory block is not a live feed.
+        RuntimeError: If the publisher stopped in the middle of a write
+            while the oldest record of the feed is looked up.
+
+    """
+
+    def __init__(self, name: str):
+        self._shm = _attach_shared_memory(name)
+        magic, capacity, _, _, _, _, guid = _HEADER.unpack_from(self._shm.buf, 0)
+        if magic != LIVE_FEED_MAGIC:
+            self._shm.close()
+            raise ValueError(f"Shared memory block {name} is not a live feed.")
+        self._capacity: int = capacity
+        self.guid: str = guid.decode("ascii")
+        try:
+            self._read = self._oldest_record()
+        except RuntimeError:
+            self._shm.close()
+            raise
+        self._data: dict[str, dict[str, np.ndarray]] = {}
+        self._buffers: dict[str, dict[str, np.ndarray]] = {}
+
+    @property
+    def completed(self) -> bool:
+        """Whether the publisher has been closed."""
+        return struct.unpack_from("<?", self._shm.buf, _COMPLETED_OFFSET)[0]
+
+    def _bytes_written(self) -> int:
+        return struct.unpack_from("<Q", self._shm.buf, _WRITTEN_OFFSET)[0]
+
+    def _bytes_begun(self) -> int:
+        return struct.unpack_from("<Q", self._shm.buf, _BEGUN_OFFSET)[0]
+
+    def _oldest_record(self) -> int:
+        deadline = time.monotonic() + _RETRY_TIMEOUT
+        delay = 1e-5
+        while True:
+            # the publisher moves the oldest record on before it announces a
+            # write, so it is up to date if it is not behind that write
+            oldest = struct.unpack_from("<Q", self._shm.buf, _OLDEST_OFFSET)[0]
+            if self._bytes_begun() - oldest <= self._capacity:
+                return oldest
+            if time.monotonic() > deadline:
+                raise RuntimeError(
+                    f"Could not find the oldest record of live feed "
+                    f"{self._shm.name} within {_RETRY_TIMEOUT} s. The publisher "
+                    f"may have stopped in the middle of a write."
+                )
+            time.sleep(delay)
+            delay = min(2 * delay, _MAX_RETRY_DELAY)
+
+    def _raise_if_overrun(self) -> None:
+        if self._bytes_begun() - self._read > self._capacity:
+            raise RuntimeError(
+                f"Live feed {self._shm.name} has overwritten data that was not "
+                f"read yet. Read more often or use a larger feed."
+            )
+
+    def update(self) -> bool:
+        """
+        Read the data published since the last update.
+
+        Returns:
+            Whether there was new data.
+
+        Raises:
+            RuntimeError: If the publisher has overwritten data that was not
+                read yet.
+
+        """
+        written = self._bytes_written()
+        self._raise_if_overrun()
+        buffer = self._shm.buf
+        records = []
+        position = self._read
+        while position < written:
+            offset = position % self._capacity
+            start = _DATA_OFFSET + offset
+            (record_length, _) = _RECORD_HEADER.unpack_from(buffer, start)
+            if record_length == 0:
+                position += self._capacity - offset
+                continue
+            if record_length > self._capacity - offset:
+                # the header is being overwritten
+                self._raise_if_overrun()
+                raise RuntimeError(
+                    f"Live feed {self._shm.name} holds a corrupt record."
+                )
+            records.append(bytes(buffer[start : start + record_length]))
+            position += record_length
+        # the records may have been overwritten while they were copied, even
+        # by a write that is still in progress
+        self._raise_if_overrun()
+
+        for record in records:
+            tree_name, tree = _unpack_record(record)
+            tree_data = self._data.setdefault(tree_name, {})
+            tree_buffers = self._buffers.setdefault(tree_name, {})
+            for name, values in tree.items():
+                if name in tree_data:
+                    tree_data[name], tree_buffers[name] = _append_to_buffer(
+                        tree_data[name], values, tree_buffers.get(name)
+                    )
+                else:
+                    tree_data[name] = values
+        self._read = position
+        return len(records) > 0
+
+    def data(self) -> ParameterData:
+        """
+        Return all data read so far. The arrays are not modified by later
+        updates.
+        """
+        return {tree_name: dict(tree) for tree_name, tree in self._data.items()}
+
+    def close(self) -> None:
+        """Detach from the shared memory block."""
+        self._shm.close()
+
+    def __enter__(self) -> LiveFeedReader:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        self.close()
@@ -55,10 +55,12 @@ from qcodes.utils import DelayedKeyboardInterrupt
 if TYPE_CHECKING:
     from types import TracebackType
 
+    from qcodes.dataset.data_set import BackgroundWriterMetrics
     from qcodes.dataset.descriptions.versioning.rundescribertypes import Shapes
     from qcodes.dataset.experiment_container import Experiment
     from qcodes.dataset.sqlite.connection import ConnectionPlus
     from qcodes.dataset.sqlite.query_helpers import VALUE
+    from qcodes.dataset.sqlite.wal_checkpoint import WALCheckpointMetrics
 
 log = logging.getLogger(__name__)
 TRACER = trace.get_tracer(__name__)
@@ -500,6 +502,18 @@ class DataSaver:
 
         """
         self.dataset._flush_data_to_database(block=block)
+        metrics = self.writer_metrics
+        if metrics is not None and self._span is not None:
+            self._span.set_attributes(
+                {
+                    "write_queue_depth": metrics.queue_depth,
+                    "write_queue_bytes": metrics.queue_bytes,
+                    "write_lag": metrics.lag,
+                    "write_rows_per_second": metrics.rows_per_second,
+                    "write_bytes_per_second": metrics.bytes_per_second,
+                    "write_rows_dropped": metrics.rows_dropped,
+                }
+            )
 
     def export_data(self) -> None:
         """Export data at end of measurement as per export_type
@@ -519,6 +533,27 @@ class DataSaver:
     def dataset(self) -> DataSetProtocol:
         return self._dataset
 
+    @property
+    def writer_metrics(self) -> BackgroundWriterMetrics | None:
+        """
+        Metrics of the thread writing the data of this measurement to the
+        database, or None if the data is not written in the background.
+        """
+        if isinstance(self._dataset, DataSet):
+            return self._dataset._background_writer_metrics()
+        return None
+
+    @property
+    def wal_checkpoint_metrics(self) -> WALCheckpointMetrics | None:
+        """
+        Metrics of the write-ahead log of the database of this measurement,
+        or None if it is not checkpointed in the background, see the
+        ``dataset.wal_checkpoint_in_background`` config option.
+        """
+        if isinstance(self._dataset, DataSet):
+            return self._dataset._wal_checkpoint_metrics()
+        return None
+
 
 class Runner:
     """
@@ -0,0 +1,374 @@
+"""
+This module provides a :class:`RunCatalog`, a file that records which runs
+are stored in which of many database files, such that runs can be found and
+loaded by their GUID without opening every database file.
+
+The catalog is refreshed incrementally: only database files whose size or
+modification time has changed since they were last scanned are opened, and
+only their runs after the last run that was catalogued are read. The files
+are scanned in parallel by a pool of processes.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import logging
+import os
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from qcodes.dataset.data_set import load_by_guid
+from qcodes.dataset.sqlite.connection import connect_read_only
+from qcodes.dataset.sqlite.database import conn_from_dbpath_or_conn
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Sequence
+
+    from qcodes.dataset.data_set_protocol import DataSetProtocol
+
+log = logging.getLogger(__name__)
+
+_catalog_schema = (
+    """
+    CREATE TABLE IF NOT EXISTS db_files (
+        path TEXT PRIMARY KEY,
+        mtime REAL,
+        size INTEGER,
+        last_run_id INTEGER,
+        -- the error that occurred when the file was last scanned, if any
+        error TEXT
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS runs (
+        path TEXT NOT NULL,
+        run_id INTEGER NOT NULL,
+        guid TEXT NOT NULL,
+        exp_id INTEGER,
+        exp_name TEXT,
+        sample_name TEXT,
+        name TEXT,
+        captured_run_id INTEGER,
+        captured_counter INTEGER,
+        run_timestamp REAL,
+        completed_timestamp REAL,
+        PRIMARY KEY (path, run_id)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS IX_runs_guid ON runs (guid)",
+)
+
+_CATALOG_COLUMNS = (
+    "path",
+    "run_id",
+    "guid",
+    "exp_id",
+    "exp_name",
+    "sample_name",
+    "name",
+    "captured_run_id",
+    "captured_counter",
+    "run_timestamp",
+    "completed_timestamp",
+)
+
+
+@dataclass(frozen=True)
+class CatalogEntry:
+    """A run in a database file as recorded by a :class:`RunCatalog`."""
+
+    path_to_db: str
+    run_id: int
+    guid: str
+    exp_id: int
+    exp_name: str
+    sample_name: str
+    name: str
+    captured_run_id: int
+    captured_counter: int
+    run_timestamp_raw: float | None
+    completed_timestamp_raw: float | None
+
+
+@dataclass(frozen=True)
+class _ScanResult:
+    path: str
+    rows: list[tuple]
+    # whether all runs of the file were read, e.g. since it has been replaced
+    all_runs: bool
+    error: str | None = None
+
+
+def _file_signature(path: str) -> tuple[float, int]:
+    """
+    Return the modification time and size of a database file, including its
+    write-ahead log, where the changes to a database in WAL journal mode
+    are stored until they are checkpointed into the file.
+    """
+    stat = os.stat(path)
+    mtime, size = stat.st_mtime, stat.st_size
+    with contextlib.suppress(FileNotFoundError):
+        wal_stat = os.stat(f"{path}-wal")
+        mtime = max(mtime, wal_stat.st_mtime)
+        size += wal_stat.st_size
+    return mtime, size
+
+
+def _scan_db_file(path: str, after_run_id: int) -> _ScanResult:
+    """
+    Read the runs after the given run id from a database file. If the file
+    does not have that many runs any more, all of its runs are read. This
+    runs in the processes of the pool of :meth:`RunCatalog.refresh`.
+    """
+    try:
+        with contextlib.closing(connect_read_only(path)) as conn:
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(runs)")}
+            if "guid" not in columns:
+                raise RuntimeError(
+                    f"The runs in {path} do not have GUIDs, the database has to "
+                    "be upgraded to be catalogued."
+                )
+            # databases before version 7 do not record these separately
+            captured_run_id = (
+                "captured_run_id" if "captured_run_id" in columns else "run_id"
+            )
+            captured_counter = (
+                "captured_counter"
+                if "captured_counter" in columns
+                else "result_counter"
+            )
+            (max_run_id,) = conn.execute("SELECT max(run_id) FROM runs").fetchone()
+            all_runs = (max_run_id or 0) < after_run_id
+            rows = conn.execute(
+                f"""
+                SELECT ?, runs.run_id, runs.guid, runs.exp_id, experiments.name,
+                experiments.sample_name, runs.name, runs."{captured_run_id}",
+                runs."{captured_counter}", runs.run_timestamp,
+                runs.completed_timestamp
+                FROM runs JOIN experiments ON runs.exp_id = experiments.exp_id
+                WHERE runs.run_id > ? ORDER BY runs.run_id
+                """,
+                (path, 0 if all_runs else after_run_id),
+            ).fetchall()
+    except (RuntimeError, sqlite3.DatabaseError) as e:
+        return _ScanResult(path, [], all_runs=False, error=str(e))
+    return _ScanResult(path, rows, all_runs=all_runs)
+
+
+class RunCatalog:
+    """
+    A catalog of the runs in many database files, stored in an SQLite file
+    of its own. For each run it records the database file and run id, the
+    GUID, the experiment and the timestamps.
+
+    Use :meth:`refresh` to catalog the database files in some directories,
+    and :meth:`load_by_guid` to load a catalogued run from whichever file
+    holds it.
+
+    Args:
+        path: Path of the catalog file. It is created if it does not exist.
+
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = str(path)
+        with contextlib.closing(self._connect()) as conn, conn:
+            for statement in _catalog_schema:
+                conn.execute(statement)
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path)
+
+    def refresh(self, *paths: str | Path, max_workers: int | None = None) -> None:
+        """
+        Catalog the runs in database files that are new or have changed since
+        they were last catalogued, and remove the runs of database files that
+        no longer exist.
+
+        Args:
+            *paths: Database files, and directories in which all ``*.db``
+                files are catalogued, including those in subdirectories.
+            max_workers: Maximum number of processes that scan the database
+                files. If None, the number of processors is used. With 1 the
+                files are scanned in this process.
+
+        """
+        files, roots = self._find_db_files(paths)
+        with contextlib.closing(self._connect()) as conn, conn:
+            catalogued = {
+                path: (mtime, size, last_run_id)
+                for path, mtime, size, last_run_id in conn.execute(
+                    "SELECT path, mtime, size, last_run_id FROM db_files"
+                )
+            }
+            removed = [
+                path
+                for path in catalogued
+                if path not in files
+                and (path in roots or any(path.startswith(root) for root in roots))
+            ]
+            for path in removed:
+                self._remove_db_file(conn, path)
+
+            to_scan = []
+            for path, signature in files.items():
+                if path in catalogued:
+                    if catalogued[path][:2] == signature:
+                        continue
+                    # runs that were not completed may have changed since
+                    (first_incomplete,) = conn.execute(
+                        """
+                        SELECT min(run_id) FROM runs
+                        WHERE path = ? AND completed_timestamp IS NULL
+                        """,
+                        (path,),
+                    ).fetchone()
+                    after_run_id = catalogued[path][2] or 0
+                    if first_incomplete is not None:
+                        after_run_id = min(after_run_id, first_incomplete - 1)
+                else:
+                    after_run_id = 0
+                to_scan.append((path, after_run_id))
+
+        log.info(
+            f"Scanning {len(to_scan)} of {len(files)} database files for the "
+            f"run catalog {self.path}"
+        )
+        for result in self._scan(to_scan, max_workers):
+            with contextlib.closing(self._connect()) as conn, conn:
+                self._store(conn, result, files[result.path])
+
+    @staticmethod
+    def _find_db_files(
+        paths: Sequence[str | Path],
+    ) -> tuple[dict[str, tuple[float, int]], list[str]]:
+        files = {}
+        roots = []
+        for path in paths:
+            path = Path(path).resolve()
+            if path.is_dir():
+                roots.append(os.path.join(str(path), ""))
+                db_files: Iterable[Path] = path.glob("**/*.db")
+            else:
+                roots.append(str(path))
+                db_files = [path] if path.exists() else []
+            for db_file in db_files:
+                files[str(db_file)] = _file_signature(str(db_file))
+        return files, roots
+
+    @staticmethod
+    def _scan(
+        to_scan: Sequence[tuple[str, int]], max_workers: int | None
+    ) -> Iterable[_ScanResult]:
+        if len(to_scan) <= 1 or max_workers == 1:
+            return [_scan_db_file(path, after) for path, after in to_scan]
+        paths, afters = zip(*to_scan)
+        with ProcessPoolExecutor(max_workers) as executor:
+            return list(executor.map(_scan_db_file, paths, afters, chunksize=16))
+
+    @staticmethod
+    def _remove_db_file(conn: sqlite3.Connection, path: str) -> None:
+        conn.execute("DELETE FROM runs WHERE path = ?", (path,))
+        conn.execute("DELETE FROM db_files WHERE path = ?", (path,))
+
+    @staticmethod
+    def _store(
+        conn: sqlite3.Connection, result: _ScanResult, signature: tuple[float, int]
+    ) -> None:
+        if result.error is not None:
+            log.warning(f"Could not catalog {result.path}: {result.error}")
+            # the error may be temporary, e.g. the file is locked, so the
+            # runs catalogued before are kept and the signature of the file
+            # is not recorded, such that the next refresh scans it again
+            conn.execute(
+                """
+                INSERT INTO db_files (path, error) VALUES (?, ?)
+                ON CONFLICT (path) DO UPDATE
+                SET mtime = NULL, size = NULL, error = excluded.error
+                """,
+                (result.path, result.error),
+            )
+            return
+        if result.all_runs:
+            conn.execute("DELETE FROM runs WHERE path = ?", (result.path,))
+        conn.executemany(
+            f"INSERT OR REPLACE INTO runs ({', '.join(_CATALOG_COLUMNS)}) "
+            f"VALUES ({', '.join('?' * len(_CATALOG_COLUMNS))})",
+            result.rows,
+        )
+        (last_run_id,) = conn.execute(
+            "SELECT max(run_id) FROM runs WHERE path = ?", (result.path,)
+        ).fetchone()
+        conn.execute(
+            "INSERT OR REPLACE INTO db_files VALUES (?, ?, ?, ?, ?)",
+            (result.path, *signature, last_run_id or 0, result.error),
+        )
+
+    def entries(
+        self, guid: str | None = None, path_to_db: str | Path | None = None
+    ) -> list[CatalogEntry]:
+        """
+        Get the catalogued runs, sorted by database file and run id.
+
+        Args:
+            guid: Only get the runs with this GUID. A run that has been
+                copied to other database files has the same GUID in all of
+                them.
+            path_to_db: Only get the runs in this database file.
+
+        """
+        conds = []
+        inputs = []
+        if guid is not None:
+            conds.append("guid = ?")
+            inputs.append(guid)
+        if path_to_db is not None:
+            conds.append("path = ?")
+            inputs.append(str(Path(path_to_db).resolve()))
+        where_clause = " WHERE " + " AND ".join(conds) if conds else ""
+        with contextlib.closing(self._connect()) as conn:
+            rows = conn.execute(
+                f"SELECT {', '.join(_CATALOG_COLUMNS)} FROM runs{where_clause} "
+                "ORDER BY path, run_id",
+                inputs,
+            ).fetchall()
+        return [CatalogEntry(*row) for row in rows]
+
+    def errors(self) -> dict[str, str]:
+        """
+        Get the database files that could not be catalogued when they were
+        last scanned, and the errors that occurred.
+        """
+        with contextlib.closing(self._connect()) as conn:
+            return dict(
+                conn.execute(
+                    "SELECT path, error FROM db_files WHERE error IS NOT NULL"
+                ).fetchall()
+            )
+
+    def __len__(self) -> int:
+        with contextlib.closing(self._connect()) as conn:
+            (n_runs,) = conn.execute("SELECT count(*) FROM runs").fetchone()
+        return n_runs
+
+    def load_by_guid(self, guid: str) -> DataSetProtocol:
+        """
+        Load a run by its GUID from the catalogued database file that holds
+        it. If the run has been copied to several database files, it is
+        loaded from the first of them in the order of their paths.
+
+        Args:
+            guid: The GUID of the run.
+
+        Raises:
+            NameError: If no run with the GUID is catalogued.
+
+        """
+        entries = self.entries(guid=guid)
+        if not entries:
+            raise NameError(f"No run with GUID: {guid} found in the run catalog.")
+        conn = conn_from_dbpath_or_conn(conn=None, path_to_db=entries[0].path_to_db)
+        return load_by_guid(guid, conn=conn)
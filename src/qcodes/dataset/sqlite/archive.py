@@ -0,0 +1,112 @@
+"""
+This module provides the storage of archived runs. The result tables of
+archived runs are moved from a database file into a companion archive file
+next to it, while their rows in the runs table stay in the database file.
+Arrays in the archived result tables are stored zlib compressed.
+
+Every connection to a database file attaches its archive file, if there is
+one, under the schema name :data:`ARCHIVE_SCHEMA`. SQLite looks up tables
+that are not qualified with a schema name in the attached databases if they
+are not in the database file itself, so the archived result tables are read
+like any other. Archiving runs is done with
+:func:`qcodes.dataset.archive_runs`.
+
+For a database file ``experiments.db`` the archive file is
+``experiments_archive.db``.
+"""
+
+from __future__ import annotations
+
+import zlib
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from qcodes.dataset.sqlite.array_header import (
+    COMPRESSED_ARRAY_MAGIC,
+    pack_array_header,
+    unpack_array_header,
+)
+
+if TYPE_CHECKING:
+    import sqlite3
+
+ARCHIVE_SCHEMA = "archive"
+"""The schema name under which the archive file is attached."""
+
+
+def archive_path(path_to_db: str | Path) -> Path:
+    """
+    Return the path of the archive file of a database file.
+    """
+    path = Path(path_to_db)
+    return path.with_name(f"{path.stem}_archive{path.suffix}")
+
+
+def attach_archive(
+    conn: sqlite3.Connection,
+    path_to_db: str | Path,
+    create: bool = False,
+    read_only: bool = False,
+) -> bool:
+    """
+    Attach the archive file of a database file to a connection to it, if
+    it is not attached already.
+
+    Args:
+        conn: Connection to the database file.
+        path_to_db: Path to the database file.
+        create: Whether to create the archive file if it does not exist.
+        read_only: Whether to attach the archive file read-only. This
+            requires that the connection has been opened with ``uri=True``.
+
+    Returns:
+        Whether the archive file is attached.
+
+    """
+    if str(path_to_db) in ("", ":memory:"):
+        return False
+    path = archive_path(path_to_db)
+    if ARCHIVE_SCHEMA in {row[1] for row in conn.execute("PRAGMA database_list")}:
+        return True
+    if not create and not path.exists():
+        return False
+    if read_only:
+        target = f"{path.absolute().as_uri()}?mode=ro"
+    else:
+        target = str(path)
+    conn.execute(f"ATTACH DATABASE ? AS {ARCHIVE_SCHEMA}", (target,))
+    return True
+
+
+def compress_array(arr: np.ndarray, level: int = 6) -> bytes:
+    """
+    Store an array as zlib compressed data preceded by a header holding the
+    dtype and the shape. The bytes of the values are shuffled such that
+    e.g. the exponents of floats are next to each other, which makes them
+    compress much better.
+
+    Args:
+        arr: The array. Structured and object arrays can not be compressed.
+        level: The zlib compression level from 0 to 9.
+
+    """
+    if arr.dtype.hasobject or arr.dtype.fields is not None:
+        raise ValueError(f"Arrays of dtype {arr.dtype} can not be compressed.")
+    header = pack_array_header(COMPRESSED_ARRAY_MAGIC, arr.dtype, arr.shape)
+    data = np.ascontiguousarray(arr).reshape(-1).view(np.uint8)
+    if arr.dtype.itemsize > 1:
+        data = np.ascontiguousarray(data.reshape(-1, arr.dtype.itemsize).T)
+    return header + zlib.compress(data.tobytes(), level)
+
+
+def decompress_array(text: bytes) -> np.ndarray:
+    """
+    Rebuild an array stored by :func:`compress_array`.
+    """
+    dtype, shape, offset = unpack_array_header(text, COMPRESSED_ARRAY_MAGIC)
+    data = np.frombuffer(zlib.decompress(memoryview(text)[offset:]), dtype=np.uint8)
+    if dtype.itemsize > 1:
+        data = np.ascontiguousarray(data.reshape(dtype.itemsize, -1).T)
+    return data.view(dtype).reshape(shape)
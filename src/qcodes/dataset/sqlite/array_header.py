@@ -0,0 +1,60 @@
+"""
+This module contains the compact binary header used to describe arrays
+stored in the database without the npy format, i.e. arrays stored with the
+raw array codec and references to arrays stored in sidecar files.
+"""
+
+from __future__ import annotations
+
+import struct
+
+import numpy as np
+
+# Arrays stored with the raw codec start with this magic string followed by
+# the codec version, the dtype string, the number of dimensions and the shape.
+# The header is padded such that the data starts at a multiple of
+# RAW_ARRAY_ALIGNMENT bytes.
+RAW_ARRAY_MAGIC = b"\x93QCRAW"
+RAW_ARRAY_VERSION = 1
+RAW_ARRAY_ALIGNMENT = 16
+# References to arrays stored in sidecar files start with this magic string
+# followed by the same header as raw arrays and the offset of the data in
+# the sidecar file.
+SIDECAR_ARRAY_MAGIC = b"\x93QCSIDE"
+# Arrays of archived runs start with this magic string followed by the same
+# header as raw arrays and the zlib compressed data, see
+# :mod:`qcodes.dataset.sqlite.archive`.
+COMPRESSED_ARRAY_MAGIC = b"\x93QCZIP"
+
+
+def pack_array_header(magic: bytes, dtype: np.dtype, shape: tuple[int, ...]) -> bytes:
+    dtype_str = dtype.str.encode("ascii")
+    return struct.pack(
+        f"<{len(magic)}sBB{len(dtype_str)}sB{len(shape)}Q",
+        magic,
+        RAW_ARRAY_VERSION,
+        len(dtype_str),
+        dtype_str,
+        len(shape),
+        *shape,
+    )
+
+
+def unpack_array_header(
+    text: bytes, magic: bytes
+) -> tuple[np.dtype, tuple[int, ...], int]:
+    """
+    Read the dtype and shape from a header written by
+    :func:`pack_array_header` and return them along with the length of the
+    header.
+    """
+    offset = len(magic) + 1
+    (dtype_len,) = struct.unpack_from("<B", text, offset)
+    offset += 1
+    dtype = np.dtype(text[offset : offset + dtype_len].decode("ascii"))
+    offset += dtype_len
+    (ndim,) = struct.unpack_from("<B", text, offset)
+    offset += 1
+    shape = struct.unpack_from(f"<{ndim}Q", text, offset)
+    offset += 8 * ndim
+    return dtype, shape, offset
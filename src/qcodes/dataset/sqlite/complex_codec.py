@@ -0,0 +1,69 @@
+"""
+This module contains the storage format of values of 'complex' type
+parameters: a fixed 16 byte blob holding the real and imaginary part as
+little endian doubles, i.e. the memory layout of a ``<c16`` numpy array.
+Since the blobs of a column can be concatenated into, or sliced out of, a
+single buffer, whole columns are encoded and decoded with one numpy call.
+
+Databases before version 10 stored each complex value as a one element
+array in the npy format. Those values can still be read.
+
+Complex values of any precision are stored, and therefore loaded, as
+complex128.
+"""
+
+from __future__ import annotations
+
+import io
+import struct
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+COMPLEX_DTYPE = np.dtype("<c16")
+COMPLEX_NBYTES = COMPLEX_DTYPE.itemsize
+_COMPLEX_STRUCT = struct.Struct("<dd")
+
+
+def encode_complex(value: complex | np.complexfloating) -> bytes:
+    return _COMPLEX_STRUCT.pack(value.real, value.imag)
+
+
+def decode_complex(blob: bytes) -> np.complex128:
+    if len(blob) == COMPLEX_NBYTES:
+        return np.complex128(complex(*_COMPLEX_STRUCT.unpack(blob)))
+    return np.complex128(np.load(io.BytesIO(blob))[0])
+
+
+def encode_complex_column(values: np.ndarray) -> list[bytes]:
+    """
+    Encode a one dimensional array of complex values into a list of blobs.
+    """
+    return np.ascontiguousarray(values, dtype=COMPLEX_DTYPE).view("V16").tolist()
+
+
+def decode_complex_column(blobs: Sequence[bytes]) -> np.ndarray:
+    """
+    Decode a sequence of blobs into a one dimensional complex array. Blobs in
+    the npy format of databases before version 10 are decoded value by value
+    unless they share the same header, in which case they are decoded in one
+    go as well. The values are always decoded as complex128, also values
+    that were complex64 when they were stored.
+    """
+    if all(len(blob) == COMPLEX_NBYTES for blob in blobs):
+        # a bytearray makes the array writeable without another copy
+        return np.frombuffer(bytearray(b"".join(blobs)), dtype=COMPLEX_DTYPE)
+
+    first = bytes(blobs[0])
+    dtype = np.lib.format.read_array(io.BytesIO(first), allow_pickle=False).dtype
+    header = first[: -dtype.itemsize]
+    if all(
+        len(blob) == len(first) and bytes(blob[: len(header)]) == header
+        for blob in blobs
+    ):
+        data = b"".join(bytes(blob[len(header) :]) for blob in blobs)
+        return np.frombuffer(data, dtype=dtype).astype(COMPLEX_DTYPE)
+    return np.array([decode_complex(bytes(blob)) for blob in blobs])
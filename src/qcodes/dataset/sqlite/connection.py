@@ -7,16 +7,20 @@ performing nested atomic transactions on an SQLite database.
 from __future__ import annotations
 
 import logging
+import sqlite3
 from contextlib import contextmanager
+from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
 import wrapt  # type: ignore[import-untyped]
 
+from qcodes.dataset.sqlite.archive import attach_archive
 from qcodes.utils import DelayedKeyboardInterrupt
 
 if TYPE_CHECKING:
-    import sqlite3
-    from collections.abc import Iterator
+    from collections.abc import Callable, Iterator
+
+    import numpy as np
 
 log = logging.getLogger(__name__)
 
@@ -44,6 +48,14 @@ class ConnectionPlus(wrapt.ObjectProxy):
     """
     Path to the database file of the connection.
     """
+    array_adapter: Callable[[np.ndarray], Any] | None = None
+    """
+    Function that encodes numpy arrays, i.e. the values of 'array' type
+    parameters, that are written with the insert helpers of
+    :mod:`.query_helpers` on this connection. If None, the adapter that is
+    registered with sqlite3 for all connections is used, which stores them
+    in the npy format.
+    """
 
     def __init__(self, sqlite3_connection: sqlite3.Connection):
         super().__init__(sqlite3_connection)
@@ -80,8 +92,41 @@ def make_connection_plus_from(
     return conn_plus
 
 
+def connect_read_only(path_to_db: str | Path) -> ConnectionPlus:
+    """
+    Open a read-only connection to an existing database file, e.g. to read
+    from it in another thread than the one of the connection that writes to
+    it. In WAL journal mode readers and a writer do not block each other.
+
+    Unlike :func:`qcodes.dataset.sqlite.database.connect` this does not
+    initialise or upgrade the database and does not register the adapters
+    and converters of the QCoDeS types, so it should only be used for a file
+    that has already been opened with that function. The connection may be
+    used from any thread but only by one thread at a time.
+
+    Args:
+        path_to_db: path to the database file
+
+    Returns:
+        read-only connection to the database
+
+    """
+    uri = f"{Path(path_to_db).absolute().as_uri()}?mode=ro"
+    sqlite3_conn = sqlite3.connect(
+        uri,
+        uri=True,
+        detect_types=sqlite3.PARSE_DECLTYPES,
+        check_same_thread=False,
+    )
+    # the result tables of archived runs are read from the archive file
+    attach_archive(sqlite3_conn, path_to_db, read_only=True)
+    return ConnectionPlus(sqlite3_conn)
+
+
 @contextmanager
-def atomic(conn: ConnectionPlus) -> Iterator[ConnectionPlus]:
+def atomic(
+    conn: ConnectionPlus, *, immediate: bool = False
+) -> Iterator[ConnectionPlus]:
     """
     Guard a series of transactions as atomic.
 
@@ -94,6 +139,10 @@ def atomic(conn: ConnectionPlus) -> Iterator[ConnectionPlus]:
 
     Args:
         conn: connection to guard
+        immediate: If True, the write lock of the database is taken when the
+            outermost transaction begins rather than at its first write, such
+            that no other connection can write to the database between the
+            reads and the writes of the transaction.
 
     """
     with DelayedKeyboardInterrupt(context={"reason": "sqlite atomic operation"}):
@@ -120,7 +169,7 @@ def atomic(conn: ConnectionPlus) -> Iterator[ConnectionPlus]:
         try:
             if is_outmost:
                 conn.isolation_level = None
-                conn.cursor().execute("BEGIN")
+                conn.cursor().execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
             yield conn
         except Exception as e:
             conn.rollback()
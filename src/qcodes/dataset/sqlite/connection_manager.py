@@ -0,0 +1,255 @@
+"""
+This module provides a :class:`ConnectionManager` that keeps connections to
+database files open and hands them out again, such that loading many runs
+and experiments from a file does not open, initialise and upgrade a new
+connection for each of them.
+
+The functions that take either a connection or the path to a database file
+use the manager of :func:`get_connection_manager` if
+``config.dataset.reuse_connections`` is enabled. The manager also lends
+read-only connections to the threads that load parameter trees
+concurrently, see :meth:`ConnectionManager.read_only_connection`.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import qcodes
+from qcodes.dataset.sqlite.archive import attach_archive
+from qcodes.dataset.sqlite.connection import ConnectionPlus, connect_read_only
+from qcodes.dataset.sqlite.database import _connect_without_init
+from qcodes.dataset.sqlite.db_upgrades import (
+    _latest_available_version,
+    perform_db_upgrade,
+)
+from qcodes.dataset.sqlite.db_upgrades.version import get_user_version
+from qcodes.dataset.sqlite.initial_schema import init_db
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
+log = logging.getLogger(__name__)
+
+
+class PooledConnection(ConnectionPlus):
+    """
+    A connection handed out by a :class:`ConnectionManager`. It is shared by
+    everything that has been loaded through the manager from the same file in
+    the same thread, so :meth:`close` does nothing. The connection is closed
+    by :meth:`ConnectionManager.close_all`, or once nothing uses it any more
+    after the manager has released it.
+    """
+
+    def close(self) -> None:
+        pass
+
+
+@dataclass
+class _PoolEntry:
+    connection: PooledConnection
+    thread: threading.Thread
+    last_used: float
+
+
+@dataclass
+class _IdleReadOnlyConnection:
+    connection: ConnectionPlus
+    last_used: float
+
+
+class ConnectionManager:
+    """
+    Keeps one open connection per database file and thread. sqlite
+    connections can only be used in the thread that opened them, so each
+    thread gets a connection of its own.
+
+    A connection that has not been handed out for ``idle_timeout`` seconds,
+    or the least recently used one if there are more than
+    ``max_connections``, is released: the manager stops handing it out and
+    drops its reference, such that the connection is closed once the
+    datasets that use it are gone. Connections of threads that have ended
+    are released as well.
+
+    The manager also remembers which files it has initialised and upgraded
+    to the latest version, and only checks the version of the file for
+    further connections to it.
+
+    Read-only connections, which any thread can use, are lent out with
+    :meth:`read_only_connection` and kept for reuse in the same way, up to
+    ``max_connections`` per file.
+
+    Args:
+        max_connections: Maximum number of connections to keep. If None,
+            ``config.dataset.connection_pool_size`` is used.
+        idle_timeout: Time in seconds after which a connection that has not
+            been handed out is released. If None,
+            ``config.dataset.connection_idle_timeout`` is used.
+
+    """
+
+    def __init__(
+        self, max_connections: int | None = None, idle_timeout: float | None = None
+    ):
+        self._max_connections = max_connections
+        self._idle_timeout = idle_timeout
+        self._lock = threading.Lock()
+        self._connections: OrderedDict[tuple[str, int], _PoolEntry] = OrderedDict()
+        self._upgraded_paths: set[str] = set()
+        self._read_only_connections: dict[str, list[_IdleReadOnlyConnection]] = {}
+
+    @property
+    def max_connections(self) -> int:
+        if self._max_connections is not None:
+            return self._max_connections
+        return qcodes.config.dataset.connection_pool_size
+
+    @property
+    def idle_timeout(self) -> float:
+        if self._idle_timeout is not None:
+            return self._idle_timeout
+        return qcodes.config.dataset.connection_idle_timeout
+
+    def __len__(self) -> int:
+        return len(self._connections)
+
+    def connection(self, path_to_db: str | Path, debug: bool = False) -> ConnectionPlus:
+        """
+        Return the connection of the current thread to a database file,
+        opening it if there is none.
+
+        Args:
+            path_to_db: Path to the database file.
+            debug: Whether a newly opened connection echoes the queries it
+                executes.
+
+        Returns:
+            The connection, whose ``close`` method does nothing.
+
+        """
+        path = os.path.abspath(path_to_db)
+        thread = threading.current_thread()
+        key = (path, threading.get_ident())
+        now = time.monotonic()
+        with self._lock:
+            self._release_idle(now)
+            entry = self._connections.get(key)
+            if entry is not None and entry.thread is thread:
+                entry.last_used = now
+                self._connections.move_to_end(key)
+                return entry.connection
+
+            connection = self._connect(path, debug)
+            self._connections[key] = _PoolEntry(connection, thread, now)
+            while len(self._connections) > max(self.max_connections, 1):
+                self._connections.popitem(last=False)
+            return connection
+
+    @contextmanager
+    def read_only_connection(self, path_to_db: str | Path) -> Iterator[ConnectionPlus]:
+        """
+        Lend a read-only connection to a database file, see
+        :func:`~qcodes.dataset.sqlite.connection.connect_read_only`, for the
+        duration of a with block. Afterwards the connection is kept for the
+        next block that reads from the same file, in any thread, such that
+        it is not opened again and its archive file not attached again.
+
+        Args:
+            path_to_db: Path to the database file.
+
+        Yields:
+            The connection, which only the current thread may use until the
+            end of the block.
+
+        """
+        path = os.path.abspath(path_to_db)
+        with self._lock:
+            self._release_idle(time.monotonic())
+            idle = self._read_only_connections.get(path)
+            connection = idle.pop().connection if idle else None
+        if connection is None:
+            connection = connect_read_only(path)
+        else:
+            # the archive file may have been created since the connection
+            # was opened
+            attach_archive(connection, path, read_only=True)
+        try:
+            yield connection
+        finally:
+            with self._lock:
+                idle = self._read_only_connections.setdefault(path, [])
+                keep = len(idle) < max(self.max_connections, 1)
+                if keep:
+                    idle.append(_IdleReadOnlyConnection(connection, time.monotonic()))
+            if not keep:
+                connection.close()
+
+    def close_all(self) -> None:
+        """
+        Close the connections that the current thread has opened and the
+        idle read-only connections, and release all other connections, which
+        can only be closed by their own thread. Datasets that were loaded with
+        a closed connection can not read from the database any more.
+        """
+        with self._lock:
+            current_thread = threading.current_thread()
+            for entry in self._connections.values():
+                if entry.thread is current_thread:
+                    entry.connection.__wrapped__.close()
+            self._connections.clear()
+            self._upgraded_paths.clear()
+            for idle in self._read_only_connections.values():
+                for idle_entry in idle:
+                    idle_entry.connection.close()
+            self._read_only_connections.clear()
+
+    def _release_idle(self, now: float) -> None:
+        for key, entry in list(self._connections.items()):
+            if (
+                now - entry.last_used >= self.idle_timeout
+                or not entry.thread.is_alive()
+            ):
+                del self._connections[key]
+        for path, idle in list(self._read_only_connections.items()):
+            # read-only connections may be closed from any thread
+            for idle_entry in idle:
+                if now - idle_entry.last_used >= self.idle_timeout:
+                    idle_entry.connection.close()
+            idle[:] = [
+                idle_entry
+                for idle_entry in idle
+                if now - idle_entry.last_used < self.idle_timeout
+            ]
+            if not idle:
+                del self._read_only_connections[path]
+
+    def _connect(self, path: str, debug: bool) -> PooledConnection:
+        connection = _connect_without_init(path, debug, PooledConnection)
+        assert isinstance(connection, PooledConnection)
+        if path in self._upgraded_paths:
+            if get_user_version(connection) == _latest_available_version():
+                return connection
+            log.info(f"Database {path} has changed since it was upgraded.")
+        init_db(connection)
+        perform_db_upgrade(connection)
+        self._upgraded_paths.add(path)
+        return connection
+
+
+_connection_manager = ConnectionManager()
+
+
+def get_connection_manager() -> ConnectionManager:
+    """
+    Return the :class:`ConnectionManager` that is used to connect to
+    database files if ``config.dataset.reuse_connections`` is enabled.
+    """
+    return _connection_manager
@@ -18,6 +18,20 @@ import numpy as np
 
 import qcodes
 from qcodes.dataset.experiment_settings import reset_default_experiment_id
+from qcodes.dataset.sqlite.archive import attach_archive, decompress_array
+from qcodes.dataset.sqlite.array_header import (
+    COMPRESSED_ARRAY_MAGIC,
+    RAW_ARRAY_ALIGNMENT,
+    RAW_ARRAY_MAGIC,
+    SIDECAR_ARRAY_MAGIC,
+    pack_array_header,
+    unpack_array_header,
+)
+from qcodes.dataset.sqlite.complex_codec import (
+    COMPLEX_NBYTES,
+    decode_complex,
+    encode_complex,
+)
 from qcodes.dataset.sqlite.connection import ConnectionPlus
 from qcodes.dataset.sqlite.db_upgrades import (
     _latest_available_version,
@@ -25,6 +39,11 @@ from qcodes.dataset.sqlite.db_upgrades import (
 )
 from qcodes.dataset.sqlite.db_upgrades.version import get_user_version
 from qcodes.dataset.sqlite.initial_schema import init_db
+from qcodes.dataset.sqlite.sidecar import (
+    SidecarArrayReference,
+    adapt_sidecar_reference,
+    convert_sidecar_reference,
+)
 from qcodes.utils.types import complex_types, numpy_floats, numpy_ints
 
 if TYPE_CHECKING:
@@ -50,7 +69,47 @@ def _adapt_array(arr: np.ndarray) -> sqlite3.Binary:
     return sqlite3.Binary(out.read())
 
 
-def _convert_array(text: bytes) -> np.ndarray:
+def _adapt_array_raw(arr: np.ndarray) -> sqlite3.Binary:
+    """
+    Store an array as its contiguous data buffer preceded by a compact
+    header holding the dtype and the shape. Arrays whose dtype can not be
+    described by a plain dtype string (structured or object arrays) are
+    stored in the npy format instead.
+    """
+    if arr.dtype.hasobject or arr.dtype.fields is not None:
+        return _adapt_array(arr)
+    if not arr.flags.c_contiguous:
+        arr = arr.copy(order="C")
+    header = pack_array_header(RAW_ARRAY_MAGIC, arr.dtype, arr.shape)
+    header_len = -(-len(header) // RAW_ARRAY_ALIGNMENT) * RAW_ARRAY_ALIGNMENT
+    out = bytearray(header_len + arr.nbytes)
+    out[: len(header)] = header
+    np.frombuffer(out, dtype=np.uint8, offset=header_len)[:] = arr.reshape(
+        -1
+    ).view(np.uint8)
+    return sqlite3.Binary(out)
+
+
+def _convert_array_raw(text: bytes) -> np.ndarray:
+    """
+    Rebuild an array stored by :func:`_adapt_array_raw`. Like an array read
+    from the npy format, the returned array owns its data and is writeable.
+    """
+    dtype, shape, offset = unpack_array_header(text, RAW_ARRAY_MAGIC)
+    header_len = -(-offset // RAW_ARRAY_ALIGNMENT) * RAW_ARRAY_ALIGNMENT
+    return np.frombuffer(text, dtype=dtype, offset=header_len).reshape(shape).copy()
+
+
+def _convert_array(text: bytes) -> np.ndarray | SidecarArrayReference:
+    if text.startswith(RAW_ARRAY_MAGIC):
+        return _convert_array_raw(text)
+    if text.startswith(SIDECAR_ARRAY_MAGIC):
+        return convert_sidecar_reference(text)
+    if text.startswith(COMPRESSED_ARRAY_MAGIC):
+        return decompress_array(text)
+    if len(text) == COMPLEX_NBYTES:
+        # a complex scalar stored for a parameter of 'array' type
+        return np.array([decode_complex(text)])
     # Using np.lib.format.read_array (counterpart of np.lib.format.write_array)
     # npy format version 3.0 is 3 times faster than previous verions (no clean up step
     # for python 2 backward compatibility)
@@ -58,9 +117,7 @@ def _convert_array(text: bytes) -> np.ndarray:
 
 
 def _convert_complex(text: bytes) -> np.complexfloating:
-    out = io.BytesIO(text)
-    out.seek(0)
-    return np.load(out)[0]
+    return decode_complex(text)
 
 
 this_session_default_encoding = sys.getdefaultencoding()
@@ -113,10 +170,7 @@ def _adapt_float(fl: float) -> float | str:
 
 
 def _adapt_complex(value: complex | np.complexfloating) -> sqlite3.Binary:
-    out = io.BytesIO()
-    np.save(out, np.array([value]))
-    out.seek(0)
-    return sqlite3.Binary(out.read())
+    return sqlite3.Binary(encode_complex(value))
 
 
 def connect(name: str | Path, debug: bool = False, version: int = -1) -> ConnectionPlus:
@@ -135,16 +189,36 @@ def connect(name: str | Path, debug: bool = False, version: int = -1) -> Connect
         connection object to the database (note, it is
         :class:`ConnectionPlus`, not :class:`sqlite3.Connection`)
 
+    """
+    conn = _connect_without_init(name, debug)
+    init_db(conn)
+    perform_db_upgrade(conn, version=version)
+    return conn
+
+
+def _connect_without_init(
+    name: str | Path,
+    debug: bool = False,
+    connection_type: type[ConnectionPlus] = ConnectionPlus,
+) -> ConnectionPlus:
+    """
+    Connect to a database like :func:`connect`, but without creating the
+    tables of a new database or upgrading an existing one.
     """
     # register numpy->binary(TEXT) adapter
     sqlite3.register_adapter(np.ndarray, _adapt_array)
     # register binary(TEXT) -> numpy converter
     sqlite3.register_converter("array", _convert_array)
+    sqlite3.register_adapter(SidecarArrayReference, adapt_sidecar_reference)
 
     sqlite3_conn = sqlite3.connect(
         name, detect_types=sqlite3.PARSE_DECLTYPES, check_same_thread=True
     )
-    conn = ConnectionPlus(sqlite3_conn)
+    conn = connection_type(sqlite3_conn)
+    # adapters are registered for all connections, so the codec chosen by the
+    # configuration is applied per connection by the insert helpers
+    if qcodes.config.dataset.array_codec == "raw":
+        conn.array_adapter = _adapt_array_raw
 
     latest_supported_version = _latest_available_version()
     db_version = get_user_version(conn)
@@ -170,11 +244,12 @@ def connect(name: str | Path, debug: bool = False, version: int = -1) -> Connect
         sqlite3.register_adapter(complex_type, _adapt_complex)  # type: ignore[arg-type]
     sqlite3.register_converter("complex", _convert_complex)
 
+    # the result tables of archived runs are read from the archive file
+    attach_archive(conn, name)
+
     if debug:
         conn.set_trace_callback(print)
 
-    init_db(conn)
-    perform_db_upgrade(conn, version=version)
     return conn
 
 
@@ -300,6 +375,11 @@ def conn_from_dbpath_or_conn(
     If neither is given this will fall back to the default db location.
     It is an error to supply both.
 
+    If ``config.dataset.reuse_connections`` is enabled, the connection to a
+    db file is taken from the :class:`.ConnectionManager` of
+    :func:`.get_connection_manager`, which shares it with everything else
+    loaded from the same file in the same thread.
+
     Args:
         conn: A ConnectionPlus object pointing to a sqlite database
         path_to_db: The path to a db file.
@@ -318,7 +398,14 @@ def conn_from_dbpath_or_conn(
         path_to_db = get_DB_location()
 
     if conn is None and path_to_db is not None:
-        conn = connect(path_to_db, get_DB_debug())
+        if qcodes.config.dataset.reuse_connections:
+            from qcodes.dataset.sqlite.connection_manager import (
+                get_connection_manager,
+            )
+
+            conn = get_connection_manager().connection(path_to_db, get_DB_debug())
+        else:
+            conn = connect(path_to_db, get_DB_debug())
     elif conn is not None:
         pass
     else:
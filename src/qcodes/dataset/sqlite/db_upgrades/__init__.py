@@ -17,8 +17,9 @@ from __future__ import annotations
 
 import logging
 import sys
+import time
 from functools import wraps
-from typing import Protocol
+from typing import TYPE_CHECKING, Protocol
 
 import numpy as np
 from tqdm import tqdm
@@ -30,8 +31,16 @@ from qcodes.dataset.sqlite.connection import (
     atomic_transaction,
     transaction,
 )
+from qcodes.dataset.sqlite.db_upgrades.batched_upgrade import (
+    _complete_upgrade,
+    dry_run_upgrades,
+    upgrade_runs_in_batches,
+)
 from qcodes.dataset.sqlite.db_upgrades.version import get_user_version, set_user_version
-from qcodes.dataset.sqlite.query_helpers import insert_column, many_many, one
+from qcodes.dataset.sqlite.query_helpers import insert_column, one
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
 
 log = logging.getLogger(__name__)
 
@@ -55,6 +64,12 @@ class TUpgraderFunction(Protocol):
 _UPGRADE_ACTIONS: dict[int, TUpgraderFunction] = {}
 
 
+# The target versions of the upgrades that upgrade the runs in batches with
+# upgrade_runs_in_batches, which a dry run performs on a sample of the runs,
+# see estimate_db_upgrade_time
+_BATCHED_UPGRADES = frozenset({1, 3, 4, 6, 7, 10, 11})
+
+
 def _latest_available_version() -> int:
     """Return latest available database schema version"""
     return len(_UPGRADE_ACTIONS)
@@ -75,10 +90,15 @@ def upgrader(func: TUpgraderFunction) -> TUpgraderFunction:
     `ConnectionPlus`. The upgrade function must either perform the upgrade
     and return (no return values allowed) or fail to perform the upgrade,
     in which case it must raise a RuntimeError. A failed upgrade must be
-    completely rolled back before the RuntimeError is raises.
+    completely rolled back before the RuntimeError is raises, except for
+    upgrades that upgrade the runs in batches with
+    :func:`.batched_upgrade.upgrade_runs_in_batches`, which keep the batches
+    that have been committed and resume after them.
 
     The decorator takes care of logging about the upgrade and managing the
-    database versioning.
+    database versioning. It is the only place that sets the version of the
+    database: after the upgrade function returns, or, for batched upgrades,
+    in the transaction that finishes the upgrade of the runs.
     """
     name_comps = func.__name__.split("_")
     if not len(name_comps) == 6:
@@ -115,10 +135,24 @@ def upgrader(func: TUpgraderFunction) -> TUpgraderFunction:
             )
             return
 
-        # This function either raises or returns
-        func(conn, show_progress_bar)
+        version_set = False
+
+        def complete_upgrade(atomic_conn: ConnectionPlus) -> None:
+            nonlocal version_set
+            set_user_version(atomic_conn, to_version)
+            version_set = True
 
-        set_user_version(conn, to_version)
+        # This function either raises or returns
+        token = _complete_upgrade.set(complete_upgrade)
+        try:
+            func(conn, show_progress_bar)
+        finally:
+            _complete_upgrade.reset(token)
+
+        # a batched upgrade may have been finished by another connection,
+        # which has set the version already
+        if not version_set and get_user_version(conn) == from_version:
+            complete_upgrade(conn)
         log.info(f"Succesfully performed upgrade {from_version} -> {to_version}")
 
     _UPGRADE_ACTIONS[to_version] = do_upgrade
@@ -151,6 +185,48 @@ def perform_db_upgrade(conn: ConnectionPlus, version: int = -1) -> None:
             _UPGRADE_ACTIONS[target_version](conn, show_progress_bar)
 
 
+def estimate_db_upgrade_time(
+    conn: ConnectionPlus, version: int = -1, sample_size: int = 100
+) -> dict[int, float | None]:
+    """
+    Estimate how long it takes to upgrade a database with a dry run of the
+    upgrades. The upgrades are performed in a transaction that is rolled
+    back afterwards, so the database is left unchanged, and the upgrades
+    that upgrade the runs in batches only upgrade a sample of the runs, from
+    which the time for all runs is extrapolated. The other upgrades can not
+    be sampled and are skipped, so they are not estimated.
+
+    Args:
+        conn: object for connection to the database
+        version: Which version to upgrade to. -1 means 'newest version'
+        sample_size: Number of runs that the batched upgrades upgrade.
+
+    Returns:
+        The estimated time in seconds of each upgrade that is needed, by the
+        version that it upgrades to, or None for the upgrades that are not
+        estimated.
+
+    """
+    version = _latest_available_version() if version == -1 else version
+    current_version = get_user_version(conn)
+
+    estimates: dict[int, float | None] = {}
+    with dry_run_upgrades(conn, sample_size) as dry_run:
+        for target_version in sorted(_UPGRADE_ACTIONS)[current_version:version]:
+            if target_version not in _BATCHED_UPGRADES:
+                # these upgrades only add indices and columns that the
+                # upgrades after them do not depend on
+                set_user_version(conn, target_version)
+                estimates[target_version] = None
+                continue
+            start = time.perf_counter()
+            _UPGRADE_ACTIONS[target_version](conn, show_progress_bar=False)
+            estimates[target_version] = dry_run.estimates.get(
+                target_version, time.perf_counter() - start
+            )
+    return estimates
+
+
 # DATABASE UPGRADE FUNCTIONS
 
 
@@ -169,21 +245,12 @@ def perform_db_upgrade_0_to_1(
     n_run_tables = len(cur.fetchall())
 
     if n_run_tables == 1:
-        with atomic(conn) as atomic_conn:
-            sql = "ALTER TABLE runs ADD COLUMN guid TEXT"
-            transaction(atomic_conn, sql)
-            # now assign GUIDs to existing runs
-            cur = transaction(atomic_conn, "SELECT run_id FROM runs")
-            run_ids = [r[0] for r in many_many(cur, "run_id")]
-
-            pbar = tqdm(
-                range(1, len(run_ids) + 1),
-                file=sys.stdout,
-                disable=not show_progress_bar,
-            )
-            pbar.set_description("Upgrading database; v0 -> v1")
 
-            for run_id in pbar:
+        def add_guid_column(atomic_conn: ConnectionPlus) -> None:
+            transaction(atomic_conn, "ALTER TABLE runs ADD COLUMN guid TEXT")
+
+        def assign_guids(atomic_conn: ConnectionPlus, run_ids: Sequence[int]) -> None:
+            for run_id in run_ids:
                 query = f"""
                         SELECT run_timestamp
                         FROM runs
@@ -199,6 +266,10 @@ def perform_db_upgrade_0_to_1(
                         """
                 sampleint = 3736062718  # 'deafcafe'
                 cur.execute(sql, (generate_guid(timeint=timeint, sampleint=sampleint),))
+
+        upgrade_runs_in_batches(
+            conn, 1, assign_guids, show_progress_bar, prepare=add_guid_column
+        )
     else:
         raise RuntimeError(f"found {n_run_tables} runs tables expected 1")
 
@@ -329,23 +400,32 @@ def perform_db_upgrade_6_to_7(
     n_run_tables = len(cur.fetchall())
 
     if n_run_tables == 1:
-        pbar = tqdm(range(1), file=sys.stdout, disable=not show_progress_bar)
-        pbar.set_description("Upgrading database; v6 -> v7")
-        # iterate through the pbar for the sake of the side effect; it
-        # prints that the database is being upgraded
-        for _ in pbar:
-            with atomic(conn) as atomic_conn:
-                sql = "ALTER TABLE runs ADD COLUMN captured_run_id"
-                transaction(atomic_conn, sql)
-                sql = "ALTER TABLE runs ADD COLUMN captured_counter"
-                transaction(atomic_conn, sql)
 
-                sql = """
-                        UPDATE runs
-                        SET captured_run_id = run_id,
-                            captured_counter = result_counter
-                        """
-                transaction(atomic_conn, sql)
+        def add_captured_columns(atomic_conn: ConnectionPlus) -> None:
+            sql = "ALTER TABLE runs ADD COLUMN captured_run_id"
+            transaction(atomic_conn, sql)
+            sql = "ALTER TABLE runs ADD COLUMN captured_counter"
+            transaction(atomic_conn, sql)
+
+        def assign_captured_values(
+            atomic_conn: ConnectionPlus, run_ids: Sequence[int]
+        ) -> None:
+            # the batches are consecutive runs
+            sql = """
+                    UPDATE runs
+                    SET captured_run_id = run_id,
+                        captured_counter = result_counter
+                    WHERE run_id BETWEEN ? AND ?
+                    """
+            transaction(atomic_conn, sql, run_ids[0], run_ids[-1])
+
+        upgrade_runs_in_batches(
+            conn,
+            7,
+            assign_captured_values,
+            show_progress_bar,
+            prepare=add_captured_columns,
+        )
     else:
         raise RuntimeError(f"found {n_run_tables} runs tables expected 1")
 
@@ -398,3 +478,33 @@ def perform_db_upgrade_8_to_9(
                 transaction(connection, _IX_runs_captured_run_id)
     else:
         raise RuntimeError(f"found {n_run_tables} runs tables expected 1")
+
+
+@upgrader
+def perform_db_upgrade_9_to_10(
+    conn: ConnectionPlus, show_progress_bar: bool = True
+) -> None:
+    """
+    Perform the upgrade from version 9 to version 10.
+
+    Store the values of 'complex' type parameters as 16 byte blobs rather
+    than as one element arrays in the npy format.
+    """
+    from qcodes.dataset.sqlite.db_upgrades.upgrade_9_to_10 import upgrade_9_to_10
+
+    upgrade_9_to_10(conn, show_progress_bar)
+
+
+@upgrader
+def perform_db_upgrade_10_to_11(
+    conn: ConnectionPlus, show_progress_bar: bool = True
+) -> None:
+    """
+    Perform the upgrade from version 10 to version 11.
+
+    Store the metadata of the runs in a run_metadata table with a row per
+    run and tag instead of in a column of the runs table per tag.
+    """
+    from qcodes.dataset.sqlite.db_upgrades.upgrade_10_to_11 import upgrade_10_to_11
+
+    upgrade_10_to_11(conn, show_progress_bar)
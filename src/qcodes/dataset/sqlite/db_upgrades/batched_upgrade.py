@@ -0,0 +1,262 @@
+"""
+This module provides the infrastructure for database upgrades that upgrade
+the runs in batches, one transaction per batch. After each batch the last
+upgraded run is recorded as a checkpoint in the upgrade_checkpoints table,
+such that an upgrade that has been interrupted resumes after the runs that
+have already been upgraded the next time the database is upgraded.
+
+While such an upgrade is in progress, other connections can read the runs
+that have already been upgraded, see :func:`get_upgrade_checkpoints`. The
+checkpoint is read and advanced while holding the write lock of the
+database, so connections, e.g. of several processes, that upgrade the same
+database at the same time share the batches rather than upgrading runs
+twice.
+"""
+
+from __future__ import annotations
+
+import logging
+import sys
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from tqdm import tqdm
+
+from qcodes.dataset.sqlite.connection import (
+    ConnectionPlus,
+    atomic,
+    atomic_transaction,
+    transaction,
+)
+from qcodes.dataset.sqlite.db_upgrades.version import get_user_version
+from qcodes.dataset.sqlite.query_helpers import many_many, one
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator, Sequence
+
+log = logging.getLogger(__name__)
+
+UPGRADE_BATCH_SIZE = 5000
+"""Number of runs that are upgraded in one transaction."""
+
+_upgrade_checkpoints_table_schema = """
+CREATE TABLE IF NOT EXISTS upgrade_checkpoints (
+    to_version INTEGER PRIMARY KEY,
+    -- all runs up to and including this run have been upgraded
+    last_run_id INTEGER NOT NULL
+);
+"""
+
+
+@dataclass
+class _DryRun:
+    """
+    The state of a dry run of the upgrades, in which the batched upgrades
+    only upgrade a sample of the runs and record how long that took.
+    """
+
+    sample_size: int
+    # the estimated time in seconds per target version of the upgrades
+    estimates: dict[int, float] = field(default_factory=dict)
+
+
+_dry_run: ContextVar[_DryRun | None] = ContextVar("_dry_run", default=None)
+
+# Sets the version of the database to the target version of the upgrade that
+# is being performed. It is provided by the upgrader that owns the version,
+# see :func:`qcodes.dataset.sqlite.db_upgrades.upgrader`, and called in the
+# transaction that finishes a batched upgrade, such that the version is set
+# atomically with the removal of the checkpoint of the upgrade.
+_complete_upgrade: ContextVar[Callable[[ConnectionPlus], None] | None] = ContextVar(
+    "_complete_upgrade", default=None
+)
+
+
+def get_upgrade_checkpoints(conn: ConnectionPlus) -> dict[int, int]:
+    """
+    Get the checkpoints of the batched upgrades that are in progress, i.e.
+    that have been interrupted or are being performed by another connection.
+
+    Args:
+        conn: Connection to the database.
+
+    Returns:
+        The id of the last run that has been upgraded by target version of
+        the upgrades. The runs up to and including that run can be read with
+        a read-only connection, see
+        :func:`qcodes.dataset.sqlite.connection.connect_read_only`, while the
+        upgrade is in progress.
+
+    """
+    sql = """
+          SELECT count(*) FROM sqlite_master
+          WHERE type='table' AND name='upgrade_checkpoints'
+          """
+    if not one(atomic_transaction(conn, sql), 0):
+        return {}
+    cur = atomic_transaction(
+        conn, "SELECT to_version, last_run_id FROM upgrade_checkpoints"
+    )
+    return dict(cur.fetchall())
+
+
+def upgrade_runs_in_batches(
+    conn: ConnectionPlus,
+    to_version: int,
+    upgrade_runs: Callable[[ConnectionPlus, Sequence[int]], None],
+    show_progress_bar: bool = True,
+    *,
+    prepare: Callable[[ConnectionPlus], None] | None = None,
+    finish: Callable[[ConnectionPlus], None] | None = None,
+    batch_size: int | None = None,
+) -> None:
+    """
+    Upgrade the runs of a database in batches of runs, one transaction per
+    batch, recording the last upgraded run after each batch. If the upgrade
+    has been interrupted before, it resumes after that run.
+
+    Args:
+        conn: Connection to the database.
+        to_version: The version that the upgrade upgrades to.
+        upgrade_runs: Function that upgrades the runs with the given ids. It
+            is called within the transaction of the batch.
+        show_progress_bar: Whether to show a progress bar of the upgraded
+            runs.
+        prepare: Function that changes the schema before any runs are
+            upgraded, e.g. adds a column. It is called in the same transaction
+            that records the start of the upgrade, so it is not called again
+            when the upgrade resumes.
+        finish: Function that changes the schema once all runs have been
+            upgraded. It is called in the same transaction in which the
+            upgrader that calls this function sets the version of the
+            database.
+        batch_size: Number of runs to upgrade per transaction. If None,
+            :data:`UPGRADE_BATCH_SIZE` is used.
+
+    """
+    batch_size = batch_size or UPGRADE_BATCH_SIZE
+    start = time.perf_counter()
+    with atomic(conn, immediate=True) as atomic_conn:
+        if get_user_version(atomic_conn) >= to_version:
+            log.info(f"Upgrade to version {to_version} done by another connection")
+            return
+        last_run_id = get_upgrade_checkpoints(atomic_conn).get(to_version)
+        if last_run_id is None:
+            if prepare is not None:
+                prepare(atomic_conn)
+            transaction(atomic_conn, _upgrade_checkpoints_table_schema)
+            transaction(
+                atomic_conn,
+                "INSERT INTO upgrade_checkpoints (to_version, last_run_id) "
+                "VALUES (?, 0)",
+                to_version,
+            )
+            last_run_id = 0
+        else:
+            log.info(
+                f"Resuming upgrade to version {to_version} after run {last_run_id}"
+            )
+
+    cur = atomic_transaction(
+        conn, "SELECT run_id FROM runs WHERE run_id > ? ORDER BY run_id", last_run_id
+    )
+    run_ids = [run_id for (run_id,) in many_many(cur, "run_id")]
+    no_of_pending_runs = len(run_ids)
+    dry_run = _dry_run.get()
+    if dry_run is not None:
+        run_ids = run_ids[: dry_run.sample_size]
+
+    pbar = tqdm(
+        total=len(run_ids),
+        file=sys.stdout,
+        disable=not show_progress_bar,
+        unit="runs",
+    )
+    pbar.set_description(f"Upgrading database; v{to_version - 1} -> v{to_version}")
+    batches_start = time.perf_counter()
+    with pbar:
+        for i in range(0, len(run_ids), batch_size):
+            with atomic(conn, immediate=True) as atomic_conn:
+                # another connection may have upgraded some of the runs
+                last_run_id = get_upgrade_checkpoints(atomic_conn).get(to_version)
+                if last_run_id is None:
+                    log.info(
+                        f"Upgrade to version {to_version} done by another connection"
+                    )
+                    return
+                batch = [
+                    run_id
+                    for run_id in run_ids[i : i + batch_size]
+                    if run_id > last_run_id
+                ]
+                if batch:
+                    upgrade_runs(atomic_conn, batch)
+                    transaction(
+                        atomic_conn,
+                        "UPDATE upgrade_checkpoints SET last_run_id = ? "
+                        "WHERE to_version = ?",
+                        batch[-1],
+                        to_version,
+                    )
+            pbar.update(len(run_ids[i : i + batch_size]))
+    batches_elapsed = time.perf_counter() - batches_start
+
+    with atomic(conn, immediate=True) as atomic_conn:
+        if to_version not in get_upgrade_checkpoints(atomic_conn):
+            log.info(f"Upgrade to version {to_version} done by another connection")
+            return
+        if finish is not None:
+            finish(atomic_conn)
+        transaction(
+            atomic_conn,
+            "DELETE FROM upgrade_checkpoints WHERE to_version = ?",
+            to_version,
+        )
+        if not get_upgrade_checkpoints(atomic_conn):
+            transaction(atomic_conn, "DROP TABLE upgrade_checkpoints")
+        complete_upgrade = _complete_upgrade.get()
+        if complete_upgrade is not None:
+            complete_upgrade(atomic_conn)
+
+    elapsed = time.perf_counter() - start
+    if run_ids:
+        log.info(
+            f"Upgraded {len(run_ids)} runs to version {to_version} in "
+            f"{elapsed:.1f} s ({len(run_ids) / elapsed:.1f} runs/s)"
+        )
+    if dry_run is not None:
+        # only the time of the batches scales with the number of runs
+        dry_run.estimates[to_version] = elapsed + batches_elapsed * (
+            no_of_pending_runs / max(len(run_ids), 1) - 1
+        )
+
+
+@contextmanager
+def dry_run_upgrades(conn: ConnectionPlus, sample_size: int) -> Iterator[_DryRun]:
+    """
+    Perform upgrades in a transaction that is rolled back afterwards, with
+    the batched upgrades only upgrading a sample of the runs.
+    """
+    if conn.in_transaction:
+        raise RuntimeError(
+            "SQLite connection has uncommitted transactions. "
+            "Please commit those before estimating the upgrade time."
+        )
+    dry_run = _DryRun(sample_size)
+    token = _dry_run.set(dry_run)
+    old_level = conn.isolation_level
+    old_atomic_in_progress = conn.atomic_in_progress
+    try:
+        conn.isolation_level = None
+        conn.execute("BEGIN")
+        # the transactions of the upgrades are nested in this one
+        conn.atomic_in_progress = True
+        yield dry_run
+    finally:
+        conn.rollback()
+        conn.atomic_in_progress = old_atomic_in_progress
+        conn.isolation_level = old_level
+        _dry_run.reset(token)
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import sqlite3
+from typing import TYPE_CHECKING
+
+from qcodes.dataset.sqlite.connection import ConnectionPlus, transaction
+from qcodes.dataset.sqlite.db_upgrades.batched_upgrade import upgrade_runs_in_batches
+from qcodes.dataset.sqlite.query_helpers import get_description_map
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+# the standard columns of the runs table of a version 10 database, all other
+# columns hold metadata
+_RUNS_TABLE_COLUMNS_V10 = (
+    "run_id",
+    "exp_id",
+    "name",
+    "result_table_name",
+    "result_counter",
+    "run_timestamp",
+    "completed_timestamp",
+    "is_completed",
+    "parameters",
+    "guid",
+    "run_description",
+    "snapshot",
+    "parent_datasets",
+    "captured_run_id",
+    "captured_counter",
+)
+
+_run_metadata_table_schema = """
+CREATE TABLE IF NOT EXISTS run_metadata (
+    run_id INTEGER NOT NULL,
+    tag TEXT NOT NULL,
+    -- the value is stored with the type it was added with
+    value,
+    PRIMARY KEY (run_id, tag),
+    FOREIGN KEY (run_id) REFERENCES runs (run_id)
+);
+"""
+
+# the run_id makes the index cover the queries for the runs with a given tag
+# and value, such that they do not need to look up the rows of the table
+_IX_run_metadata_tag_value = """
+CREATE INDEX IF NOT EXISTS IX_run_metadata_tag_value
+ON run_metadata (tag, value, run_id)
+"""
+
+
+def _metadata_columns(conn: ConnectionPlus) -> list[str]:
+    cur = transaction(conn, "PRAGMA table_info(runs)")
+    description = get_description_map(cur)
+    return [
+        row[description["name"]]
+        for row in cur.fetchall()
+        if row[description["name"]] not in _RUNS_TABLE_COLUMNS_V10
+    ]
+
+
+def upgrade_10_to_11(conn: ConnectionPlus, show_progress_bar: bool = True) -> None:
+    """
+    Perform the upgrade from version 10 to version 11.
+
+    Create the run_metadata table, which holds a row per run and tag with
+    the value of the metadata, and move the metadata from the columns that
+    have been added to the runs table for each tag into it. The columns are
+    dropped from the runs table if SQLite supports dropping columns.
+    """
+    tags = _metadata_columns(conn)
+
+    def create_run_metadata_table(atomic_conn: ConnectionPlus) -> None:
+        transaction(atomic_conn, _run_metadata_table_schema)
+        transaction(atomic_conn, _IX_run_metadata_tag_value)
+
+    def move_metadata(atomic_conn: ConnectionPlus, run_ids: Sequence[int]) -> None:
+        # the batches are consecutive runs, and the tags of a run keep the
+        # order of the columns
+        for tag in tags:
+            transaction(
+                atomic_conn,
+                f"""
+                INSERT INTO run_metadata (run_id, tag, value)
+                SELECT run_id, ?, "{tag}" FROM runs
+                WHERE run_id BETWEEN ? AND ? AND "{tag}" IS NOT NULL
+                ORDER BY run_id
+                """,
+                tag,
+                run_ids[0],
+                run_ids[-1],
+            )
+
+    def drop_metadata_columns(atomic_conn: ConnectionPlus) -> None:
+        if sqlite3.sqlite_version_info >= (3, 35, 0):
+            for tag in tags:
+                transaction(atomic_conn, f'ALTER TABLE runs DROP COLUMN "{tag}"')
+
+    upgrade_runs_in_batches(
+        conn,
+        11,
+        move_metadata,
+        show_progress_bar,
+        prepare=create_run_metadata_table,
+        finish=drop_metadata_columns,
+    )
@@ -2,24 +2,17 @@ from __future__ import annotations
 
 import json
 import logging
-import sys
 from collections import defaultdict
 from typing import TYPE_CHECKING
 
-from tqdm import tqdm
-
 from qcodes.dataset.descriptions.param_spec import ParamSpec
 from qcodes.dataset.descriptions.versioning.v0 import InterDependencies
-from qcodes.dataset.sqlite.connection import (
-    ConnectionPlus,
-    atomic,
-    atomic_transaction,
-    transaction,
-)
-from qcodes.dataset.sqlite.query_helpers import get_description_map, one
+from qcodes.dataset.sqlite.connection import ConnectionPlus, transaction
+from qcodes.dataset.sqlite.db_upgrades.batched_upgrade import upgrade_runs_in_batches
+from qcodes.dataset.sqlite.query_helpers import get_description_map
 
 if TYPE_CHECKING:
-    from collections.abc import Mapping, Sequence
+    from collections.abc import Callable, Mapping, Sequence
 
 log = logging.getLogger(__name__)
 
@@ -186,40 +179,26 @@ def _2to3_get_paramspecs(
     return paramspecs
 
 
-def upgrade_2_to_3(conn: ConnectionPlus, show_progress_bar: bool = True) -> None:
+def _2to3_run_description_updater(
+    conn: ConnectionPlus,
+) -> Callable[[ConnectionPlus, Sequence[int]], None]:
     """
-    Perform the upgrade from version 2 to version 3
-
-    Insert a new column, run_description, to the runs table and fill it out
-    for exisitng runs with information retrieved from the layouts and
-    dependencies tables represented as the json output of a RunDescriber
-    object
+    Return a function that fills out the run_description column of the given
+    runs with information retrieved from the layouts and dependencies tables
+    represented as the json output of a RunDescriber object. The tables are
+    read once here rather than for every batch of runs.
     """
-
-    no_of_runs_query = "SELECT max(run_id) FROM runs"
-    no_of_runs = one(atomic_transaction(conn, no_of_runs_query), "max(run_id)")
-    no_of_runs = no_of_runs or 0
-
-    # If one run fails, we want the whole upgrade to roll back, hence the
-    # entire upgrade is one atomic transaction
-
-    with atomic(conn) as atomic_conn:
-        sql = "ALTER TABLE runs ADD COLUMN run_description TEXT"
-        transaction(conn, sql)
-
-        result_tables = _2to3_get_result_tables(atomic_conn)
-        layout_ids_all = _2to3_get_layout_ids(atomic_conn)
-        indeps_all = _2to3_get_indeps(atomic_conn)
-        deps_all = _2to3_get_deps(atomic_conn)
-        layouts = _2to3_get_layouts(atomic_conn)
-        dependencies = _2to3_get_dependencies(atomic_conn)
-
-        pbar = tqdm(
-            range(1, no_of_runs + 1), file=sys.stdout, disable=not show_progress_bar
-        )
-        pbar.set_description("Upgrading database; v2 -> v3")
-
-        for run_id in pbar:
+    result_tables = _2to3_get_result_tables(conn)
+    layout_ids_all = _2to3_get_layout_ids(conn)
+    indeps_all = _2to3_get_indeps(conn)
+    deps_all = _2to3_get_deps(conn)
+    layouts = _2to3_get_layouts(conn)
+    dependencies = _2to3_get_dependencies(conn)
+
+    def update_run_descriptions(
+        atomic_conn: ConnectionPlus, run_ids: Sequence[int]
+    ) -> None:
+        for run_id in run_ids:
             if run_id in layout_ids_all:
                 result_table_name = result_tables[run_id]
                 layout_ids = list(layout_ids_all[run_id])
@@ -258,3 +237,28 @@ def upgrade_2_to_3(conn: ConnectionPlus, show_progress_bar: bool = True) -> None
             cur = atomic_conn.cursor()
             cur.execute(sql, (json_str, run_id))
             log.debug(f"Upgrade in transition, run number {run_id}: OK")
+
+    return update_run_descriptions
+
+
+def upgrade_2_to_3(conn: ConnectionPlus, show_progress_bar: bool = True) -> None:
+    """
+    Perform the upgrade from version 2 to version 3
+
+    Insert a new column, run_description, to the runs table and fill it out
+    for exisitng runs with information retrieved from the layouts and
+    dependencies tables represented as the json output of a RunDescriber
+    object
+    """
+
+    def add_run_description_column(atomic_conn: ConnectionPlus) -> None:
+        sql = "ALTER TABLE runs ADD COLUMN run_description TEXT"
+        transaction(atomic_conn, sql)
+
+    upgrade_runs_in_batches(
+        conn,
+        3,
+        _2to3_run_description_updater(conn),
+        show_progress_bar,
+        prepare=add_run_description_column,
+    )
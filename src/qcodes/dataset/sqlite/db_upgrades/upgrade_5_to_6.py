@@ -1,14 +1,16 @@
 from __future__ import annotations
 
 import json
-import sys
-
-from tqdm import tqdm
+from typing import TYPE_CHECKING
 
 from qcodes.dataset.descriptions.versioning.v0 import InterDependencies
-from qcodes.dataset.sqlite.connection import ConnectionPlus, atomic, atomic_transaction
+from qcodes.dataset.sqlite.db_upgrades.batched_upgrade import upgrade_runs_in_batches
 from qcodes.dataset.sqlite.queries import get_run_description, update_run_description
-from qcodes.dataset.sqlite.query_helpers import one
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from qcodes.dataset.sqlite.connection import ConnectionPlus
 
 
 def upgrade_5_to_6(conn: ConnectionPlus, show_progress_bar: bool = True) -> None:
@@ -19,22 +21,10 @@ def upgrade_5_to_6(conn: ConnectionPlus, show_progress_bar: bool = True) -> None
     called 'version'. Note that version changes of the runs_description will
     not be tracked as schema upgrades.
     """
-    no_of_runs_query = "SELECT max(run_id) FROM runs"
-    no_of_runs = one(atomic_transaction(conn, no_of_runs_query), "max(run_id)")
-    no_of_runs = no_of_runs or 0
-
-    # If one run fails, we want the whole upgrade to roll back, hence the
-    # entire upgrade is one atomic transaction
+    empty_idps_ser = InterDependencies()._to_dict()
 
-    with atomic(conn) as atomic_conn:
-        pbar = tqdm(
-            range(1, no_of_runs + 1), file=sys.stdout, disable=not show_progress_bar
-        )
-        pbar.set_description("Upgrading database; v5 -> v6")
-
-        empty_idps_ser = InterDependencies()._to_dict()
-
-        for run_id in pbar:
+    def add_versions(atomic_conn: ConnectionPlus, run_ids: Sequence[int]) -> None:
+        for run_id in run_ids:
             json_str = get_run_description(atomic_conn, run_id)
             if json_str is None:
                 new_json = json.dumps(
@@ -46,3 +36,5 @@ def upgrade_5_to_6(conn: ConnectionPlus, show_progress_bar: bool = True) -> None
                 new_ser["interdependencies"] = ser["interdependencies"]
                 new_json = json.dumps(new_ser)
             update_run_description(atomic_conn, run_id, new_json)
+
+    upgrade_runs_in_batches(conn, 6, add_versions, show_progress_bar)
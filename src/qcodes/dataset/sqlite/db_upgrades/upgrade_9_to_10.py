@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from qcodes.dataset.sqlite.complex_codec import (
+    COMPLEX_NBYTES,
+    decode_complex_column,
+    encode_complex_column,
+)
+from qcodes.dataset.sqlite.connection import ConnectionPlus, transaction
+from qcodes.dataset.sqlite.db_upgrades.batched_upgrade import upgrade_runs_in_batches
+from qcodes.dataset.sqlite.query_helpers import get_description_map, many_many
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+
+def _complex_columns(conn: ConnectionPlus, table_name: str) -> list[str]:
+    cur = transaction(conn, f'PRAGMA table_info("{table_name}")')
+    description = get_description_map(cur)
+    return [
+        row[description["name"]]
+        for row in cur.fetchall()
+        if row[description["type"]] == "complex"
+    ]
+
+
+def upgrade_9_to_10(conn: ConnectionPlus, show_progress_bar: bool = True) -> None:
+    """
+    Perform the upgrade from version 9 to version 10.
+
+    Convert the values of 'complex' columns of all result tables from one
+    element arrays in the npy format to 16 byte blobs.
+    """
+
+    def convert_complex_columns(
+        atomic_conn: ConnectionPlus, run_ids: Sequence[int]
+    ) -> None:
+        # the batches are consecutive runs
+        sql = """
+              SELECT result_table_name FROM runs
+              WHERE run_id BETWEEN ? AND ?
+              AND result_table_name IN
+              (SELECT name FROM sqlite_master WHERE type='table')
+              """
+        table_names = many_many(
+            transaction(atomic_conn, sql, run_ids[0], run_ids[-1]),
+            "result_table_name",
+        )
+        for (table_name,) in table_names:
+            for column in _complex_columns(atomic_conn, table_name):
+                # casting the column drops its declared type such that the
+                # blobs are returned as they are stored
+                cur = transaction(
+                    atomic_conn,
+                    f'SELECT rowid, CAST("{column}" AS BLOB) FROM "{table_name}" '
+                    f'WHERE "{column}" IS NOT NULL '
+                    f'AND length("{column}") != {COMPLEX_NBYTES}',
+                )
+                rows = cur.fetchall()
+                if not rows:
+                    continue
+                rowids, blobs = zip(*rows)
+                values = encode_complex_column(decode_complex_column(blobs))
+                atomic_conn.executemany(
+                    f'UPDATE "{table_name}" SET "{column}" = ? WHERE rowid = ?',
+                    zip(values, rowids),
+                )
+
+    upgrade_runs_in_batches(conn, 10, convert_complex_columns, show_progress_bar)
@@ -10,8 +10,9 @@ import sqlite3
 import time
 import unicodedata
 import warnings
+from concurrent.futures import ThreadPoolExecutor
 from itertools import zip_longest
-from typing import TYPE_CHECKING, Any, Literal, cast
+from typing import TYPE_CHECKING, Any, Literal, TypeVar, cast
 
 import numpy as np
 import numpy.typing as npt
@@ -26,6 +27,10 @@ from qcodes.dataset.descriptions.versioning import serialization as serial
 from qcodes.dataset.descriptions.versioning import v0
 from qcodes.dataset.descriptions.versioning.converters import new_to_old, old_to_new
 from qcodes.dataset.guids import build_guid_from_components, parse_guid
+from qcodes.dataset.sqlite.complex_codec import (
+    decode_complex,
+    decode_complex_column,
+)
 from qcodes.dataset.sqlite.connection import (
     ConnectionPlus,
     atomic,
@@ -47,6 +52,7 @@ from qcodes.dataset.sqlite.query_helpers import (
     sql_placeholder_string,
     update_where,
 )
+from qcodes.dataset.sqlite.sidecar import resolve_sidecar_references
 from qcodes.utils import list_of_data_to_maybe_ragged_nd_array
 
 if TYPE_CHECKING:
@@ -54,6 +60,8 @@ if TYPE_CHECKING:
 
 log = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
 
 _unicode_categories: tuple[
     Literal["Lu"],
@@ -69,7 +77,8 @@ _unicode_categories: tuple[
 
 
 # in the current version, these are the standard columns of the "runs" table
-# Everything else is metadata
+# In databases before version 11, everything else is metadata. From version 11
+# on, the metadata is stored in the "run_metadata" table.
 RUNS_TABLE_COLUMNS = (
     "run_id",
     "exp_id",
@@ -126,6 +135,7 @@ def get_parameter_data(
     start: int | None = None,
     end: int | None = None,
     callback: Callable[[float], None] | None = None,
+    max_workers: int | None = None,
 ) -> dict[str, dict[str, np.ndarray]]:
     """
     Get data for one or more parameters and its dependencies. The data
@@ -153,20 +163,88 @@ def get_parameter_data(
         end: end of range; if None, then ends at the bottom of the table
         callback: Function called during the data loading every
             config.dataset.callback_percent.
+        max_workers: Number of threads that load the parameter trees
+            concurrently, see :func:`_load_parameter_trees`. If None,
+            config.dataset.load_max_workers is used. The trees are always
+            loaded one after another if a callback is given.
 
     """
     rundescriber = get_rundescriber_from_result_table_name(conn, table_name)
 
-    output = {}
     if len(columns) == 0:
         columns = [ps.name for ps in rundescriber.interdeps.non_dependencies]
-
-    # loop over all the requested parameters
-    for output_param in columns:
-        output[output_param] = get_shaped_parameter_data_for_one_paramtree(
-            conn, table_name, rundescriber, output_param, start, end, callback
+    if callback is not None:
+        max_workers = 1
+
+    def load_tree(
+        tree_conn: ConnectionPlus, output_param: str
+    ) -> dict[str, np.ndarray]:
+        return get_shaped_parameter_data_for_one_paramtree(
+            tree_conn, table_name, rundescriber, output_param, start, end, callback
         )
-    return output
+
+    return _load_parameter_trees(conn, columns, load_tree, max_workers)
+
+
+def _load_parameter_trees(
+    conn: ConnectionPlus,
+    parameters: Sequence[str],
+    load_tree: Callable[[ConnectionPlus, str], T],
+    max_workers: int | None = None,
+) -> dict[str, T]:
+    """
+    Load the data of a number of parameter trees by calling ``load_tree``
+    with a connection to the database and the name of the dependent
+    parameter of each tree.
+
+    If ``max_workers`` is larger than one, the trees are loaded concurrently
+    by up to that many threads, each reading with a read-only connection to
+    the database file that is lent by the manager of
+    :func:`.get_connection_manager` and reused by later loads. sqlite3
+    releases the GIL while it
+    executes a query, so the table scan of one tree overlaps with those and
+    the numpy conversion of the others. The trees are loaded one after
+    another with ``conn`` itself for in-memory databases and if ``conn`` has
+    uncommitted changes, since other connections cannot see those.
+
+    Args:
+        conn: Connection to the database
+        parameters: Names of the dependent parameters of the trees to load
+        load_tree: Function that loads the data of one tree
+        max_workers: Maximum number of threads. If None,
+            config.dataset.load_max_workers is used.
+
+    Returns:
+        Mapping from the name of the dependent parameter to the data of its
+        tree, in the order of ``parameters``.
+
+    """
+    if max_workers is None:
+        max_workers = config.dataset.load_max_workers
+    if (
+        max_workers <= 1
+        or len(parameters) <= 1
+        or conn.path_to_dbfile in ("", ":memory:")
+        or conn.in_transaction
+    ):
+        return {parameter: load_tree(conn, parameter) for parameter in parameters}
+
+    from qcodes.dataset.sqlite.connection_manager import get_connection_manager
+
+    connection_manager = get_connection_manager()
+
+    def load_tree_in_worker(parameter: str) -> T:
+        with connection_manager.read_only_connection(
+            conn.path_to_dbfile
+        ) as worker_conn:
+            return load_tree(worker_conn, parameter)
+
+    with ThreadPoolExecutor(
+        max_workers=min(max_workers, len(parameters)),
+        thread_name_prefix="qcodes_load_parameter_tree",
+    ) as executor:
+        trees = list(executor.map(load_tree_in_worker, parameters))
+    return dict(zip(parameters, trees))
 
 
 def get_shaped_parameter_data_for_one_paramtree(
@@ -190,6 +268,18 @@ def get_shaped_parameter_data_for_one_paramtree(
     one_param_output, _ = get_parameter_data_for_one_paramtree(
         conn, table_name, rundescriber, output_param, start, end, callback
     )
+    return _reshape_parameter_tree_data(rundescriber, output_param, one_param_output)
+
+
+def _reshape_parameter_tree_data(
+    rundescriber: RunDescriber,
+    output_param: str,
+    one_param_output: dict[str, np.ndarray],
+) -> dict[str, np.ndarray]:
+    """
+    Reshape the data of a parameter tree according to the shapes in the run
+    description if the number of points matches the expected number.
+    """
     if rundescriber.shapes is not None:
         shape = rundescriber.shapes.get(output_param)
 
@@ -233,16 +323,40 @@ def get_parameter_data_for_one_paramtree(
     start: int | None,
     end: int | None,
     callback: Callable[[float], None] | None = None,
+    *,
+    after_id: int | None = None,
+    until_id: int | None = None,
 ) -> tuple[dict[str, np.ndarray], int]:
-    interdeps = rundescriber.interdeps
+    # the values are converted column by column, so the converters that are
+    # called for each value are skipped
     data, paramspecs, n_rows = _get_data_for_one_param_tree(
-        conn, table_name, interdeps, output_param, start, end, callback
+        conn,
+        table_name,
+        rundescriber.interdeps,
+        output_param,
+        start,
+        end,
+        callback,
+        skip_converters=True,
+        after_id=after_id,
+        until_id=until_id,
     )
     if not paramspecs[0].name == output_param:
         raise ValueError(
             "output_param should always be the first "
             "parameter in a parameter tree. It is not"
         )
+    if all(paramspec.type in ("numeric", "complex") for paramspec in paramspecs):
+        return _raw_data_to_arrays(data, paramspecs), n_rows
+    data = list(
+        zip(
+            *(
+                _convert_raw_column(paramspec, column)
+                for paramspec, column in zip(paramspecs, zip(*data))
+            )
+        )
+    )
+    sidecar_columns = resolve_sidecar_references(conn, table_name, data, paramspecs)
     _expand_data_to_arrays(data, paramspecs)
 
     param_data = {}
@@ -252,8 +366,11 @@ def get_parameter_data_for_one_paramtree(
 
     specs_and_data = zip_longest(paramspecs, res_t, fillvalue=())
 
-    for paramspec, column_data in specs_and_data:
+    for i, (paramspec, column_data) in enumerate(specs_and_data):
         assert isinstance(paramspec, ParamSpecBase)
+        if i in sidecar_columns:
+            param_data[paramspec.name] = sidecar_columns[i]
+            continue
         # its not obvious how to type that paramspecs is always
         # longer than res_t
         if paramspec.type == "numeric":
@@ -269,6 +386,98 @@ def get_parameter_data_for_one_paramtree(
     return param_data, n_rows
 
 
+def _raw_data_to_arrays(
+    data: list[tuple[Any, ...]], paramspecs: Sequence[ParamSpecBase]
+) -> dict[str, np.ndarray]:
+    """
+    Convert rows of values of 'numeric' and 'complex' columns, as returned by
+    sqlite without converters, into one array per column. Numeric values
+    become float64 and complex values complex128. If all columns are numeric
+    they are converted in one go, otherwise each column is converted with
+    one numpy call.
+    """
+    if all(paramspec.type == "numeric" for paramspec in paramspecs):
+        try:
+            values = np.array(data, dtype=np.float64)
+        except (TypeError, ValueError):
+            pass
+        else:
+            columns = values.reshape(len(data), len(paramspecs)).T.copy()
+            return {
+                paramspec.name: column for paramspec, column in zip(paramspecs, columns)
+            }
+
+    raw_columns = zip_longest(paramspecs, zip(*data), fillvalue=())
+    return {
+        paramspec.name: _convert_raw_column(paramspec, column)
+        for paramspec, column in raw_columns
+    }
+
+
+def _convert_raw_column(paramspec: ParamSpecBase, values: Sequence[Any]) -> Any:
+    """
+    Convert the values of a column, as returned by sqlite without converters,
+    the way the converter registered for the type of the parameter would.
+    'numeric' and 'complex' columns are converted into one array per column,
+    the values of 'array' columns are decoded one by one.
+    """
+    if paramspec.type == "numeric":
+        return _numeric_column_to_array(values)
+    if paramspec.type == "complex":
+        return _complex_column_to_array(values)
+    if paramspec.type == "array":
+        from qcodes.dataset.sqlite.database import _convert_array
+
+        return [
+            _convert_array(value) if isinstance(value, bytes) else value
+            for value in values
+        ]
+    return values
+
+
+def _numeric_column_to_array(values: Sequence[Any]) -> np.ndarray:
+    """
+    Convert the values of a 'numeric' column, as returned by sqlite without
+    converters, into a float64 array. NaN and infinities, which are stored
+    as text, are parsed by numpy. If some values can not be converted to
+    float, they are converted value by value the way the converter of the
+    'numeric' type does, and an object array is returned.
+    """
+    try:
+        return np.array(values, dtype=np.float64)
+    except (TypeError, ValueError):
+        pass
+    from qcodes.dataset.sqlite.database import (
+        _convert_numeric,
+        this_session_default_encoding,
+    )
+
+    def convert(value: Any) -> Any:
+        if isinstance(value, str):
+            return _convert_numeric(value.encode(this_session_default_encoding))
+        if isinstance(value, bytes):
+            return _convert_numeric(value)
+        return value
+
+    return list_of_data_to_maybe_ragged_nd_array(
+        [convert(value) for value in values], np.float64
+    )
+
+
+def _complex_column_to_array(blobs: Sequence[Any]) -> np.ndarray:
+    """
+    Decode the blobs of a 'complex' column, as returned by sqlite without
+    converters, into a complex128 array with one numpy call, see
+    :func:`.complex_codec.decode_complex_column`. Columns with NULL values
+    are decoded value by value.
+    """
+    if all(isinstance(blob, bytes) for blob in blobs):
+        return decode_complex_column(blobs)
+    return list_of_data_to_maybe_ragged_nd_array(
+        [decode_complex(blob) if isinstance(blob, bytes) else blob for blob in blobs]
+    )
+
+
 def _expand_data_to_arrays(
     data: list[tuple[Any, ...]], paramspecs: Sequence[ParamSpecBase]
 ) -> None:
@@ -281,7 +490,14 @@ def _expand_data_to_arrays(
             types_mapping: dict[int, Callable[[str], np.dtype[Any]]] = {}
             for i, x in enumerate(types):
                 if x == "numeric":
-                    types_mapping[i] = lambda _: np.dtype(np.float64)
+                    # columns with text are kept as objects, like they are
+                    # when loading trees without arrays
+                    numeric_dtype = np.dtype(
+                        object
+                        if any(isinstance(row[i], str) for row in data)
+                        else np.float64
+                    )
+                    types_mapping[i] = lambda _, dtype=numeric_dtype: dtype
                 elif x == "complex":
                     types_mapping[i] = lambda _: np.dtype(np.complex128)
                 elif x == "text":
@@ -335,6 +551,10 @@ def _get_data_for_one_param_tree(
     start: int | None,
     end: int | None,
     callback: Callable[[float], None] | None = None,
+    *,
+    skip_converters: bool = False,
+    after_id: int | None = None,
+    until_id: int | None = None,
 ) -> tuple[list[tuple[Any, ...]], list[ParamSpecBase], int]:
     output_param_spec = interdeps._id_to_paramspec[output_param]
     # find all the dependencies of this param
@@ -350,6 +570,9 @@ def _get_data_for_one_param_tree(
         start=start,
         end=end,
         callback=callback,
+        skip_converters=skip_converters,
+        after_id=after_id,
+        until_id=until_id,
     )
     n_rows = len(res)
     return res, paramspecs, n_rows
@@ -398,26 +621,31 @@ def get_table_max_id(conn: ConnectionPlus, table_name: str) -> int:
     return one(c, 0)
 
 
-def _get_offset_limit_for_callback(
-    conn: ConnectionPlus, table_name: str, param_name: str
-) -> tuple[np.ndarray, np.ndarray]:
+def _get_id_bounds_for_callback(
+    conn: ConnectionPlus,
+    table_name: str,
+    param_name: str,
+    after_id: int | None = None,
+    until_id: int | None = None,
+) -> np.ndarray:
     """
     Since sqlite3 does not allow to keep track of the data loading progress,
-    we compute how many sqlite request correspond to a progress of
-    config.dataset.callback_percent.
-    This function return a list of offset and a integer value of limit to
-    be used to run such SQL requests.
+    we split the rows to load into chunks of ids that correspond to a
+    progress of config.dataset.callback_percent. Each chunk is loaded with
+    its own SQL request that only visits the rows with ids in that chunk.
 
     Args:
         conn: Connection to the database
         table_name: Name of the table that holds the data
         param_name: Name of the parameter to get the setpoints of
+        after_id: Only rows with an id larger than this are loaded. None
+            is equivalent to 0.
+        until_id: Only rows with an id up to and including this are loaded.
+            None is equivalent to the max id of the table.
 
     Returns:
-        offset: list of SQL offset corresponding to a progress of
-            config.dataset.callback_percent
-        limit: SQL limit corresponding to a progress of
-            config.dataset.callback_percent
+        The bounds of the chunks, the rows with ids in
+        ``(bounds[i], bounds[i + 1]]`` make up the i-th chunk.
 
     """
 
@@ -425,28 +653,27 @@ def _get_offset_limit_for_callback(
     # dependent parameter
     nb_row = get_parameter_db_row(conn, table_name, param_name)
 
-    # Second, we get the max id of the table
-    max_id = get_table_max_id(conn, table_name)
+    # Second, we get the range of ids to load
+    lower = after_id if after_id is not None else 0
+    if until_id is None:
+        until_id = get_table_max_id(conn, table_name) or 0
+    upper = max(until_id, lower)
 
-    # Third, we create a list of offset corresponding to a progress of
+    # Third, we create a list of bounds corresponding to a progress of
     # config.dataset.callback_percent
     if nb_row >= 100:
         # Using linspace with dtype=int ensure of having an array finishing
-        # by max_id
-        offset: npt.NDArray[np.int32] = np.linspace(
-            0, max_id, int(100 / config.dataset.callback_percent) + 1, dtype=int
+        # by upper
+        bounds: npt.NDArray[np.int64] = np.linspace(
+            lower, upper, int(100 / config.dataset.callback_percent) + 1, dtype=int
         )
 
     else:
         # If there is less than 100 row to be downloaded, we overwrite the
         # config.dataset.callback_percent to avoid many calls for small download
-        offset = np.array([0, nb_row // 2, nb_row])
-
-    # The number of row downloaded between two iterations may vary
-    # We compute the limit corresponding to each offset
-    limit = offset[1:] - offset[:-1]
+        bounds = np.array([lower, (lower + upper) // 2, upper])
 
-    return offset, limit
+    return bounds
 
 
 def get_parameter_tree_values(
@@ -457,6 +684,9 @@ def get_parameter_tree_values(
     start: int | None = None,
     end: int | None = None,
     callback: Callable[[float], None] | None = None,
+    skip_converters: bool = False,
+    after_id: int | None = None,
+    until_id: int | None = None,
 ) -> list[tuple[Any, ...]]:
     """
     Get the values of one or more columns from a data table. The rows
@@ -479,6 +709,14 @@ def get_parameter_tree_values(
             nothing is returned.
         callback: Function called during the data loading every
             config.dataset.callback_percent.
+        skip_converters: If True, the values are returned the way sqlite
+            stores them rather than being passed through the converters
+            registered for the declared types of the columns.
+        after_id: Only retrieve rows with an id larger than this. Unlike
+            ``start`` this does not require sqlite to step over the rows
+            that come before. ``start`` and ``end`` count from the first
+            row after ``after_id``.
+        until_id: Only retrieve rows with an id up to and including this.
 
     Returns:
         A list of list. The outer list index is row number, the inner list
@@ -488,60 +726,127 @@ def get_parameter_tree_values(
 
     cursor = conn.cursor()
 
-    # Without callback: int
-    # With callback: np.ndarray
-    offset: int | np.ndarray
-    limit: int | np.ndarray
-
     offset = max((start - 1), 0) if start is not None else 0
     limit = max((end - offset), 0) if end is not None else -1
 
     if start is not None and end is not None and start > end:
         limit = 0
 
+    # Create the base sql query
+    columns = [toplevel_param_name] + list(other_param_names)
+    if skip_converters:
+        # an expression has no declared type, so sqlite3 does not look up a
+        # converter for it
+        selection = ",".join(f'+"{column}" AS "{column}"' for column in columns)
+    else:
+        selection = ",".join(f'"{column}"' for column in columns)
+
     # start and end currently not working with callback
     if start is None and end is None and callback is not None:
-        offset, limit = _get_offset_limit_for_callback(
-            conn, result_table_name, toplevel_param_name
+        bounds = _get_id_bounds_for_callback(
+            conn, result_table_name, toplevel_param_name, after_id, until_id
         )
+        sql = f"""
+               SELECT {selection} FROM "{result_table_name}"
+               WHERE {toplevel_param_name} IS NOT NULL
+               AND id > ? AND id <= ?
+               """
+        progress_current = 100 / (len(bounds) - 1)
 
-    # Create the base sql query
-    columns = [toplevel_param_name] + list(other_param_names)
+        progress_total = 0.0
+        callback(progress_total)
+
+        res: list[tuple[Any, ...]] = []
+        for lower, upper in zip(bounds[:-1], bounds[1:]):
+            cursor.execute(sql, (int(lower), int(upper)))
+            res.extend(many_many(cursor, *columns))
+            progress_total += progress_current
+            callback(progress_total)
+        return res
+
+    id_conditions = ""
+    id_values: list[int] = []
+    if after_id is not None:
+        id_conditions += " AND id > ?"
+        id_values.append(after_id)
+    if until_id is not None:
+        id_conditions += " AND id <= ?"
+        id_values.append(until_id)
     sql = f"""
-           SELECT "{'","'.join(columns)}" FROM "{result_table_name}"
-           WHERE {toplevel_param_name} IS NOT NULL
+           SELECT {selection} FROM "{result_table_name}"
+           WHERE {toplevel_param_name} IS NOT NULL{id_conditions}
            LIMIT ? OFFSET ?
            """
+    cursor.execute(sql, (*id_values, limit, offset))
+    return many_many(cursor, *columns)
 
-    # Request if no callback
-    if callback is None:
-        cursor.execute(sql, (limit, offset))
-        res = many_many(cursor, *columns)
 
-    # Request if callback
-    elif callback is not None:
-        assert isinstance(offset, np.ndarray)
-        assert isinstance(limit, np.ndarray)
-        progress_current = 100 / len(limit)
+def get_parameter_tree_id_range(
+    conn: ConnectionPlus, result_table_name: str, toplevel_param_name: str
+) -> tuple[int, int, int]:
+    """
+    Get the number of rows of a data table where the 'toplevel_param_name'
+    column has non-NULL values, i.e. the rows that
+    :func:`get_parameter_tree_values` retrieves, and the smallest and the
+    largest of their ids.
 
-        # 0
-        progress_total = 0.0
-        callback(progress_total)
+    Args:
+        conn: Connection to the DB file
+        result_table_name: The result table to get the row ids of
+        toplevel_param_name: Name of the column that holds the top level
+            parameter
 
-        # 1
-        cursor.execute(sql, (limit[0], offset[0]))
-        res = many_many(cursor, *columns)
-        progress_total += progress_current
-        callback(progress_total)
+    Returns:
+        The number of rows, and the smallest and the largest id, which are 0
+        if there are no rows
 
-        # others
-        for i in range(1, len(offset) - 1):
-            cursor.execute(sql, (limit[i], offset[i]))
-            res.extend(many_many(cursor, *columns))
-            progress_total += progress_current
-            callback(progress_total)
+    """
+    cursor = conn.execute(
+        f"""
+        SELECT COUNT(*), MIN(id), MAX(id) FROM "{result_table_name}"
+        WHERE "{toplevel_param_name}" IS NOT NULL
+        """
+    )
+    n_rows, min_id, max_id = cursor.fetchone()
+    return n_rows, min_id or 0, max_id or 0
 
-    return res
+
+def get_parameter_tree_row_id(
+    conn: ConnectionPlus,
+    result_table_name: str,
+    toplevel_param_name: str,
+    position: int,
+    after_id: int = 0,
+) -> int | None:
+    """
+    Get the id of a row of a data table where the 'toplevel_param_name'
+    column has a non-NULL value by its position among those rows. Only the
+    rows with an id larger than ``after_id`` are stepped over, so that the
+    ids of rows far into the table can be found starting from the id of a
+    row close before them.
+
+    Args:
+        conn: Connection to the DB file
+        result_table_name: The result table to get the row id of
+        toplevel_param_name: Name of the column that holds the top level
+            parameter
+        position: The (0-indexed) position of the row among the rows with
+            an id larger than ``after_id``
+        after_id: Only count the rows with an id larger than this
+
+    Returns:
+        The id of the row, or None if there are not that many rows
+
+    """
+    row = conn.execute(
+        f"""
+        SELECT id FROM "{result_table_name}"
+        WHERE "{toplevel_param_name}" IS NOT NULL AND id > ?
+        ORDER BY id LIMIT 1 OFFSET ?
+        """,
+        (after_id, position),
+    ).fetchone()
+    return None if row is None else row[0]
 
 
 def get_runid_from_expid_and_counter(
@@ -631,74 +936,231 @@ def get_runid_from_guid(conn: ConnectionPlus, guid: str) -> int | None:
     return run_id
 
 
-def _query_guids_from_run_spec(
+RUN_SUMMARY_ORDER_COLUMNS = (
+    "run_id",
+    "exp_id",
+    "name",
+    "run_timestamp",
+    "completed_timestamp",
+    "captured_run_id",
+    "captured_counter",
+)
+
+RUN_SUMMARY_OPTIONAL_COLUMNS = (
+    "run_description",
+    "snapshot",
+    "parent_datasets",
+    "metadata",
+)
+
+_RUN_SUMMARY_COLUMNS = (
+    "run_id",
+    "exp_id",
+    "name",
+    "result_counter",
+    "run_timestamp",
+    "completed_timestamp",
+    "is_completed",
+    "parameters",
+    "guid",
+    "captured_run_id",
+    "captured_counter",
+)
+
+
+def get_raw_run_summaries(
     conn: ConnectionPlus,
-    captured_run_id: int | None = None,
-    captured_counter: int | None = None,
+    *,
+    columns: Sequence[str] = RUN_SUMMARY_OPTIONAL_COLUMNS,
+    run_ids: Sequence[int] | None = None,
+    exp_id: int | None = None,
     experiment_name: str | None = None,
     sample_name: str | None = None,
-) -> list[str]:
+    captured_run_id: int | None = None,
+    captured_counter: int | None = None,
+    where: Mapping[str, Any] | None = None,
+    order_by: str = "run_id",
+    descending: bool = False,
+    limit: int | None = None,
+    offset: int = 0,
+) -> list[dict[str, Any]]:
     """
-    Get the GUIDs of runs matching the supplied run specifications.
-
-    # Todo: do we need to select by start/end time too? Is result name useful?
+    Get the attributes of the runs matching the supplied specifications, one
+    dictionary per run, with a single query that joins the runs with their
+    experiments.
 
     Args:
-        conn: connection to the database.
-        captured_run_id: the run_id that was assigned to this
-            run at capture time.
-        captured_counter: the counter that was assigned to this
-            run at capture time.
+        conn: Connection to the database.
+        columns: The columns of the runs table that are large or rarely
+            needed to also get, out of ``RUN_SUMMARY_OPTIONAL_COLUMNS``.
+            ``metadata`` stands for the metadata of the runs, which is
+            returned as a dictionary of the tags that the run has a value for.
+        run_ids: The run ids that the runs should have.
+        exp_id: Id of the experiment that the runs should belong to.
         experiment_name: Name of the experiment that the runs should belong to.
-        sample_name: Name of the sample that the query should be restricted to.
+        sample_name: Name of the sample that the runs should belong to.
+        captured_run_id: The run_id that was assigned to the runs at
+            capture time.
+        captured_counter: The counter that was assigned to the runs at
+            capture time.
+        where: Mapping from metadata tags to the value that the metadata of
+            the runs should have, or to a tuple of an operator and a value,
+            e.g. ``("<", 20)``. Requires a database of version 11 or later.
+        order_by: The column of the runs table to sort the runs by, out of
+            ``RUN_SUMMARY_ORDER_COLUMNS``. Runs with the same value are
+            sorted by run_id.
+        descending: Whether to sort the runs in descending order.
+        limit: The maximum number of runs to get. If None, all runs are
+            returned.
+        offset: The number of runs to skip, for getting the runs one page at
+            a time.
 
     Returns:
-        A list of the GUIDs matching the supplied specifications.
-
-    """
-    # first find all experiments that match the given sample
-    # and experiment name
-    exp_query = {}
-    exp_ids: list[int] | None
-    if experiment_name is not None or sample_name is not None:
-        if sample_name is not None:
-            exp_query["sample_name"] = sample_name
-        if experiment_name is not None:
-            exp_query["name"] = experiment_name
-        exp_ids = get_matching_exp_ids(conn, **exp_query)
-        if exp_ids == []:
-            return []
-    else:
-        exp_ids = None
+        A list of dictionaries with the standard and the requested optional
+        columns of the runs table, as well as the ``exp_name`` and
+        ``sample_name`` of the experiment of each run.
 
-    conds = []
-    inputs = []
-
-    if exp_ids is not None:
-        exp_placeholder = sql_placeholder_string(len(exp_ids))
-        conds.append(f"exp_id in {exp_placeholder}")
-        inputs.extend(exp_ids)
-    if captured_run_id is not None:
-        conds.append("captured_run_id is ?")
-        inputs.append(captured_run_id)
-    if captured_counter is not None:
-        conds.append("captured_counter is ?")
-        inputs.append(captured_counter)
-
-    if len(conds) >= 1:
-        where_clause = " WHERE " + " AND ".join(conds)
-    else:
-        where_clause = ""
+    """
+    unknown_columns = set(columns) - set(RUN_SUMMARY_OPTIONAL_COLUMNS)
+    if unknown_columns:
+        raise ValueError(
+            f"Unknown columns {sorted(unknown_columns)}, the optional columns "
+            f"are {RUN_SUMMARY_OPTIONAL_COLUMNS}."
+        )
+    if order_by not in RUN_SUMMARY_ORDER_COLUMNS:
+        raise ValueError(
+            f"Can not order runs by {order_by!r}, they can be ordered by "
+            f"{RUN_SUMMARY_ORDER_COLUMNS}."
+        )
+    has_metadata_table = _check_if_table_found(conn, "run_metadata")
+    if where and not has_metadata_table:
+        raise RuntimeError(
+            "Can not select runs by their metadata in a database before version 11."
+        )
 
-    query = "SELECT guid from runs" + where_clause + " ORDER BY run_id"
+    table_columns = [row[1] for row in conn.execute("PRAGMA table_info(runs)")]
+    metadata_columns = (
+        [col for col in table_columns if col not in RUNS_TABLE_COLUMNS]
+        if "metadata" in columns and not has_metadata_table
+        else []
+    )
+    # runs tables of old databases may not have a parent_datasets column
+    optional_columns = [
+        col for col in columns if col != "metadata" and col in table_columns
+    ]
+    selected = [f'runs."{col}"' for col in (*_RUN_SUMMARY_COLUMNS, *optional_columns)]
+    selected += ["experiments.name", "experiments.sample_name"]
+    selected += [f'runs."{col}"' for col in metadata_columns]
 
-    cursor = conn.cursor()
-    if len(inputs) > 0:
-        cursor.execute(query, inputs)
+    conds = []
+    inputs: list[Any] = []
+    if run_ids is not None:
+        conds.append(f"runs.run_id IN {sql_placeholder_string(len(run_ids))}")
+        inputs.extend(run_ids)
+    for column, value in (
+        ("runs.exp_id", exp_id),
+        ("experiments.name", experiment_name),
+        ("experiments.sample_name", sample_name),
+        ("runs.captured_run_id", captured_run_id),
+        ("runs.captured_counter", captured_counter),
+    ):
+        if value is not None:
+            conds.append(f"{column} IS ?")
+            inputs.append(value)
+    for tag, condition in (where or {}).items():
+        cond, values = _metadata_condition(tag, condition)
+        conds.append(cond)
+        inputs.extend(values)
+    where_clause = " WHERE " + " AND ".join(conds) if conds else ""
+
+    direction = "DESC" if descending else "ASC"
+    runs_clause = (
+        "FROM runs JOIN experiments ON runs.exp_id = experiments.exp_id"
+        f"{where_clause} "
+        f'ORDER BY runs."{order_by}" {direction}, runs.run_id {direction} '
+        "LIMIT ? OFFSET ?"
+    )
+    inputs += [-1 if limit is None else limit, offset]
+
+    n_columns = len(_RUN_SUMMARY_COLUMNS) + len(optional_columns)
+    summaries = []
+    for row in conn.execute(f"SELECT {', '.join(selected)} {runs_clause}", inputs):
+        summary = dict(zip((*_RUN_SUMMARY_COLUMNS, *optional_columns), row))
+        summary["exp_name"] = row[n_columns]
+        summary["sample_name"] = row[n_columns + 1]
+        for col in columns:
+            summary.setdefault(col, None)
+        if "metadata" in columns:
+            summary["metadata"] = {
+                tag: value
+                for tag, value in zip(metadata_columns, row[n_columns + 2 :])
+                if value is not None
+            }
+        summaries.append(summary)
+
+    if "metadata" in columns and has_metadata_table and summaries:
+        metadata_by_run_id = {
+            summary["run_id"]: summary["metadata"] for summary in summaries
+        }
+        if conds or limit is not None or offset:
+            cursor = conn.execute(
+                "SELECT run_id, tag, value FROM run_metadata "
+                f"WHERE run_id IN (SELECT runs.run_id {runs_clause}) ORDER BY rowid",
+                inputs,
+            )
+        else:
+            # the metadata of all runs is read faster without the subquery
+            cursor = conn.execute(
+                "SELECT run_id, tag, value FROM run_metadata ORDER BY rowid"
+            )
+        for run_id, tag, value in cursor:
+            if run_id in metadata_by_run_id:
+                metadata_by_run_id[run_id][tag] = value
+    return summaries
+
+
+_METADATA_OPERATORS = {
+    "==": "=",
+    "!=": "!=",
+    "<": "<",
+    "<=": "<=",
+    ">": ">",
+    ">=": ">=",
+    "like": "LIKE",
+    "in": "IN",
+}
+
+
+def _metadata_condition(tag: str, condition: Any) -> tuple[str, list[Any]]:
+    """
+    Build the SQL condition that selects the runs that have metadata with the
+    given tag whose value matches the condition. The condition is either a
+    value that the metadata must be equal to, or a tuple of an operator and a
+    value, where the operator is one of "==", "!=", "<", "<=", ">", ">=",
+    "like" (a pattern in the syntax of the SQL LIKE operator) and "in" (a
+    sequence of values). Values are compared like in SQLite, i.e. numbers
+    compare less than text. Runs that do not have the tag never match.
+    """
+    if isinstance(condition, tuple):
+        operator, value = condition
     else:
-        cursor.execute(query)
-
-    return [guid for (guid,) in cursor.fetchall()]
+        operator, value = "==", condition
+    if operator not in _METADATA_OPERATORS:
+        raise ValueError(
+            f"Unknown operator {operator!r} for tag {tag!r}, the operators "
+            f"are {tuple(_METADATA_OPERATORS)}."
+        )
+    if operator == "in":
+        values = [tag, *value]
+        value_placeholder = sql_placeholder_string(len(value))
+    else:
+        values = [tag, value]
+        value_placeholder = "?"
+    cond = (
+        "runs.run_id IN (SELECT run_id FROM run_metadata WHERE tag = ? "
+        f"AND value {_METADATA_OPERATORS[operator]} {value_placeholder})"
+    )
+    return cond, values
 
 
 def _get_layout_id(
@@ -1800,9 +2262,21 @@ def get_data_by_tag_and_table_name(
 ) -> VALUE | None:
     """
     Get data from the "tag" column for the row in "runs" table where
-    "result_table_name" matches "table_name".
-    Returns None if the "tag" column is missing in "runs" table.
+    "result_table_name" matches "table_name", or the metadata of the run
+    with the given tag if the tag is not a column of the "runs" table.
+    Returns None if the run has no data for the tag.
     """
+    if tag not in RUNS_TABLE_COLUMNS and _check_if_table_found(conn, "run_metadata"):
+        cursor = conn.execute(
+            """
+            SELECT value FROM run_metadata
+            JOIN runs ON run_metadata.run_id = runs.run_id
+            WHERE runs.result_table_name = ? AND run_metadata.tag = ?
+            """,
+            (table_name, tag),
+        )
+        row = cursor.fetchone()
+        return row[0] if row is not None else None
     try:
         data = select_one_where(conn, "runs", tag, "result_table_name", table_name)
     except RuntimeError as e:
@@ -1823,6 +2297,22 @@ def get_metadata_from_run_id(conn: ConnectionPlus, run_id: int) -> dict[str, Any
     """
     Get all metadata associated with the specified run
     """
+    if not _check_if_table_found(conn, "run_metadata"):
+        return _get_metadata_from_dynamic_columns(conn, run_id)
+    cursor = conn.execute(
+        "SELECT tag, value FROM run_metadata WHERE run_id = ? ORDER BY rowid",
+        (run_id,),
+    )
+    return dict(cursor.fetchall())
+
+
+def _get_metadata_from_dynamic_columns(
+    conn: ConnectionPlus, run_id: int
+) -> dict[str, Any]:
+    """
+    Get all metadata associated with the specified run from the columns of
+    the runs table of a database before version 11.
+    """
     non_metadata = RUNS_TABLE_COLUMNS
 
     metadata = {}
@@ -1917,6 +2407,10 @@ def add_data_to_dynamic_columns(
     Add columns from keys and insert values.
     (updates if exists, creates otherwise)
 
+    For the runs table of a database from version 11 on, only the standard
+    columns of the table are updated, the other keys are added to the
+    metadata of the run with :func:`add_metadata_to_run`.
+
     Note that None is not a valid value, and keys
     should be valid SQLite column names (i.e. contain only
     alphanumeric characters and underscores).
@@ -1928,6 +2422,17 @@ def add_data_to_dynamic_columns(
         table_name: the table to add to, defaults to runs
 
     """
+    if table_name == "runs" and _check_if_table_found(conn, "run_metadata"):
+        validate_dynamic_column_data(data)
+        columns = {tag: val for tag, val in data.items() if tag in RUNS_TABLE_COLUMNS}
+        if columns:
+            update_columns(conn, row_id, table_name, columns)
+        add_metadata_to_run(
+            conn,
+            row_id,
+            {tag: val for tag, val in data.items() if tag not in RUNS_TABLE_COLUMNS},
+        )
+        return
     try:
         insert_data_in_dynamic_columns(conn, row_id, table_name, data)
     except sqlite3.OperationalError as e:
@@ -1939,6 +2444,33 @@ def add_data_to_dynamic_columns(
             raise e
 
 
+def add_metadata_to_run(
+    conn: ConnectionPlus, run_id: int, metadata: Mapping[str, Any]
+) -> None:
+    """
+    Add metadata to a run, replacing the values of tags that the run already
+    has. The values are stored with their type, such that they can be
+    compared in queries, e.g. by :func:`get_raw_run_summaries`.
+
+    Note that None is not a valid value, and tags should only contain
+    alphanumeric characters and underscores.
+
+    Args:
+        conn: the connection to the sqlite database
+        run_id: the run to add the metadata to
+        metadata: the metadata to add
+
+    """
+    validate_dynamic_column_data(metadata)
+    conn.executemany(
+        """
+        INSERT INTO run_metadata (run_id, tag, value) VALUES (?, ?, ?)
+        ON CONFLICT (run_id, tag) DO UPDATE SET value = excluded.value
+        """,
+        [(run_id, tag, value) for tag, value in metadata.items()],
+    )
+
+
 def get_experiment_name_from_experiment_id(conn: ConnectionPlus, exp_id: int) -> str:
     exp_name = select_one_where(conn, "experiments", "name", "exp_id", exp_id)
     assert isinstance(exp_name, str)
@@ -2073,6 +2605,7 @@ def load_new_data_for_rundescriber(
     table_name: str,
     rundescriber: RunDescriber,
     read_status: Mapping[str, int],
+    max_workers: int | None = None,
 ) -> tuple[dict[str, dict[str, np.ndarray]], dict[str, int]]:
     """
     Load all new data for a given rundesciber since the rows given by read_status.
@@ -2081,31 +2614,45 @@ def load_new_data_for_rundescriber(
         conn: The connection to the sqlite database
         table_name: The name of the table the data is stored in
         rundescriber: The rundescriber that describes the run
-        read_status: Mapping from dependent parameter name to number of rows
-          read from the db previously.
+        read_status: Mapping from dependent parameter name to the id of the
+          last row read from the db previously.
+        max_workers: Number of threads that load the parameter trees
+          concurrently, see :func:`_load_parameter_trees`. If None,
+          config.dataset.load_max_workers is used.
 
     Returns:
-        new data and an updated number of rows read.
+        new data and an updated id of the last row read.
 
     """
 
     parameters = tuple(ps.name for ps in rundescriber.interdeps.non_dependencies)
     updated_read_status: dict[str, int] = dict(read_status)
-    new_data_dict: dict[str, dict[str, np.ndarray]] = {}
 
-    for meas_parameter in parameters:
-        start = read_status.get(meas_parameter, 0) + 1
-        new_data, n_rows_read = get_parameter_data_for_one_paramtree(
-            conn,
+    # Rows are only ever appended to the results table, so reading up to the
+    # max id at this point in time is consistent across parameter trees
+    # even if rows are written while we read
+    until_id = get_table_max_id(conn, table_name) or 0
+
+    def load_tree(
+        tree_conn: ConnectionPlus, meas_parameter: str
+    ) -> dict[str, np.ndarray]:
+        new_data, _ = get_parameter_data_for_one_paramtree(
+            tree_conn,
             table_name,
             rundescriber=rundescriber,
             output_param=meas_parameter,
-            start=start,
+            start=None,
             end=None,
             callback=None,
+            after_id=read_status.get(meas_parameter, 0),
+            until_id=until_id,
         )
-        new_data_dict[meas_parameter] = new_data
-        updated_read_status[meas_parameter] = start + n_rows_read - 1
+        return new_data
+
+    new_data_dict = _load_parameter_trees(conn, parameters, load_tree, max_workers)
+    for meas_parameter in parameters:
+        after_id = read_status.get(meas_parameter, 0)
+        updated_read_status[meas_parameter] = max(after_id, until_id)
     return new_data_dict, updated_read_status
 
 
@@ -2157,34 +2704,36 @@ def get_experiment_attributes_by_exp_id(
 
 
 def _populate_results_table(
-    source_conn: ConnectionPlus,
-    target_conn: ConnectionPlus,
+    conn: ConnectionPlus,
+    source_schema: str,
     source_table_name: str,
     target_table_name: str,
 ) -> None:
     """
-    Copy over all the entries of the results table
-    """
-    get_data_query = f"""
-                     SELECT *
-                     FROM "{source_table_name}"
-                     """
-
-    source_cursor = source_conn.cursor()
-    target_cursor = target_conn.cursor()
-
-    for row in source_cursor.execute(get_data_query):
-        column_names = ",".join(
-            d[0] for d in source_cursor.description[1:]
-        )  # the first key is "id"
-        values = tuple(val for val in row[1:])
-        value_placeholders = sql_placeholder_string(len(values))
-        insert_data_query = f"""
-        INSERT INTO "{target_table_name}"
-        ({column_names})
-        values {value_placeholders}
+    Copy over all the entries of a results table in a database that is
+    attached to the connection under the given schema name into a results
+    table of the main database of the connection. The rows are copied with a
+    single ``INSERT ... SELECT`` statement, such that the values are copied as
+    stored without passing through Python.
+    """
+    # the first column is "id", which the target table assigns itself
+    column_names = [
+        row[1]
+        for row in conn.execute(
+            f'PRAGMA "{source_schema}".table_info("{source_table_name}")'
+        ).fetchall()
+        if row[1] != "id"
+    ]
+    if not column_names:
+        return
+    columns = ",".join(f'"{column}"' for column in column_names)
+    conn.execute(
+        f"""
+        INSERT INTO main."{target_table_name}" ({columns})
+        SELECT {columns} FROM "{source_schema}"."{source_table_name}"
+        ORDER BY id
         """
-        target_cursor.execute(insert_data_query, values)
+    )
 
 
 def _rewrite_timestamps(
@@ -2282,7 +2831,22 @@ def raw_time_to_str_time(
 def _check_if_table_found(conn: ConnectionPlus, table_name: str) -> bool:
     query = "SELECT name FROM sqlite_master WHERE type='table' AND name=?"
     cursor = conn.cursor()
-    return not many_many(cursor.execute(query, (table_name,)), "name") == []
+    if not many_many(cursor.execute(query, (table_name,)), "name") == []:
+        return True
+    # the result tables of archived runs are in the attached archive file
+    schemas = [row[1] for row in cursor.execute("PRAGMA database_list")]
+    return any(
+        many_many(
+            cursor.execute(
+                f'SELECT name FROM "{schema}".sqlite_master '
+                "WHERE type='table' AND name=?",
+                (table_name,),
+            ),
+            "name",
+        )
+        for schema in schemas
+        if schema not in ("main", "temp")
+    )
 
 
 def _get_result_table_name_by_guid(conn: ConnectionPlus, guid: str) -> str:
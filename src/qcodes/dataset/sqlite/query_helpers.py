@@ -5,24 +5,23 @@ are useful for building more database-specific queries out of them.
 
 from __future__ import annotations
 
-import itertools
 from collections.abc import Mapping, Sequence
+from functools import lru_cache
 from typing import TYPE_CHECKING, Any
 
-import numpy as np
 from numpy import ndarray
-from packaging import version
 
+from qcodes.dataset.sqlite.complex_codec import encode_complex_column
 from qcodes.dataset.sqlite.connection import (
     ConnectionPlus,
     atomic,
     atomic_transaction,
     transaction,
 )
-from qcodes.dataset.sqlite.settings import SQLiteSettings
 
 if TYPE_CHECKING:
     import sqlite3
+    from collections.abc import Iterable
 
 # represent the type of  data we can/want map to sqlite column
 VALUE = str | complex | list | ndarray | bool | None
@@ -245,13 +244,55 @@ def insert_values(
         ({_values})
     """
 
-    c = atomic_transaction(conn, query, *values)
+    c = atomic_transaction(conn, query, *_adapt_arrays(conn, values))
     return_value = c.lastrowid
     if return_value is None:
         raise RuntimeError(f"Insert_values into {formatted_name} failed")
     return return_value
 
 
+@lru_cache(maxsize=256)
+def _single_row_insert_query(formatted_name: str, columns: tuple[str, ...]) -> str:
+    """
+    Return the query that inserts a single row into the given columns of the
+    given table. The query string is cached such that the same string object
+    is handed to sqlite on every call, which lets the statement cache of the
+    connection reuse the prepared statement instead of parsing it again.
+    """
+    _columns = ",".join(columns)
+    _values = ",".join(["?"] * len(columns))
+    return f'INSERT INTO "{formatted_name}" ({_columns}) VALUES ({_values})'
+
+
+def _insert_rows(
+    conn: ConnectionPlus,
+    formatted_name: str,
+    columns: Sequence[str],
+    rows: Iterable[Sequence[VALUE]],
+) -> int:
+    """
+    Insert all rows of the ``rows`` iterable with a single ``executemany``
+    call of a prepared single row INSERT statement. The rows are consumed
+    lazily, so no flattened copy of the values is ever made.
+
+    Returns:
+        The rowid of the last inserted row.
+
+    """
+    query = _single_row_insert_query(formatted_name, tuple(columns))
+
+    with atomic(conn) as atomic_conn:
+        c = atomic_conn.cursor()
+        c.executemany(query, rows)
+        no_of_rows = c.rowcount
+        # executemany does not update cursor.lastrowid
+        return_value = one(c.execute("SELECT last_insert_rowid()"), 0)
+
+    if no_of_rows < 1 or return_value is None:
+        raise RuntimeError(f"insert_many_values into {formatted_name} failed ")
+    return return_value
+
+
 def insert_many_values(
     conn: ConnectionPlus,
     formatted_name: str,
@@ -266,69 +307,87 @@ def insert_many_values(
     values: [[x1, y1], [x2, y2], [x3, y3]]
 
     NOTE this need to be committed before closing the connection.
+
+    Returns:
+        The rowid of the last inserted row.
+
     """
     # We demand that all values have the same length
     lengths = [len(val) for val in values]
-    if len(np.unique(lengths)) > 1:
+    if len(set(lengths)) > 1:
         raise ValueError(
             "Wrong input format for values. Must specify the "
             "same number of values for all columns. Received"
             f" lengths {lengths}."
         )
-    no_of_rows = len(lengths)
-    no_of_columns = lengths[0]
-
-    # The TOTAL number of inserted values in one query
-    # must be less than the SQLITE_MAX_VARIABLE_NUMBER
-
-    # Version check cf.
-    # "https://stackoverflow.com/questions/9527851/sqlite-error-
-    #  too-many-terms-in-compound-select"
-    version_str = SQLiteSettings.settings["VERSION"]
-
-    # According to the SQLite changelog, the version number
-    # to check against below
-    # ought to be 3.7.11, but that fails on Travis
-    if version.parse(str(version_str)) <= version.parse("3.8.2"):
-        max_var = SQLiteSettings.limits["MAX_COMPOUND_SELECT"]
-    else:
-        max_var = SQLiteSettings.limits["MAX_VARIABLE_NUMBER"]
-    rows_per_transaction = int(int(max_var) / no_of_columns)
 
-    _columns = ",".join(columns)
-    _values = "(" + ",".join(["?"] * len(values[0])) + ")"
+    rows: Iterable[Sequence[Any]] = values
+    if conn.array_adapter is not None:
+        rows = (_adapt_arrays(conn, row) for row in values)
+    return _insert_rows(conn, formatted_name, columns, rows)
 
-    a, b = divmod(no_of_rows, rows_per_transaction)
-    chunks = a * [rows_per_transaction] + [b]
-    if chunks[-1] == 0:
-        chunks.pop()
 
-    start = 0
-    stop = 0
+def insert_many_columns(
+    conn: ConnectionPlus,
+    formatted_name: str,
+    columns: Sequence[str],
+    values: Sequence[Sequence[VALUE] | ndarray],
+) -> int:
+    """
+    Inserts many values for the specified columns where the values are
+    given column by column rather than row by row. Numpy arrays are
+    converted to sqlite compatible values in one go, and the rows are only
+    assembled while the statement is being executed.
 
-    return_value = None
-    with atomic(conn) as atomic_conn:
-        for ii, chunk in enumerate(chunks):
-            _values_x_params = ",".join([_values] * chunk)
+    Example input:
+    columns: ['xparam', 'yparam']
+    values: [np.array([x1, x2, x3]), np.array([y1, y2, y3])]
+
+    NOTE this need to be committed before closing the connection.
+
+    Returns:
+        The rowid of the last inserted row, like :func:`insert_many_values`.
+
+    """
+    if len(columns) != len(values):
+        raise ValueError(
+            f"Got {len(values)} columns of values for {len(columns)} column names."
+        )
+    lengths = {len(val) for val in values}
+    if len(lengths) != 1:
+        raise ValueError(
+            "Wrong input format for values. All columns must have the "
+            f"same number of values. Received lengths {sorted(lengths)}."
+        )
 
-            query = f"""INSERT INTO "{formatted_name}"
-                        ({_columns})
-                        VALUES
-                        {_values_x_params}
-                     """
-            stop += chunk
-            # we need to make values a flat list from a list of list
-            flattened_values = list(itertools.chain.from_iterable(values[start:stop]))
+    python_values = [_to_sqlite_column(val) for val in values]
+    if conn.array_adapter is not None:
+        python_values = [_adapt_arrays(conn, val) for val in python_values]
+    return _insert_rows(conn, formatted_name, columns, zip(*python_values))
 
-            c = transaction(atomic_conn, query, *flattened_values)
 
-            if ii == 0:
-                return_value = c.lastrowid
-            start += chunk
+def _adapt_arrays(conn: ConnectionPlus, values: Sequence[Any]) -> Sequence[Any]:
+    """
+    Encode the numpy arrays among the values with the array adapter of the
+    connection, if it has one, see :attr:`.ConnectionPlus.array_adapter`.
+    """
+    adapter = conn.array_adapter
+    if adapter is None:
+        return values
+    return [adapter(value) if isinstance(value, ndarray) else value for value in values]
 
-    if return_value is None:
-        raise RuntimeError(f"insert_many_values into {formatted_name} failed ")
-    return return_value
+
+def _to_sqlite_column(values: Sequence[VALUE] | ndarray) -> Sequence[Any]:
+    """
+    Convert a numpy array of values into python values in one go. Complex
+    values are encoded into their blobs here rather than value by value by
+    the sqlite adapter.
+    """
+    if not isinstance(values, ndarray):
+        return values
+    if values.ndim == 1 and values.dtype.kind == "c":
+        return encode_complex_column(values)
+    return values.tolist()
 
 
 def length(conn: ConnectionPlus, formatted_name: str) -> int:
@@ -0,0 +1,271 @@
+"""
+This module provides storage of large 'array' type values in sidecar files
+next to the database file. Values above a size threshold are appended to an
+append-only binary file per run and parameter, and only a small reference
+holding dtype, shape and offset in that file is stored in the result table.
+When loading, the references are resolved into :class:`numpy.memmap` views
+of the sidecar files.
+
+For a database file ``experiments.db`` the data of the parameter ``y`` of the
+run with GUID ``guid`` is stored in ``experiments_sidecar/guid/y.bin``.
+"""
+
+from __future__ import annotations
+
+import logging
+import shutil
+import sqlite3
+import struct
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, BinaryIO
+
+import numpy as np
+
+from qcodes.dataset.sqlite.array_header import (
+    SIDECAR_ARRAY_MAGIC,
+    pack_array_header,
+    unpack_array_header,
+)
+from qcodes.dataset.sqlite.connection import atomic_transaction
+from qcodes.dataset.sqlite.query_helpers import one
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping, Sequence
+
+    from qcodes.dataset.descriptions.param_spec import ParamSpecBase
+    from qcodes.dataset.sqlite.connection import ConnectionPlus
+
+log = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class SidecarArrayReference:
+    """
+    Placeholder for an array whose data is stored in a sidecar file. The
+    file is not known to the reference itself but follows from the run and
+    the parameter that the value belongs to.
+    """
+
+    dtype: np.dtype
+    shape: tuple[int, ...]
+    offset: int
+
+    @property
+    def nbytes(self) -> int:
+        return int(np.prod(self.shape, dtype=np.int64)) * self.dtype.itemsize
+
+
+def adapt_sidecar_reference(ref: SidecarArrayReference) -> sqlite3.Binary:
+    header = pack_array_header(SIDECAR_ARRAY_MAGIC, ref.dtype, ref.shape)
+    return sqlite3.Binary(header + struct.pack("<Q", ref.offset))
+
+
+def convert_sidecar_reference(text: bytes) -> SidecarArrayReference:
+    dtype, shape, offset = unpack_array_header(text, SIDECAR_ARRAY_MAGIC)
+    (data_offset,) = struct.unpack_from("<Q", text, offset)
+    return SidecarArrayReference(dtype=dtype, shape=shape, offset=data_offset)
+
+
+def sidecar_dir(path_to_db: str | Path) -> Path:
+    """
+    Return the directory holding the sidecar files of a database file.
+    """
+    path = Path(path_to_db)
+    return path.with_name(f"{path.stem}_sidecar")
+
+
+def sidecar_run_dir(path_to_db: str | Path, guid: str) -> Path:
+    """
+    Return the directory holding the sidecar files of one run.
+    """
+    return sidecar_dir(path_to_db) / guid
+
+
+class SidecarWriter:
+    """
+    Appends array values of one run to its sidecar files.
+
+    Args:
+        path_to_db: Path to the database file of the run.
+        guid: GUID of the run.
+        threshold: Arrays of at least this many bytes are stored in the
+            sidecar files, smaller arrays are left for the result table.
+
+    """
+
+    def __init__(self, path_to_db: str | Path, guid: str, threshold: int):
+        self.run_dir = sidecar_run_dir(path_to_db, guid)
+        self.threshold = threshold
+        self._files: dict[str, BinaryIO] = {}
+        self._sizes_when_opened: dict[str, int] = {}
+
+    def offload(self, name: str, column: Sequence[Any]) -> list[Any]:
+        """
+        Append the arrays of a column of values of the parameter ``name``
+        that are at least ``threshold`` bytes large to the sidecar file of
+        that parameter and return the column with those arrays replaced by
+        references. The file is flushed before returning, such that the data
+        is visible to readers by the time the references are in the database.
+        """
+        new_column: list[Any] = []
+        file = None
+        for value in column:
+            if (
+                isinstance(value, np.ndarray)
+                and value.size > 0
+                and value.nbytes >= self.threshold
+                and not value.dtype.hasobject
+                and value.dtype.fields is None
+            ):
+                if file is None:
+                    file = self._file(name)
+                offset = file.tell()
+                file.write(np.ascontiguousarray(value).data)
+                value = SidecarArrayReference(
+                    dtype=value.dtype, shape=value.shape, offset=offset
+                )
+            new_column.append(value)
+        if file is not None:
+            file.flush()
+        return new_column
+
+    def tell(self) -> dict[str, int]:
+        """
+        Return the current size of the sidecar files, to be passed to
+        :meth:`truncate` if the values offloaded after this call can not be
+        written to the database.
+        """
+        return {name: file.tell() for name, file in self._files.items()}
+
+    def truncate(self, sizes: Mapping[str, int]) -> None:
+        """
+        Discard the data appended to the sidecar files since ``sizes`` were
+        returned by :meth:`tell`, such that no data is left in the files that
+        is not referenced from the database. Files that were created since
+        are removed.
+        """
+        for name in list(self._files):
+            file = self._files[name]
+            size = sizes.get(name, self._sizes_when_opened[name])
+            if size == 0:
+                file.close()
+                del self._files[name]
+                del self._sizes_when_opened[name]
+                (self.run_dir / f"{name}.bin").unlink()
+            else:
+                file.truncate(size)
+                file.seek(size)
+
+    def _file(self, name: str) -> BinaryIO:
+        if name not in self._files:
+            self.run_dir.mkdir(parents=True, exist_ok=True)
+            file = open(self.run_dir / f"{name}.bin", "ab")
+            self._files[name] = file
+            self._sizes_when_opened[name] = file.tell()
+        return self._files[name]
+
+    def close(self) -> None:
+        for file in self._files.values():
+            file.close()
+        self._files.clear()
+        self._sizes_when_opened.clear()
+
+
+def _get_guid_from_result_table_name(conn: ConnectionPlus, table_name: str) -> str:
+    sql = "SELECT guid FROM runs WHERE result_table_name = ?"
+    return one(atomic_transaction(conn, sql, table_name), "guid")
+
+
+def resolve_sidecar_references(
+    conn: ConnectionPlus,
+    table_name: str,
+    data: list[tuple[Any, ...]],
+    paramspecs: Sequence[ParamSpecBase],
+) -> dict[int, np.memmap]:
+    """
+    Replace the sidecar references in rows of values loaded from a result
+    table by read-only :class:`numpy.memmap` views of the sidecar files.
+    This is a NOOP for databases without sidecar files.
+
+    Returns:
+        A mapping from column index to the column as a single
+        :class:`numpy.memmap` for the columns whose values are stored
+        back to back in their sidecar file with the same dtype and shape,
+        such that they can be used without stacking the rows.
+
+    """
+    stacked_columns: dict[int, np.memmap] = {}
+    array_columns = [i for i, ps in enumerate(paramspecs) if ps.type == "array"]
+    if not data or not array_columns or conn.path_to_dbfile in ("", ":memory:"):
+        return stacked_columns
+    if not sidecar_dir(conn.path_to_dbfile).exists():
+        return stacked_columns
+
+    run_dir = sidecar_run_dir(
+        conn.path_to_dbfile, _get_guid_from_result_table_name(conn, table_name)
+    )
+    for i in array_columns:
+        refs = [row[i] for row in data]
+        if not any(isinstance(ref, SidecarArrayReference) for ref in refs):
+            continue
+        file_map = np.memmap(run_dir / f"{paramspecs[i].name}.bin", mode="r")
+
+        column = [
+            file_map[ref.offset : ref.offset + ref.nbytes]
+            .view(ref.dtype)
+            .reshape(ref.shape)
+            if isinstance(ref, SidecarArrayReference)
+            else ref
+            for ref in refs
+        ]
+        for i_row, row in enumerate(data):
+            data[i_row] = (*row[:i], column[i_row], *row[i + 1 :])
+
+        stacked = _stack_contiguous_references(file_map, refs)
+        if stacked is not None:
+            stacked_columns[i] = stacked
+    return stacked_columns
+
+
+def _stack_contiguous_references(
+    file_map: np.memmap, refs: Sequence[Any]
+) -> np.memmap | None:
+    first = refs[0]
+    if not isinstance(first, SidecarArrayReference) or first.nbytes == 0:
+        return None
+    if int(np.prod(first.shape)) <= 1:
+        # scalar values may get expanded to the shape of other arrays in
+        # the parameter tree so they can not be used as is
+        return None
+    for i, ref in enumerate(refs):
+        if (
+            not isinstance(ref, SidecarArrayReference)
+            or ref.dtype != first.dtype
+            or ref.shape != first.shape
+            or ref.offset != first.offset + i * first.nbytes
+        ):
+            return None
+    end = first.offset + len(refs) * first.nbytes
+    return (
+        file_map[first.offset : end]
+        .view(first.dtype)
+        .reshape((len(refs), *first.shape))
+    )
+
+
+def copy_sidecar_files(
+    source_db_path: str | Path, target_db_path: str | Path, guid: str
+) -> None:
+    """
+    Copy the sidecar files of a run from one database file to another. This
+    is a NOOP if the run has no sidecar files.
+    """
+    if str(source_db_path) in ("", ":memory:"):
+        return
+    source = sidecar_run_dir(source_db_path, guid)
+    if not source.exists():
+        return
+    target = sidecar_run_dir(target_db_path, guid)
+    log.info(f"Copying sidecar files of run {guid} to {target}")
+    shutil.copytree(source, target, dirs_exist_ok=True)
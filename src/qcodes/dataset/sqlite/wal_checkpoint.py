@@ -0,0 +1,222 @@
+"""
+This module provides checkpointing of the write-ahead log (WAL) of a database
+in a background thread.
+
+By default SQLite checkpoints the WAL whenever a commit makes it exceed 1000
+pages, within that commit. While readers, e.g. live plots, keep such
+checkpoints from completing, the WAL keeps growing, and the checkpoints that
+eventually do complete take long and delay the commit that triggered them.
+The :class:`WALCheckpointer` turns these automatic checkpoints off for the
+connections that write results and instead runs passive checkpoints in its
+own thread, between the commits of the writers, once enough data has been
+written or enough time has passed since the last checkpoint.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import sqlite3
+import time
+from dataclasses import dataclass
+from threading import Condition, Thread
+from typing import TYPE_CHECKING
+
+from qcodes.dataset.sqlite.database import connect
+
+if TYPE_CHECKING:
+    from qcodes.dataset.sqlite.connection import ConnectionPlus
+
+log = logging.getLogger(__name__)
+
+
+@dataclass
+class WALCheckpointMetrics:
+    """
+    Snapshot of the state of the write-ahead log of a database and of the
+    checkpoints run in the background.
+    """
+
+    wal_bytes: int
+    """Size in bytes of the write-ahead log file."""
+    bytes_since_checkpoint: int
+    """Estimated size in bytes of the results written since the last checkpoint."""
+    frames_not_checkpointed: int
+    """
+    Number of frames of the write-ahead log that the last checkpoint could not
+    copy into the database, because readers were still using them.
+    """
+    checkpoints: int
+    """Number of checkpoints run in the background."""
+    last_checkpoint_latency: float
+    """Time in seconds the last checkpoint took."""
+    max_checkpoint_latency: float
+    """Time in seconds the longest checkpoint took."""
+
+
+def is_wal_mode(conn: ConnectionPlus) -> bool:
+    """
+    Return whether the database of a connection uses a write-ahead log.
+    """
+    journal_mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+    return journal_mode.lower() == "wal"
+
+
+class WALCheckpointer(Thread):
+    """
+    Run passive checkpoints of the write-ahead log of a database in a
+    background thread. A checkpoint is run once the writers have reported
+    ``max_bytes`` of results with :meth:`notify_flush`, or ``interval``
+    seconds after the last checkpoint if results have been written since or
+    if the last checkpoint could not complete. A passive checkpoint never
+    waits for readers or writers, so it does not delay the writers.
+
+    Args:
+        path_to_db: Path to the database file.
+        max_bytes: Estimated size in bytes of the results written after
+            which a checkpoint is run. If None, checkpoints are only run
+            based on ``interval``.
+        interval: Time in seconds after which a checkpoint is run. If None,
+            checkpoints are only run based on ``max_bytes``.
+
+    """
+
+    def __init__(
+        self,
+        path_to_db: str,
+        max_bytes: int | None = None,
+        interval: float | None = None,
+    ):
+        super().__init__(daemon=True)
+        self.path = path_to_db
+        self.max_bytes = max_bytes
+        self.interval = interval
+        self.checkpoints = 0
+        self.last_checkpoint_latency = 0.0
+        self.max_checkpoint_latency = 0.0
+        self._condition = Condition()
+        self._stopping = False
+        self._bytes_since_checkpoint = 0
+        self._frames_not_checkpointed = 0
+        self._last_checkpoint_time = time.perf_counter()
+        self._suspended_autocheckpoints: list[tuple[ConnectionPlus, int]] = []
+
+    def suspend_autocheckpoint(self, conn: ConnectionPlus) -> None:
+        """
+        Turn off the automatic checkpoints of a connection that writes
+        results until the checkpointer is stopped, see :meth:`stop`.
+        """
+        if any(conn is suspended for suspended, _ in self._suspended_autocheckpoints):
+            return
+        pages = conn.execute("PRAGMA wal_autocheckpoint").fetchone()[0]
+        conn.execute("PRAGMA wal_autocheckpoint=0")
+        self._suspended_autocheckpoints.append((conn, pages))
+
+    def notify_flush(self, nbytes: int) -> None:
+        """
+        Report that results of an estimated size of ``nbytes`` have been
+        committed to the database.
+        """
+        with self._condition:
+            self._bytes_since_checkpoint += nbytes
+            # the thread works out again when the next checkpoint is due
+            self._condition.notify()
+
+    def metrics(self) -> WALCheckpointMetrics:
+        """
+        Return the current metrics of the write-ahead log and the checkpoints.
+        """
+        try:
+            wal_bytes = os.path.getsize(f"{self.path}-wal")
+        except OSError:
+            wal_bytes = 0
+        with self._condition:
+            return WALCheckpointMetrics(
+                wal_bytes=wal_bytes,
+                bytes_since_checkpoint=self._bytes_since_checkpoint,
+                frames_not_checkpointed=self._frames_not_checkpointed,
+                checkpoints=self.checkpoints,
+                last_checkpoint_latency=self.last_checkpoint_latency,
+                max_checkpoint_latency=self.max_checkpoint_latency,
+            )
+
+    def run(self) -> None:
+        conn = connect(self.path)
+        try:
+            while True:
+                with self._condition:
+                    while not (self._stopping or self._is_due()):
+                        self._condition.wait(timeout=self._time_until_due())
+                    stopping = self._stopping
+                self._checkpoint(conn)
+                if stopping:
+                    return
+        finally:
+            conn.close()
+
+    def stop(self) -> None:
+        """
+        Run a last checkpoint, wait for the thread to join and turn the
+        automatic checkpoints of the connections back on.
+
+        If the thread is not alive only the automatic checkpoints are turned
+        back on.
+        """
+        if self.is_alive():
+            with self._condition:
+                self._stopping = True
+                self._condition.notify()
+            self.join()
+        for conn, pages in self._suspended_autocheckpoints:
+            try:
+                conn.execute(f"PRAGMA wal_autocheckpoint={pages}")
+            except sqlite3.ProgrammingError:
+                # the connection has been closed in the meantime
+                pass
+        self._suspended_autocheckpoints.clear()
+
+    def _is_due(self) -> bool:
+        if (
+            self.max_bytes is not None
+            and self._bytes_since_checkpoint >= self.max_bytes
+        ):
+            return True
+        return (
+            self.interval is not None
+            and (self._bytes_since_checkpoint > 0 or self._frames_not_checkpointed > 0)
+            and time.perf_counter() - self._last_checkpoint_time >= self.interval
+        )
+
+    def _time_until_due(self) -> float | None:
+        nothing_to_checkpoint = (
+            self._bytes_since_checkpoint == 0 and self._frames_not_checkpointed == 0
+        )
+        if self.interval is None or nothing_to_checkpoint:
+            return None
+        elapsed = time.perf_counter() - self._last_checkpoint_time
+        return max(self.interval - elapsed, 0.0)
+
+    def _checkpoint(self, conn: ConnectionPlus) -> None:
+        with self._condition:
+            self._bytes_since_checkpoint = 0
+        start = time.perf_counter()
+        try:
+            _, log_frames, checkpointed_frames = conn.execute(
+                "PRAGMA wal_checkpoint(PASSIVE)"
+            ).fetchone()
+        except sqlite3.Error as e:
+            log.warning(f"Could not checkpoint the write-ahead log; {e}")
+            log_frames = checkpointed_frames = 0
+        end = time.perf_counter()
+        latency = end - start
+        with self._condition:
+            self._last_checkpoint_time = end
+            # both are -1 if the database is not in WAL mode
+            self._frames_not_checkpointed = max(log_frames - checkpointed_frames, 0)
+            self.checkpoints += 1
+            self.last_checkpoint_latency = latency
+            self.max_checkpoint_latency = max(self.max_checkpoint_latency, latency)
+        log.debug(
+            f"Checkpointed {checkpointed_frames} of {log_frames} frames of the "
+            f"write-ahead log in {latency * 1000:.1f} ms"
+        )
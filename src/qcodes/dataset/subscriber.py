@@ -2,23 +2,107 @@ from __future__ import annotations
 
 import functools
 import logging
-import time
-from queue import Empty, Queue
-from threading import Thread
+from dataclasses import dataclass
+from threading import Condition, Thread
 from typing import TYPE_CHECKING, Any
 
-from qcodes.dataset.sqlite.connection import atomic_transaction
+import numpy as np
 
 if TYPE_CHECKING:
-    from collections.abc import Callable, Mapping
+    from collections.abc import Callable, Mapping, Sequence
 
-    from qcodes.dataset.data_set import DataSet
+    from qcodes.dataset.data_set import DataSet, _ResultColumns
+
+
+@dataclass(frozen=True)
+class ResultBatch:
+    """
+    The rows that were written to the results table of a :class:`.DataSet`
+    in one transaction, stored column by column. Parameters that have no
+    value in some of the rows hold None in those rows, like the NULL values
+    in the results table.
+    """
+
+    columns: Mapping[str, np.ndarray]
+    """Mapping from parameter name to the values of the parameter."""
+    n_rows: int
+    """Number of rows in the batch."""
+
+    @classmethod
+    def from_results(cls, results: Sequence[_ResultColumns]) -> ResultBatch:
+        n_rows = sum(len(result) for result in results)
+        names = list(dict.fromkeys(name for result in results for name in result.keys))
+        columns: dict[str, np.ndarray] = {}
+        for name in names:
+            pieces = [
+                _column_to_array(result.columns[result.keys.index(name)])
+                if name in result.keys
+                else np.full(len(result), None, dtype=object)
+                for result in results
+            ]
+            columns[name] = _concatenate_rows(pieces, n_rows)
+        return cls(columns=columns, n_rows=n_rows)
+
+    def rows(self, names: Sequence[str]) -> list[tuple[Any, ...]]:
+        """
+        Return the values of the given parameters row by row, as tuples in
+        the order of ``names``.
+        """
+        columns = [
+            _column_to_values(self.columns[name])
+            if name in self.columns
+            else [None] * self.n_rows
+            for name in names
+        ]
+        return list(zip(*columns))
+
+
+def _column_to_array(column: np.ndarray | Sequence[Any]) -> np.ndarray:
+    if isinstance(column, np.ndarray):
+        return column
+    try:
+        return np.asarray(column)
+    except ValueError:
+        # values of different shapes
+        array = np.empty(len(column), dtype=object)
+        array[:] = [np.asarray(value) for value in column]
+        return array
+
+
+def _concatenate_rows(pieces: Sequence[np.ndarray], n_rows: int) -> np.ndarray:
+    if len(pieces) == 1:
+        return pieces[0]
+    try:
+        return np.concatenate(pieces)
+    except ValueError:
+        # pieces with rows of different shapes
+        array = np.empty(n_rows, dtype=object)
+        array[:] = [row for piece in pieces for row in piece]
+        return array
+
+
+def _column_to_values(column: np.ndarray) -> list[Any]:
+    if column.ndim == 1:
+        return column.tolist()
+    return list(column)
 
 
 class _Subscriber(Thread):
     """
-    Class to add a subscriber to a :class:`.DataSet`. The subscriber gets called every
-    time an insert is made to the results_table.
+    Class to add a subscriber to a :class:`.DataSet`. The subscriber gets
+    called with the rows that were written to the results_table since it was
+    last called, once at least ``min_queue_length`` rows have been written.
+
+    The :class:`.DataSet` hands every batch of rows that it has written in
+    one transaction over to its subscribers as a :class:`ResultBatch` after
+    the transaction has been committed, and the subscriber thread waits
+    until that happens.
+
+    By default the callback is called with a list of row tuples holding the
+    values of all parameters of the :class:`.DataSet`, the number of rows
+    in the :class:`.DataSet` and the state. If ``batched`` is True, it is
+    called with the list of :class:`ResultBatch` instead of the list of row
+    tuples.
 
     The _Subscriber is not meant to be instantiated directly, but rather used
     via the 'subscribe' method of the :class:`.DataSet`.
@@ -38,6 +122,7 @@ class _Subscriber(Thread):
         loop_sleep_time: int = 0,  # in milliseconds
         min_queue_length: int = 1,
         callback_kwargs: Mapping[str, Any] | None = None,
+        batched: bool = False,
     ) -> None:
         super().__init__()
 
@@ -46,12 +131,16 @@ class _Subscriber(Thread):
         self.dataSet = dataSet
         self.table_name = dataSet.table_name
         self._data_set_len = len(dataSet)
+        self._parameter_names = [p.name for p in dataSet.get_parameters()]
 
         self.state = state
+        self.batched = batched
 
-        self.data_queue: Queue[Any] = Queue()
+        self._batches: list[ResultBatch] = []
         self._queue_length: int = 0
+        self._condition = Condition()
         self._stop_signal: bool = False
+        self._done_signal: bool = False
         # convert milliseconds to seconds
         self._loop_sleep_time = loop_sleep_time / 1000
         self.min_queue_length = min_queue_length
@@ -61,71 +150,87 @@ class _Subscriber(Thread):
         else:
             self.callback = functools.partial(callback, **callback_kwargs)
 
-        self.callback_id = f"callback{self._id}"
-        self.trigger_id = f"sub{self._id}"
-
-        conn = dataSet.conn
-
-        conn.create_function(self.callback_id, -1, self._cache_data_to_queue)
-
-        parameters = dataSet.get_parameters()
-        sql_param_list = ",".join(f"NEW.{p.name}" for p in parameters)
-        sql_create_trigger_for_callback = f"""
-        CREATE TRIGGER {self.trigger_id}
-            AFTER INSERT ON '{self.table_name}'
-        BEGIN
-            SELECT {self.callback_id}({sql_param_list});
-        END;"""
-        atomic_transaction(conn, sql_create_trigger_for_callback)
-
         self.log = logging.getLogger(f"_Subscriber {self._id}")
 
-    def _cache_data_to_queue(self, *args: Any) -> None:
-        self.data_queue.put(args)
-        self._data_set_len += 1
-        self._queue_length += 1
+    def publish(self, batch: ResultBatch) -> None:
+        """
+        Hand a batch of rows that has been written to the results table
+        over to the subscriber.
+        """
+        with self._condition:
+            self._batches.append(batch)
+            self._data_set_len += batch.n_rows
+            self._queue_length += batch.n_rows
+            self._condition.notify()
 
     def run(self) -> None:
         self.log.debug("Starting subscriber")
         self._loop()
 
-    @staticmethod
-    def _exhaust_queue(queue: Queue[Any]) -> list[Any]:
-        result_list = []
-        while True:
-            try:
-                result_list.append(queue.get(block=False))
-            except Empty:
-                break
-        return result_list
-
     def _call_callback_on_queue_data(self) -> None:
-        result_list = self._exhaust_queue(self.data_queue)
-        self.callback(result_list, self._data_set_len, self.state)
+        with self._condition:
+            batches = self._batches
+            self._batches = []
+            self._queue_length = 0
+            data_set_len = self._data_set_len
+        if self.batched:
+            self.callback(batches, data_set_len, self.state)
+        else:
+            result_list = [
+                row for batch in batches for row in batch.rows(self._parameter_names)
+            ]
+            self.callback(result_list, data_set_len, self.state)
+
+    def _has_enough_data(self) -> bool:
+        return self._queue_length >= max(self.min_queue_length, 1)
 
     def _loop(self) -> None:
         while True:
-            if self._stop_signal:
+            with self._condition:
+                self._condition.wait_for(
+                    lambda: (
+                        self._stop_signal
+                        or self._done_signal
+                        or self._has_enough_data()
+                    )
+                )
+                stop = self._stop_signal
+                done = self._done_signal
+
+            if stop:
                 self._clean_up()
                 break
 
-            if self._queue_length >= self.min_queue_length:
-                self._call_callback_on_queue_data()
-                self._queue_length = 0
-
-            time.sleep(self._loop_sleep_time)
-
-            if self.dataSet.completed:
-                self._call_callback_on_queue_data()
+            self._call_callback_on_queue_data()
+            if done:
                 break
 
+            if self._loop_sleep_time > 0:
+                with self._condition:
+                    self._condition.wait_for(
+                        lambda: self._stop_signal or self._done_signal,
+                        timeout=self._loop_sleep_time,
+                    )
+
     def done_callback(self) -> None:
-        self._call_callback_on_queue_data()
+        """
+        Call the callback a last time with the data that has not been
+        handed to it yet and wait for the subscriber to finish.
+        """
+        with self._condition:
+            self._done_signal = True
+            self._condition.notify()
+        if self.is_alive():
+            self.join()
+        elif not self._stop_signal:
+            self._call_callback_on_queue_data()
 
     def schedule_stop(self) -> None:
         if not self._stop_signal:
             self.log.debug("Scheduling stop")
-            self._stop_signal = True
+            with self._condition:
+                self._stop_signal = True
+                self._condition.notify()
 
     def _clean_up(self) -> None:
         self.log.debug("Stopped subscriber")
@@ -25,7 +25,12 @@ from ipywidgets import (  # type: ignore[import-untyped]
 )
 from ruamel.yaml import YAML
 
-from qcodes.dataset import experiments, initialise_or_create_database_at, plot_dataset
+from qcodes.dataset import (
+    RunSummary,
+    get_run_summaries,
+    initialise_or_create_database_at,
+    plot_dataset,
+)
 
 if TYPE_CHECKING:
     from collections.abc import Callable, Iterable, Sequence
@@ -35,6 +40,9 @@ if TYPE_CHECKING:
 
 _META_DATA_KEY = "widget_notes"
 
+# the columns of the runs that the widget shows without a click
+_SUMMARY_COLUMNS = ("run_description", "metadata")
+
 
 def _get_in(nested_keys: Sequence[str], dct: dict[str, Any]) -> dict[str, Any]:
     """Returns dct[i0][i1]...[iX] where [i0, i1, ..., iX]==nested_keys."""
@@ -200,6 +208,10 @@ def nested_dict_browser(
     return box
 
 
+def _load_data_set(ds: DataSetProtocol | RunSummary) -> DataSetProtocol:
+    return ds.load_dataset() if isinstance(ds, RunSummary) else ds
+
+
 def _plot_ds(ds: DataSetProtocol) -> None:
     import matplotlib.pyplot as plt
 
@@ -208,7 +220,7 @@ def _plot_ds(ds: DataSetProtocol) -> None:
 
 
 def _do_in_tab(
-    tab: Tab, ds: DataSetProtocol, which: Literal["plot", "snapshot"]
+    tab: Tab, ds: DataSetProtocol | RunSummary, which: Literal["plot", "snapshot"]
 ) -> Callable[[Button], None]:
     """Performs an operation inside of a subtab of a `ipywidgets.Tab`.
 
@@ -256,7 +268,7 @@ def _do_in_tab(
 
             try:
                 if which == "plot":
-                    _plot_ds(ds)
+                    _plot_ds(_load_data_set(ds))
                 elif which == "snapshot":
                     snapshot = ds.snapshot
                     if snapshot is not None:
@@ -287,7 +299,7 @@ def create_tab(do_display: bool = True) -> Tab:
     return tab
 
 
-def editable_metadata(ds: DataSetProtocol) -> Box:
+def editable_metadata(ds: DataSetProtocol | RunSummary) -> Box:
     def _button_to_input(text: str, box: Box) -> Callable[[Button], None]:
         def on_click(_: Button) -> None:
             text_input = Textarea(
@@ -318,12 +330,12 @@ def editable_metadata(ds: DataSetProtocol) -> Box:
         return on_click
 
     def _save_button(
-        box: Box, ds: DataSetProtocol, do_save: bool = True
+        box: Box, ds: DataSetProtocol | RunSummary, do_save: bool = True
     ) -> Callable[[Button], None]:
         def on_click(_: Button) -> None:
             text = box.children[0].value
             if do_save:
-                ds.add_metadata(tag=_META_DATA_KEY, metadata=text)
+                _load_data_set(ds).add_metadata(tag=_META_DATA_KEY, metadata=text)
             box.children = (_changeable_button(text, box),)
 
         return on_click
@@ -348,7 +360,7 @@ def _yaml_dump(dct: dict[str, Any]) -> str:
         return f.getvalue()
 
 
-def _get_parameters(ds: DataSetProtocol) -> dict[str, dict[str, Any]]:
+def _get_parameters(ds: DataSetProtocol | RunSummary) -> dict[str, dict[str, Any]]:
     independent = {}
     dependent = {}
 
@@ -368,7 +380,7 @@ def _get_parameters(ds: DataSetProtocol) -> dict[str, dict[str, Any]]:
     return {"independent": independent, "dependent": dependent}
 
 
-def _get_experiment_button(ds: DataSetProtocol) -> Box:
+def _get_experiment_button(ds: DataSetProtocol | RunSummary) -> Box:
     title = f"{ds.exp_name}, {ds.sample_name}"
     body = _yaml_dump(
         {
@@ -382,7 +394,7 @@ def _get_experiment_button(ds: DataSetProtocol) -> Box:
     return button_to_text(title, body)
 
 
-def _get_timestamp_button(ds: DataSetProtocol) -> Box:
+def _get_timestamp_button(ds: DataSetProtocol | RunSummary) -> Box:
     start_timestamp = ds.run_timestamp_raw
     end_timestamp = ds.completed_timestamp_raw
     if start_timestamp is not None and end_timestamp is not None:
@@ -403,7 +415,7 @@ def _get_timestamp_button(ds: DataSetProtocol) -> Box:
     return button_to_text(start or "", body)
 
 
-def _get_run_id_button(ds: DataSetProtocol) -> Box:
+def _get_run_id_button(ds: DataSetProtocol | RunSummary) -> Box:
     title = str(ds.run_id)
     body = _yaml_dump(
         {
@@ -415,13 +427,14 @@ def _get_run_id_button(ds: DataSetProtocol) -> Box:
     return button_to_text(title, body)
 
 
-def _get_parameters_button(ds: DataSetProtocol) -> Box:
+def _get_parameters_button(ds: DataSetProtocol | RunSummary) -> Box:
     parameters = _get_parameters(ds)
-    title = ds._parameters or ""
+    parameters_str = ds.parameters if isinstance(ds, RunSummary) else ds._parameters
+    title = parameters_str or ""
     return button_to_text(title, _yaml_dump(parameters))
 
 
-def _get_snapshot_button(ds: DataSetProtocol, tab: Tab) -> Button:
+def _get_snapshot_button(ds: DataSetProtocol | RunSummary, tab: Tab) -> Button:
     return button(
         "",
         "warning",
@@ -431,7 +444,7 @@ def _get_snapshot_button(ds: DataSetProtocol, tab: Tab) -> Button:
     )
 
 
-def _get_plot_button(ds: DataSetProtocol, tab: Tab) -> Button:
+def _get_plot_button(ds: DataSetProtocol | RunSummary, tab: Tab) -> Button:
     return button(
         "",
         "warning",
@@ -442,7 +455,7 @@ def _get_plot_button(ds: DataSetProtocol, tab: Tab) -> Button:
 
 
 def _experiment_widget(
-    data_sets: Iterable[DataSetProtocol], tab: Tab
+    data_sets: Iterable[DataSetProtocol | RunSummary], tab: Tab
 ) -> GridspecLayout:
     """Show a `ipywidgets.GridspecLayout` with information about the
     loaded experiment. The clickable buttons can perform an action in ``tab``.
@@ -486,7 +499,7 @@ def _experiment_widget(
 
 def experiments_widget(
     db: str | None = None,
-    data_sets: Sequence[DataSetProtocol] | None = None,
+    data_sets: Sequence[DataSetProtocol | RunSummary] | None = None,
     *,
     sort_by: Literal["timestamp", "run_id"] | None = "run_id",
 ) -> VBox:
@@ -501,31 +514,44 @@ def experiments_widget(
 
     Args:
         db: Optionally pass a database file, if no database has been loaded.
-        data_sets: Sequence of :class:`qcodes.dataset.DataSetProtocol`\s.
-            If datasets are explicitly provided via this argument, the ``db``
-            argument has no effect.
+        data_sets: Sequence of :class:`qcodes.dataset.DataSetProtocol`\s or
+            :class:`qcodes.dataset.RunSummary`\s. If datasets are explicitly
+            provided via this argument, the ``db`` argument has no effect.
+            Otherwise the widget shows the summaries of all runs in the
+            database, which are read with a single query, and only loads
+            the dataset of a run to plot it or to edit its notes.
         sort_by: Sort datasets in widget by either "timestamp" (newest first),
             "run_id" or None (no predefined sorting).
 
     """
+    runs: Sequence[DataSetProtocol | RunSummary]
     if data_sets is None:
         if db is not None:
             initialise_or_create_database_at(db)
-        data_sets = [ds for exp in experiments() for ds in exp.data_sets()]
-    if sort_by == "run_id":
-        data_sets = sorted(data_sets, key=lambda ds: ds.run_id)
+        if sort_by == "timestamp":
+            runs = get_run_summaries(
+                columns=_SUMMARY_COLUMNS, order_by="run_timestamp", descending=True
+            )
+        elif sort_by == "run_id":
+            runs = get_run_summaries(columns=_SUMMARY_COLUMNS)
+        else:
+            runs = get_run_summaries(columns=_SUMMARY_COLUMNS, order_by="exp_id")
+    elif sort_by == "run_id":
+        runs = sorted(data_sets, key=lambda ds: ds.run_id)
     elif sort_by == "timestamp":
-        data_sets = sorted(
+        runs = sorted(
             data_sets,
             key=lambda ds: ds.run_timestamp_raw
             if ds.run_timestamp_raw is not None
             else 0,
             reverse=True,
         )
+    else:
+        runs = data_sets
 
     title = HTML("<h1>QCoDeS experiments widget</h1>")
     tab = create_tab(do_display=False)
-    grid = _experiment_widget(data_sets, tab)
+    grid = _experiment_widget(runs, tab)
     return VBox([title, tab, grid])
 
 
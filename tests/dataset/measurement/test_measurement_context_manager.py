@@ -492,8 +492,8 @@ def test_subscriptions(experiment, DAC, DMM) -> None:
             datasaver.add_result((DAC.ch1, dac_val), (DMM.v1, dmm_val))
 
             # Ensure that data is flushed to the database despite the write
-            # period, so that the database triggers are executed, which in turn
-            # add data to the queues within the subscribers
+            # period, so that the written data is handed over to the
+            # subscribers
             datasaver.flush_data_to_database()
 
             # In order to make this test deterministic, we need to ensure that
@@ -501,12 +501,10 @@ def test_subscriptions(experiment, DAC, DMM) -> None:
             # flushed to database and the "state" object (that is passed to
             # subscriber constructor) has been updated by the corresponding
             # subscriber's callback function. At the moment, there is no robust
-            # way to ensure this. The reason is that the subscribers have
-            # internal queue which is populated via a trigger call from the SQL
-            # database, hence from this "main" thread it is difficult to say
-            # whether the queue is empty because the subscriber callbacks have
-            # already been executed or because the triggers of the SQL database
-            # has not been executed yet.
+            # way to ensure this. The reason is that the subscribers call
+            # their callbacks from their own threads, hence from this "main"
+            # thread it is difficult to say whether the callbacks have
+            # already been executed or not.
             #
             # In order to overcome this problem, a special decorator is used to
             # wrap the assertions. This is going to ensure that some time is
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+from typing import TYPE_CHECKING
+
+import pytest
+
+import qcodes as qc
+from qcodes.dataset import (
+    ConnectionManager,
+    experiments,
+    get_connection_manager,
+    load_by_guid,
+    load_by_id,
+    new_data_set,
+    new_experiment,
+)
+from qcodes.dataset.sqlite import connection_manager as connection_manager_module
+from qcodes.dataset.sqlite.database import get_DB_location
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+    from pathlib import Path
+
+
+@pytest.fixture(name="reuse_connections")
+def _reuse_connections(empty_temp_db) -> Generator[ConnectionManager, None, None]:
+    qc.config.dataset.reuse_connections = True
+    manager = get_connection_manager()
+    try:
+        yield manager
+    finally:
+        manager.close_all()
+
+
+def test_loaded_datasets_share_connection(reuse_connections) -> None:
+    new_experiment("test-experiment", sample_name="test-sample")
+    dataset = new_data_set("test-dataset")
+    dataset.mark_started()
+    dataset.mark_completed()
+
+    loaded_by_id = load_by_id(dataset.run_id)
+    loaded_by_guid = load_by_guid(dataset.guid)
+    (exp,) = experiments()
+
+    assert loaded_by_id.conn is loaded_by_guid.conn  # type: ignore[attr-defined]
+    assert exp.conn is loaded_by_id.conn  # type: ignore[attr-defined]
+    assert len(reuse_connections) == 1
+
+    # closing a shared connection does not affect the others using it
+    exp.conn.close()
+    assert load_by_id(dataset.run_id).guid == dataset.guid
+
+    reuse_connections.close_all()
+    assert len(reuse_connections) == 0
+    with pytest.raises(sqlite3.ProgrammingError):
+        exp.conn.execute("SELECT 1")
+    assert load_by_id(dataset.run_id).conn is not exp.conn  # type: ignore[attr-defined]
+
+
+def test_connections_are_not_shared_by_default(experiment) -> None:
+    dataset = new_data_set("test-dataset")
+    dataset.mark_started()
+    dataset.mark_completed()
+
+    assert (
+        load_by_id(dataset.run_id).conn  # type: ignore[attr-defined]
+        is not load_by_id(dataset.run_id).conn  # type: ignore[attr-defined]
+    )
+
+
+def test_connection_per_thread(reuse_connections) -> None:
+    path = get_DB_location()
+    connection = reuse_connections.connection(path)
+    connections = []
+    thread = threading.Thread(
+        target=lambda: connections.append(reuse_connections.connection(path))
+    )
+    thread.start()
+    thread.join()
+
+    assert connections[0] is not connection
+    # the connection of the thread that has ended is released
+    assert reuse_connections.connection(path) is connection
+    assert len(reuse_connections) == 1
+
+
+def test_connection_pool_size(tmp_path: Path, mocker) -> None:
+    init_db = mocker.spy(connection_manager_module, "init_db")
+    manager = ConnectionManager(max_connections=1)
+    path_a = str(tmp_path / "a.db")
+    try:
+        connection_a = manager.connection(path_a)
+        assert manager.connection(path_a) is connection_a
+        manager.connection(tmp_path / "b.db")
+        assert len(manager) == 1
+        # the version of a file that was upgraded before is only checked
+        assert manager.connection(path_a) is not connection_a
+        assert init_db.call_count == 2
+    finally:
+        manager.close_all()
+
+
+def test_connection_idle_timeout(tmp_path: Path) -> None:
+    manager = ConnectionManager(idle_timeout=0)
+    try:
+        connection = manager.connection(tmp_path / "a.db")
+        assert manager.connection(tmp_path / "a.db") is not connection
+    finally:
+        manager.close_all()
+
+
+def test_read_only_connections_are_reused(tmp_path: Path) -> None:
+    path = tmp_path / "a.db"
+    manager = ConnectionManager(max_connections=1)
+    try:
+        connection = manager.connection(path)
+        connection.execute("CREATE TABLE results (a INTEGER)")
+        connection.commit()
+        with manager.read_only_connection(path) as first:
+            with manager.read_only_connection(path) as second:
+                assert second is not first
+                with pytest.raises(sqlite3.OperationalError, match="readonly"):
+                    second.execute("DELETE FROM results")
+        # the connection that is kept is lent again, also to another thread
+        lent = []
+
+        def lend() -> None:
+            with manager.read_only_connection(path) as connection:
+                lent.append(connection)
+                connection.execute("SELECT count(*) FROM results").fetchone()
+
+        thread = threading.Thread(target=lend)
+        thread.start()
+        thread.join()
+        assert lent == [second]
+        # only one connection is kept per file, the one returned last is closed
+        with pytest.raises(sqlite3.ProgrammingError):
+            first.execute("SELECT 1")
+    finally:
+        manager.close_all()
+    with pytest.raises(sqlite3.ProgrammingError):
+        second.execute("SELECT 1")
+
+
+def test_read_only_connection_idle_timeout(tmp_path: Path) -> None:
+    path = tmp_path / "a.db"
+    manager = ConnectionManager(idle_timeout=0)
+    try:
+        manager.connection(path)
+        with manager.read_only_connection(path) as first:
+            pass
+        with manager.read_only_connection(path) as second:
+            assert second is not first
+        with pytest.raises(sqlite3.ProgrammingError):
+            first.execute("SELECT 1")
+    finally:
+        manager.close_all()
@@ -8,6 +8,7 @@ import numpy as np
 import pytest
 from hypothesis import HealthCheck, given, settings
 
+from qcodes.dataset.data_set_cache import _append_to_buffer
 from qcodes.dataset.descriptions.detect_shapes import detect_shape_of_measurement
 from qcodes.dataset.measurements import Measurement
 
@@ -979,6 +980,92 @@ def test_cache_2d_shape(
     )
 
 
+@pytest.mark.parametrize("in_memory_cache", [True, False])
+def test_cache_unshaped_grows_buffer(experiment, DAC, in_memory_cache) -> None:
+    meas = Measurement()
+    meas.register_parameter(DAC.ch1)
+    meas.register_parameter(DAC.ch2, setpoints=(DAC.ch1,))
+
+    n_points = 200
+    with meas.run(in_memory_cache=in_memory_cache) as datasaver:
+        dataset = datasaver.dataset
+        views = []
+        for i in range(n_points):
+            datasaver.add_result((DAC.ch1, i), (DAC.ch2, 2 * i))
+            datasaver.flush_data_to_database(block=True)
+            views.append(dataset.cache.data()["dummy_dac_ch2"]["dummy_dac_ch2"])
+
+    # the data are views of a buffer that is only reallocated
+    # a logarithmic number of times
+    bases = {id(view.base) for view in views[1:]}
+    assert len(bases) <= int(np.log2(n_points)) + 1
+    for i, view in enumerate(views):
+        np.testing.assert_array_equal(view, 2 * np.arange(i + 1))
+    _assert_parameter_data_is_identical(
+        dataset.get_parameter_data(), dataset.cache.data()
+    )
+
+
+def test_append_to_buffer() -> None:
+    existing = np.arange(3.0)
+    data, buffer = _append_to_buffer(existing, np.array([3.0]), None)
+    assert data.base is buffer
+    np.testing.assert_array_equal(data, np.arange(4.0))
+
+    # appending to the data reuses the buffer
+    more, buffer_2 = _append_to_buffer(data, np.array([4.0, 5.0]), buffer)
+    assert buffer_2 is buffer
+    np.testing.assert_array_equal(more, np.arange(6.0))
+    np.testing.assert_array_equal(data, np.arange(4.0))
+
+    # appending values of another dtype copies to a new buffer
+    complex_data, buffer_3 = _append_to_buffer(more, np.array([6 + 1j]), buffer)
+    assert buffer_3 is not buffer
+    assert complex_data.dtype == np.complex128
+    np.testing.assert_array_equal(complex_data, np.append(np.arange(6.0), 6 + 1j))
+
+
+def test_append_to_buffer_ragged() -> None:
+    existing = np.arange(6).reshape(3, 2)
+    data, buffer = _append_to_buffer(existing, np.arange(6).reshape(2, 3), None)
+    assert data.dtype == object
+    assert data.shape == (5,)
+    for row, expected in zip(data, [*existing, *np.arange(6).reshape(2, 3)]):
+        np.testing.assert_array_equal(row, expected)
+
+    more, buffer_2 = _append_to_buffer(data, np.arange(4).reshape(1, 4), buffer)
+    assert buffer_2 is buffer
+    assert more.shape == (6,)
+    np.testing.assert_array_equal(more[-1], np.arange(4))
+
+
+@pytest.mark.parametrize("in_memory_cache", [True, False])
+def test_cache_unshaped_ragged_matches_parameter_data(
+    experiment, in_memory_cache
+) -> None:
+    meas = Measurement()
+    meas.register_custom_parameter("x", paramtype="array")
+    meas.register_custom_parameter("y", paramtype="array", setpoints=("x",))
+
+    lengths = [2, 2, 3, 1, 3]
+    with meas.run(in_memory_cache=in_memory_cache) as datasaver:
+        dataset = datasaver.dataset
+        for length in lengths:
+            datasaver.add_result(("x", np.arange(length)), ("y", np.ones(length)))
+            datasaver.flush_data_to_database(block=True)
+            dataset.cache.data()
+
+    # ragged rows are kept as a one dimensional object array of the rows,
+    # which is how they are returned when loading them from the database
+    expected = dataset.get_parameter_data()["y"]
+    cached = dataset.cache.data()["y"]
+    for name in ("x", "y"):
+        assert cached[name].dtype == expected[name].dtype == object
+        assert cached[name].shape == expected[name].shape == (len(lengths),)
+        for cached_row, expected_row in zip(cached[name], expected[name]):
+            np.testing.assert_array_equal(cached_row, expected_row)
+
+
 def _assert_completed_cache_is_as_expected(
     cache_data_trees, param_data_trees, flatten=False, clip=False
 ):
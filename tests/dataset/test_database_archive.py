@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+import sys
+import time
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pytest
+from numpy.testing import assert_array_equal
+
+from qcodes.dataset import (
+    archive_runs,
+    archive_runs_older_than,
+    connect,
+    database_archive,
+    extract_runs_into_db,
+    load_by_guid,
+    load_by_id,
+    new_data_set,
+    new_experiment,
+)
+from qcodes.dataset.database_archive import main
+from qcodes.dataset.descriptions.dependencies import InterDependencies_
+from qcodes.dataset.descriptions.param_spec import ParamSpecBase
+from qcodes.dataset.sqlite.archive import (
+    archive_path,
+    compress_array,
+    decompress_array,
+)
+from qcodes.dataset.sqlite.queries import _check_if_table_found
+from tests.common import error_caused_by
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def _add_runs(path: Path, n_runs: int, complete: bool = True) -> list[str]:
+    x = ParamSpecBase("x", "numeric")
+    y = ParamSpecBase("y", "array")
+    interdeps = InterDependencies_(dependencies={y: (x,)})
+    conn = connect(path)
+    try:
+        exp = new_experiment("test-experiment", sample_name="test-sample", conn=conn)
+        guids = []
+        for _ in range(n_runs):
+            dataset = new_data_set("test-dataset", exp_id=exp.exp_id, conn=conn)
+            dataset.set_interdependencies(interdeps)
+            dataset.mark_started()
+            dataset.add_results(
+                [{"x": float(i), "y": np.linspace(0, i, 100)} for i in range(10)]
+            )
+            if complete:
+                dataset.mark_completed()
+            guids.append(dataset.guid)
+    finally:
+        conn.close()
+    return guids
+
+
+@pytest.mark.parametrize(
+    "arr",
+    [
+        np.linspace(0, 1, 1000),
+        np.arange(24, dtype=np.int16).reshape(2, 3, 4),
+        np.array([1 + 2j, 3 - 4j]),
+        np.array([], dtype=np.float32),
+    ],
+)
+def test_compress_array_roundtrip(arr: np.ndarray) -> None:
+    restored = decompress_array(compress_array(arr))
+    assert restored.dtype == arr.dtype
+    assert_array_equal(restored, arr)
+
+
+def test_compress_array_rejects_object_arrays() -> None:
+    with pytest.raises(ValueError, match="can not be compressed"):
+        compress_array(np.array([1, "a"], dtype=object))
+
+
+def test_archived_runs_load_transparently(tmp_path: Path) -> None:
+    path = tmp_path / "experiments.db"
+    guids = _add_runs(path, 3)
+    expected = {guid: load_by_guid(guid, conn=connect(path)) for guid in guids}
+    expected_data = {
+        guid: dataset.get_parameter_data() for guid, dataset in expected.items()
+    }
+    size_before = path.stat().st_size
+
+    assert archive_runs(path, 1, 2, vacuum=True) == [1, 2]
+    # archiving again is a no-op
+    assert archive_runs(path, 1) == []
+
+    assert archive_path(path).exists()
+    assert path.stat().st_size < size_before
+    conn = connect(path)
+    table_names = [expected[guid].table_name for guid in guids]
+    in_main = [
+        conn.execute(
+            "SELECT count(*) FROM main.sqlite_master WHERE name=?", (name,)
+        ).fetchone()[0]
+        for name in table_names
+    ]
+    assert in_main == [0, 0, 1]
+    assert all(_check_if_table_found(conn, name) for name in table_names)
+    conn.close()
+
+    for run_id, guid in enumerate(guids, start=1):
+        for dataset in (
+            load_by_guid(guid, conn=connect(path)),
+            load_by_id(run_id, conn=connect(path)),
+        ):
+            assert dataset.guid == guid
+            assert dataset.number_of_results == 10
+            data = dataset.get_parameter_data()
+            cache_data = dataset.cache.data()
+            for name in ("x", "y"):
+                assert_array_equal(data["y"][name], expected_data[guid]["y"][name])
+                assert_array_equal(
+                    cache_data["y"][name], expected_data[guid]["y"][name]
+                )
+
+
+def test_archive_runs_requires_completed_runs(tmp_path: Path) -> None:
+    path = tmp_path / "experiments.db"
+    _add_runs(path, 1, complete=False)
+    with pytest.raises(RuntimeError) as excinfo:
+        archive_runs(path, 1)
+    assert error_caused_by(excinfo, "Dataset not completed")
+    assert load_by_id(1, conn=connect(path)).number_of_results == 10
+
+
+def test_archive_runs_resumes_after_interruption(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    path = tmp_path / "experiments.db"
+    (guid,) = _add_runs(path, 1)
+    expected = load_by_guid(guid, conn=connect(path)).get_parameter_data()
+
+    # interrupt the archiving after the copy into the archive is committed
+    def interrupt(*args: object) -> None:
+        raise KeyboardInterrupt
+
+    with monkeypatch.context() as m:
+        m.setattr(database_archive, "_drop_archived_result_table", interrupt)
+        with pytest.raises(KeyboardInterrupt):
+            archive_runs(path, 1)
+    conn = connect(path)
+    (table_name,) = conn.execute("SELECT result_table_name FROM runs").fetchone()
+    assert conn.execute(
+        "SELECT count(*) FROM main.sqlite_master WHERE name=?", (table_name,)
+    ).fetchone() == (1,)
+    conn.close()
+
+    # the copy is checked and not made again before the result table is dropped
+    with monkeypatch.context() as m:
+        m.setattr(
+            database_archive,
+            "_compress_arrays",
+            lambda *args: pytest.fail("copied again"),
+        )
+        assert archive_runs(path, 1) == [1]
+    data = load_by_guid(guid, conn=connect(path)).get_parameter_data()
+    for name in ("x", "y"):
+        assert_array_equal(data["y"][name], expected["y"][name])
+
+
+def test_archive_runs_keeps_result_table_if_copy_is_incomplete(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    path = tmp_path / "experiments.db"
+    _add_runs(path, 1)
+    with monkeypatch.context() as m:
+        m.setattr(
+            database_archive,
+            "_drop_archived_result_table",
+            lambda *args: None,
+        )
+        archive_runs(path, 1)
+    conn = connect(path)
+    (table_name,) = conn.execute("SELECT result_table_name FROM runs").fetchone()
+    conn.execute(f'DELETE FROM archive."{table_name}" WHERE id = 1')
+    conn.commit()
+    conn.close()
+
+    with pytest.raises(RuntimeError) as excinfo:
+        archive_runs(path, 1)
+    assert error_caused_by(excinfo, "rather than 10")
+    assert load_by_id(1, conn=connect(path)).number_of_results == 10
+
+
+def test_archive_runs_older_than(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    path = tmp_path / "experiments.db"
+    _add_runs(path, 2)
+    _add_runs(path, 1, complete=False)
+    assert archive_runs_older_than(path, days=1) == []
+
+    # pretend that a day has passed
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 24 * 3600 + 1)
+    monkeypatch.setattr(
+        sys, "argv", ["qcodes-archive-runs", str(path), "--older-than", "1"]
+    )
+    main()
+
+    conn = connect(path)
+    archived = conn.execute("SELECT run_id FROM archive.archived_runs").fetchall()
+    conn.close()
+    assert sorted(run_id for (run_id,) in archived) == [1, 2]
+
+
+def test_extract_archived_runs(tmp_path: Path) -> None:
+    source_path = tmp_path / "source.db"
+    target_path = tmp_path / "target.db"
+    guids = _add_runs(source_path, 2)
+    archive_runs(source_path, 1)
+
+    extract_runs_into_db(source_path, target_path, 1, 2)
+
+    for guid in guids:
+        source_data = load_by_guid(guid, conn=connect(source_path))
+        target_data = load_by_guid(guid, conn=connect(target_path))
+        assert_array_equal(
+            target_data.get_parameter_data()["y"]["y"],
+            source_data.get_parameter_data()["y"]["y"],
+        )
@@ -1,9 +1,13 @@
+import io
 import json
 import logging
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
 from copy import deepcopy
 
+import numpy as np
 import pytest
 from pytest import LogCaptureFixture
 
@@ -26,10 +30,13 @@ from qcodes.dataset.descriptions.dependencies import InterDependencies_
 from qcodes.dataset.descriptions.param_spec import ParamSpecBase
 from qcodes.dataset.descriptions.versioning.v0 import InterDependencies
 from qcodes.dataset.guids import parse_guid
+from qcodes.dataset.sqlite import db_upgrades
 from qcodes.dataset.sqlite.connection import atomic_transaction
 from qcodes.dataset.sqlite.database import get_db_version_and_newest_available_version
 from qcodes.dataset.sqlite.db_upgrades import (
     _latest_available_version,
+    batched_upgrade,
+    estimate_db_upgrade_time,
     perform_db_upgrade,
     perform_db_upgrade_0_to_1,
     perform_db_upgrade_1_to_2,
@@ -40,7 +47,11 @@ from qcodes.dataset.sqlite.db_upgrades import (
     perform_db_upgrade_6_to_7,
     perform_db_upgrade_7_to_8,
     perform_db_upgrade_8_to_9,
+    perform_db_upgrade_9_to_10,
+    perform_db_upgrade_10_to_11,
+    upgrade_10_to_11,
 )
+from qcodes.dataset.sqlite.db_upgrades.batched_upgrade import get_upgrade_checkpoints
 from qcodes.dataset.sqlite.db_upgrades.version import get_user_version, set_user_version
 from qcodes.dataset.sqlite.queries import get_run_description, update_GUIDs
 from qcodes.dataset.sqlite.query_helpers import (
@@ -93,7 +104,7 @@ def test_tables_exist(empty_temp_db, version) -> None:
     WHERE type = 'table'
     """
     cursor = conn.execute(query)
-    expected_tables = ["experiments", "runs", "layouts", "dependencies"]
+    expected_tables = ["experiments", "runs", "layouts", "dependencies", "run_metadata"]
     rows = [row for row in cursor]
     assert len(rows) == len(expected_tables)
     for (sql,), expected_table in zip(rows, expected_tables):
@@ -875,7 +886,7 @@ def test_cannot_connect_to_newer_db() -> None:
 
 
 def test_latest_available_version() -> None:
-    assert _latest_available_version() == 9
+    assert _latest_available_version() == 11
 
 
 @pytest.mark.parametrize("version", VERSIONS[:-1])
@@ -911,3 +922,204 @@ def test_perform_actual_upgrade_8_to_9(db_file) -> None:
 
         c = atomic_transaction(conn, index_query)
         assert len(c.fetchall()) == 3
+
+
+def test_perform_upgrade_9_to_10(tmp_path) -> None:
+    conn = connect(tmp_path / "version9.db", version=9)
+    new_experiment("test-experiment", sample_name="test-sample", conn=conn)
+    dataset = DataSet(conn=conn)
+    x = ParamSpecBase("x", "numeric")
+    z = ParamSpecBase("z", "complex")
+    dataset.set_interdependencies(InterDependencies_(dependencies={z: (x,)}))
+    dataset.mark_started()
+    zvals = [1 + 2j, np.complex64(-3.5j), None, 0j]
+    dataset.add_results([{"x": i, "z": zval} for i, zval in enumerate(zvals)])
+    dataset.mark_completed()
+
+    # rewrite the values the way databases before version 10 stored them
+    for rowid, zval in enumerate(zvals, start=1):
+        if zval is None:
+            continue
+        npy = io.BytesIO()
+        np.save(npy, np.array([zval]))
+        atomic_transaction(
+            conn,
+            f'UPDATE "{dataset.table_name}" SET z = ? WHERE rowid = ?',
+            npy.getvalue(),
+            rowid,
+        )
+
+    perform_db_upgrade_9_to_10(conn)
+    assert get_user_version(conn) == 10
+
+    lengths = atomic_transaction(
+        conn, f'SELECT length(z) FROM "{dataset.table_name}"'
+    ).fetchall()
+    assert [length for (length,) in lengths] == [16, 16, None, 16]
+
+    data = dataset.get_parameter_data("z")["z"]["z"]
+    np.testing.assert_array_equal(data, [1 + 2j, -3.5j, 0j])
+    conn.close()
+
+
+def test_perform_upgrade_10_to_11(tmp_path) -> None:
+    conn = connect(tmp_path / "version10.db", version=10)
+    new_experiment("test-experiment", sample_name="test-sample", conn=conn)
+    dataset_a = DataSet(conn=conn)
+    dataset_a.add_metadata("fridge", "BF3")
+    dataset_a.add_metadata("T_mK", 15)
+    dataset_b = DataSet(conn=conn)
+    dataset_b.add_metadata("T_mK", 25.5)
+    assert is_column_in_table(conn, "runs", "T_mK")
+
+    perform_db_upgrade_10_to_11(conn)
+    assert get_user_version(conn) == 11
+
+    assert not is_column_in_table(conn, "runs", "fridge")
+    assert not is_column_in_table(conn, "runs", "T_mK")
+    rows = atomic_transaction(
+        conn, "SELECT run_id, tag, value FROM run_metadata ORDER BY rowid"
+    ).fetchall()
+    assert [tuple(row) for row in rows] == [
+        (dataset_a.run_id, "fridge", "BF3"),
+        (dataset_a.run_id, "T_mK", 15),
+        (dataset_b.run_id, "T_mK", 25.5),
+    ]
+    loaded = DataSet(conn=conn, run_id=dataset_a.run_id)
+    assert loaded.metadata == {"fridge": "BF3", "T_mK": 15}
+    assert loaded.get_metadata("T_mK") == 15
+    conn.close()
+
+
+def test_interrupted_batched_upgrade_resumes(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(batched_upgrade, "UPGRADE_BATCH_SIZE", 2)
+    conn = connect(tmp_path / "version10.db", version=10)
+    new_experiment("test-experiment", sample_name="test-sample", conn=conn)
+    run_ids = []
+    for i in range(5):
+        dataset = DataSet(conn=conn)
+        dataset.add_metadata("T_mK", i)
+        run_ids.append(dataset.run_id)
+
+    # interrupt the upgrade after the first batch of runs
+    atomic_transaction(conn, batched_upgrade._upgrade_checkpoints_table_schema)
+    atomic_transaction(
+        conn,
+        """
+        CREATE TEMP TRIGGER interrupt_upgrade
+        BEFORE UPDATE ON upgrade_checkpoints WHEN NEW.last_run_id > 2
+        BEGIN SELECT RAISE(ABORT, 'interrupted'); END
+        """,
+    )
+    with pytest.raises(RuntimeError):
+        perform_db_upgrade_10_to_11(conn, show_progress_bar=False)
+
+    assert get_user_version(conn) == 10
+    assert get_upgrade_checkpoints(conn) == {11: run_ids[1]}
+    rows = atomic_transaction(conn, "SELECT run_id FROM run_metadata").fetchall()
+    assert [run_id for (run_id,) in rows] == run_ids[:2]
+
+    atomic_transaction(conn, "DROP TRIGGER interrupt_upgrade")
+    perform_db_upgrade_10_to_11(conn, show_progress_bar=False)
+
+    assert get_user_version(conn) == 11
+    assert get_upgrade_checkpoints(conn) == {}
+    rows = atomic_transaction(
+        conn, "SELECT run_id, value FROM run_metadata ORDER BY run_id"
+    ).fetchall()
+    assert [tuple(row) for row in rows] == list(zip(run_ids, range(5)))
+    conn.close()
+
+
+def test_concurrent_batched_upgrades_share_batches(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(batched_upgrade, "UPGRADE_BATCH_SIZE", 1)
+    path = tmp_path / "version10.db"
+    conn = connect(path, version=10)
+    new_experiment("test-experiment", sample_name="test-sample", conn=conn)
+    run_ids = []
+    for i in range(6):
+        dataset = DataSet(conn=conn)
+        dataset.add_metadata("T_mK", i)
+        run_ids.append(dataset.run_id)
+    conn.close()
+
+    # both connections start the upgrade before either of them has claimed it
+    both_started = threading.Barrier(2)
+    upgrade_runs_in_batches = upgrade_10_to_11.upgrade_runs_in_batches
+
+    def start_together(*args, **kwargs):
+        both_started.wait(timeout=10)
+        upgrade_runs_in_batches(*args, **kwargs)
+
+    monkeypatch.setattr(upgrade_10_to_11, "upgrade_runs_in_batches", start_together)
+
+    def upgrade() -> None:
+        thread_conn = connect(path, version=10)
+        try:
+            perform_db_upgrade_10_to_11(thread_conn, show_progress_bar=False)
+        finally:
+            thread_conn.close()
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [executor.submit(upgrade) for _ in range(2)]
+        for future in futures:
+            future.result()
+
+    conn = connect(path, version=10)
+    assert get_user_version(conn) == 11
+    assert get_upgrade_checkpoints(conn) == {}
+    rows = atomic_transaction(
+        conn, "SELECT run_id, value FROM run_metadata ORDER BY run_id"
+    ).fetchall()
+    # each run has been upgraded once
+    assert [tuple(row) for row in rows] == list(zip(run_ids, range(6)))
+    conn.close()
+
+
+def test_batched_upgrade_sets_version_once(tmp_path, monkeypatch) -> None:
+    conn = connect(tmp_path / "version10.db", version=10)
+    new_experiment("test-experiment", sample_name="test-sample", conn=conn)
+    DataSet(conn=conn).add_metadata("T_mK", 15)
+
+    versions_set = []
+
+    def record_user_version(conn, version):
+        versions_set.append((conn.in_transaction, version))
+        set_user_version(conn, version)
+
+    monkeypatch.setattr(db_upgrades, "set_user_version", record_user_version)
+    perform_db_upgrade_10_to_11(conn, show_progress_bar=False)
+
+    # the version is set in the transaction that removes the checkpoint
+    assert versions_set == [(True, 11)]
+    assert get_user_version(conn) == 11
+    conn.close()
+
+
+def test_estimate_db_upgrade_time(tmp_path) -> None:
+    conn = connect(tmp_path / "version8.db", version=9)
+    new_experiment("test-experiment", sample_name="test-sample", conn=conn)
+    for i in range(5):
+        DataSet(conn=conn).add_metadata("T_mK", i)
+    # the upgrade from version 8 to version 9 only adds this index
+    atomic_transaction(conn, "DROP INDEX IX_runs_captured_run_id")
+    set_user_version(conn, 8)
+
+    estimates = estimate_db_upgrade_time(conn, sample_size=2)
+
+    assert list(estimates) == [9, 10, 11]
+    # the upgrades that do not upgrade the runs in batches are not estimated
+    assert estimates[9] is None
+    assert estimates[10] is not None and estimates[10] >= 0
+    assert estimates[11] is not None and estimates[11] >= 0
+    # the dry run leaves the database unchanged
+    assert get_user_version(conn) == 8
+    c = atomic_transaction(conn, "PRAGMA index_list(runs)")
+    assert "IX_runs_captured_run_id" not in [row[1] for row in c.fetchall()]
+    assert is_column_in_table(conn, "runs", "T_mK")
+    assert get_upgrade_checkpoints(conn) == {}
+    assert not conn.in_transaction
+
+    perform_db_upgrade(conn)
+    assert get_user_version(conn) == LATEST_VERSION
+    conn.close()
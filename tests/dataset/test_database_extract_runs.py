@@ -22,7 +22,13 @@ from qcodes.dataset.data_set import (
     load_by_id,
     load_by_run_spec,
 )
-from qcodes.dataset.database_extract_runs import extract_runs_into_db
+from qcodes.dataset.data_set_info import get_run_summaries
+from qcodes.dataset.database_extract_runs import (
+    extract_runs_into_db,
+    extract_runs_into_dbs,
+)
+from qcodes.dataset.descriptions.dependencies import InterDependencies_
+from qcodes.dataset.descriptions.param_spec import ParamSpecBase
 from qcodes.dataset.experiment_container import (
     Experiment,
     load_experiment_by_name,
@@ -31,8 +37,12 @@ from qcodes.dataset.experiment_container import (
 from qcodes.dataset.linked_datasets.links import Link
 from qcodes.dataset.measurements import Measurement
 from qcodes.dataset.sqlite.connection import path_to_dbfile
-from qcodes.dataset.sqlite.database import get_db_version_and_newest_available_version
+from qcodes.dataset.sqlite.database import (
+    connect,
+    get_db_version_and_newest_available_version,
+)
 from qcodes.dataset.sqlite.queries import get_experiments
+from qcodes.dataset.sqlite.sidecar import sidecar_run_dir
 from qcodes.instrument_drivers.mock_instruments import DummyInstrument
 from qcodes.station import Station
 from tests.common import error_caused_by, skip_if_no_fixtures
@@ -960,3 +970,103 @@ def test_column_mismatch(two_empty_temp_db_connections, some_interdeps, inst) ->
     target_copied_ds = DataSet(conn=target_conn, run_id=2)
 
     assert target_copied_ds.the_same_dataset_as(source_ds)
+
+
+def test_extraction_copies_sidecar_files(two_empty_temp_db_connections) -> None:
+    source_conn, target_conn = two_empty_temp_db_connections
+    source_path = path_to_dbfile(source_conn)
+    target_path = path_to_dbfile(target_conn)
+
+    qc.config.dataset.sidecar_threshold_bytes = 0
+    Experiment(conn=source_conn)
+    source_ds = DataSet(conn=source_conn)
+    x = ParamSpecBase("x", "numeric")
+    y = ParamSpecBase("y", "array")
+    source_ds.set_interdependencies(InterDependencies_(dependencies={y: (x,)}))
+    source_ds.mark_started()
+    yvals = [np.random.rand(10) for _ in range(4)]
+    source_ds.add_results([{"x": i, "y": yval} for i, yval in enumerate(yvals)])
+    source_ds.mark_completed()
+
+    extract_runs_into_db(source_path, target_path, source_ds.run_id)
+
+    assert (sidecar_run_dir(target_path, source_ds.guid) / "y.bin").exists()
+    target_ds = load_by_guid(source_ds.guid, conn=target_conn)
+    assert_array_equal(target_ds.get_parameter_data()["y"]["y"], np.array(yvals))
+
+
+def test_extraction_in_several_transactions(
+    two_empty_temp_db_connections, some_interdeps
+) -> None:
+    """
+    Test that the runs of the transactions that were committed before a run
+    that is not completed remain in the target DB
+    """
+    source_conn, target_conn = two_empty_temp_db_connections
+    source_path = path_to_dbfile(source_conn)
+    target_path = path_to_dbfile(target_conn)
+
+    source_exp = Experiment(conn=source_conn)
+    source_datasets = []
+    for _ in range(5):
+        source_ds = DataSet(conn=source_conn, exp_id=source_exp.exp_id)
+        source_ds.set_interdependencies(some_interdeps[1])
+        source_ds.mark_started()
+        source_ds.add_results(
+            [{name: val for name in some_interdeps[1].names} for val in range(10)]
+        )
+        source_datasets.append(source_ds)
+    for source_ds in source_datasets[:4]:
+        source_ds.mark_completed()
+
+    with pytest.raises(RuntimeError):
+        extract_runs_into_db(
+            source_path, target_path, 1, 2, 3, 4, 5, runs_per_transaction=2
+        )
+
+    target_runs = get_run_summaries(target_conn)
+    assert [run.guid for run in target_runs] == [ds.guid for ds in source_datasets[:4]]
+    for source_ds in source_datasets[:4]:
+        assert load_by_guid(source_ds.guid, conn=target_conn).the_same_dataset_as(
+            source_ds
+        )
+
+
+def test_extraction_into_several_dbs(
+    two_empty_temp_db_connections, some_interdeps, tmp_path
+) -> None:
+    source_conn, _ = two_empty_temp_db_connections
+    source_path = path_to_dbfile(source_conn)
+
+    source_exp = Experiment(conn=source_conn)
+    source_datasets = []
+    for _ in range(4):
+        source_ds = DataSet(conn=source_conn, exp_id=source_exp.exp_id)
+        source_ds.set_interdependencies(some_interdeps[1])
+        source_ds.mark_started()
+        source_ds.add_results(
+            [{name: val for name in some_interdeps[1].names} for val in range(10)]
+        )
+        source_ds.mark_completed()
+        source_datasets.append(source_ds)
+
+    run_ids_by_target_db = {
+        tmp_path / "target_a.db": [1, 3],
+        tmp_path / "target_b.db": [2],
+        tmp_path / "target_c.db": [4, 2],
+    }
+    extract_runs_into_dbs(source_path, run_ids_by_target_db, max_workers=3)
+
+    for target_path, run_ids in run_ids_by_target_db.items():
+        target_conn = connect(target_path)
+        try:
+            target_runs = get_run_summaries(target_conn)
+            assert [run.guid for run in target_runs] == [
+                source_datasets[run_id - 1].guid for run_id in run_ids
+            ]
+            for run_id in run_ids:
+                source_ds = source_datasets[run_id - 1]
+                target_ds = load_by_guid(source_ds.guid, conn=target_conn)
+                assert target_ds.the_same_dataset_as(source_ds)
+        finally:
+            target_conn.close()
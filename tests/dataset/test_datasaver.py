@@ -1,13 +1,22 @@
 import re
+import time
 from typing import TYPE_CHECKING
 
 import numpy as np
 import pytest
 
+import qcodes as qc
 from qcodes.dataset import new_data_set
+from qcodes.dataset.data_set import (
+    _BackgroundWriter,
+    _DataWriteQueue,
+    _merge_result_columns,
+    _ResultColumns,
+)
 from qcodes.dataset.descriptions.dependencies import InterDependencies_
 from qcodes.dataset.descriptions.param_spec import ParamSpecBase
 from qcodes.dataset.measurements import DataSaver
+from qcodes.dataset.sqlite.wal_checkpoint import is_wal_mode
 
 if TYPE_CHECKING:
     from collections.abc import Callable
@@ -178,3 +187,185 @@ def test_duplicated_parameter_raises() -> None:
     finally:
         data_saver.dataset.mark_completed()
         data_saver.dataset.conn.close()  # type: ignore[attr-defined]
+
+
+@pytest.mark.usefixtures("experiment")
+@pytest.mark.parametrize("bg_writing", [True, False])
+def test_writer_metrics(bg_writing) -> None:
+    p = ParamSpecBase("p", "numeric")
+
+    test_set = new_data_set("test-dataset")
+    test_set.set_interdependencies(InterDependencies_(standalones=(p,)))
+    test_set.mark_started(start_bg_writer=bg_writing)
+
+    idps = InterDependencies_(standalones=(p,))
+
+    data_saver = DataSaver(dataset=test_set, write_period=0, interdeps=idps)
+
+    try:
+        for _ in range(3):
+            data_saver.add_result(("p", np.arange(10)))
+        data_saver.flush_data_to_database(block=True)
+        metrics = data_saver.writer_metrics
+        if bg_writing:
+            assert metrics is not None
+            assert metrics.rows_written == 30
+            assert metrics.rows_dropped == 0
+            assert metrics.queue_depth == 0
+            assert metrics.queue_bytes == 0
+            assert metrics.lag == 0
+            assert metrics.rows_per_second > 0
+            assert metrics.bytes_per_second > 0
+        else:
+            assert metrics is None
+        np.testing.assert_array_equal(
+            test_set.get_parameter_data("p")["p"]["p"], np.tile(np.arange(10), 3)
+        )
+    finally:
+        data_saver.dataset.mark_completed()
+        data_saver.dataset.conn.close()  # type: ignore[attr-defined]
+
+
+@pytest.mark.usefixtures("experiment")
+@pytest.mark.parametrize("bg_writing", [True, False])
+def test_wal_checkpoint_in_background(bg_writing) -> None:
+    qc.config.dataset.wal_checkpoint_in_background = True
+    qc.config.dataset.wal_checkpoint_bytes = 1
+    p = ParamSpecBase("p", "numeric")
+
+    test_set = new_data_set("test-dataset")
+    assert is_wal_mode(test_set.conn)
+    test_set.set_interdependencies(InterDependencies_(standalones=(p,)))
+    test_set.mark_started(start_bg_writer=bg_writing)
+
+    idps = InterDependencies_(standalones=(p,))
+
+    data_saver = DataSaver(dataset=test_set, write_period=0, interdeps=idps)
+
+    try:
+        if not bg_writing:
+            # results are committed on this connection without checkpointing
+            autocheckpoint = test_set.conn.execute("PRAGMA wal_autocheckpoint")
+            assert autocheckpoint.fetchone()[0] == 0
+        data_saver.add_result(("p", np.arange(10)))
+        data_saver.flush_data_to_database(block=True)
+
+        metrics = data_saver.wal_checkpoint_metrics
+        assert metrics is not None
+        deadline = time.perf_counter() + 10
+        while metrics.checkpoints == 0 and time.perf_counter() < deadline:
+            time.sleep(0.01)
+            metrics = data_saver.wal_checkpoint_metrics
+            assert metrics is not None
+        assert metrics.checkpoints >= 1
+        assert metrics.bytes_since_checkpoint == 0
+        assert metrics.max_checkpoint_latency >= metrics.last_checkpoint_latency
+        assert metrics.wal_bytes > 0
+    finally:
+        data_saver.dataset.mark_completed()
+
+    assert data_saver.wal_checkpoint_metrics is None
+    autocheckpoint = test_set.conn.execute("PRAGMA wal_autocheckpoint")
+    assert autocheckpoint.fetchone()[0] == 1000
+    np.testing.assert_array_equal(
+        test_set.get_parameter_data("p")["p"]["p"], np.arange(10)
+    )
+    test_set.conn.close()
+
+
+@pytest.mark.usefixtures("experiment")
+def test_no_wal_checkpoint_by_default() -> None:
+    test_set = new_data_set("test-dataset")
+    test_set.set_interdependencies(
+        InterDependencies_(standalones=(ParamSpecBase("p", "numeric"),))
+    )
+    test_set.mark_started()
+    try:
+        assert test_set._wal_checkpoint_metrics() is None
+    finally:
+        test_set.mark_completed()
+        test_set.conn.close()
+
+
+def test_write_queue_drops_results_when_full() -> None:
+    queue = _DataWriteQueue(max_bytes=100, block_when_full=False)
+
+    # a single item larger than the limit is accepted by an empty queue
+    assert queue.put_results({"keys": ["x"]}, nbytes=150, nrows=15)
+    assert not queue.put_results({"keys": ["x"]}, nbytes=10, nrows=1)
+    assert queue.pending_items == 1
+    assert queue.pending_bytes == 150
+    assert queue.rows_dropped == 1
+
+    queue.results_written(nbytes=150, nitems=1)
+    assert queue.put_results({"keys": ["x"]}, nbytes=60, nrows=6)
+    assert queue.put_results({"keys": ["x"]}, nbytes=40, nrows=4)
+    assert not queue.put_results({"keys": ["x"]}, nbytes=1, nrows=1)
+    assert queue.pending_bytes == 100
+    assert queue.rows_dropped == 2
+
+
+def test_background_writer_collects_results_up_to_control_item(
+    empty_temp_db_connection,
+) -> None:
+    queue = _DataWriteQueue()
+    writer = _BackgroundWriter(queue, empty_temp_db_connection)
+
+    for i in range(3):
+        queue.put_results(
+            {"keys": ["x"], "values": [[i]], "table_name": "results"},
+            nbytes=8,
+            nrows=1,
+        )
+    queue.put({"keys": "finalize", "values": 1})
+    queue.put_results(
+        {"keys": ["x"], "values": [[3]], "table_name": "results"}, nbytes=8, nrows=1
+    )
+
+    batch = writer._collect_batch(queue.get())
+    assert [item["values"] for item in batch] == [[[0]], [[1]], [[2]]]
+    # the control item is handled next, before the items after it
+    assert writer._next_item is not None
+    assert writer._next_item["keys"] == "finalize"
+    assert queue.get()["values"] == [[3]]
+    assert queue.unfinished_tasks == 5
+
+
+@pytest.mark.filterwarnings("ignore::pytest.PytestUnhandledThreadExceptionWarning")
+def test_blocked_put_results_raises_if_writer_stops(
+    empty_temp_db_connection,
+) -> None:
+    queue = _DataWriteQueue(max_bytes=10)
+    queue.writer_check_interval = 0.01
+    writer = _BackgroundWriter(queue, empty_temp_db_connection)
+
+    def fail() -> None:
+        time.sleep(0.1)
+        raise ValueError("disk full")
+
+    writer._run = fail  # type: ignore[method-assign]
+    assert queue.put_results({"keys": ["x"]}, nbytes=8, nrows=1, writer=writer)
+    writer.start()
+    # the queue is full and the writer stops while waiting for room
+    with pytest.raises(RuntimeError, match="has stopped") as excinfo:
+        queue.put_results({"keys": ["x"]}, nbytes=8, nrows=1, writer=writer)
+    assert isinstance(excinfo.value.__cause__, ValueError)
+    assert not writer.is_alive()
+
+
+def test_merge_result_columns_concatenates_each_column_once(mocker) -> None:
+    results = [
+        _ResultColumns(keys=("x", "y"), columns=[np.array([i]), [np.arange(i)]])
+        for i in range(100)
+    ]
+    results.insert(50, _ResultColumns(keys=("z",), columns=[np.array([-1])]))
+    results.insert(51, _ResultColumns(keys=("x", "y"), columns=[np.array([]), []]))
+    concatenate = mocker.spy(np, "concatenate")
+
+    merged = _merge_result_columns(results)
+
+    assert [result.keys for result in merged] == [("x", "y"), ("z",), ("x", "y")]
+    assert concatenate.call_count == 2
+    np.testing.assert_array_equal(merged[0].columns[0], np.arange(50))
+    np.testing.assert_array_equal(merged[2].columns[0], np.arange(50, 100))
+    assert [len(value) for value in merged[2].columns[1]] == list(range(50, 100))
@@ -1,6 +1,7 @@
 import io
 import random
 import re
+import sqlite3
 from copy import copy
 from typing import TYPE_CHECKING, ClassVar
 
@@ -25,9 +26,21 @@ from qcodes.dataset.descriptions.dependencies import InterDependencies_
 from qcodes.dataset.descriptions.param_spec import ParamSpecBase
 from qcodes.dataset.descriptions.rundescriber import RunDescriber
 from qcodes.dataset.guids import parse_guid
-from qcodes.dataset.sqlite.connection import atomic, path_to_dbfile
-from qcodes.dataset.sqlite.database import _convert_array, get_DB_location
+from qcodes.dataset.sqlite import queries
+from qcodes.dataset.sqlite.array_header import RAW_ARRAY_MAGIC
+from qcodes.dataset.sqlite.connection import (
+    atomic,
+    atomic_transaction,
+    path_to_dbfile,
+)
+from qcodes.dataset.sqlite.database import (
+    _adapt_array_raw,
+    _convert_array,
+    connect,
+    get_DB_location,
+)
 from qcodes.dataset.sqlite.queries import _rewrite_timestamps, _unicode_categories
+from qcodes.dataset.sqlite.sidecar import sidecar_run_dir
 from qcodes.utils.types import complex_types, numpy_complex, numpy_floats, numpy_ints
 from tests.common import error_caused_by
 from tests.dataset.helper_functions import verify_data_dict
@@ -635,6 +648,28 @@ def test_numpy_complex(dataset) -> None:
     np.testing.assert_array_equal(result["x"]["x"], expected_result)
 
 
+def test_complex_data_decoded_by_column(dataset, mocker) -> None:
+    x = ParamSpecBase("x", "numeric")
+    z = ParamSpecBase("z", "complex")
+    dataset.set_interdependencies(InterDependencies_(dependencies={z: (x,)}))
+    dataset.mark_started()
+
+    xvals = np.random.rand(10)
+    zvals = (np.random.rand(10) + 1j * np.random.rand(10)).astype(np.complex64)
+    dataset.add_results([{"x": xval, "z": zval} for xval, zval in zip(xvals, zvals)])
+
+    decode_column = mocker.spy(queries, "decode_complex_column")
+    retrieved = dataset.get_parameter_data()["z"]
+    # the column is decoded in one go rather than by the converter
+    decode_column.assert_called_once()
+    # complex64 values are stored and loaded as complex128
+    assert retrieved["z"].dtype == np.complex128
+    assert retrieved["x"].dtype == np.float64
+    np.testing.assert_array_equal(retrieved["z"], zvals)
+    np.testing.assert_array_equal(retrieved["x"], xvals)
+    retrieved["z"][0] = 0
+
+
 def test_numpy_nan(dataset) -> None:
     parameter_m = ParamSpecBase("m", "numeric")
     idps = InterDependencies_(standalones=(parameter_m,))
@@ -662,6 +697,75 @@ def test_numpy_inf(dataset) -> None:
     assert np.isinf(retrieved).all()
 
 
+def test_numeric_data_loaded_in_bulk(dataset) -> None:
+    x = ParamSpecBase("x", "numeric")
+    y = ParamSpecBase("y", "numeric")
+    dataset.set_interdependencies(InterDependencies_(dependencies={y: (x,)}))
+    dataset.mark_started()
+
+    xvals = np.random.rand(20)
+    yvals = np.random.rand(20)
+    yvals[3] = np.nan
+    yvals[5] = -np.inf
+    dataset.add_results(
+        [{"x": xval, "y": yval} for xval, yval in zip(xvals, yvals)] + [{"y": 7}]
+    )
+
+    retrieved = dataset.get_parameter_data()["y"]
+    assert retrieved["x"].dtype == np.float64
+    assert retrieved["y"].dtype == np.float64
+    # values are not round tripped through their text representation
+    np.testing.assert_array_equal(retrieved["x"], [*xvals, np.nan])
+    np.testing.assert_array_equal(retrieved["y"], [*yvals, 7])
+
+
+def test_numeric_data_with_text_falls_back_to_converter(dataset) -> None:
+    m = ParamSpecBase("m", "numeric")
+    dataset.set_interdependencies(InterDependencies_(standalones=(m,)))
+    dataset.mark_started()
+
+    dataset.add_results([{"m": 1.5}, {"m": "not a number"}])
+    statements: list[str] = []
+    dataset.conn.set_trace_callback(statements.append)
+    try:
+        retrieved = dataset.get_parameter_data()["m"]["m"]
+    finally:
+        dataset.conn.set_trace_callback(None)
+    assert retrieved.tolist() == [1.5, "not a number"]
+    # the rows are read once
+    result_table_reads = [
+        sql for sql in statements if f'FROM "{dataset.table_name}"' in sql
+    ]
+    assert len(result_table_reads) == 1
+
+
+def test_numeric_data_in_array_tree_loaded_like_without_arrays(dataset) -> None:
+    x = ParamSpecBase("x", "numeric")
+    y = ParamSpecBase("y", "array")
+    m = ParamSpecBase("m", "numeric")
+    dataset.set_interdependencies(
+        InterDependencies_(dependencies={y: (x,)}, standalones=(m,))
+    )
+    dataset.mark_started()
+
+    xvals = [1, 2.5, -np.inf, "not a number"]
+    dataset.add_results([{"x": xval, "y": np.arange(3.0)} for xval in xvals])
+    dataset.add_results([{"m": xval} for xval in xvals])
+    dataset.mark_completed()
+
+    data = dataset.get_parameter_data()
+    # each value of x is expanded to the shape of y
+    expanded_x = data["y"]["x"]
+    assert expanded_x.shape == (len(xvals), 3)
+    assert expanded_x[:, 0].tolist() == data["m"]["m"].tolist()
+    assert expanded_x[:, 0].tolist() == expanded_x[:, 2].tolist()
+
+    numeric_only = dataset.get_parameter_data("m", end=3)["m"]["m"]
+    array_tree = dataset.get_parameter_data("y", end=3)["y"]["x"]
+    assert numeric_only.dtype == array_tree.dtype == np.float64
+    np.testing.assert_array_equal(array_tree[:, 0], numeric_only)
+
+
 def test_backward_compat__adapt_array_v0_33() -> None:
     for dtype in numpy_floats + complex_types:
         arr: np.ndarray = np.asarray([1.0], dtype=np.dtype(dtype))
@@ -671,6 +775,150 @@ def test_backward_compat__adapt_array_v0_33() -> None:
         assert arr == _convert_array(out.read())
 
 
+@pytest.mark.parametrize(
+    "arr",
+    [
+        np.linspace(0, 1, 11),
+        np.zeros((3, 4), dtype=np.complex64),
+        np.array(3),
+        np.array([], dtype="<U3"),
+        np.array(["ab", "c"]),
+        np.ones((4, 5))[:, ::2],
+        np.asfortranarray(np.arange(6).reshape(2, 3)).astype(">i4"),
+    ],
+)
+def test_raw_array_codec_roundtrip(arr) -> None:
+    blob = _adapt_array_raw(arr)
+    assert bytes(blob).startswith(RAW_ARRAY_MAGIC)
+    converted = _convert_array(bytes(blob))
+    assert converted.dtype == arr.dtype
+    assert converted.shape == arr.shape
+    np.testing.assert_array_equal(converted, arr)
+
+
+def test_raw_array_codec_in_dataset(tmp_path) -> None:
+    qc.config.dataset.array_codec = "raw"
+    conn = connect(tmp_path / "raw_codec.db")
+    qc.config.dataset.array_codec = "npy"
+    # opening a connection with another codec must not change this one
+    npy_conn = connect(tmp_path / "npy_codec.db")
+    try:
+        new_experiment("test-experiment", sample_name="test-sample", conn=conn)
+        dataset = DataSet(conn=conn)
+        x = ParamSpecBase("x", "array")
+        y = ParamSpecBase("y", "array")
+        dataset.set_interdependencies(InterDependencies_(dependencies={y: (x,)}))
+        dataset.mark_started()
+
+        xvals = np.linspace(0, 1, 7)
+        yvals = [np.random.rand(7) for _ in range(3)]
+        dataset.add_results([{"x": xvals, "y": yval} for yval in yvals])
+        dataset.mark_completed()
+
+        blobs = atomic_transaction(
+            conn, f'SELECT CAST(y AS BLOB) FROM "{dataset.table_name}"'
+        ).fetchall()
+        assert all(blob.startswith(RAW_ARRAY_MAGIC) for (blob,) in blobs)
+
+        data = dataset.get_parameter_data()["y"]
+        np.testing.assert_array_equal(data["y"], np.array(yvals))
+        np.testing.assert_array_equal(data["x"], np.array([xvals] * 3))
+
+        (loaded,) = atomic_transaction(
+            conn, f'SELECT y FROM "{dataset.table_name}"'
+        ).fetchone()
+        np.testing.assert_array_equal(loaded, yvals[0])
+        assert loaded.flags.writeable
+
+        new_experiment("test-experiment", sample_name="test-sample", conn=npy_conn)
+        npy_dataset = DataSet(conn=npy_conn)
+        npy_dataset.set_interdependencies(InterDependencies_(dependencies={y: (x,)}))
+        npy_dataset.mark_started()
+        npy_dataset.add_results([{"x": xvals, "y": yvals[0]}])
+        npy_dataset.mark_completed()
+        (npy_blob,) = atomic_transaction(
+            npy_conn, f'SELECT CAST(y AS BLOB) FROM "{npy_dataset.table_name}"'
+        ).fetchone()
+        assert not npy_blob.startswith(RAW_ARRAY_MAGIC)
+    finally:
+        conn.close()
+        npy_conn.close()
+
+
+def test_sidecar_storage_of_large_arrays(tmp_path) -> None:
+    qc.config.dataset.sidecar_threshold_bytes = 100
+    conn = connect(tmp_path / "sidecar.db")
+    try:
+        new_experiment("test-experiment", sample_name="test-sample", conn=conn)
+        dataset = DataSet(conn=conn)
+        x = ParamSpecBase("x", "array")
+        y = ParamSpecBase("y", "array")
+        dataset.set_interdependencies(InterDependencies_(dependencies={y: (x,)}))
+        dataset.mark_started()
+
+        # x is below the threshold and stays in the database
+        xvals = np.linspace(0, 1, 7)
+        yvals = [np.random.rand(7, 5) for _ in range(3)]
+        dataset.add_results([{"x": xvals, "y": yval} for yval in yvals])
+        dataset.mark_completed()
+
+        sidecar_file = sidecar_run_dir(dataset.path_to_db, dataset.guid) / "y.bin"
+        assert sidecar_file.stat().st_size == 3 * yvals[0].nbytes
+        assert not (sidecar_file.parent / "x.bin").exists()
+
+        data = dataset.get_parameter_data()["y"]
+        assert isinstance(data["y"], np.memmap)
+        np.testing.assert_array_equal(data["y"], np.array(yvals))
+        np.testing.assert_array_equal(data["x"], np.array([xvals] * 3))
+
+        single_row = dataset.get_parameter_data("y", start=2, end=2)["y"]["y"]
+        np.testing.assert_array_equal(single_row, np.array(yvals[1:2]))
+    finally:
+        conn.close()
+
+
+def test_sidecar_data_discarded_when_insert_fails(tmp_path, mocker) -> None:
+    qc.config.dataset.sidecar_threshold_bytes = 100
+    conn = connect(tmp_path / "sidecar.db")
+    try:
+        new_experiment("test-experiment", sample_name="test-sample", conn=conn)
+        dataset = DataSet(conn=conn)
+        x = ParamSpecBase("x", "array")
+        y = ParamSpecBase("y", "array")
+        dataset.set_interdependencies(InterDependencies_(dependencies={y: (x,)}))
+        dataset.mark_started()
+        sidecar_file = sidecar_run_dir(dataset.path_to_db, dataset.guid) / "y.bin"
+
+        xvals = np.linspace(0, 1, 7)
+        yvals = [np.random.rand(7, 5) for _ in range(3)]
+        mocker.patch(
+            "qcodes.dataset.data_set.insert_many_columns",
+            side_effect=sqlite3.OperationalError("disk I/O error"),
+        )
+        with pytest.raises(sqlite3.OperationalError, match="disk I/O error"):
+            dataset.add_results([{"x": xvals, "y": yvals[0]}])
+        assert not sidecar_file.exists()
+
+        mocker.stopall()
+        dataset.add_results([{"x": xvals, "y": yvals[1]}])
+        mocker.patch(
+            "qcodes.dataset.data_set.insert_many_columns",
+            side_effect=sqlite3.OperationalError("disk I/O error"),
+        )
+        with pytest.raises(sqlite3.OperationalError, match="disk I/O error"):
+            dataset.add_results([{"x": xvals, "y": yvals[0]}])
+        assert sidecar_file.stat().st_size == yvals[1].nbytes
+
+        mocker.stopall()
+        dataset.add_results([{"x": xvals, "y": yvals[2]}])
+        dataset.mark_completed()
+        assert sidecar_file.stat().st_size == 2 * yvals[0].nbytes
+        data = dataset.get_parameter_data()["y"]
+        np.testing.assert_array_equal(data["y"], np.array(yvals[1:]))
+    finally:
+        conn.close()
+
+
 def test_missing_keys(dataset) -> None:
     """
     Test that we can now have partial results with keys missing. This is for
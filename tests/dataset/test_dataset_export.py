@@ -6,8 +6,11 @@ import os
 from pathlib import Path
 from typing import TYPE_CHECKING
 
+import dask
+import dask.array
 import numpy as np
 import pandas as pd
+import pyarrow.parquet as pq
 import pytest
 import xarray as xr
 from hypothesis import HealthCheck, given, settings
@@ -23,15 +26,28 @@ from qcodes.dataset import (
     get_data_export_path,
     load_by_guid,
     load_by_id,
+    load_from_file,
     load_from_netcdf,
     new_data_set,
 )
+from qcodes.dataset.data_set_in_memory import DataSetInMem
 from qcodes.dataset.descriptions.dependencies import InterDependencies_
 from qcodes.dataset.descriptions.param_spec import ParamSpecBase
 from qcodes.dataset.descriptions.versioning import serialization as serial
 from qcodes.dataset.export_config import DataExportType
+from qcodes.dataset.exporters import export_to_xarray
+from qcodes.dataset.exporters.export_to_arrow import (
+    _from_arrow_array,
+    _to_arrow_array,
+    load_arrow_file_metadata,
+)
 from qcodes.dataset.exporters.export_to_pandas import _generate_pandas_index
-from qcodes.dataset.exporters.export_to_xarray import _calculate_index_shape
+from qcodes.dataset.exporters.export_to_xarray import (
+    _calculate_index_shape,
+    _NotStreamableError,
+    _stream_to_h5netcdf,
+    xarray_to_h5netcdf_with_complex_numbers,
+)
 from qcodes.dataset.linked_datasets.links import links_to_str
 
 if TYPE_CHECKING:
@@ -612,6 +628,27 @@ def test_export_netcdf_complex_data(tmp_path_factory, mock_dataset_complex) -> N
     assert df.y.values.tolist() == [1.0 + 1j]
 
 
+def test_export_netcdf_sidecar_data(tmp_path_factory, experiment) -> None:
+    qcodes.config.dataset.sidecar_threshold_bytes = 0
+    dataset = new_data_set("dataset")
+    xparam = ParamSpecBase("x", "array")
+    yparam = ParamSpecBase("y", "array")
+    dataset.set_interdependencies(InterDependencies_(dependencies={yparam: (xparam,)}))
+    dataset.mark_started()
+    xvals = np.linspace(0, 1, 11)
+    yvals = np.random.rand(11)
+    dataset.add_results([{"x": xvals, "y": yvals}])
+    dataset.mark_completed()
+    assert isinstance(dataset.get_parameter_data()["y"]["y"], np.memmap)
+
+    tmp_path = tmp_path_factory.mktemp("export_netcdf")
+    dataset.export(export_type="netcdf", path=str(tmp_path), prefix="qcodes_")
+    file_path = tmp_path / f"qcodes_{dataset.captured_run_id}_{dataset.guid}.nc"
+    with xr.open_dataset(file_path) as ds:
+        np.testing.assert_array_equal(ds["x"].values, xvals)
+        np.testing.assert_array_equal(ds["y"].values, yvals)
+
+
 def test_export_no_or_nonexistent_type_specified(
     tmp_path_factory, mock_dataset
 ) -> None:
@@ -868,9 +905,8 @@ def test_export_dataset_delayed_numeric(
         "Dataset is expected to be larger that threshold. Using distributed export."
         in caplog.records[0].msg
     )
-    assert "Writing individual files to temp dir" in caplog.records[1].msg
-    assert "Combining temp files into one file" in caplog.records[2].msg
-    assert "Writing netcdf file using Dask delayed writer" in caplog.records[3].msg
+    assert "Writing chunks of rows to netcdf file" in caplog.records[1].msg
+    assert "Combining temp files" not in caplog.text
 
     loaded_ds = xr.load_dataset(mock_dataset_grid.export_info.export_paths["nc"])
     assert loaded_ds.x.shape == (10,)
@@ -902,9 +938,8 @@ def test_export_dataset_delayed(
         "Dataset is expected to be larger that threshold. Using distributed export."
         in caplog.records[0].msg
     )
-    assert "Writing individual files to temp dir" in caplog.records[1].msg
-    assert "Combining temp files into one file" in caplog.records[2].msg
-    assert "Writing netcdf file using Dask delayed writer" in caplog.records[3].msg
+    assert "Writing chunks of rows to netcdf file" in caplog.records[1].msg
+    assert "Combining temp files" not in caplog.text
 
     loaded_ds = xr.load_dataset(mock_dataset_numpy.export_info.export_paths["nc"])
     assert loaded_ds.x.shape == (10,)
@@ -938,9 +973,8 @@ def test_export_dataset_delayed_complex(
         "Dataset is expected to be larger that threshold. Using distributed export."
         in caplog.records[0].msg
     )
-    assert "Writing individual files to temp dir" in caplog.records[1].msg
-    assert "Combining temp files into one file" in caplog.records[2].msg
-    assert "Writing netcdf file using Dask delayed writer" in caplog.records[3].msg
+    assert "Writing chunks of rows to netcdf file" in caplog.records[1].msg
+    assert "Combining temp files" not in caplog.text
 
     loaded_ds = xr.load_dataset(
         mock_dataset_numpy_complex.export_info.export_paths["nc"]
@@ -960,6 +994,82 @@ def test_export_dataset_delayed_complex(
     _assert_xarray_metadata_is_as_expected(loaded_ds, mock_dataset_numpy_complex)
 
 
+def test_export_dataset_delayed_identical_to_direct_export(
+    tmp_path_factory: TempPathFactory,
+    mock_dataset_grid: DataSet,
+    mock_dataset_numpy_complex: DataSet,
+) -> None:
+    tmp_path = tmp_path_factory.mktemp("export_netcdf")
+    qcodes.config.dataset.export_chunked_threshold = 0
+    qcodes.config.dataset.export_chunked_export_of_large_files_enabled = True
+    for dataset in (mock_dataset_grid, mock_dataset_numpy_complex):
+        direct_path = tmp_path / f"direct_{dataset.run_id}.nc"
+        xarray_to_h5netcdf_with_complex_numbers(
+            dataset.to_xarray_dataset(), direct_path
+        )
+        dataset.export(export_type="netcdf", path=tmp_path, prefix="qcodes_")
+
+        direct_ds = xr.load_dataset(direct_path)
+        loaded_ds = xr.load_dataset(dataset.export_info.export_paths["nc"])
+        assert loaded_ds.identical(direct_ds)
+
+
+def test_export_dataset_delayed_falls_back_to_combining_files(
+    tmp_path_factory: TempPathFactory, experiment, caplog
+) -> None:
+    dataset = new_data_set("dataset")
+    xparam = ParamSpecBase("x", "numeric")
+    yparam = ParamSpecBase("y", "numeric")
+    zparam = ParamSpecBase("z", "numeric")
+    idps = InterDependencies_(dependencies={zparam: (xparam, yparam)})
+    dataset.set_interdependencies(idps)
+    dataset.mark_started()
+    # the outer setpoint is decreasing so the slices along it can not be appended
+    for x in range(9, -1, -1):
+        for y in range(20, 25):
+            dataset.add_results([{"x": x, "y": y, "z": x + y}])
+    dataset.mark_completed()
+
+    tmp_path = tmp_path_factory.mktemp("export_netcdf")
+    qcodes.config.dataset.export_chunked_threshold = 0
+    qcodes.config.dataset.export_chunked_export_of_large_files_enabled = True
+    with caplog.at_level(logging.INFO):
+        dataset.export(export_type="netcdf", path=tmp_path, prefix="qcodes_")
+
+    assert "Writing chunks of rows to netcdf file" in caplog.records[1].msg
+    assert "Falling back to combining individual files" in caplog.records[2].msg
+    assert "Writing individual files to temp dir" in caplog.records[3].msg
+    assert "Combining temp files into one file" in caplog.records[4].msg
+    assert "Writing netcdf file using Dask delayed writer" in caplog.records[5].msg
+
+    loaded_ds = xr.load_dataset(dataset.export_info.export_paths["nc"])
+    assert_allclose(loaded_ds.x, np.arange(10))
+    assert_allclose(loaded_ds.y, np.arange(20, 25))
+    assert_allclose(loaded_ds.z, np.arange(10)[:, None] + np.arange(20, 25))
+
+
+def test_stream_to_netcdf_checks_outer_setpoint_before_writing(
+    tmp_path_factory: TempPathFactory, experiment
+) -> None:
+    dataset = new_data_set("dataset")
+    xparam = ParamSpecBase("x", "numeric")
+    yparam = ParamSpecBase("y", "numeric")
+    zparam = ParamSpecBase("z", "numeric")
+    idps = InterDependencies_(dependencies={zparam: (xparam, yparam)})
+    dataset.set_interdependencies(idps)
+    dataset.mark_started()
+    # x is the first setpoint but it is swept fastest
+    for y in range(20, 25):
+        for x in range(10):
+            dataset.add_results([{"x": x, "y": y, "z": x + y}])
+    dataset.mark_completed()
+
+    file_path = tmp_path_factory.mktemp("export_netcdf") / "streamed.nc"
+    with pytest.raises(_NotStreamableError, match="not the slowest axis"):
+        _stream_to_h5netcdf(dataset, file_path, rows_per_chunk=7)
+    assert not file_path.exists()
+
+
 def test_export_non_grid_dataset_xarray(mock_dataset_non_grid: DataSet) -> None:
     xr_ds = mock_dataset_non_grid.to_xarray_dataset()
     assert xr_ds.sizes == {"multi_index": 50}
@@ -1489,3 +1599,293 @@ def test_export_lazy_load_in_mem_dataset(
     getattr(dataset_loaded_by_guid, function_name)()
 
     assert dataset_loaded_by_guid.cache._data != {}
+
+
+def _assert_parameter_data_equal(data_a, data_b) -> None:
+    assert list(data_a) == list(data_b)
+    for tree, tree_data in data_a.items():
+        assert list(tree_data) == list(data_b[tree])
+        for name, values in tree_data.items():
+            assert values.dtype == data_b[tree][name].dtype
+            assert values.shape == data_b[tree][name].shape
+            np.testing.assert_array_equal(values, data_b[tree][name])
+
+
+@pytest.mark.parametrize("export_type", ["parquet", "arrow"])
+@pytest.mark.parametrize(
+    "dataset_fixture",
+    [
+        "mock_dataset_numpy",
+        "mock_dataset_numpy_complex",
+        "mock_dataset_grid_with_shapes",
+        "mock_dataset_in_mem_grid",
+    ],
+)
+def test_export_to_arrow_file_roundtrip(
+    tmp_path_factory: TempPathFactory, request, dataset_fixture, export_type
+) -> None:
+    dataset = request.getfixturevalue(dataset_fixture)
+    tmp_path = tmp_path_factory.mktemp("export_arrow")
+    qcodes.config.dataset.export_row_group_size = 3
+    dataset.export(export_type=export_type, path=tmp_path, prefix="qcodes_")
+
+    file_path = dataset.export_info.export_paths[export_type]
+    assert file_path.endswith(f".{export_type}")
+    loaded_ds = load_from_file(file_path)
+
+    assert isinstance(loaded_ds, DataSetInMem)
+    assert loaded_ds.cache._data == {}
+    assert loaded_ds.guid == dataset.guid
+    assert loaded_ds.name == dataset.name
+    assert loaded_ds.exp_name == dataset.exp_name
+    assert loaded_ds.sample_name == dataset.sample_name
+    assert loaded_ds.captured_run_id == dataset.captured_run_id
+    assert loaded_ds.run_timestamp_raw == dataset.run_timestamp_raw
+    assert loaded_ds.completed_timestamp_raw == dataset.completed_timestamp_raw
+    assert loaded_ds.description == dataset.description
+    assert loaded_ds.snapshot == dataset.snapshot
+    assert loaded_ds.export_info.export_paths[export_type] == file_path
+    _assert_parameter_data_equal(
+        loaded_ds.get_parameter_data(), dataset.get_parameter_data()
+    )
+
+
+def test_export_to_parquet_row_groups(
+    tmp_path_factory: TempPathFactory, mock_dataset_grid: DataSet
+) -> None:
+    tmp_path = tmp_path_factory.mktemp("export_parquet")
+    qcodes.config.dataset.export_row_group_size = 7
+    mock_dataset_grid.add_metadata("mymetadatatag", 42)
+    mock_dataset_grid.export(export_type="parquet", path=tmp_path)
+
+    file_path = mock_dataset_grid.export_info.export_paths["parquet"]
+    parquet_file = pq.ParquetFile(file_path)
+    assert parquet_file.metadata.num_row_groups == 8
+    assert [parquet_file.metadata.row_group(i).num_rows for i in range(8)] == 7 * [
+        7
+    ] + [1]
+
+    table = parquet_file.read()
+    assert table.column_names == ["z", "x", "y"]
+    np.testing.assert_array_equal(table["x"].to_numpy(), np.repeat(np.arange(10.0), 5))
+    np.testing.assert_array_equal(
+        table["z"].to_numpy(), (np.arange(10)[:, None] + np.arange(20, 25)).ravel()
+    )
+
+    loaded_ds = load_from_file(file_path)
+    assert loaded_ds.metadata["mymetadatatag"] == 42
+
+
+def test_export_to_arrow_file_trees_with_different_shapes(
+    tmp_path_factory: TempPathFactory, experiment
+) -> None:
+    dataset = new_data_set("dataset")
+    xparam = ParamSpecBase("x", "numeric")
+    freqparam = ParamSpecBase("freq", "array")
+    specparam = ParamSpecBase("spectrum", "array")
+    powerparam = ParamSpecBase("power", "complex")
+    labelparam = ParamSpecBase("label", "text")
+    idps = InterDependencies_(
+        dependencies={
+            specparam: (xparam, freqparam),
+            powerparam: (xparam,),
+            labelparam: (xparam,),
+        }
+    )
+    dataset.set_interdependencies(idps)
+    dataset.mark_started()
+    for x in range(5):
+        dataset.add_results(
+            [
+                {"x": x, "freq": np.arange(4.0), "spectrum": x + np.arange(4.0)},
+                {"x": x, "power": x + 1j},
+                {"x": x, "label": f"point {x}"},
+            ]
+        )
+    dataset.mark_completed()
+
+    tmp_path = tmp_path_factory.mktemp("export_arrow")
+    qcodes.config.dataset.export_row_group_size = 2
+    dataset.export(export_type="arrow", path=tmp_path)
+    file_path = dataset.export_info.export_paths["arrow"]
+
+    loaded_ds = load_from_file(file_path)
+    _assert_parameter_data_equal(
+        loaded_ds.get_parameter_data(), dataset.get_parameter_data()
+    )
+    # x is expanded to the shape of the spectrum in its tree so it can not
+    # share the column of x in the other trees
+    parameter_trees = load_arrow_file_metadata(file_path, DataExportType.ARROW)[
+        "parameter_trees"
+    ]
+    assert parameter_trees["spectrum"]["x"] == "spectrum.x"
+    assert parameter_trees["power"]["x"] == "x"
+    assert parameter_trees["label"]["x"] == "x"
+
+
+def test_arrow_array_roundtrip_of_ragged_values() -> None:
+    ragged = np.empty(3, dtype=object)
+    ragged[:] = [np.arange(2.0), np.arange(5.0), np.arange(0.0)]
+    loaded = _from_arrow_array(_to_arrow_array(ragged))
+    assert loaded.dtype == object
+    for row, loaded_row in zip(ragged, loaded):
+        np.testing.assert_array_equal(row, loaded_row)
+
+    values = np.arange(24.0).reshape(2, 3, 4) * 1j
+    loaded = _from_arrow_array(_to_arrow_array(values))
+    assert loaded.shape == (2, 3, 4)
+    np.testing.assert_array_equal(loaded, values)
+
+
+@pytest.mark.parametrize(
+    "dataset_fixture",
+    ["mock_dataset_grid_with_shapes", "mock_dataset_numpy_with_shapes"],
+)
+def test_to_xarray_dataset_lazy_on_grid(request, dataset_fixture) -> None:
+    dataset = request.getfixturevalue(dataset_fixture)
+    with dask.config.set({"array.chunk-size": "150B"}):
+        lazy_xds = dataset.to_xarray_dataset(lazy=True)
+    xds = dataset.to_xarray_dataset()
+
+    assert isinstance(lazy_xds["z"].data, dask.array.Array)
+    # each chunk holds whole rows of the grid
+    assert lazy_xds["z"].data.numblocks[0] > 1
+    assert lazy_xds["z"].data.numblocks[1:] == (1,)
+    assert lazy_xds.sizes == xds.sizes
+    xr.testing.assert_identical(lazy_xds.compute(), xds)
+
+    lazy_dataarray = dataset.to_xarray_dataarray_dict(lazy=True)["z"]
+    xr.testing.assert_identical(
+        lazy_dataarray.compute(), dataset.to_xarray_dataarray_dict()["z"]
+    )
+
+
+@pytest.fixture(name="mock_dataset_numpy_with_shapes")
+def _make_mock_dataset_numpy_with_shapes(experiment) -> DataSet:
+    dataset = new_data_set("dataset")
+    xparam = ParamSpecBase("x", "numeric")
+    yparam = ParamSpecBase("y", "array")
+    zparam = ParamSpecBase("z", "array")
+    idps = InterDependencies_(dependencies={zparam: (xparam, yparam)})
+    dataset.set_interdependencies(idps, shapes={"z": (10, 11)})
+
+    y = np.arange(10, 21, 1)
+    dataset.mark_started()
+    # descending x is sorted like when loading the data
+    for x in range(9, -1, -1):
+        dataset.add_results([{"x": x, "y": y, "z": x + y}])
+    dataset.mark_completed()
+    return dataset
+
+
+def test_to_xarray_dataset_lazy_without_grid(
+    mock_dataset_numpy: DataSet, mock_dataset_grid_incomplete_with_shapes: DataSet
+) -> None:
+    with dask.config.set({"array.chunk-size": "1KiB"}):
+        lazy_xds = mock_dataset_numpy.to_xarray_dataset(lazy=True)
+    data = mock_dataset_numpy.get_parameter_data()["z"]
+
+    assert lazy_xds["z"].dims == ("z_index", "z_dim_1")
+    assert lazy_xds["z"].data.numblocks == (4, 1)
+    assert isinstance(lazy_xds["x"].data, dask.array.Array)
+    assert lazy_xds["x"].attrs["units"] == "x unit"
+    for name in ("x", "y", "z"):
+        np.testing.assert_array_equal(lazy_xds[name].values, data[name])
+
+    # incomplete data is not reshaped to the shape in the run description
+    dataset = mock_dataset_grid_incomplete_with_shapes
+    lazy_xds = dataset.to_xarray_dataset(lazy=True, start=3, end=30)
+    data = dataset.get_parameter_data(start=3, end=30)["z"]
+    assert lazy_xds["z"].dims == ("z_index",)
+    for name in ("x", "y", "z"):
+        np.testing.assert_array_equal(lazy_xds[name].values, data[name])
+
+
+def test_to_xarray_dataset_lazy_renames_shared_setpoints(experiment) -> None:
+    dataset = new_data_set("dataset")
+    xparam = ParamSpecBase("x", "numeric")
+    yparam = ParamSpecBase("y", "numeric")
+    zparam = ParamSpecBase("z", "numeric")
+    idps = InterDependencies_(dependencies={yparam: (xparam,), zparam: (xparam,)})
+    dataset.set_interdependencies(idps, shapes={"y": (5,)})
+    dataset.mark_started()
+    dataset.add_results([{"x": x, "y": 2 * x} for x in range(5)])
+    dataset.add_results([{"x": x, "z": 3 * x} for x in range(7)])
+    dataset.mark_completed()
+
+    lazy_xds = dataset.to_xarray_dataset(lazy=True)
+
+    assert lazy_xds["y"].dims == ("x",)
+    assert lazy_xds["z"].dims == ("z_index",)
+    np.testing.assert_array_equal(lazy_xds["x"].values, np.arange(5))
+    np.testing.assert_array_equal(lazy_xds["z_x"].values, np.arange(7))
+    np.testing.assert_array_equal(lazy_xds["z"].values, 3 * np.arange(7))
+    assert lazy_xds["z_x"].attrs["name"] == "x"
+
+
+def test_to_xarray_dataset_lazy_interleaved_trees(experiment) -> None:
+    dataset = new_data_set("dataset")
+    xparam = ParamSpecBase("x", "numeric")
+    yparam = ParamSpecBase("y", "numeric")
+    zparam = ParamSpecBase("z", "numeric")
+    idps = InterDependencies_(dependencies={yparam: (xparam,), zparam: (xparam,)})
+    dataset.set_interdependencies(idps)
+    dataset.mark_started()
+    # the rows of the two trees alternate, so neither has a row for every id
+    for x in range(100):
+        dataset.add_results([{"x": x, "y": 2 * x}])
+        if x % 3 == 0:
+            dataset.add_results([{"x": x, "z": 3 * x}])
+    dataset.mark_completed()
+
+    with dask.config.set({"array.chunk-size": "100B"}):
+        lazy_xds = dataset.to_xarray_dataset(lazy=True, start=5, end=90)
+    assert lazy_xds["y"].data.numblocks[0] > 1
+    data = dataset.get_parameter_data(start=5, end=90)
+    for tree in ("y", "z"):
+        np.testing.assert_array_equal(lazy_xds[tree].values, data[tree][tree])
+        np.testing.assert_array_equal(lazy_xds[f"{tree}_x"].values, data[tree]["x"])
+
+
+@pytest.mark.parametrize(
+    "dataset_fixture",
+    [
+        "mock_dataset_grid_with_shapes",
+        "mock_dataset_grid_incomplete_with_shapes",
+        "mock_dataset_numpy_with_shapes",
+    ],
+)
+def test_export_shaped_grid_to_xarray_without_pandas_index(
+    request, dataset_fixture, mocker
+) -> None:
+    dataset = request.getfixturevalue(dataset_fixture)
+    generate_index = mocker.spy(export_to_xarray, "_generate_pandas_index")
+    xds = dataset.to_xarray_dataset()
+    generate_index.assert_not_called()
+
+    mocker.patch.object(
+        export_to_xarray, "_load_grid_to_xarray_dataarray", return_value=None
+    )
+    xr.testing.assert_identical(xds, dataset.to_xarray_dataset())
+    assert generate_index.call_count == 1
+
+
+def test_export_shaped_non_grid_to_xarray_falls_back_to_pandas_index(
+    experiment, mocker
+) -> None:
+    dataset = new_data_set("dataset")
+    xparam = ParamSpecBase("x", "numeric")
+    yparam = ParamSpecBase("y", "numeric")
+    zparam = ParamSpecBase("z", "numeric")
+    idps = InterDependencies_(dependencies={zparam: (xparam, yparam)})
+    dataset.set_interdependencies(idps, shapes={"z": (2, 3)})
+    dataset.mark_started()
+    # y changes along both dimensions of the shape
+    for i in range(6):
+        dataset.add_results([{"x": i // 3, "y": i, "z": i}])
+    dataset.mark_completed()
+
+    generate_index = mocker.spy(export_to_xarray, "_generate_pandas_index")
+    xds = dataset.to_xarray_dataset()
+    assert generate_index.call_count == 1
+    assert xds.sizes == {"x": 2, "y": 6}
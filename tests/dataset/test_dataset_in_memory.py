@@ -366,7 +366,7 @@ def test_dataset_in_memory_does_not_create_runs_table(
 
     tables_query = 'SELECT * FROM sqlite_master WHERE TYPE = "table"'
     tables = list(atomic_transaction(conn, tables_query).fetchall())
-    assert len(tables) == 4
+    assert len(tables) == 5
     tablenames = tuple(table[1] for table in tables)
     assert all(ds.name not in table_name for table_name in tablenames)
 
@@ -16,7 +16,11 @@ from qcodes.dataset.data_set import (
     load_by_run_spec,
     new_data_set,
 )
-from qcodes.dataset.data_set_info import get_run_attributes
+from qcodes.dataset.data_set_info import (
+    find_runs,
+    get_run_attributes,
+    get_run_summaries,
+)
 from qcodes.dataset.descriptions.rundescriber import RunDescriber
 from qcodes.dataset.experiment_container import new_experiment
 from qcodes.dataset.sqlite.queries import (
@@ -140,6 +144,127 @@ def test_get_run_attributes() -> None:
     assert loaded_attrs["metadata"] == {"foo": "bar"}
 
 
+@pytest.mark.usefixtures("empty_temp_db")
+def test_get_run_summaries() -> None:
+    exp_a = new_experiment(name="exp_a", sample_name="sample_a")
+    ds_a = new_data_set("ds_a")
+    ds_a.mark_started()
+    ds_a.mark_completed()
+    ds_a.add_metadata("foo", "bar")
+    ds_a.add_snapshot('{"station": {}}')
+    exp_b = new_experiment(name="exp_b", sample_name="sample_b")
+    ds_b = new_data_set("ds_b")
+    ds_c = new_data_set("ds_c")
+    ds_c.mark_started()
+
+    summaries = get_run_summaries()
+    assert [s.guid for s in summaries] == [ds_a.guid, ds_b.guid, ds_c.guid]
+
+    summary = summaries[0]
+    assert summary.run_id == ds_a.run_id
+    assert summary.exp_id == exp_a.exp_id
+    assert summary.name == "ds_a"
+    assert summary.exp_name == "exp_a"
+    assert summary.sample_name == "sample_a"
+    assert summary.counter == ds_a.counter
+    assert summary.captured_run_id == ds_a.captured_run_id
+    assert summary.captured_counter == ds_a.captured_counter
+    assert summary.run_timestamp_raw == ds_a.run_timestamp_raw
+    assert summary.completed_timestamp() == ds_a.completed_timestamp()
+    assert summary.completed is True
+    assert summary.parameters == ds_a.parameters
+    assert summary.path_to_db == ds_a.path_to_db
+    assert summary.metadata == {"foo": "bar"}
+    assert summary.snapshot == {"station": {}}
+    assert summary.description == ds_a.description
+    assert summary.parent_dataset_links == []
+    assert summary.load_dataset().guid == ds_a.guid
+
+    assert [s.name for s in get_run_summaries(exp_id=exp_b.exp_id)] == [
+        "ds_b",
+        "ds_c",
+    ]
+    assert [s.name for s in get_run_summaries(sample_name="sample_a")] == ["ds_a"]
+    assert [s.name for s in get_run_summaries(run_ids=[1, 3])] == ["ds_a", "ds_c"]
+
+    # runs that have not been started come last
+    by_timestamp = get_run_summaries(order_by="run_timestamp", descending=True)
+    assert [s.name for s in by_timestamp] == ["ds_c", "ds_a", "ds_b"]
+    page = get_run_summaries(order_by="run_timestamp", descending=True, offset=1)
+    assert [s.name for s in page] == ["ds_a", "ds_b"]
+    page = get_run_summaries(
+        order_by="run_timestamp", descending=True, limit=1, offset=1
+    )
+    assert [s.name for s in page] == ["ds_a"]
+
+    with pytest.raises(ValueError, match="Can not order runs by"):
+        get_run_summaries(order_by="snapshot")
+    with pytest.raises(ValueError, match="Unknown columns"):
+        get_run_summaries(columns=["run_description", "guid"])
+
+
+@pytest.mark.usefixtures("experiment")
+def test_get_run_summaries_loads_other_columns_lazily() -> None:
+    ds = new_data_set("test-dataset")
+    ds.mark_started()
+    ds.mark_completed()
+    ds.add_metadata("foo", "bar")
+
+    (summary,) = get_run_summaries(ds.conn, columns=())
+    assert summary._raw_columns == {}
+    assert summary.metadata == {"foo": "bar"}
+    assert summary.snapshot is None
+    assert summary.description == ds.description
+    assert summary.parent_dataset_links == []
+    assert set(summary._raw_columns) == {
+        "metadata",
+        "snapshot",
+        "run_description",
+        "parent_datasets",
+    }
+
+
+@pytest.mark.usefixtures("experiment")
+def test_find_runs() -> None:
+    metadata = [
+        {"fridge": "BF3", "T_mK": 15},
+        {"fridge": "BF3", "T_mK": 25.5},
+        {"fridge": "BF4", "T_mK": 10},
+        {"fridge": "BF3", "T_mK": "cold"},
+        {"fridge": "BF3"},
+    ]
+    run_ids = []
+    for run_metadata in metadata:
+        ds = new_data_set("test-dataset", metadata=run_metadata)
+        run_ids.append(ds.run_id)
+
+    def found(where, **kwargs):
+        return [
+            run_ids.index(summary.run_id)
+            for summary in find_runs(where=where, **kwargs)
+        ]
+
+    assert found({"fridge": "BF3", "T_mK": ("<", 20)}) == [0]
+    assert found({"fridge": "BF3"}, order_by="run_id", descending=True) == [
+        4,
+        3,
+        1,
+        0,
+    ]
+    assert found({"T_mK": (">=", 15)}) == [0, 1, 3]
+    assert found({"T_mK": ("!=", 15)}) == [1, 2, 3]
+    assert found({"T_mK": ("in", (10, 15))}) == [0, 2]
+    assert found({"fridge": ("like", "bf%")}) == [0, 1, 2, 3, 4]
+    assert found({"fridge": "BF5"}) == []
+    assert found({"fridge": "BF3"}, limit=2, offset=1) == [1, 3]
+
+    (summary,) = find_runs(where={"T_mK": 10})
+    assert summary.metadata == {"fridge": "BF4", "T_mK": 10}
+
+    with pytest.raises(ValueError, match="Unknown operator"):
+        find_runs(where={"T_mK": ("~", 10)})
+
+
 @pytest.mark.usefixtures("empty_temp_db")
 def test_experiment_info_in_dataset() -> None:
     exp = new_experiment(name="for_loading", sample_name="no_sample")
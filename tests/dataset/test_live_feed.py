@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import struct
+import time
+from multiprocessing import shared_memory
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pytest
+
+from qcodes.dataset import LiveFeedPublisher, LiveFeedReader, live_feed
+from qcodes.dataset.measurements import Measurement
+
+if TYPE_CHECKING:
+    from multiprocessing.queues import Queue
+
+
+@pytest.mark.parametrize("bg_writing", [True, False])
+def test_live_feed_of_measurement(experiment, DAC, DMM, bg_writing) -> None:
+    meas = Measurement(exp=experiment)
+    meas.register_parameter(DAC.ch1)
+    meas.register_parameter(DMM.v1, setpoints=(DAC.ch1,))
+
+    with meas.run(write_in_background=bg_writing) as datasaver:
+        with LiveFeedPublisher(datasaver.dataset, size=4096) as feed:
+            reader = LiveFeedReader(feed.name)
+            assert reader.guid == datasaver.dataset.guid
+            assert reader.update() is False
+            assert reader.data() == {}
+
+            for i in range(100):
+                datasaver.add_result((DAC.ch1, i), (DMM.v1, 2 * i))
+                if i % 10 == 9:
+                    assert reader.update() is True
+                    data = reader.data()
+                    np.testing.assert_array_equal(
+                        data["dummy_dmm_v1"]["dummy_dac_ch1"], np.arange(i + 1)
+                    )
+                    np.testing.assert_array_equal(
+                        data["dummy_dmm_v1"]["dummy_dmm_v1"], 2 * np.arange(i + 1)
+                    )
+            assert not reader.completed
+        assert reader.completed
+        reader.close()
+
+        # data added after the publisher was closed is not published
+        datasaver.add_result((DAC.ch1, 100), (DMM.v1, 200))
+
+
+def test_live_feed_reader_detects_overrun(experiment, DAC, caplog) -> None:
+    meas = Measurement(exp=experiment)
+    meas.register_parameter(DAC.ch1, paramtype="array")
+
+    with meas.run() as datasaver:
+        with LiveFeedPublisher(datasaver.dataset, size=1024) as feed:
+            with LiveFeedReader(feed.name) as reader:
+                datasaver.add_result((DAC.ch1, np.arange(50.0)))
+                assert reader.update() is True
+                np.testing.assert_array_equal(
+                    reader.data()["dummy_dac_ch1"]["dummy_dac_ch1"],
+                    [np.arange(50.0)],
+                )
+                for _ in range(5):
+                    datasaver.add_result((DAC.ch1, np.arange(50.0)))
+                with pytest.raises(RuntimeError, match="overwritten data"):
+                    reader.update()
+
+            with caplog.at_level(logging.WARNING):
+                datasaver.add_result((DAC.ch1, np.arange(200.0)))
+            assert "does not fit" in caplog.text
+
+
+def test_live_feed_reader_attaching_after_wrap_around(experiment, DAC) -> None:
+    meas = Measurement(exp=experiment)
+    meas.register_parameter(DAC.ch1, paramtype="array")
+
+    with meas.run() as datasaver:
+        with LiveFeedPublisher(datasaver.dataset, size=1024) as feed:
+            for i in range(10):
+                datasaver.add_result((DAC.ch1, np.full(50, float(i))))
+            with LiveFeedReader(feed.name) as reader:
+                assert reader.update() is True
+                values = reader.data()["dummy_dac_ch1"]["dummy_dac_ch1"]
+                # the reader starts at the oldest record left in the buffer
+                assert 0 < len(values) < 10
+                np.testing.assert_array_equal(
+                    values[:, 0], np.arange(10 - len(values), 10)
+                )
+
+
+def test_live_feed_reader_detects_write_in_progress(experiment, DAC) -> None:
+    meas = Measurement(exp=experiment)
+    meas.register_parameter(DAC.ch1, paramtype="array")
+
+    with meas.run() as datasaver:
+        with LiveFeedPublisher(datasaver.dataset, size=1024) as feed:
+            with LiveFeedReader(feed.name) as reader:
+                datasaver.add_result((DAC.ch1, np.arange(50.0)))
+                # announce a write that overwrites the record without
+                # completing it, as if the publisher were in the middle of it
+                written = struct.unpack_from("<Q", feed._shm.buf, 16)[0]
+                struct.pack_into("<Q", feed._shm.buf, 32, written + 1024)
+                with pytest.raises(RuntimeError, match="overwritten data"):
+                    reader.update()
+
+
+def test_live_feed_reader_rejects_other_shared_memory() -> None:
+    block = shared_memory.SharedMemory(create=True, size=256)
+    try:
+        with pytest.raises(ValueError, match="not a live feed"):
+            LiveFeedReader(block.name)
+    finally:
+        block.close()
+        block.unlink()
+
+
+def _read_live_feed_in_other_process(name: str, queue: Queue) -> None:
+    with LiveFeedReader(name) as reader:
+        queue.put("attached")
+        while not reader.completed:
+            reader.update()
+            time.sleep(0.01)
+        reader.update()
+        queue.put(reader.data())
+
+
+def test_live_feed_read_in_other_process(experiment, DAC, DMM) -> None:
+    meas = Measurement(exp=experiment)
+    meas.register_parameter(DAC.ch1)
+    meas.register_parameter(DMM.v1, setpoints=(DAC.ch1,))
+    context = multiprocessing.get_context("spawn")
+    queue = context.Queue()
+
+    with meas.run() as datasaver:
+        feed = LiveFeedPublisher(datasaver.dataset, size=4096)
+        process = context.Process(
+            target=_read_live_feed_in_other_process, args=(feed.name, queue)
+        )
+        process.start()
+        try:
+            assert queue.get(timeout=60) == "attached"
+            for i in range(100):
+                datasaver.add_result((DAC.ch1, i), (DMM.v1, 2 * i))
+                if i % 10 == 9:
+                    time.sleep(0.05)
+        except BaseException:
+            process.kill()
+            raise
+    # the publisher is closed when the run is completed
+    data = queue.get(timeout=60)
+    process.join(timeout=60)
+    assert process.exitcode == 0
+    np.testing.assert_array_equal(data["dummy_dmm_v1"]["dummy_dac_ch1"], np.arange(100))
+    np.testing.assert_array_equal(
+        data["dummy_dmm_v1"]["dummy_dmm_v1"], 2 * np.arange(100)
+    )
+
+
+def test_live_feed_closed_when_run_is_completed(experiment, DAC) -> None:
+    meas = Measurement(exp=experiment)
+    meas.register_parameter(DAC.ch1)
+
+    with meas.run() as datasaver:
+        feed = LiveFeedPublisher(datasaver.dataset, size=1024)
+        name = feed.name
+        datasaver.add_result((DAC.ch1, 1))
+    assert datasaver.dataset.cache._live_feeds == []
+    with pytest.raises(FileNotFoundError):
+        LiveFeedReader(name)
+
+
+def test_live_feed_reader_gives_up_on_incomplete_write(
+    experiment, DAC, monkeypatch
+) -> None:
+    monkeypatch.setattr(live_feed, "_RETRY_TIMEOUT", 0.05)
+    meas = Measurement(exp=experiment)
+    meas.register_parameter(DAC.ch1)
+
+    with meas.run() as datasaver:
+        with LiveFeedPublisher(datasaver.dataset, size=1024) as feed:
+            # a write announced beyond the oldest record, as if the publisher
+            # had stopped between updating the two
+            struct.pack_into("<Q", feed._shm.buf, 32, 4096)
+            start = time.perf_counter()
+            with pytest.raises(RuntimeError, match="stopped in the middle"):
+                LiveFeedReader(feed.name)
+            assert time.perf_counter() - start < 5
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import os
+import sqlite3
+from typing import TYPE_CHECKING
+
+import pytest
+
+from qcodes.dataset import (
+    RunCatalog,
+    connect,
+    load_by_guid,
+    new_data_set,
+    new_experiment,
+    run_catalog,
+)
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def _add_runs(path: Path, n_runs: int, complete: bool = True) -> list[str]:
+    conn = connect(path)
+    try:
+        exp = new_experiment("test-experiment", sample_name="test-sample", conn=conn)
+        guids = []
+        for _ in range(n_runs):
+            dataset = new_data_set("test-dataset", exp_id=exp.exp_id, conn=conn)
+            dataset.mark_started()
+            if complete:
+                dataset.mark_completed()
+            guids.append(dataset.guid)
+    finally:
+        conn.close()
+    return guids
+
+
+def _touch(path: Path) -> None:
+    # make sure the modification time changes on file systems with a coarse
+    # time resolution
+    stat = os.stat(path)
+    os.utime(path, (stat.st_atime, stat.st_mtime + 10))
+
+
+def test_run_catalog(tmp_path: Path) -> None:
+    (tmp_path / "sub").mkdir()
+    path_a = tmp_path / "a.db"
+    path_b = tmp_path / "sub" / "b.db"
+    guids_a = _add_runs(path_a, 2)
+    guids_b = _add_runs(path_b, 3)
+
+    catalog = RunCatalog(tmp_path / "catalog.sqlite")
+    catalog.refresh(tmp_path, max_workers=2)
+
+    assert len(catalog) == 5
+    assert [entry.guid for entry in catalog.entries(path_to_db=path_b)] == guids_b
+    (entry,) = catalog.entries(guid=guids_a[1])
+    assert entry.path_to_db == str(path_a.resolve())
+    assert entry.run_id == 2
+    assert entry.exp_name == "test-experiment"
+    assert entry.sample_name == "test-sample"
+    assert entry.completed_timestamp_raw is not None
+
+    dataset = catalog.load_by_guid(guids_b[2])
+    assert dataset.guid == guids_b[2]
+    assert dataset.path_to_db == str(path_b.resolve())
+
+    with pytest.raises(NameError, match="No run with GUID"):
+        catalog.load_by_guid("00000000-0000-0000-0000-000000000000")
+
+    # the catalog persists in its file
+    assert len(RunCatalog(tmp_path / "catalog.sqlite")) == 5
+
+
+def test_run_catalog_incremental_refresh(tmp_path: Path, mocker) -> None:
+    path_a = tmp_path / "a.db"
+    path_b = tmp_path / "b.db"
+    _add_runs(path_a, 2)
+    _add_runs(path_b, 1, complete=False)
+    catalog = RunCatalog(tmp_path / "catalog.sqlite")
+    catalog.refresh(tmp_path, max_workers=1)
+
+    scan = mocker.spy(run_catalog, "_scan_db_file")
+    catalog.refresh(tmp_path, max_workers=1)
+    scan.assert_not_called()
+
+    # only the new runs and the runs that were not completed are scanned
+    new_guids = _add_runs(path_a, 1)
+    _touch(path_a)
+    conn = connect(path_b)
+    load_by_guid(catalog.entries(path_to_db=path_b)[0].guid, conn=conn).mark_completed()
+    conn.close()
+    _touch(path_b)
+    catalog.refresh(tmp_path, max_workers=1)
+    assert sorted(call.args for call in scan.call_args_list) == [
+        (str(path_a.resolve()), 2),
+        (str(path_b.resolve()), 0),
+    ]
+    assert catalog.entries(path_to_db=path_a)[-1].guid == new_guids[0]
+    assert all(entry.completed_timestamp_raw for entry in catalog.entries())
+
+    # a replaced file with fewer runs is scanned again completely
+    path_a.unlink()
+    replaced_guids = _add_runs(path_a, 1)
+    _touch(path_a)
+    catalog.refresh(tmp_path, max_workers=1)
+    assert [e.guid for e in catalog.entries(path_to_db=path_a)] == replaced_guids
+
+    # removed files are removed from the catalog
+    path_b.unlink()
+    catalog.refresh(tmp_path, max_workers=1)
+    assert len(catalog) == 1
+
+
+def test_run_catalog_records_errors(tmp_path: Path) -> None:
+    (tmp_path / "broken.db").write_text("not a database")
+    _add_runs(tmp_path / "a.db", 1)
+    catalog = RunCatalog(tmp_path / "catalog.sqlite")
+    catalog.refresh(tmp_path)
+
+    assert len(catalog) == 1
+    assert list(catalog.errors()) == [str((tmp_path / "broken.db").resolve())]
+
+
+def test_run_catalog_keeps_runs_when_scan_fails(tmp_path: Path, mocker) -> None:
+    path_a = tmp_path / "a.db"
+    guids = _add_runs(path_a, 1)
+    catalog = RunCatalog(tmp_path / "catalog.sqlite")
+    catalog.refresh(tmp_path, max_workers=1)
+
+    new_guids = _add_runs(path_a, 1)
+    _touch(path_a)
+    mocker.patch.object(
+        run_catalog,
+        "connect_read_only",
+        side_effect=sqlite3.OperationalError("database is locked"),
+    )
+    catalog.refresh(tmp_path, max_workers=1)
+    assert [entry.guid for entry in catalog.entries()] == guids
+    assert list(catalog.errors().values()) == ["database is locked"]
+
+    # the file is scanned again by the next refresh although it is unchanged
+    mocker.stopall()
+    catalog.refresh(tmp_path, max_workers=1)
+    assert [entry.guid for entry in catalog.entries()] == guids + new_guids
+    assert catalog.errors() == {}
@@ -3,6 +3,7 @@
 # functions here
 import logging
 import re
+import sqlite3
 import time
 import unicodedata
 from contextlib import contextmanager
@@ -14,6 +15,7 @@ import pytest
 from hypothesis import given
 from pytest import LogCaptureFixture
 
+import qcodes.dataset
 import qcodes.dataset.descriptions.versioning.serialization as serial
 from qcodes.dataset.data_set import DataSet
 from qcodes.dataset.descriptions.dependencies import InterDependencies_
@@ -24,6 +26,7 @@ from qcodes.dataset.guids import generate_guid
 
 # mut: module under test
 from qcodes.dataset.sqlite import connection as mut_conn
+from qcodes.dataset.sqlite import connection_manager as mut_manager
 from qcodes.dataset.sqlite import database as mut_db
 from qcodes.dataset.sqlite import queries as mut_queries
 from qcodes.dataset.sqlite import query_helpers as mut_help
@@ -181,6 +184,181 @@ def test_insert_many_values_raises(experiment) -> None:
         )
 
 
+def test_insert_many_columns_raises(experiment) -> None:
+    conn = experiment.conn
+
+    with pytest.raises(ValueError):
+        mut_help.insert_many_columns(
+            conn, "some_string", ["column1", "column2"], values=[[1], [1, 3]]
+        )
+    with pytest.raises(ValueError):
+        mut_help.insert_many_columns(
+            conn, "some_string", ["column1", "column2"], values=[[1]]
+        )
+
+
+def test_insert_many_columns_matches_insert_many_values(experiment) -> None:
+    conn = experiment.conn
+    n_max = int(qcodes.dataset.SQLiteSettings.limits["MAX_VARIABLE_NUMBER"])
+    n_rows = n_max * 2 + 3
+
+    for table in ("by_rows", "by_columns"):
+        atomic_transaction(conn, f'CREATE TABLE "{table}" (x numeric, y text)')
+
+    xs = np.linspace(0, 1, n_rows)
+    ys = np.array([f"value_{i}" for i in range(n_rows)])
+
+    last_row = mut_help.insert_many_values(
+        conn, "by_rows", ["x", "y"], [[x, y] for x, y in zip(xs, ys)]
+    )
+    last_column_row = mut_help.insert_many_columns(
+        conn, "by_columns", ["x", "y"], [xs, ys]
+    )
+    # the rowid of the last row is returned, even if the rows would not
+    # have fit into one INSERT statement
+    assert last_row == last_column_row == n_rows
+
+    rows = atomic_transaction(conn, 'SELECT x, y FROM "by_rows"').fetchall()
+    columns = atomic_transaction(conn, 'SELECT x, y FROM "by_columns"').fetchall()
+    assert len(columns) == n_rows
+    assert rows == columns
+
+
+def test_insert_many_columns_complex(experiment) -> None:
+    conn = experiment.conn
+    atomic_transaction(conn, 'CREATE TABLE "complex_values" (z complex)')
+
+    zs = np.array([1 + 2j, -3.5j, np.nan + 1j], dtype=np.complex64)
+    mut_help.insert_many_columns(conn, "complex_values", ["z"], [zs])
+    mut_help.insert_many_values(conn, "complex_values", ["z"], [[z] for z in zs])
+
+    blobs = atomic_transaction(
+        conn, 'SELECT CAST(z AS BLOB) FROM "complex_values"'
+    ).fetchall()
+    assert all(len(blob) == 16 for (blob,) in blobs)
+    values = atomic_transaction(conn, 'SELECT z FROM "complex_values"').fetchall()
+    np.testing.assert_array_equal([value for (value,) in values], np.tile(zs, 2))
+
+
+def test_load_new_data_for_rundescriber_reads_after_last_id(experiment) -> None:
+    x = ParamSpecBase("x", "numeric")
+    y = ParamSpecBase("y", "numeric")
+    z = ParamSpecBase("z", "numeric")
+    idps = InterDependencies_(dependencies={y: (x,), z: (x,)})
+    ds = DataSet(conn=experiment.conn)
+    ds.set_interdependencies(idps)
+    ds.mark_started()
+    desc = ds.description
+
+    ds.add_results([{"x": 0, "y": 0, "z": 0}, {"x": 1, "y": 1}])
+    data, read_status = mut_queries.load_new_data_for_rundescriber(
+        experiment.conn, ds.table_name, desc, {}
+    )
+    assert read_status == {"y": 2, "z": 2}
+    np.testing.assert_array_equal(data["y"]["y"], [0, 1])
+    np.testing.assert_array_equal(data["z"]["z"], [0])
+
+    ds.add_results([{"x": 2, "z": 2}, {"x": 3, "y": 3, "z": 3}])
+    with patch.object(
+        mut_queries,
+        "get_parameter_tree_values",
+        wraps=mut_queries.get_parameter_tree_values,
+    ) as spy:
+        data, read_status = mut_queries.load_new_data_for_rundescriber(
+            experiment.conn, ds.table_name, desc, read_status
+        )
+    assert read_status == {"y": 4, "z": 4}
+    assert all(call.kwargs["after_id"] == 2 for call in spy.call_args_list)
+    np.testing.assert_array_equal(data["y"]["x"], [3])
+    np.testing.assert_array_equal(data["z"]["x"], [2, 3])
+
+    data, read_status = mut_queries.load_new_data_for_rundescriber(
+        experiment.conn, ds.table_name, desc, read_status
+    )
+    assert read_status == {"y": 4, "z": 4}
+    assert data["y"]["y"].size == 0
+    assert data["z"]["z"].size == 0
+
+
+def test_get_parameter_data_in_parallel(experiment) -> None:
+    x = ParamSpecBase("x", "numeric")
+    dependents = [ParamSpecBase(f"y{i}", "numeric") for i in range(5)]
+    idps = InterDependencies_(dependencies={y: (x,) for y in dependents})
+    ds = DataSet(conn=experiment.conn)
+    ds.set_interdependencies(idps)
+    ds.mark_started()
+    ds.add_results(
+        [
+            {"x": j, **{y.name: i * j for i, y in enumerate(dependents)}}
+            for j in range(50)
+        ]
+    )
+    ds.mark_completed()
+
+    expected = mut_queries.get_parameter_data(
+        experiment.conn, ds.table_name, max_workers=1
+    )
+    try:
+        with patch.object(
+            mut_manager, "connect_read_only", wraps=mut_manager.connect_read_only
+        ) as spy:
+            actual = mut_queries.get_parameter_data(
+                experiment.conn, ds.table_name, max_workers=3
+            )
+            assert 1 <= spy.call_count <= 3
+            n_connections = spy.call_count
+            # the read-only connections are reused by later loads
+            mut_queries.get_parameter_data(
+                experiment.conn, ds.table_name, max_workers=n_connections
+            )
+            assert spy.call_count == n_connections
+        assert list(actual) == [y.name for y in dependents]
+        for name, tree in expected.items():
+            assert list(actual[name]) == list(tree)
+            for param, values in tree.items():
+                np.testing.assert_array_equal(actual[name][param], values)
+
+        qcodes.config.dataset.load_max_workers = 2
+        data, _ = mut_queries.load_new_data_for_rundescriber(
+            experiment.conn, ds.table_name, ds.description, {}
+        )
+        np.testing.assert_array_equal(data["y4"]["y4"], expected["y4"]["y4"])
+    finally:
+        mut_manager.get_connection_manager().close_all()
+
+
+def test_load_parameter_trees_uses_conn_for_uncommitted_changes(experiment) -> None:
+    conn = experiment.conn
+    conn.execute("CREATE TABLE uncommitted (a INTEGER)")
+    conn.execute("INSERT INTO uncommitted VALUES (1)")
+    assert conn.in_transaction
+    try:
+        with patch.object(mut_manager, "connect_read_only") as spy:
+            loaded = mut_queries._load_parameter_trees(
+                conn,
+                ["a", "b"],
+                lambda tree_conn, name: tree_conn.execute(
+                    "SELECT count(*) FROM uncommitted"
+                ).fetchone()[0],
+                max_workers=2,
+            )
+        spy.assert_not_called()
+        assert loaded == {"a": 1, "b": 1}
+    finally:
+        conn.rollback()
+
+
+def test_connect_read_only(experiment) -> None:
+    conn = mut_conn.connect_read_only(experiment.conn.path_to_dbfile)
+    try:
+        assert conn.path_to_dbfile == experiment.conn.path_to_dbfile
+        assert conn.execute("SELECT count(*) FROM experiments").fetchone()[0] == 1
+        with pytest.raises(sqlite3.OperationalError, match="readonly"):
+            conn.execute("DELETE FROM experiments")
+    finally:
+        conn.close()
+
+
 def test_get_non_existing_metadata_returns_none(experiment) -> None:
     assert (
         mut_queries.get_data_by_tag_and_table_name(
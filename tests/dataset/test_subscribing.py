@@ -3,13 +3,16 @@ import logging
 from numbers import Number
 from typing import Any
 
+import numpy as np
 import pytest
 from numpy import ndarray
 
 import qcodes
+from qcodes.dataset.data_set import _ResultColumns
 from qcodes.dataset.descriptions.dependencies import InterDependencies_
 from qcodes.dataset.descriptions.param_spec import ParamSpecBase
 from qcodes.dataset.sqlite.connection import atomic_transaction
+from qcodes.dataset.subscriber import ResultBatch
 from tests.common import retry_until_does_not_throw
 
 log = logging.getLogger(__name__)
@@ -160,6 +163,53 @@ def test_basic_subscription(dataset, basic_subscriber) -> None:
     assert len(triggers) == 0
 
 
+@pytest.mark.parametrize("bg_writing", [True, False])
+def test_batched_subscription(dataset, bg_writing) -> None:
+    xparam = ParamSpecBase(name="x", paramtype="numeric")
+    yparam = ParamSpecBase(name="y", paramtype="numeric")
+    zparam = ParamSpecBase(name="z", paramtype="array")
+    idps = InterDependencies_(dependencies={yparam: (xparam,), zparam: (xparam,)})
+    dataset.set_interdependencies(idps)
+    dataset.mark_started(start_bg_writer=bg_writing)
+
+    def collect_batches(batches, length, state):
+        state.append((batches, length))
+
+    state: list[tuple[list[ResultBatch], int]] = []
+    dataset.subscribe(collect_batches, batched=True, state=state)
+
+    dataset.add_results([{"x": x, "y": -x} for x in range(3)])
+    dataset.add_results([{"x": 3, "z": np.arange(2)}])
+    dataset.mark_completed()
+
+    # the callback is called a last time when the dataset is completed
+    assert state[-1][1] == 4
+    batches = [batch for batches, _ in state for batch in batches]
+    # the background writer may write both results in one transaction
+    assert sum(batch.n_rows for batch in batches) == 4
+    assert all(isinstance(batch.columns["x"], np.ndarray) for batch in batches)
+    rows = [row for batch in batches for row in batch.rows(["x", "y", "z"])]
+    assert [row[:2] for row in rows] == [(0, 0), (1, -1), (2, -2), (3, None)]
+    assert [row[2] is None for row in rows] == [True, True, True, False]
+    np.testing.assert_array_equal(rows[3][2], [0, 1])
+
+    get_triggers_sql = "SELECT * FROM sqlite_master WHERE TYPE = 'trigger';"
+    assert atomic_transaction(dataset.conn, get_triggers_sql).fetchall() == []
+
+
+def test_result_batch_from_results_with_missing_values() -> None:
+    batch = ResultBatch.from_results(
+        [
+            _ResultColumns(keys=("x", "y"), columns=[np.arange(2.0), [1.0, 2.0]]),
+            _ResultColumns(keys=("x",), columns=[np.array([2.0])]),
+        ]
+    )
+    assert batch.n_rows == 3
+    np.testing.assert_array_equal(batch.columns["x"], [0.0, 1.0, 2.0])
+    assert batch.columns["y"].tolist() == [1.0, 2.0, None]
+    assert batch.rows(["y", "x"]) == [(1.0, 0.0), (2.0, 1.0), (None, 2.0)]
+
+
 @pytest.mark.usefixtures("working_subscriber_config")
 def test_subscription_from_config(dataset, basic_subscriber) -> None:
     """
@@ -16,6 +16,7 @@ from ipywidgets import (  # type: ignore[import-untyped]
 )
 
 from qcodes import interactive_widget
+from qcodes.dataset import get_run_summaries, load_by_guid
 
 # set matplotlib backend before importing pyplot
 matplotlib.use("Agg")
@@ -151,3 +152,26 @@ def test_experiments_widget_sorting(standalone_parameters_dataset, sort_by) -> N
     grid = widget.children[2]
     assert isinstance(grid, GridspecLayout)
     assert grid.n_rows == 1 + 1
+
+
+def test_widget_on_run_summaries(tab, standalone_parameters_dataset) -> None:
+    ds = standalone_parameters_dataset
+    (summary,) = get_run_summaries()
+
+    box = interactive_widget._get_parameters_button(summary)
+    assert box.children[0].description == ds._parameters
+
+    snapshot_button = interactive_widget._get_snapshot_button(summary, tab)
+    snapshot_button.click()
+    time.sleep(0.5)  # after click
+    assert "snapshot" in tab.get_title(1)
+
+    box = interactive_widget.editable_metadata(summary)
+    box.children[0].click()
+    text_area, save_box = box.children
+    text_area.value = "test value"
+    save_box.children[0].click()
+    time.sleep(0.5)  # after click
+    assert load_by_guid(ds.guid).metadata[interactive_widget._META_DATA_KEY] == (
+        "test value"
+    )